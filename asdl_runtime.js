@@ -0,0 +1,1332 @@
+//------------------------------------------------------------------------------
+// Shared runtime of the table-driven AST modules.
+// NOTE: unlike the modules it builds, this code is not generated: it doesn't
+//       depend on any ASDL definition. The node classes it builds mirror the
+//       ones emitted by asdl_gen_js.py with --backend=object, and
+//       test/test_table.js checks that the two behave the same, so changes to
+//       the emitted code should be made here as well.
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+
+'use strict';
+
+// define(exports, table) builds an AST module into exports from table, the
+// description of an ASDL definition emitted by asdl_gen_js.py with
+// --backend=table:
+//
+//   schema_id: the id of the schema, for serialization.
+//   profile: the emission profile ('debug', 'assert' or 'release').
+//   intern: whether leaf classes get interning of() factories.
+//   abstract: the names of the abstract node classes.
+//   classes: one entry per concrete node class, in kind order: its name, the
+//     name of its parent class and its fields as 'type name' strings, with
+//     a ? or * after the type of optional and sequence fields. Node types
+//     are given by class name.
+//
+// The resulting module has the same interface, and its nodes the same
+// behavior, as the one emitted with --backend=object; the node classes are
+// just built by generic code instead of being written out one by one.
+exports.define = function(exports, table) {
+  // ASTError is the exception type used by this module to signal errors
+  var ASTError = exports.ASTError = function(message) {
+    Error.captureStackTrace(this, ASTError);
+    this.message = message;
+  }
+
+  ASTError.prototype = new Error();
+  ASTError.prototype.constructor = ASTError;
+
+  // Some helper code used throughout the module
+  var _check_identifier = function(v, who, what, loc) {
+    if (Object.prototype.toString.call(v) !== '[object String]') {
+      throw new ASTError('Line ' + loc + ': ' + who + ' expects ' + what + ' to be an identifier');
+    }
+  }
+
+  var _check_string = function(v, who, what, loc) {
+    if (Object.prototype.toString.call(v) !== '[object String]' ||
+        v[0] !== "\"" || v[v.length - 1] !== "\"") {
+      throw new ASTError('Line ' + loc + ': ' + who + ' expects ' + what + ' to be a string');
+    }
+  }
+
+  // ints are integers of at most 52 bits plus a sign, so that they serialize
+  // exactly.
+  var _check_int = function(v, who, what, loc) {
+    if (!Number.isInteger(v) || Math.abs(v) > 4503599627370495) {
+      throw new ASTError('Line ' + loc + ': ' + who + ' expects ' + what + ' to be an int');
+    }
+  }
+
+  var _check_boolean = function(v, who, what, loc) {
+    if (Object.prototype.toString.call(v) !== '[object Boolean]') {
+      throw new ASTError('Line ' + loc + ': ' + who + ' expects ' + what + ' to be a boolean');
+    }
+  }
+
+  var _check_array = function(v, who, what, loc) {
+    if (Object.prototype.toString.call(v) !== '[object Array]') {
+      throw new ASTError('Line ' + loc + ': ' + who + ' expects ' + what + ' to be an array');
+    }
+  }
+
+  // The checks in node constructors only run when the COOL_AST_CHECKS
+  // environment variable is set.
+  var _checks_enabled = typeof process !== 'undefined' &&
+                        !!process.env.COOL_AST_CHECKS;
+
+  var _abstractmethod = function() {
+    throw new ASTError('Abstract method called');
+  }
+
+  // Node is an abstract interface implemented by all the AST nodes defined here.
+  // This interface is required by NodeVisitor (ZZZ?) to be able to walk any AST.
+  var Node = exports.Node = function() {
+    throw new ASTError('Node is an abstract class');
+  }
+
+  // forEachChild(callback, ctx) calls callback.call(ctx, child, field, index)
+  // for each child node, in order. field is the name of the field holding the
+  // child; index is its index for sequence fields and -1 otherwise. Use
+  // child_name(field, index) to get a printable name for the child.
+  Node.prototype.forEachChild = _abstractmethod;
+
+  // children() returns an array of {'name': ..., 'node': ...} objects, one per
+  // child node. It allocates; prefer forEachChild where possible.
+  Node.prototype.children = function() {
+    var children = [];
+    this.forEachChild(_push_child, children);
+    return children;
+  }
+
+  var _push_child = function(node, field, index) {
+    this.push({'name': child_name(field, index), 'node': node});
+  }
+
+  // The children of all leaf nodes. Frozen, since it's shared.
+  var _no_children = Object.freeze([]);
+
+  var child_name = exports.child_name = function(field, index) {
+    return index < 0 ? field : field + '[' + index.toString() + ']';
+  }
+
+  // transformChildren(fn, ctx) returns the node with each child node replaced by
+  // fn.call(ctx, child), without modifying it: if fn returns all the children
+  // unchanged, the node itself is returned; otherwise, a new node of the same
+  // class, with the same attributes and loc, sharing the unchanged children.
+  Node.prototype.transformChildren = _abstractmethod;
+
+  // _dump(d, depth) appends the dump of the node, at the given depth, and of its
+  // descendants to the _Dumper d (see dump).
+  Node.prototype._dump = _abstractmethod;
+
+  // The result of fn.call(ctx, node) for each node of seq: seq itself if no node
+  // changed, else a new array, built from the first changed node on.
+  var _transform_seq = function(seq, fn, ctx) {
+    for (var i = 0; i < seq.length; i++) {
+      var node = fn.call(ctx, seq[i]);
+      if (node !== seq[i]) {
+        var result = seq.slice(0, i);
+        result.push(node);
+        for (i++; i < seq.length; i++) {
+          result.push(fn.call(ctx, seq[i]));
+        }
+        return result;
+      }
+    }
+    return seq;
+  }
+
+  Node.attributes = [];
+  Node.node_type = 'Node';
+
+  // Each concrete node class has a distinct integer kind on its prototype,
+  // indexing node_types and node_classes.
+  Node.prototype.kind = -1;
+
+  // equals(other, options) compares two trees structurally: same node types and
+  // equal attributes and children, field by field, stopping at the first
+  // difference. locs are compared too, unless options.ignoreLoc is set.
+  //
+  // structuralHash() returns a 32-bit hash of the tree, consistent with equals
+  // (locs are not hashed). It's cached in the node, so nodes must not be
+  // modified after their hash has been computed. It recurses once per level of
+  // the tree, and overflows the stack on trees about 10000 levels deep.
+  Node.prototype.equals = _abstractmethod;
+  Node.prototype.structuralHash = _abstractmethod;
+
+  // Compare the headers of two nodes: true if their fields have to be compared,
+  // false if they are known to differ.
+  var _same_header = function(a, b, options) {
+    return b !== null && b !== undefined && a.kind === b.kind &&
+           (a._hash === 0 || b._hash === 0 || a._hash === b._hash) &&
+           ((options !== undefined && options.ignoreLoc) || a.loc === b.loc);
+  }
+
+  var _node_equals = function(a, b, options) {
+    return a === null ? b === null : a.equals(b, options);
+  }
+
+  var _nodes_equal = function(a, b, options) {
+    if (a.length !== b.length) {
+      return false;
+    }
+    for (var i = 0; i < a.length; i++) {
+      if (!a[i].equals(b[i], options)) {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  var _values_equal = function(a, b) {
+    if (a.length !== b.length) {
+      return false;
+    }
+    for (var i = 0; i < a.length; i++) {
+      if (a[i] !== b[i]) {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  var _mix_hash = function(h, v) {
+    return (Math.imul(h, 0x01000193) ^ v) | 0;
+  }
+
+  var _hash_value = function(v) {
+    if (v === null) {
+      return 0x2545f491;
+    } else if (typeof v === 'string') {
+      var h = 0x811c9dc5 | 0;
+      for (var i = 0; i < v.length; i++) {
+        h = _mix_hash(h, v.charCodeAt(i));
+      }
+      return h;
+    } else if (typeof v === 'boolean') {
+      return v ? 0x3c6ef372 : 0x1b873593;
+    } else {
+      return (v | 0) ^ ((v / 4294967296) | 0);
+    }
+  }
+
+  var _hash_node = function(node) {
+    return node === null ? 0x2545f491 : node.structuralHash();
+  }
+
+  var _hash_nodes = function(nodes) {
+    var h = nodes.length;
+    for (var i = 0; i < nodes.length; i++) {
+      h = _mix_hash(h, nodes[i].structuralHash());
+    }
+    return h;
+  }
+
+  var _hash_values = function(values) {
+    var h = values.length;
+    for (var i = 0; i < values.length; i++) {
+      h = _mix_hash(h, _hash_value(values[i]));
+    }
+    return h;
+  }
+
+  // Freeze a node that is going to be shared. Its hash is computed first, since
+  // structuralHash can't cache it in a frozen node.
+  var _freeze_node = function(node) {
+    node.structuralHash();
+    return Object.freeze(node);
+  }
+
+
+  //
+  //-------------------- Interning --------------------
+  //
+
+  // Leaf node classes whose fields all have builtin types (or that have no fields,
+  // like NoExpr) have an of() factory taking the same arguments as their
+  // constructor: IntConst.of(token, loc).
+  // The builder creates these nodes through it. What of() does depends on the
+  // interning mode set with set_interning(mode, limit):
+  //
+  // 'off' (the default): of() always creates a new node.
+  // 'loc': nodes with the same fields and the same loc are shared.
+  // 'noloc': nodes with the same fields are shared, whatever their loc; shared
+  //   nodes have no loc. Only for passes that don't need locs of leaves.
+  //
+  // Shared nodes are frozen. limit bounds the number of nodes kept per class
+  // (default: 4096); a class's table is emptied when a node has to be added to
+  // it while it's full.
+  var _interning = {mode: 0, limit: 4096, generation: 0};
+
+  var set_interning = exports.set_interning = function(mode, limit) {
+    var modes = {'off': 0, 'loc': 1, 'noloc': 2};
+    if (!modes.hasOwnProperty(mode)) {
+      throw new ASTError('Unknown interning mode ' + mode);
+    }
+    _interning.mode = modes[mode];
+    _interning.limit = limit || 4096;
+    // Drop all the tables
+    _interning.generation++;
+  }
+
+  // The interning table of a node class: nested Maps keyed by the fields and
+  // the loc. full empties it.
+  var _interning_table = function(cls, full) {
+    if (full || cls._interned_generation !== _interning.generation) {
+      cls._interned = new Map();
+      cls._interned_count = 0;
+      cls._interned_generation = _interning.generation;
+    }
+    return cls._interned;
+  }
+
+
+  //
+  //-------------------- AST nodes --------------------
+  //
+
+  var _checks = table.profile === 'debug' ||
+                (table.profile === 'assert' && _checks_enabled);
+
+  var _builtin_checks = {
+    'identifier': _check_identifier,
+    'string': _check_string,
+    'int': _check_int,
+    'boolean': _check_boolean};
+
+  // _Writer and _Reader methods of the builtin types
+  var _builtin_methods = {
+    'identifier': 'string', 'string': 'string', 'int': 'int',
+    'boolean': 'boolean'};
+
+  var _construct = function(cls, args) {
+    return Reflect.construct(cls, args);
+  }
+
+  // A field of the table, with the functions comparing, hashing and checking
+  // its values.
+  var _Field = function(desc) {
+    var m = /^(\w+)([?*]?) (\w+)$/.exec(desc);
+    this.type = m[1];
+    this.name = m[3];
+    this.opt = m[2] === '?';
+    this.seq = m[2] === '*';
+    this.node = !_builtin_methods.hasOwnProperty(this.type);
+    this.method = this.node ? 'node' : _builtin_methods[this.type];
+    if (this.node) {
+      this.equal = this.seq ? _nodes_equal : this.opt ? _node_equals :
+                   function(a, b, options) {return a.equals(b, options);};
+      this.hash = this.seq ? _hash_nodes : this.opt ? _hash_node :
+                  function(v) {return v.structuralHash();};
+    } else {
+      this.equal = this.seq ? _values_equal : function(a, b) {return a === b;};
+      this.hash = this.seq ? _hash_values : _hash_value;
+    }
+  }
+
+  // Check the constructor argument v for this field of a node of the given
+  // class.
+  _Field.prototype.check = function(classname, v, loc) {
+    var cls = this.node ? _classes[this.type] : null;
+    if (this.seq) {
+      _check_array(v, classname, this.name, loc);
+      for (var i = 0; i < v.length; i++) {
+        if (cls === null) {
+          _builtin_checks[this.type](v[i], classname, this.name, loc);
+        } else if (!(v[i] instanceof cls)) {
+          throw new ASTError(classname + ' expects ' + this.name +
+                             ' to be an array of ' + this.type);
+        }
+      }
+    } else if (this.opt && v === null) {
+      return;
+    } else if (cls === null) {
+      _builtin_checks[this.type](v, classname, this.name, loc);
+    } else if (!(v instanceof cls)) {
+      throw new ASTError(classname + ' expects ' + this.name + ' to be a ' +
+                         this.type);
+    }
+  }
+
+  // Node classes by name
+  var _classes = {'Node': Node};
+
+  // The fields of the node classes and their node-typed fields, indexed by
+  // kind.
+  var _fields = [];
+  var _child_fields = [];
+
+  // Functions creating a node of each kind from the constructor's arguments:
+  // its of() factory if it has one, else its constructor.
+  var _creators = [];
+
+  var node_types = exports.node_types = [];
+  var node_classes = exports.node_classes = [];
+
+  var _define_abstract_class = function(classname) {
+    var cls = exports[classname] = _classes[classname] = function() {
+      throw new ASTError(classname + ' is an abstract class');
+    }
+    cls.prototype = Object.create(Node.prototype);
+    cls.prototype.constructor = cls;
+  }
+
+  var _define_class = function(classname, parentname, fields, kind) {
+    var n = fields.length;
+    var cls = exports[classname] = _classes[classname] = function() {
+      var loc = arguments[n];
+      if (_checks) {
+        for (var f = 0; f < n; f++) {
+          fields[f].check(classname, arguments[f], loc);
+        }
+      }
+      // Always in the same order, so that all the instances of a class share
+      // a single shape
+      for (var f = 0; f < n; f++) {
+        this[fields[f].name] = arguments[f];
+      }
+      this.loc = loc;
+      this._hash = 0;
+    }
+    var proto = cls.prototype = Object.create(_classes[parentname].prototype);
+    proto.constructor = cls;
+    proto.kind = kind;
+
+    var attrs = fields.filter(function(field) {
+      return !field.seq && !field.node;
+    }).map(function(field) {return field.name;});
+    if (table.profile === 'debug') {
+      Object.defineProperties(cls, {
+        'attributes': {get: function() {return attrs.slice();}},
+        'node_type': {get: function() {return classname;}}
+      });
+    } else {
+      cls.attributes = attrs;
+      cls.node_type = classname;
+    }
+
+    var children = fields.filter(function(field) {return field.node;});
+    proto.forEachChild = function(callback, ctx) {
+      for (var f = 0; f < children.length; f++) {
+        var field = children[f];
+        var v = this[field.name];
+        if (field.seq) {
+          for (var i = 0; i < v.length; i++) {
+            callback.call(ctx, v[i], field.name, i);
+          }
+        } else if (!field.opt || v !== null) {
+          callback.call(ctx, v, field.name, -1);
+        }
+      }
+    }
+    if (children.length === 0) {
+      proto.children = function() {
+        return _no_children;
+      }
+    } else if (!children.some(function(field) {return field.seq;})) {
+      proto.children = function() {
+        var result = [];
+        for (var f = 0; f < children.length; f++) {
+          var v = this[children[f].name];
+          if (v !== null) {
+            result.push({'name': children[f].name, 'node': v});
+          }
+        }
+        return result;
+      }
+    }
+
+    if (children.length === 0) {
+      proto.transformChildren = function() {
+        return this;
+      }
+    } else {
+      proto.transformChildren = function(fn, ctx) {
+        var args = [];
+        var changed = false;
+        for (var f = 0; f < n; f++) {
+          var field = fields[f];
+          var v = this[field.name];
+          var t = v;
+          if (field.node) {
+            if (field.seq) {
+              t = _transform_seq(v, fn, ctx);
+            } else if (!field.opt || v !== null) {
+              t = fn.call(ctx, v);
+            }
+            changed = changed || t !== v;
+          }
+          args.push(t);
+        }
+        if (!changed) {
+          return this;
+        }
+        args.push(this.loc);
+        return _construct(cls, args);
+      }
+    }
+
+    proto._dump = function(d, depth) {
+      var s = classname + '(';
+      for (var a = 0; a < attrs.length; a++) {
+        s += (a === 0 ? '' : ', ') + attrs[a] + '=' + this[attrs[a]];
+      }
+      d.line(depth, s + ')', this.loc);
+      for (var f = 0; f < children.length; f++) {
+        var field = children[f];
+        var v = this[field.name];
+        if (field.seq) {
+          for (var i = 0; i < v.length; i++) {
+            v[i]._dump(d, depth + 1);
+          }
+        } else if (!field.opt || v !== null) {
+          v._dump(d, depth + 1);
+        }
+      }
+    }
+
+    proto.equals = function(other, options) {
+      if (this === other) {
+        return true;
+      }
+      if (!_same_header(this, other, options)) {
+        return false;
+      }
+      for (var f = 0; f < n; f++) {
+        var name = fields[f].name;
+        if (!fields[f].equal(this[name], other[name], options)) {
+          return false;
+        }
+      }
+      return true;
+    }
+
+    proto.structuralHash = function() {
+      if (this._hash === 0) {
+        var h = kind + 1;
+        for (var f = 0; f < n; f++) {
+          h = _mix_hash(h, fields[f].hash(this[fields[f].name]));
+        }
+        this._hash = h || 1;
+      }
+      return this._hash;
+    }
+
+    proto._serialize = function(w) {
+      for (var f = 0; f < n; f++) {
+        var field = fields[f];
+        var v = this[field.name];
+        if (field.seq) {
+          w.uint(v.length);
+          for (var i = 0; i < v.length; i++) {
+            w[field.method](v[i]);
+          }
+        } else {
+          w[field.method](v);
+        }
+      }
+    }
+
+    if (table.intern && fields.every(function(field) {
+          return !field.node && !field.seq;
+        })) {
+      cls.of = function() {
+        if (_interning.mode === 0) {
+          return _construct(cls, arguments);
+        }
+        var args = Array.prototype.slice.call(arguments, 0, n);
+        args.push(_interning.mode === 2 ? undefined : arguments[n]);
+        // One level of Maps per argument, the last one holding the node
+        var t = _interning_table(cls, false);
+        for (var i = 0; i < n; i++) {
+          var next = t.get(args[i]);
+          if (next === undefined) {
+            next = new Map();
+            t.set(args[i], next);
+          }
+          t = next;
+        }
+        var node = t.get(args[n]);
+        if (node === undefined) {
+          if (cls._interned_count >= _interning.limit) {
+            _interning_table(cls, true);
+            return cls.of.apply(null, args);
+          }
+          node = _freeze_node(_construct(cls, args));
+          t.set(args[n], node);
+          cls._interned_count++;
+        }
+        return node;
+      }
+    }
+
+    _fields.push(fields);
+    _child_fields.push(children);
+    _creators.push(cls.of || function() {return _construct(cls, arguments);});
+    node_types.push(classname);
+    node_classes.push(cls);
+  }
+
+  table.abstract.forEach(_define_abstract_class);
+  table.classes.forEach(function(desc, kind) {
+    _define_class(desc[0], desc[1], desc.slice(2).map(function(field) {
+      return new _Field(field);
+    }), kind);
+  });
+  if (!table.intern) {
+    delete exports.set_interning;
+  }
+
+  //
+  //-------------------- Visitor --------------------
+  //
+
+  // GeneratedVisitor is the base for visitors of these ASTs. To create a
+  // visitor, inherit from GeneratedVisitor and define visit_Type methods for
+  // visiting nodes of type Type; nodes without such a method are handled by
+  // visit_children, which visits all their children.
+  //
+  // visit dispatches on node.kind through a table of methods, built the first
+  // time the visitor visits a node. The table of a visitor class is shared by all
+  // its instances; a visitor with visit_ methods of its own (assigned to it
+  // rather than to its class, before its first visit) gets its own table.
+  var GeneratedVisitor = exports.GeneratedVisitor = function() {
+    this._dispatch = null;
+  }
+
+  GeneratedVisitor.prototype.visit = function(node) {
+    var dispatch = this._dispatch || (this._dispatch = _dispatch_table(
+        this, 'visit_', 'visit_children'));
+    return dispatch[node.kind].call(this, node);
+  }
+
+  GeneratedVisitor.prototype.visit_children = function(node) {
+    node.forEachChild(this.visit, this);
+  }
+
+  // The methods of obj named prefix + node type, indexed by kind, with the method
+  // named fallback for the node types without one. The table is cached on obj's
+  // class's prototype, unless obj has methods starting with prefix of its own.
+  var _dispatch_table = function(obj, prefix, fallback) {
+    var own = Object.keys(obj).some(function(name) {
+      return name.lastIndexOf(prefix, 0) === 0;
+    });
+    if (own) {
+      return _method_table(obj, prefix, fallback);
+    }
+    var proto = Object.getPrototypeOf(obj);
+    var cache = '_' + prefix + 'table';
+    if (!Object.prototype.hasOwnProperty.call(proto, cache)) {
+      proto[cache] = _method_table(proto, prefix, fallback);
+    }
+    return proto[cache];
+  }
+
+  var _method_table = function(obj, prefix, fallback) {
+    var table = [];
+    for (var kind = 0; kind < node_types.length; kind++) {
+      var method = obj[prefix + node_types[kind]];
+      table.push(method === undefined ? obj[fallback] : method);
+    }
+    return table;
+  }
+
+  //
+  //-------------------- Transformer --------------------
+  //
+
+  // GeneratedTransformer is the base for passes rewriting these ASTs without
+  // modifying them. To create a transformer, inherit from GeneratedTransformer
+  // and define transform_Type methods returning the node replacing a node of
+  // type Type (possibly the node itself); nodes without such a method are handled
+  // by transform_children, which transforms their children. transform(root)
+  // returns the new tree. Nodes are only rebuilt if one of their children
+  // changed, so the new tree shares all the unchanged subtrees with the old one,
+  // and transforming a tree without changing anything returns it as is.
+  //
+  // Dispatch goes through a table of methods, as for visitors.
+  var GeneratedTransformer = exports.GeneratedTransformer = function() {
+    this._dispatch = null;
+  }
+
+  GeneratedTransformer.prototype.transform = function(node) {
+    var dispatch = this._dispatch || (this._dispatch = _dispatch_table(
+        this, 'transform_', 'transform_children'));
+    return dispatch[node.kind].call(this, node);
+  }
+
+  GeneratedTransformer.prototype.transform_children = function(node) {
+    return node.transformChildren(this.transform, this);
+  }
+
+  //
+  //-------------------- Dumping --------------------
+  //
+
+  // dump(node, show_loc, write) dumps the tree rooted at node as
+  // ast_visitor.NodeDumper does: a line "Type(attr=value, ...)" per node,
+  // followed by " @ loc: " and its loc if show_loc is set, indented by 4 spaces
+  // per level. Each node class has a _dump method appending its line to a shared
+  // _Dumper and then dumping its children, so nothing is allocated per node but
+  // the line itself. Being recursive, dump overflows the stack on trees about
+  // 10000 levels deep.
+  //
+  // Without write, the dump is returned as a string. Otherwise it's passed to
+  // write(chunk) in chunks of about _DUMP_CHUNK characters as it's produced, so
+  // that large trees can be streamed (e.g. to fs.writeSync) without building the
+  // whole string, and nothing is returned.
+  var dump = exports.dump = function(node, show_loc, write) {
+    var d = new _Dumper(show_loc || false, write || null);
+    node._dump(d, 0);
+    return d.finish();
+  }
+
+  var _DUMP_CHUNK = 65536;
+
+  // Indentation strings by depth, shared by all the dumps
+  var _indents = [''];
+
+  var _Dumper = function(show_loc, write) {
+    this.show_loc = show_loc;
+    this.write = write;
+    this.buf = '';
+    this.sep = '';
+  }
+
+  _Dumper.prototype.line = function(depth, s, loc) {
+    while (_indents.length <= depth) {
+      _indents.push(_indents[_indents.length - 1] + '    ');
+    }
+    if (this.show_loc) {
+      s += ' @ loc: ' + loc;
+    }
+    this.buf += this.sep + _indents[depth] + s;
+    this.sep = '\n';
+    if (this.write !== null && this.buf.length >= _DUMP_CHUNK) {
+      this.write(this.buf);
+      this.buf = '';
+    }
+  }
+
+  _Dumper.prototype.finish = function() {
+    if (this.write === null) {
+      return this.buf;
+    }
+    if (this.buf.length > 0) {
+      this.write(this.buf);
+      this.buf = '';
+    }
+  }
+
+  //
+  //-------------------- Walkers --------------------
+  //
+
+  // walkPreorder(root, fn, ctx) and walkPostorder(root, fn, ctx) call
+  // fn.call(ctx, node) for every node of the tree rooted at root, parents
+  // before their children or after them, respectively. Children are walked in
+  // the order of their fields, like forEachChild. The walk uses an explicit
+  // stack rather than recursion, so it works on trees of any depth.
+  //
+  // fn can return SKIP to have the children of the node skipped (walkPreorder
+  // only), or STOP to end the walk. The walkers return false if the walk was
+  // stopped and true otherwise.
+  var SKIP = exports.SKIP = {};
+  var STOP = exports.STOP = {};
+
+  // Marks the position of a node whose children are being walked by
+  // walkPostorder.
+  var _POSTORDER_MARK = {};
+
+  var walkPreorder = exports.walkPreorder = function(root, fn, ctx) {
+    var stack = [root];
+    while (stack.length > 0) {
+      var node = stack.pop();
+      var action = fn.call(ctx, node);
+      if (action === STOP) {
+        return false;
+      } else if (action === SKIP) {
+        continue;
+      }
+      _push_children(node, stack);
+    }
+    return true;
+  }
+
+  var walkPostorder = exports.walkPostorder = function(root, fn, ctx) {
+    var stack = [root];
+    while (stack.length > 0) {
+      var node = stack.pop();
+      if (node === _POSTORDER_MARK) {
+        if (fn.call(ctx, stack.pop()) === STOP) {
+          return false;
+        }
+        continue;
+      }
+      stack.push(node, _POSTORDER_MARK);
+      _push_children(node, stack);
+    }
+    return true;
+  }
+
+  // Push the children of node on stack, in reverse order so that they are
+  // popped in order.
+  var _push_children = function(node, stack) {
+    var fields = _child_fields[node.kind];
+    for (var f = fields.length - 1; f >= 0; f--) {
+      var v = node[fields[f].name];
+      if (fields[f].seq) {
+        for (var i = v.length - 1; i >= 0; i--) {
+          stack.push(v[i]);
+        }
+      } else if (v !== null) {
+        stack.push(v);
+      }
+    }
+  }
+
+  //
+  //-------------------- Kind index --------------------
+  //
+
+  // buildKindIndex(root) walks the tree rooted at root once and returns a
+  // KindIndex of it, which passes can share to find all the nodes of a kind
+  // without walking the tree again.
+  //
+  // Each position in the tree gets an id, in preorder; the root's is 0. The
+  // index has side arrays mapping ids to:
+  //
+  //   nodes: the node at the position (null once removed by replace).
+  //   parents: the id of the parent, -1 for the root.
+  //   fields: the name of the parent's field holding the node.
+  //   slots: the index of the node in that field, -1 if it's not a sequence.
+  //   sizes: the number of ids in the subtree of the node.
+  //
+  // ofKind(kind) returns the nodes of a kind, given as a kind number or a node
+  // class; forEachOfKind(kind, fn, ctx) calls fn.call(ctx, node, id) for them.
+  // An abstract class (such as Node itself) stands for all its concrete
+  // subclasses, whose nodes come kind by kind.
+  // parentOf(node) and idOf(node) map nodes to their positions. Interned nodes
+  // can appear at several positions; these methods throw an ASTError for them,
+  // and the side arrays must be used instead.
+  //
+  // replace(node, replacement) replaces a subtree, both in the tree and in the
+  // index: the ids of the old subtree are retired and the new one is indexed
+  // with fresh ids, without walking the rest of the tree. node can also be
+  // given by id. The replacement must be of the type the field holding node is
+  // declared with. The cached structural hashes of the ancestors are reset.
+  // Nodes of a kind come in preorder, followed by those added by replacements.
+  var KindIndex = exports.KindIndex = function(root) {
+    this.root = root;
+    this.nodes = [];
+    this.parents = [];
+    this.fields = [];
+    this.slots = [];
+    this.sizes = [];
+    this._kinds = [];
+    for (var k = 0; k < node_classes.length; k++) {
+      this._kinds.push([]);
+    }
+    // id -> id of the root of the subtree that replaced it
+    this._replaced = new Map();
+    // node -> its id, or the array of its ids if it has several. Built by the
+    // first idOf, and then kept up to date by replace.
+    this._positions = null;
+    this._add(root, -1, null, -1);
+  }
+
+  var buildKindIndex = exports.buildKindIndex = function(root) {
+    return new KindIndex(root);
+  }
+
+  // The kinds of the nodes of kind, given as for ofKind.
+  var _kinds_of = function(kind) {
+    if (typeof kind === 'number') {
+      if (kind >= 0 && kind < node_classes.length && kind % 1 === 0) {
+        return [kind];
+      }
+    } else if (typeof kind === 'function' &&
+               (kind === Node || kind.prototype instanceof Node)) {
+      if (kind !== Node && kind.prototype.hasOwnProperty('kind')) {
+        return [kind.prototype.kind];
+      }
+      var kinds = [];
+      for (var k = 0; k < node_classes.length; k++) {
+        if (node_classes[k].prototype instanceof kind) {
+          kinds.push(k);
+        }
+      }
+      return kinds;
+    }
+    throw new ASTError('Not a node kind or class: ' + kind);
+  }
+
+  KindIndex.prototype.ofKind = function(kind) {
+    var result = [];
+    this.forEachOfKind(kind, function(node) { result.push(node); });
+    return result;
+  }
+
+  KindIndex.prototype.forEachOfKind = function(kind, fn, ctx) {
+    var kinds = _kinds_of(kind);
+    for (var k = 0; k < kinds.length; k++) {
+      var ids = this._kinds[kinds[k]];
+      // Drop the ids retired by replace along the way
+      var live = 0;
+      for (var i = 0; i < ids.length; i++) {
+        var node = this.nodes[ids[i]];
+        if (node !== null) {
+          ids[live++] = ids[i];
+          fn.call(ctx, node, ids[i]);
+        }
+      }
+      ids.length = live;
+    }
+  }
+
+  KindIndex.prototype.idOf = function(node) {
+    if (this._positions === null) {
+      this._positions = new Map();
+      for (var id = 0; id < this.nodes.length; id++) {
+        if (this.nodes[id] !== null) {
+          this._add_position(this.nodes[id], id);
+        }
+      }
+    }
+    var id = this._positions.get(node);
+    if (id === undefined) {
+      return -1;
+    } else if (typeof id !== 'number') {
+      throw new ASTError('KindIndex: node occurs at several positions');
+    }
+    return id;
+  }
+
+  KindIndex.prototype._add_position = function(node, id) {
+    var ids = this._positions.get(node);
+    if (ids === undefined) {
+      this._positions.set(node, id);
+    } else if (typeof ids === 'number') {
+      this._positions.set(node, [ids, id]);
+    } else {
+      ids.push(id);
+    }
+  }
+
+  KindIndex.prototype._remove_position = function(node, id) {
+    var ids = this._positions.get(node);
+    if (typeof ids === 'number') {
+      this._positions.delete(node);
+    } else {
+      ids.splice(ids.indexOf(id), 1);
+      if (ids.length === 1) {
+        this._positions.set(node, ids[0]);
+      }
+    }
+  }
+
+  KindIndex.prototype.parentOf = function(node) {
+    var id = this.idOf(node);
+    if (id < 0) {
+      throw new ASTError('KindIndex: node is not in the tree');
+    }
+    return this.parents[id] < 0 ? null : this.nodes[this.parents[id]];
+  }
+
+  KindIndex.prototype.replace = function(node, replacement) {
+    var id = typeof node === 'number' ? node : this.idOf(node);
+    if (id < 0 || id >= this.nodes.length || this.nodes[id] === null) {
+      throw new ASTError('KindIndex: node is not in the tree');
+    }
+    var parent = this.parents[id];
+    if (parent < 0) {
+      if (!(replacement instanceof Node)) {
+        throw new ASTError('KindIndex: replacement is not a node');
+      }
+      this.root = replacement;
+    } else {
+      var holder = this.nodes[parent];
+      if (!(replacement instanceof
+            _field_classes[holder.kind][this.fields[id]])) {
+        throw new ASTError('KindIndex: replacement has the wrong type');
+      }
+      if (this.slots[id] < 0) {
+        holder[this.fields[id]] = replacement;
+      } else {
+        holder[this.fields[id]][this.slots[id]] = replacement;
+      }
+      for (var a = parent; a >= 0; a = this.parents[a]) {
+        this.nodes[a]._hash = 0;
+      }
+    }
+    this._retire(id);
+    this._replaced.set(id, this._add(replacement, parent, this.fields[id],
+                                     this.slots[id]));
+  }
+
+  // Retire the ids of the subtree at id, and of the subtrees that replaced
+  // parts of it.
+  KindIndex.prototype._retire = function(id) {
+    var pending = [id];
+    while (pending.length > 0) {
+      var first = pending.pop();
+      var end = first + this.sizes[first];
+      for (var i = first; i < end; i++) {
+        if (this._positions !== null && this.nodes[i] !== null) {
+          this._remove_position(this.nodes[i], i);
+        }
+        this.nodes[i] = null;
+        var moved = this._replaced.get(i);
+        if (moved !== undefined) {
+          this._replaced.delete(i);
+          pending.push(moved);
+        }
+      }
+    }
+  }
+
+  // Index the subtree of root, at the given position, with fresh ids. Return the
+  // id of root.
+  KindIndex.prototype._add = function(root, root_parent, root_field,
+                                      root_slot) {
+    var first = this.nodes.length;
+    var stack = [root, root_parent, root_field, root_slot];
+    while (stack.length > 0) {
+      var slot = stack.pop();
+      var field = stack.pop();
+      var parent = stack.pop();
+      var node = stack.pop();
+      var id = this.nodes.length;
+      this.nodes.push(node);
+      this.parents.push(parent);
+      this.fields.push(field);
+      this.slots.push(slot);
+      this.sizes.push(1);
+      this._kinds[node.kind].push(id);
+      if (this._positions !== null) {
+        this._add_position(node, id);
+      }
+      _push_indexed_children(node, id, stack);
+    }
+    for (var i = this.nodes.length - 1; i > first; i--) {
+      this.sizes[this.parents[i]] += this.sizes[i];
+    }
+    return first;
+  }
+
+  // The classes of the nodes held by the node fields of each kind, by field name
+  var _field_classes = _child_fields.map(function(fields) {
+    var classes = {};
+    fields.forEach(function(field) {
+      classes[field.name] = _classes[field.type];
+    });
+    return classes;
+  });
+
+  // Like _push_children, with each child followed by id, its field's name and
+  // its index in the field.
+  var _push_indexed_children = function(node, id, stack) {
+    var fields = _child_fields[node.kind];
+    for (var f = fields.length - 1; f >= 0; f--) {
+      var name = fields[f].name;
+      var v = node[name];
+      if (fields[f].seq) {
+        for (var i = v.length - 1; i >= 0; i--) {
+          stack.push(v[i], id, name, i);
+        }
+      } else if (v !== null) {
+        stack.push(v, id, name, -1);
+      }
+    }
+  }
+
+  //
+  //-------------------- Builder --------------------
+  //
+
+  // builder exposes the node constructors and field accessors of this module as
+  // plain functions: builder.Obj(name, loc) creates an Obj node and
+  // builder.name(node) reads the name field of a node. The arena backend
+  // exposes the same interface over node handles, so code written against a
+  // builder (such as the parser) can target either representation.
+  var builder = exports.builder = {
+    kinds: {},
+    kind: function(node) {return node.kind;},
+    loc: function(node) {return node.loc;},
+    node_type: function(node) {return node.constructor.node_type;}
+  };
+
+  node_types.forEach(function(classname, kind) {
+    builder.kinds[classname] = kind;
+    builder[classname] = _creators[kind];
+  });
+  _fields.forEach(function(fields) {
+    fields.forEach(function(field) {
+      var name = field.name;
+      builder[name] = function(node) {return node[name];};
+    });
+  });
+
+  //
+  //-------------------- Serialization --------------------
+  //
+
+  // serialize(node) encodes the tree rooted at node into a compact binary form,
+  // returned as a Uint8Array. deserialize(bytes) decodes it back into a tree of
+  // nodes (bytes can be a Uint8Array or a Buffer).
+  //
+  // The encoding, where all integers are unsigned LEB128 varints:
+  // - The magic 'CAST', the format version and the schema id: a hash of the
+  //   ASDL definition this module was generated from, so that ASTs are never
+  //   decoded against a different schema.
+  // - A string table: the number of strings, then the length in bytes and the
+  //   UTF-8 encoding of each string. Identifiers and strings in the tree are
+  //   stored as their index in the table plus 1, with 0 for null.
+  // - The root node. A node is encoded as its kind plus 1 (0 for null), its loc
+  //   plus 1 (0 for a missing loc), and then its fields in order. Sequences are
+  //   their length followed by their elements. ints are zigzag-encoded, and
+  //   booleans are a single 0 or 1 byte.
+  //
+  // Both recurse once per level of the tree, so trees a few thousand levels
+  // deep (such as a left-deep chain of thousands of binary operators) overflow
+  // node's default stack with a RangeError; deserialize gives up first, at about
+  // half the depth serialize handles. The Python deserializer generated by
+  // asdl_gen_py.py reads with an explicit stack and has no such limit.
+  var serialize = exports.serialize = function(node) {
+    var body = new _Writer();
+    body.node(node);
+
+    var out = new _Writer();
+    for (var i = 0; i < _MAGIC.length; i++) {
+      out.byte(_MAGIC.charCodeAt(i));
+    }
+    out.uint(_FORMAT_VERSION);
+    out.uint(schema_id);
+    out.uint(body.strings.length);
+    for (var i = 0; i < body.strings.length; i++) {
+      var utf8 = _utf8_encode(body.strings[i]);
+      out.uint(utf8.length);
+      out.bytes(utf8);
+    }
+    out.bytes(body.buf.subarray(0, body.pos));
+    return out.buf.slice(0, out.pos);
+  }
+
+  var deserialize = exports.deserialize = function(bytes) {
+    var r = new _Reader(bytes);
+    for (var i = 0; i < _MAGIC.length; i++) {
+      if (r.byte() !== _MAGIC.charCodeAt(i)) {
+        throw new ASTError('Not a serialized AST');
+      }
+    }
+    var version = r.uint();
+    if (version !== _FORMAT_VERSION) {
+      throw new ASTError('Unsupported serialized AST version ' + version);
+    }
+    if (r.uint() !== schema_id) {
+      throw new ASTError('Serialized AST was built from a different schema');
+    }
+    var nstrings = r.uint();
+    for (var i = 0; i < nstrings; i++) {
+      var length = r.uint();
+      if (r.pos + length > bytes.length) {
+        throw new ASTError('Truncated serialized AST');
+      }
+      r.strings.push(_utf8_decode(bytes, r.pos, r.pos + length));
+      r.pos += length;
+    }
+    return r.node();
+  }
+
+  var _MAGIC = 'CAST';
+  var _FORMAT_VERSION = 1;
+
+  var _Writer = function() {
+    this.buf = new Uint8Array(256);
+    this.pos = 0;
+    this.strings = [];
+    this._string_index = Object.create(null);
+  }
+
+  _Writer.prototype._reserve = function(n) {
+    if (this.pos + n > this.buf.length) {
+      var buf = new Uint8Array(Math.max(this.buf.length * 2, this.pos + n));
+      buf.set(this.buf);
+      this.buf = buf;
+    }
+  }
+
+  _Writer.prototype.byte = function(b) {
+    this._reserve(1);
+    this.buf[this.pos++] = b;
+  }
+
+  _Writer.prototype.bytes = function(bytes) {
+    this._reserve(bytes.length);
+    this.buf.set(bytes, this.pos);
+    this.pos += bytes.length;
+  }
+
+  // Arithmetic rather than bitwise operations, so that values beyond 32 bits
+  // are encoded correctly. Anything but the integers from 0 to 2^53 - 1 (such as
+  // a negative or fractional loc) would be encoded as something else, and is
+  // rejected.
+  _Writer.prototype.uint = function(v) {
+    if (!Number.isSafeInteger(v) || v < 0) {
+      throw new ASTError('Can\'t serialize ' + v + ': not an unsigned integer');
+    }
+    this._reserve(10);
+    while (v >= 128) {
+      this.buf[this.pos++] = (v % 128) | 128;
+      v = Math.floor(v / 128);
+    }
+    this.buf[this.pos++] = v;
+  }
+
+  // Only ints as checked by _check_int have an exact zigzag encoding.
+  _Writer.prototype.int = function(v) {
+    if (!Number.isInteger(v) || Math.abs(v) > 4503599627370495) {
+      throw new ASTError('Can\'t serialize ' + v + ': not an int');
+    }
+    this.uint(v >= 0 ? v * 2 : -v * 2 - 1);
+  }
+
+  _Writer.prototype.boolean = function(v) {
+    this.byte(v ? 1 : 0);
+  }
+
+  _Writer.prototype.string = function(s) {
+    if (s === null) {
+      this.uint(0);
+      return;
+    }
+    var index = this._string_index[s];
+    if (index === undefined) {
+      index = this._string_index[s] = this.strings.length;
+      this.strings.push(s);
+    }
+    this.uint(index + 1);
+  }
+
+  _Writer.prototype.node = function(node) {
+    if (node === null) {
+      this.uint(0);
+      return;
+    }
+    this.uint(node.kind + 1);
+    this.uint(node.loc === undefined || node.loc === null ? 0 : node.loc + 1);
+    node._serialize(this);
+  }
+
+  var _Reader = function(bytes) {
+    this.bytes = bytes;
+    this.pos = 0;
+    this.strings = [];
+  }
+
+  _Reader.prototype.byte = function() {
+    if (this.pos >= this.bytes.length) {
+      throw new ASTError('Truncated serialized AST');
+    }
+    return this.bytes[this.pos++];
+  }
+
+  _Reader.prototype.uint = function() {
+    var v = 0;
+    var scale = 1;
+    var b;
+    do {
+      b = this.byte();
+      v += (b & 127) * scale;
+      scale *= 128;
+    } while (b & 128);
+    return v;
+  }
+
+  _Reader.prototype.int = function() {
+    var v = this.uint();
+    return v % 2 === 0 ? v / 2 : -(v + 1) / 2;
+  }
+
+  _Reader.prototype.boolean = function() {
+    return this.byte() !== 0;
+  }
+
+  _Reader.prototype.string = function() {
+    var index = this.uint();
+    if (index === 0) {
+      return null;
+    }
+    if (index > this.strings.length) {
+      throw new ASTError('Unknown string index ' + (index - 1));
+    }
+    return this.strings[index - 1];
+  }
+
+  _Reader.prototype.node = function() {
+    var tag = this.uint();
+    if (tag === 0) {
+      return null;
+    }
+    var deserializer = _deserializers[tag - 1];
+    if (deserializer === undefined) {
+      throw new ASTError('Unknown node kind ' + (tag - 1));
+    }
+    var loc = this.uint();
+    return deserializer(this, loc === 0 ? undefined : loc - 1);
+  }
+
+  // Read a sequence whose elements are read by the given _Reader method.
+  _Reader.prototype.seq = function(read) {
+    var length = this.uint();
+    var values = [];
+    for (var i = 0; i < length; i++) {
+      values.push(read.call(this));
+    }
+    return values;
+  }
+
+  // Strings are encoded and decoded with the standard UTF-8 codec. Strings
+  // that have no UTF-8 encoding (with unpaired surrogates) aren't serialized,
+  // and malformed UTF-8 isn't decoded, rather than replaced by U+FFFD.
+  var _utf8_encoder = new TextEncoder();
+  var _utf8_decoder = new TextDecoder('utf-8', {fatal: true, ignoreBOM: true});
+  var _unpaired_surrogate =
+      /[\ud800-\udbff](?![\udc00-\udfff])|(?:^|[^\ud800-\udbff])[\udc00-\udfff]/;
+
+  var _utf8_encode = function(s) {
+    if (_unpaired_surrogate.test(s)) {
+      throw new ASTError('Can\'t serialize ' + JSON.stringify(s) +
+                         ': not valid Unicode');
+    }
+    return _utf8_encoder.encode(s);
+  }
+
+  var _utf8_decode = function(bytes, start, end) {
+    try {
+      return _utf8_decoder.decode(bytes.subarray(start, end));
+    } catch (e) {
+      throw new ASTError('Invalid UTF-8 string in serialized AST');
+    }
+  }
+
+  var schema_id = exports.schema_id = table.schema_id;
+
+  // Functions reading the fields of a node from a _Reader and creating the
+  // node, indexed by kind.
+  var _deserializers = _fields.map(function(fields, kind) {
+    var create = _creators[kind];
+    return function(r, loc) {
+      var args = [];
+      for (var f = 0; f < fields.length; f++) {
+        var method = r[fields[f].method];
+        args.push(fields[f].seq ? r.seq(method) : method.call(r));
+      }
+      args.push(loc);
+      return create.apply(null, args);
+    }
+  });
+}
@@ -0,0 +1,56 @@
+//------------------------------------------------------------------------------
+// Node statistics for Cool programs.
+//
+// Parses the given Cool source files with an instrumented AST module (one
+// generated with tools/asdl_gen_js.py --instrument; see the ast-stats target
+// in the Makefile), dumps each AST once, and prints the per-node-type
+// construction and walk counts as JSON, most constructed types first.
+//
+// The ASTs are dumped with ast_visitor.NodeDumper, which walks them through
+// forEachChild. dump_ast goes through the generated _dump methods instead,
+// which aren't counted.
+//
+// Usage: node ast_stats.js <instrumented AST module> <file.cl>...
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+var ast_visitor = require('./ast_visitor');
+var parser = require('./parser');
+var fs = require('fs');
+var path = require('path');
+
+
+var main = function() {
+  if (process.argv.length < 4) {
+    console.error('Usage: node ast_stats.js <instrumented AST module> ' +
+                  '<file.cl>...');
+    process.exit(1);
+  }
+  var instrumented = require(path.resolve(process.argv[2]));
+  if (typeof instrumented.stats !== 'function') {
+    console.error(process.argv[2] + ' is not instrumented');
+    process.exit(1);
+  }
+
+  process.argv.slice(3).forEach(function(filename) {
+    var ast = new parser.Parser(instrumented.builder).parse(
+      fs.readFileSync(filename, 'utf8'));
+    new ast_visitor.NodeDumper().visit(ast);
+  });
+
+  var stats = instrumented.stats();
+  var sorted = {};
+  Object.keys(stats).sort(function(a, b) {
+    return stats[b].constructed - stats[a].constructed || (a < b ? -1 : 1);
+  }).forEach(function(name) {
+    sorted[name] = stats[name];
+  });
+  console.log(JSON.stringify(sorted, null, 2));
+}
+
+if (module.parent === null) {
+  main();
+}
@@ -1,13 +1,15 @@
 //------------------------------------------------------------------------------
 // AST Visitor.
 //
-// The generic NodeVisitor class and a visitor for dumping ASTs to a string.
+// The generic NodeVisitor and NodeTransformer classes, a visitor for dumping
+// ASTs to a string and the dump_ast function.
 //
 // Eli Bendersky (eliben@gmail.com)
 // This code is in the public domain
 //------------------------------------------------------------------------------
 'use strict';
 
+var cool_ast = require('./cool_ast');
 
 // NodeVisitor - implements the classical visitor design pattern.
 //
@@ -19,26 +21,38 @@
 // visit_Type for visiting nodes of type Type. Custom visitors inherit the
 // visit_children method which can be used to generically dispatch children
 // nodes if the custom visitor doesn't have special provision for them.
+//
+// The dispatch itself is implemented by cool_ast.GeneratedVisitor, which looks
+// up visit_Type methods once per visitor class and then dispatches on the
+// integer kind of nodes.
 var NodeVisitor = exports.NodeVisitor = function() {
+  cool_ast.GeneratedVisitor.call(this);
 }
 
-NodeVisitor.prototype.visit = function(node) {
-  var visitor_name = 'visit_' + node.constructor.node_type;
-  var method = (visitor_name in this) ? this[visitor_name]
-                                      : this.visit_children;
-  return method.call(this, node);
-}
+NodeVisitor.prototype = Object.create(cool_ast.GeneratedVisitor.prototype);
+NodeVisitor.prototype.constructor = NodeVisitor;
 
-NodeVisitor.prototype.visit_children = function(node) {
-  var children = node.children();
-  for (var i = 0; i < children.length; i++) {
-    this.visit(children[i].node);
-  }
+// NodeTransformer - the base of passes that rewrite ASTs.
+//
+// To create a transformer, inherit from NodeTransformer and define methods
+// transform_Type returning the node that replaces a node of type Type. The
+// inherited transform_children method can be used to transform the children of
+// a node, and is the default for types without a transform_Type method.
+// transform(root) returns the rewritten tree. The original tree is never
+// modified: only the nodes on the path to a changed node are rebuilt, and the
+// rest is shared between the two trees. This is implemented by
+// cool_ast.GeneratedTransformer.
+var NodeTransformer = exports.NodeTransformer = function() {
+  cool_ast.GeneratedTransformer.call(this);
 }
 
+NodeTransformer.prototype = Object.create(
+    cool_ast.GeneratedTransformer.prototype);
+NodeTransformer.prototype.constructor = NodeTransformer;
+
 // NodeDumper - implements the visitor interface and dumps an AST tree/node
-// into a string.
-// dump_ast is a convenience function.
+// into a string. dump_ast produces the same dumps faster, and is what should be
+// used; NodeDumper is the reference implementation of the format.
 var NodeDumper = exports.NodeDumper = function(show_loc) {
   this.show_loc = show_loc || false;
 }
@@ -47,11 +61,16 @@ NodeDumper.prototype = Object.create(NodeVisitor.prototype);
 NodeDumper.constructor = NodeDumper;
 
 NodeDumper.prototype.visit = function(node) {
-  var output_lines = this._visit_aux(node, 0);
-  return output_lines.join('\n');
+  this._lines = [];
+  this._offset = 0;
+  this._visit_aux(node);
+  return this._lines.join('\n');
 }
 
-NodeDumper.prototype._visit_aux = function(node, offset) {
+// Appends the lines dumping node to this._lines, indented by this._offset.
+// Keeping the offset in the dumper lets _visit_aux be passed directly to
+// forEachChild.
+NodeDumper.prototype._visit_aux = function(node) {
   var s = node.constructor.node_type + '(';
   for (var i = 0; i < node.constructor.attributes.length; i++) {
     var attrname = node.constructor.attributes[i];
@@ -64,19 +83,18 @@ NodeDumper.prototype._visit_aux = function(node, offset) {
   if (this.show_loc) {
     s += ' @ loc: ' + node.loc;
   }
-  var output = [(Array(offset + 1).join(' ') + s)];
-
-  var children = node.children();
-  for (var i = 0; i < children.length; i++) {
-    output = output.concat(this._visit_aux(children[i].node, offset + 4));
-  }
+  this._lines.push(Array(this._offset + 1).join(' ') + s);
 
-  return output;
+  this._offset += 4;
+  node.forEachChild(this._visit_aux, this);
+  this._offset -= 4;
 }
 
-var dump_ast = exports.dump_ast = function(ast, show_loc) {
-  show_loc = show_loc || false;
-  var dumper = new NodeDumper(show_loc);
-  return dumper.visit(ast);
+// Dumps the AST through the _dump methods generated for the node classes (see
+// cool_ast.dump). Without write, returns the dump as a string. With write, it
+// streams the dump to write(chunk) instead:
+//   dump_ast(ast, true, function(chunk) { fs.writeSync(fd, chunk); });
+var dump_ast = exports.dump_ast = function(ast, show_loc, write) {
+  return cool_ast.dump(ast, show_loc || false, write);
 }
 
@@ -0,0 +1,109 @@
+//------------------------------------------------------------------------------
+// Benchmark of leaf node interning.
+//
+// Parses the sample Cool programs many times under each interning mode of
+// cool_ast (see set_interning), keeping all the ASTs alive, and reports the
+// number of node references in the trees, the number of distinct node objects
+// (nodes actually allocated), the heap growth and the parsing time. Also
+// checks that 'loc' interning doesn't change the dumped ASTs.
+//
+// Run with: node --expose-gc bench/bench_interning.js [copies]
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+var ast = require('../cool_ast');
+var ast_visitor = require('../ast_visitor');
+var parser = require('../parser');
+var fs = require('fs');
+var path = require('path');
+
+var samples_dir = path.join(__dirname, '..', 'cool_code_samples');
+
+var read_samples = function() {
+  return fs.readdirSync(samples_dir).filter(function(name) {
+    return /\.cl$/.test(name);
+  }).sort().map(function(name) {
+    return fs.readFileSync(path.join(samples_dir, name), 'utf8');
+  });
+}
+
+var gc = function() {
+  if (typeof global.gc === 'function') {
+    global.gc();
+  }
+}
+
+// Counts the node references in the trees and the distinct nodes among them.
+var count_nodes = function(trees) {
+  var seen = new Set();
+  var refs = 0;
+  var walk = function(node) {
+    refs++;
+    seen.add(node);
+    node.forEachChild(walk);
+  }
+  trees.forEach(walk);
+  return {refs: refs, distinct: seen.size};
+}
+
+var run_mode = function(mode, sources, copies) {
+  ast.set_interning(mode);
+  gc();
+  var heap_before = process.memoryUsage().heapUsed;
+  var start = process.hrtime();
+  var trees = [];
+  for (var i = 0; i < copies; i++) {
+    sources.forEach(function(source) {
+      trees.push(new parser.Parser().parse(source));
+    });
+  }
+  var elapsed = process.hrtime(start);
+  gc();
+  var heap_after = process.memoryUsage().heapUsed;
+  var counts = count_nodes(trees);
+  return {
+    mode: mode,
+    node_refs: counts.refs,
+    nodes_allocated: counts.distinct,
+    heap_bytes: heap_after - heap_before,
+    parse_ms: elapsed[0] * 1e3 + elapsed[1] / 1e6,
+    trees: trees};
+}
+
+var main = function() {
+  var copies = parseInt(process.argv[2] || '50', 10);
+  if (typeof global.gc !== 'function') {
+    console.error('Warning: run with --expose-gc for meaningful heap sizes');
+  }
+  var sources = read_samples();
+  var results = ['off', 'loc', 'noloc'].map(function(mode) {
+    return run_mode(mode, sources, copies);
+  });
+
+  // Interning with locs must not change the trees
+  var dump = function(tree) {
+    return ast_visitor.dump_ast(tree, true);
+  }
+  for (var i = 0; i < sources.length; i++) {
+    if (dump(results[0].trees[i]) !== dump(results[1].trees[i])) {
+      throw new Error('loc interning changed the AST of sample ' + i);
+    }
+  }
+  ast.set_interning('off');
+
+  console.log(JSON.stringify({
+    samples: sources.length,
+    copies: copies,
+    results: results.map(function(r) {
+      return {mode: r.mode, node_refs: r.node_refs,
+              nodes_allocated: r.nodes_allocated, heap_bytes: r.heap_bytes,
+              parse_ms: Math.round(r.parse_ms * 100) / 100};
+    })}, null, 2));
+}
+
+if (module.parent === null) {
+  main();
+}
@@ -0,0 +1,88 @@
+//------------------------------------------------------------------------------
+// Benchmark of the lexers.
+//
+// Lexes each of the Cool samples, and their concatenation repeated to several
+// sizes, with the hand-written lexer.js and the table-driven cool_lexer.js
+// generated by tools/lex_gen_js.py. Checks that both produce the same tokens
+// and errors, and reports in JSON the best time of several runs and the
+// throughput of each.
+//
+// Run with: node bench/bench_lexer.js [runs]
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+var assert = require('assert');
+var fs = require('fs');
+var path = require('path');
+
+var lexers = {
+  lexer: require('../lexer'),
+  cool_lexer: require('../cool_lexer')
+};
+
+// How many times the concatenated samples are repeated for the large inputs
+var REPEATS = [10, 100, 1000];
+
+var inputs = function() {
+  var samples_dir = path.join(__dirname, '..', 'cool_code_samples');
+  var result = {};
+  var all = [];
+  fs.readdirSync(samples_dir).forEach(function(name) {
+    var source = fs.readFileSync(path.join(samples_dir, name), 'utf8');
+    result[name] = source;
+    all.push(source);
+  });
+  var concatenated = all.join('\n');
+  REPEATS.forEach(function(n) {
+    result['all_x' + n] = new Array(n + 1).join(concatenated + '\n');
+  });
+  return result;
+}
+
+var lex = function(m, str) {
+  var lex = new m.Lexer();
+  lex.input(str);
+  var count = 0;
+  while (lex.token() !== null) {
+    count++;
+  }
+  return count;
+}
+
+var time_lexer = function(m, str, runs) {
+  var best = Infinity;
+  var count = 0;
+  for (var i = 0; i < runs; i++) {
+    var start = process.hrtime();
+    count = lex(m, str);
+    var elapsed = process.hrtime(start);
+    best = Math.min(best, elapsed[0] * 1e3 + elapsed[1] / 1e6);
+  }
+  return {tokens: count, ms: Math.round(best * 1000) / 1000,
+          mb_per_s: Math.round(str.length / best / 1e3 * 100) / 100};
+}
+
+var main = function() {
+  var runs = parseInt(process.argv[2] || '10', 10);
+  var sources = inputs();
+  var results = {};
+  Object.keys(sources).forEach(function(name) {
+    var str = sources[name];
+    assert.deepEqual(lexers.cool_lexer.lex_all(str),
+                     lexers.lexer.lex_all(str), name);
+    results[name] = {chars: str.length};
+    Object.keys(lexers).forEach(function(lexer_name) {
+      results[name][lexer_name] = time_lexer(lexers[lexer_name], str, runs);
+    });
+    results[name].speedup = Math.round(
+        results[name].lexer.ms / results[name].cool_lexer.ms * 100) / 100;
+  });
+  console.log(JSON.stringify({runs: runs, results: results}, null, 2));
+}
+
+if (module.parent === null) {
+  main();
+}
@@ -0,0 +1,94 @@
+//------------------------------------------------------------------------------
+// Benchmark of the load time of AST modules.
+//
+// Requires each module given on the command line in fresh node processes,
+// several times, and reports in JSON the size of the code loaded (the module
+// and everything it requires, such as the shared runtime of table-driven
+// modules), the best and median time the require took, and the heap it
+// added. Meant for comparing the modules emitted by asdl_gen_js.py with
+// --backend=object and --backend=table for the same schema.
+//
+// Run with: node bench/bench_load.js [--runs N] module.js...
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+var child_process = require('child_process');
+var path = require('path');
+
+// Run in the child process: require the module and print the measurements.
+var CHILD_CODE = [
+  "var fs = require('fs');",
+  "var before = Object.keys(require.cache);",
+  "global.gc();",
+  "var heap_before = process.memoryUsage().heapUsed;",
+  "var start = process.hrtime();",
+  "require(process.argv[1]);",
+  "var elapsed = process.hrtime(start);",
+  "global.gc();",
+  "var heap_after = process.memoryUsage().heapUsed;",
+  "var loaded = Object.keys(require.cache).filter(function(name) {",
+  "  return before.indexOf(name) < 0;",
+  "});",
+  "console.log(JSON.stringify({",
+  "  ms: elapsed[0] * 1e3 + elapsed[1] / 1e6,",
+  "  heap_bytes: heap_after - heap_before,",
+  "  files: loaded.length,",
+  "  code_bytes: loaded.reduce(function(total, name) {",
+  "    return total + fs.statSync(name).size;",
+  "  }, 0)}));"].join('\n');
+
+var measure = function(module_path) {
+  var output = child_process.execFileSync(
+      process.execPath, ['--expose-gc', '-e', CHILD_CODE, module_path],
+      {encoding: 'utf8'});
+  return JSON.parse(output);
+}
+
+var median = function(values) {
+  var sorted = values.slice().sort(function(a, b) { return a - b; });
+  return sorted[Math.floor(sorted.length / 2)];
+}
+
+var round = function(v) {
+  return Math.round(v * 1000) / 1000;
+}
+
+var bench_module = function(module_path, runs) {
+  var samples = [];
+  for (var i = 0; i < runs; i++) {
+    samples.push(measure(module_path));
+  }
+  var times = samples.map(function(s) { return s.ms; });
+  var heaps = samples.map(function(s) { return s.heap_bytes; });
+  return {
+    files: samples[0].files,
+    code_bytes: samples[0].code_bytes,
+    best_ms: round(Math.min.apply(null, times)),
+    median_ms: round(median(times)),
+    median_heap_bytes: median(heaps)};
+}
+
+var main = function() {
+  var args = process.argv.slice(2);
+  var runs = 10;
+  if (args[0] === '--runs') {
+    runs = parseInt(args[1], 10);
+    args = args.slice(2);
+  }
+  if (args.length === 0) {
+    console.error('Usage: node bench/bench_load.js [--runs N] module.js...');
+    process.exit(1);
+  }
+  var results = {};
+  args.forEach(function(name) {
+    results[name] = bench_module(path.resolve(name), runs);
+  });
+  console.log(JSON.stringify({runs: runs, results: results}, null, 2));
+}
+
+if (module.parent === null) {
+  main();
+}
@@ -0,0 +1,124 @@
+//------------------------------------------------------------------------------
+// Benchmark of lexing, parsing and walking large Cool programs.
+//
+// The workloads are random programs generated by tools/cool_synth.py, each
+// given as its Cool source (name.cl) and the JS module building its AST
+// (name.js), which must sit next to it. For each workload, checks that parsing
+// the source gives the AST the module builds, and reports in JSON the best
+// time of several runs of: lexing the source, parsing it, building the AST
+// through the builder, walking it, dumping it with dump_ast and with the
+// reference ast_visitor.NodeDumper, and streaming the dump to a file.
+//
+// Run with: node bench/bench_parse.js [--runs N] workload.cl...
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+var assert = require('assert');
+var fs = require('fs');
+var os = require('os');
+var path = require('path');
+var ast = require('../cool_ast');
+var ast_visitor = require('../ast_visitor');
+var cool_lexer = require('../cool_lexer');
+var parser = require('../parser');
+
+var best_time = function(runs, fn) {
+  var best = Infinity;
+  var result;
+  for (var i = 0; i < runs; i++) {
+    var start = process.hrtime();
+    result = fn();
+    var elapsed = process.hrtime(start);
+    best = Math.min(best, elapsed[0] * 1e3 + elapsed[1] / 1e6);
+  }
+  return {ms: Math.round(best * 1000) / 1000, result: result};
+}
+
+var lex = function(source) {
+  var lexer = new cool_lexer.Lexer();
+  lexer.input(source);
+  var count = 0;
+  while (lexer.token() !== null) {
+    count++;
+  }
+  return count;
+}
+
+var count_nodes = function(tree) {
+  var count = 0;
+  ast.walkPreorder(tree, function() { count++; });
+  return count;
+}
+
+var bench_workload = function(filename, runs) {
+  var source = fs.readFileSync(filename, 'utf8');
+  var module = require(path.resolve(filename.replace(/\.cl$/, '.js')));
+  var parsed = new parser.Parser().parse(source);
+  var built = module.build(ast.builder);
+  assert.strictEqual(ast_visitor.dump_ast(parsed), ast_visitor.dump_ast(built),
+                     filename + ': the parsed AST differs from the built one');
+  assert.strictEqual(count_nodes(built), module.nodes);
+
+  var results = {chars: source.length, nodes: module.nodes};
+  var dump_file = path.join(os.tmpdir(), 'bench_parse_dump.txt');
+  var phases = {
+    lex: function() { return lex(source); },
+    parse: function() { return new parser.Parser().parse(source); },
+    build: function() { return module.build(ast.builder); },
+    walk: function() { return count_nodes(parsed); },
+    dump: function() { return ast_visitor.dump_ast(parsed).length; },
+    dump_visitor: function() {
+      return new ast_visitor.NodeDumper(false).visit(parsed).length;
+    },
+    dump_to_file: function() {
+      var fd = fs.openSync(dump_file, 'w');
+      try {
+        ast_visitor.dump_ast(parsed, false, function(chunk) {
+          fs.writeSync(fd, chunk);
+        });
+      } finally {
+        fs.closeSync(fd);
+      }
+    }
+  };
+  Object.keys(phases).forEach(function(name) {
+    var timed = best_time(runs, phases[name]);
+    results[name] = {ms: timed.ms};
+    if (name === 'lex') {
+      results.tokens = timed.result;
+      results[name].mb_per_s = Math.round(
+          source.length / timed.ms / 1e3 * 100) / 100;
+    } else {
+      results[name].nodes_per_ms = Math.round(module.nodes / timed.ms);
+    }
+  });
+  assert.strictEqual(fs.readFileSync(dump_file, 'utf8'),
+                     ast_visitor.dump_ast(parsed));
+  fs.unlinkSync(dump_file);
+  return results;
+}
+
+var main = function() {
+  var args = process.argv.slice(2);
+  var runs = 5;
+  if (args[0] === '--runs') {
+    runs = parseInt(args[1], 10);
+    args = args.slice(2);
+  }
+  if (args.length === 0) {
+    console.error('usage: node bench/bench_parse.js [--runs N] workload.cl...');
+    process.exit(1);
+  }
+  var results = {};
+  args.forEach(function(filename) {
+    results[path.basename(filename)] = bench_workload(filename, runs);
+  });
+  console.log(JSON.stringify({runs: runs, results: results}, null, 2));
+}
+
+if (module.parent === null) {
+  main();
+}
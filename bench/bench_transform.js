@@ -0,0 +1,179 @@
+//------------------------------------------------------------------------------
+// Benchmark of a rewriting pass that touches a few nodes of a large program.
+//
+// The program is the concatenation of the Cool samples, repeated. The pass
+// renames a given number of the Obj nodes, spread over the program, and is run
+// in three ways:
+// - transformer: a NodeTransformer, which only rebuilds the paths from the root
+//   to the renamed nodes and shares the rest with the original tree.
+// - copy: a deep copy of the tree (through serialization), renamed in place.
+//   Like the transformer, it leaves the original tree intact.
+// - in_place: the original tree renamed in place, for reference; this is what
+//   breaks cached ASTs.
+// For each, the best time of several runs is reported in JSON, with the heap
+// retained by the result (beyond the original tree) and the number of nodes it
+// doesn't share with the original tree.
+//
+// Run with: node --expose-gc bench/bench_transform.js [repeats] [touched] [runs]
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+var assert = require('assert');
+var fs = require('fs');
+var path = require('path');
+var ast = require('../cool_ast');
+var ast_visitor = require('../ast_visitor');
+var parser = require('../parser');
+
+var large_program = function(repeats) {
+  var samples_dir = path.join(__dirname, '..', 'cool_code_samples');
+  var sources = fs.readdirSync(samples_dir).sort().map(function(name) {
+    return fs.readFileSync(path.join(samples_dir, name), 'utf8');
+  });
+  return new parser.Parser().parse(
+      new Array(repeats + 1).join(sources.join('\n') + '\n'));
+}
+
+// The Obj nodes of tree, in preorder
+var obj_nodes = function(tree) {
+  var result = [];
+  ast.walkPreorder(tree, function(node) {
+    if (node instanceof ast.Obj) {
+      result.push(node);
+    }
+  });
+  return result;
+}
+
+// A Set of touched nodes out of nodes, evenly spread
+var pick = function(nodes, touched) {
+  var step = Math.max(1, Math.floor(nodes.length / touched));
+  var result = new Set();
+  for (var i = 0; i < nodes.length && result.size < touched; i += step) {
+    result.add(nodes[i]);
+  }
+  return result;
+}
+
+var Renamer = function(targets) {
+  ast_visitor.NodeTransformer.call(this);
+  this.targets = targets;
+}
+
+Renamer.prototype = Object.create(ast_visitor.NodeTransformer.prototype);
+Renamer.prototype.constructor = Renamer;
+
+Renamer.prototype.transform_Obj = function(node) {
+  return this.targets.has(node) ? new ast.Obj(node.name + '_', node.loc) :
+                                  node;
+}
+
+// The touched nodes are identified by their preorder index among the Obj nodes,
+// so that they can be found in copies of the tree.
+var rename_in_place = function(tree, indices) {
+  var i = 0;
+  ast.walkPreorder(tree, function(node) {
+    if (node instanceof ast.Obj && indices.has(i++)) {
+      node.name += '_';
+    }
+  });
+  return tree;
+}
+
+var strategies = {
+  transformer: function(tree, targets, indices) {
+    return new Renamer(targets).transform(tree);
+  },
+  copy: function(tree, targets, indices) {
+    return rename_in_place(ast.deserialize(ast.serialize(tree)), indices);
+  },
+  in_place: function(tree, targets, indices) {
+    return rename_in_place(tree, indices);
+  }
+};
+
+var count_new_nodes = function(original, result) {
+  var old = new Set();
+  ast.walkPreorder(original, function(node) { old.add(node); });
+  var count = 0;
+  ast.walkPreorder(result, function(node) {
+    if (!old.has(node)) {
+      count++;
+    }
+  });
+  return count;
+}
+
+var heap_used = function() {
+  global.gc();
+  global.gc();
+  return process.memoryUsage().heapUsed;
+}
+
+var bench_strategy = function(name, repeats, touched, runs) {
+  var best = Infinity;
+  var heap = 0;
+  var new_nodes = 0;
+  for (var run = 0; run < runs; run++) {
+    // A fresh tree every run, since in_place modifies it
+    var tree = large_program(repeats);
+    var objs = obj_nodes(tree);
+    var targets = pick(objs, touched);
+    var indices = new Set();
+    objs.forEach(function(node, i) {
+      if (targets.has(node)) {
+        indices.add(i);
+      }
+    });
+    var before = ast_visitor.dump_ast(tree);
+
+    var start = process.hrtime();
+    var result = strategies[name](tree, targets, indices);
+    var elapsed = process.hrtime(start);
+    best = Math.min(best, elapsed[0] * 1e3 + elapsed[1] / 1e6);
+
+    var renamed = obj_nodes(result).filter(function(node) {
+      return /_$/.test(node.name);
+    }).length;
+    assert.strictEqual(renamed, targets.size);
+    if (name !== 'in_place') {
+      assert.strictEqual(ast_visitor.dump_ast(tree), before);
+    }
+    new_nodes = name === 'in_place' ? 0 : count_new_nodes(tree, result);
+
+    // The heap retained by the result is what dropping it frees, the original
+    // tree staying alive
+    var heap_with_result = heap_used();
+    result = null;
+    heap = heap_with_result - heap_used();
+  }
+  return {ms: Math.round(best * 1000) / 1000, retained_heap_bytes: heap,
+          new_nodes: new_nodes};
+}
+
+var main = function() {
+  if (typeof global.gc !== 'function') {
+    console.error('Run with node --expose-gc');
+    process.exit(1);
+  }
+  var repeats = parseInt(process.argv[2] || '100', 10);
+  var touched = parseInt(process.argv[3] || '10', 10);
+  var runs = parseInt(process.argv[4] || '5', 10);
+  var tree = large_program(repeats);
+  var nodes = 0;
+  ast.walkPreorder(tree, function() { nodes++; });
+  var results = {};
+  Object.keys(strategies).forEach(function(name) {
+    results[name] = bench_strategy(name, repeats, touched, runs);
+  });
+  console.log(JSON.stringify({repeats: repeats, nodes: nodes,
+                              touched: touched, runs: runs, results: results},
+                             null, 2));
+}
+
+if (module.parent === null) {
+  main();
+}
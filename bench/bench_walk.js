@@ -0,0 +1,119 @@
+//------------------------------------------------------------------------------
+// Benchmark of the iterative tree walkers.
+//
+// Builds synthetic trees of several shapes: deep chains of unary and binary
+// operations and nested lets, which recursion can't walk past some depth, and
+// a bushy balanced tree for comparison. Each tree is walked by walkPreorder,
+// walkPostorder and a recursive walk over forEachChild, and the best time of
+// several runs is reported for each, in JSON. A recursive walk that overflows
+// the stack is reported as such.
+//
+// Run with: node bench/bench_walk.js [depth] [runs]
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+var ast = require('../cool_ast');
+
+var unary_chain = function(depth) {
+  var tree = new ast.IntConst(0, 1);
+  for (var i = 0; i < depth; i++) {
+    tree = new ast.UnaryOp('~', tree, 1);
+  }
+  return tree;
+}
+
+// a + 1 + 2 + ..., which parses into a left-deep tree
+var binary_chain = function(depth) {
+  var tree = new ast.Obj('a', 1);
+  for (var i = 0; i < depth; i++) {
+    tree = new ast.BinaryOp('+', tree, new ast.IntConst(i, 1), 1);
+  }
+  return tree;
+}
+
+var let_chain = function(depth) {
+  var tree = new ast.Obj('x', 1);
+  for (var i = 0; i < depth; i++) {
+    var init = new ast.Letinit('x', 'Int', new ast.IntConst(i, 1), 1);
+    tree = new ast.Let([init], new ast.Block([tree], 1), 1);
+  }
+  return tree;
+}
+
+// A balanced tree of conditionals with about as many nodes as the chains
+var balanced = function(depth) {
+  var levels = Math.max(1, Math.round(Math.log(depth) / Math.log(3)));
+  var build = function(level) {
+    if (level === 0) {
+      return new ast.Obj('x', 1);
+    }
+    return new ast.Cond(build(level - 1), build(level - 1), build(level - 1), 1);
+  }
+  return build(levels);
+}
+
+var walkers = {
+  walkPreorder: function(tree) {
+    var count = 0;
+    ast.walkPreorder(tree, function() { count++; });
+    return count;
+  },
+  walkPostorder: function(tree) {
+    var count = 0;
+    ast.walkPostorder(tree, function() { count++; });
+    return count;
+  },
+  recursive: function(tree) {
+    var count = 0;
+    var walk = function(node) {
+      count++;
+      node.forEachChild(walk);
+    }
+    walk(tree);
+    return count;
+  }
+};
+
+var time_walker = function(walker, tree, runs) {
+  var best = Infinity;
+  var count = 0;
+  for (var i = 0; i < runs; i++) {
+    var start = process.hrtime();
+    try {
+      count = walker(tree);
+    } catch (e) {
+      if (e instanceof RangeError) {
+        return {error: 'stack overflow'};
+      }
+      throw e;
+    }
+    var elapsed = process.hrtime(start);
+    best = Math.min(best, elapsed[0] * 1e3 + elapsed[1] / 1e6);
+  }
+  return {nodes: count, ms: Math.round(best * 1000) / 1000,
+          nodes_per_ms: Math.round(count / best)};
+}
+
+var main = function() {
+  var depth = parseInt(process.argv[2] || '100000', 10);
+  var runs = parseInt(process.argv[3] || '10', 10);
+  var shapes = {unary_chain: unary_chain, binary_chain: binary_chain,
+                let_chain: let_chain, balanced: balanced};
+  var results = {};
+  Object.keys(shapes).forEach(function(shape) {
+    var tree = shapes[shape](depth);
+    results[shape] = {};
+    Object.keys(walkers).forEach(function(name) {
+      results[shape][name] = time_walker(walkers[name], tree, runs);
+    });
+  });
+  console.log(JSON.stringify({depth: depth, runs: runs, results: results},
+                             null, 2));
+}
+
+if (module.parent === null) {
+  main();
+}
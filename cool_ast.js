@@ -32,8 +32,10 @@ var _check_string = function(v, who, what, loc) {
   }
 }
 
+// ints are integers of at most 52 bits plus a sign, so that they serialize
+// exactly.
 var _check_int = function(v, who, what, loc) {
-  if (Object.prototype.toString.call(v) !== '[object Number]') {
+  if (!Number.isInteger(v) || Math.abs(v) > 4503599627370495) {
     throw new ASTError('Line ' + loc + ': ' + who + ' expects ' + what + ' to be an int');
   }
 }
@@ -60,10 +62,202 @@ var Node = exports.Node = function() {
   throw new ASTError('Node is an abstract class');
 }
 
-Node.prototype.children = _abstractmethod;
+// forEachChild(callback, ctx) calls callback.call(ctx, child, field, index)
+// for each child node, in order. field is the name of the field holding the
+// child; index is its index for sequence fields and -1 otherwise. Use
+// child_name(field, index) to get a printable name for the child.
+Node.prototype.forEachChild = _abstractmethod;
+
+// children() returns an array of {'name': ..., 'node': ...} objects, one per
+// child node. It allocates; prefer forEachChild where possible.
+Node.prototype.children = function() {
+  var children = [];
+  this.forEachChild(_push_child, children);
+  return children;
+}
+
+var _push_child = function(node, field, index) {
+  this.push({'name': child_name(field, index), 'node': node});
+}
+
+// The children of all leaf nodes. Frozen, since it's shared.
+var _no_children = Object.freeze([]);
+
+var child_name = exports.child_name = function(field, index) {
+  return index < 0 ? field : field + '[' + index.toString() + ']';
+}
+
+// transformChildren(fn, ctx) returns the node with each child node replaced by
+// fn.call(ctx, child), without modifying it: if fn returns all the children
+// unchanged, the node itself is returned; otherwise, a new node of the same
+// class, with the same attributes and loc, sharing the unchanged children.
+Node.prototype.transformChildren = _abstractmethod;
+
+// _dump(d, depth) appends the dump of the node, at the given depth, and of its
+// descendants to the _Dumper d (see dump).
+Node.prototype._dump = _abstractmethod;
+
+// The result of fn.call(ctx, node) for each node of seq: seq itself if no node
+// changed, else a new array, built from the first changed node on.
+var _transform_seq = function(seq, fn, ctx) {
+  for (var i = 0; i < seq.length; i++) {
+    var node = fn.call(ctx, seq[i]);
+    if (node !== seq[i]) {
+      var result = seq.slice(0, i);
+      result.push(node);
+      for (i++; i < seq.length; i++) {
+        result.push(fn.call(ctx, seq[i]));
+      }
+      return result;
+    }
+  }
+  return seq;
+}
+
 Node.attributes = [];
 Node.node_type = 'Node';
 
+// Each concrete node class has a distinct integer kind on its prototype,
+// indexing node_types and node_classes.
+Node.prototype.kind = -1;
+
+// equals(other, options) compares two trees structurally: same node types and
+// equal attributes and children, field by field, stopping at the first
+// difference. locs are compared too, unless options.ignoreLoc is set.
+//
+// structuralHash() returns a 32-bit hash of the tree, consistent with equals
+// (locs are not hashed). It's cached in the node, so nodes must not be
+// modified after their hash has been computed. It recurses once per level of
+// the tree, and overflows the stack on trees about 10000 levels deep.
+Node.prototype.equals = _abstractmethod;
+Node.prototype.structuralHash = _abstractmethod;
+
+// Compare the headers of two nodes: true if their fields have to be compared,
+// false if they are known to differ.
+var _same_header = function(a, b, options) {
+  return b !== null && b !== undefined && a.kind === b.kind &&
+         (a._hash === 0 || b._hash === 0 || a._hash === b._hash) &&
+         ((options !== undefined && options.ignoreLoc) || a.loc === b.loc);
+}
+
+var _node_equals = function(a, b, options) {
+  return a === null ? b === null : a.equals(b, options);
+}
+
+var _nodes_equal = function(a, b, options) {
+  if (a.length !== b.length) {
+    return false;
+  }
+  for (var i = 0; i < a.length; i++) {
+    if (!a[i].equals(b[i], options)) {
+      return false;
+    }
+  }
+  return true;
+}
+
+var _values_equal = function(a, b) {
+  if (a.length !== b.length) {
+    return false;
+  }
+  for (var i = 0; i < a.length; i++) {
+    if (a[i] !== b[i]) {
+      return false;
+    }
+  }
+  return true;
+}
+
+var _mix_hash = function(h, v) {
+  return (Math.imul(h, 0x01000193) ^ v) | 0;
+}
+
+var _hash_value = function(v) {
+  if (v === null) {
+    return 0x2545f491;
+  } else if (typeof v === 'string') {
+    var h = 0x811c9dc5 | 0;
+    for (var i = 0; i < v.length; i++) {
+      h = _mix_hash(h, v.charCodeAt(i));
+    }
+    return h;
+  } else if (typeof v === 'boolean') {
+    return v ? 0x3c6ef372 : 0x1b873593;
+  } else {
+    return (v | 0) ^ ((v / 4294967296) | 0);
+  }
+}
+
+var _hash_node = function(node) {
+  return node === null ? 0x2545f491 : node.structuralHash();
+}
+
+var _hash_nodes = function(nodes) {
+  var h = nodes.length;
+  for (var i = 0; i < nodes.length; i++) {
+    h = _mix_hash(h, nodes[i].structuralHash());
+  }
+  return h;
+}
+
+var _hash_values = function(values) {
+  var h = values.length;
+  for (var i = 0; i < values.length; i++) {
+    h = _mix_hash(h, _hash_value(values[i]));
+  }
+  return h;
+}
+
+// Freeze a node that is going to be shared. Its hash is computed first, since
+// structuralHash can't cache it in a frozen node.
+var _freeze_node = function(node) {
+  node.structuralHash();
+  return Object.freeze(node);
+}
+
+
+//
+//-------------------- Interning --------------------
+//
+
+// Leaf node classes whose fields all have builtin types (or that have no fields,
+// like NoExpr) have an of() factory taking the same arguments as their
+// constructor: IntConst.of(token, loc).
+// The builder creates these nodes through it. What of() does depends on the
+// interning mode set with set_interning(mode, limit):
+//
+// 'off' (the default): of() always creates a new node.
+// 'loc': nodes with the same fields and the same loc are shared.
+// 'noloc': nodes with the same fields are shared, whatever their loc; shared
+//   nodes have no loc. Only for passes that don't need locs of leaves.
+//
+// Shared nodes are frozen. limit bounds the number of nodes kept per class
+// (default: 4096); a class's table is emptied when a node has to be added to
+// it while it's full.
+var _interning = {mode: 0, limit: 4096, generation: 0};
+
+var set_interning = exports.set_interning = function(mode, limit) {
+  var modes = {'off': 0, 'loc': 1, 'noloc': 2};
+  if (!modes.hasOwnProperty(mode)) {
+    throw new ASTError('Unknown interning mode ' + mode);
+  }
+  _interning.mode = modes[mode];
+  _interning.limit = limit || 4096;
+  // Drop all the tables
+  _interning.generation++;
+}
+
+// The interning table of a node class: nested Maps keyed by the fields and
+// the loc. full empties it.
+var _interning_table = function(cls, full) {
+  if (full || cls._interned_generation !== _interning.generation) {
+    cls._interned = new Map();
+    cls._interned_count = 0;
+    cls._interned_generation = _interning.generation;
+  }
+  return cls._interned;
+}
+
 
 //
 //-------------------- AST nodes --------------------
@@ -86,20 +280,65 @@ var Case = exports.Case = function(name, type_decl, expr, loc) {
   this.expr = expr;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Case.prototype = Object.create(Node.prototype);
 Case.prototype.constructor = Case;
+Case.prototype.kind = 0;
 
 Object.defineProperties(Case, {
   'attributes': {get: function() {return ['name', 'type_decl'];}},
   'node_type': {get: function() {return 'Case';}}
 });
 
-Case.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'expr', 'node': this.expr});
-  return children;
+Case.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.expr, 'expr', -1);
+}
+
+Case.prototype.children = function() {
+  return [{'name': 'expr', 'node': this.expr}];
+}
+
+Case.prototype.transformChildren = function(fn, ctx) {
+  var expr = fn.call(ctx, this.expr);
+  if (expr === this.expr) {
+    return this;
+  }
+  return new Case(this.name, this.type_decl, expr, this.loc);
+}
+
+Case.prototype._dump = function(d, depth) {
+  d.line(depth, 'Case(name=' + this.name +
+                ', type_decl=' + this.type_decl + ')', this.loc);
+  this.expr._dump(d, depth + 1);
+}
+
+Case.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.name === other.name &&
+         this.type_decl === other.type_decl &&
+         this.expr.equals(other.expr, options);
+}
+
+Case.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 1;
+    h = _mix_hash(h, _hash_value(this.name));
+    h = _mix_hash(h, _hash_value(this.type_decl));
+    h = _mix_hash(h, this.expr.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Case.prototype._serialize = function(w) {
+  w.string(this.name);
+  w.string(this.type_decl);
+  w.node(this.expr);
 }
 
 //
@@ -122,22 +361,71 @@ var Class = exports.Class = function(name, parent, features, loc) {
   this.features = features;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Class.prototype = Object.create(Node.prototype);
 Class.prototype.constructor = Class;
+Class.prototype.kind = 1;
 
 Object.defineProperties(Class, {
   'attributes': {get: function() {return ['name', 'parent'];}},
   'node_type': {get: function() {return 'Class';}}
 });
 
-Class.prototype.children = function () {
-  var children = [];
-  for (var i = 0; i < this.features.length; i++) {
-    children.push({'name': 'features[' + i.toString() + ']', 'node': this.features[i]});
+Class.prototype.forEachChild = function(callback, ctx) {
+  var features = this.features;
+  for (var i = 0; i < features.length; i++) {
+    callback.call(ctx, features[i], 'features', i);
+  }
+}
+
+Class.prototype.transformChildren = function(fn, ctx) {
+  var features = _transform_seq(this.features, fn, ctx);
+  if (features === this.features) {
+    return this;
+  }
+  return new Class(this.name, this.parent, features, this.loc);
+}
+
+Class.prototype._dump = function(d, depth) {
+  d.line(depth, 'Class(name=' + this.name +
+                ', parent=' + this.parent + ')', this.loc);
+  var features = this.features;
+  for (var i = 0; i < features.length; i++) {
+    features[i]._dump(d, depth + 1);
+  }
+}
+
+Class.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.name === other.name &&
+         this.parent === other.parent &&
+         _nodes_equal(this.features, other.features, options);
+}
+
+Class.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 2;
+    h = _mix_hash(h, _hash_value(this.name));
+    h = _mix_hash(h, _hash_value(this.parent));
+    h = _mix_hash(h, _hash_nodes(this.features));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Class.prototype._serialize = function(w) {
+  w.string(this.name);
+  w.string(this.parent);
+  var features = this.features;
+  w.uint(features.length);
+  for (var i = 0; i < features.length; i++) {
+    w.node(features[i]);
   }
-  return children;
 }
 
 //
@@ -164,20 +452,61 @@ var Assign = exports.Assign = function(name, expr, loc) {
   this.expr = expr;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Assign.prototype = Object.create(Expression.prototype);
 Assign.prototype.constructor = Assign;
+Assign.prototype.kind = 2;
 
 Object.defineProperties(Assign, {
   'attributes': {get: function() {return ['name'];}},
   'node_type': {get: function() {return 'Assign';}}
 });
 
-Assign.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'expr', 'node': this.expr});
-  return children;
+Assign.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.expr, 'expr', -1);
+}
+
+Assign.prototype.children = function() {
+  return [{'name': 'expr', 'node': this.expr}];
+}
+
+Assign.prototype.transformChildren = function(fn, ctx) {
+  var expr = fn.call(ctx, this.expr);
+  if (expr === this.expr) {
+    return this;
+  }
+  return new Assign(this.name, expr, this.loc);
+}
+
+Assign.prototype._dump = function(d, depth) {
+  d.line(depth, 'Assign(name=' + this.name + ')', this.loc);
+  this.expr._dump(d, depth + 1);
+}
+
+Assign.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.name === other.name &&
+         this.expr.equals(other.expr, options);
+}
+
+Assign.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 3;
+    h = _mix_hash(h, _hash_value(this.name));
+    h = _mix_hash(h, this.expr.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Assign.prototype._serialize = function(w) {
+  w.string(this.name);
+  w.node(this.expr);
 }
 
 //
@@ -205,23 +534,77 @@ var StaticDispatch = exports.StaticDispatch = function(expr, type_name, name, ac
   this.actual = actual;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 StaticDispatch.prototype = Object.create(Expression.prototype);
 StaticDispatch.prototype.constructor = StaticDispatch;
+StaticDispatch.prototype.kind = 3;
 
 Object.defineProperties(StaticDispatch, {
   'attributes': {get: function() {return ['type_name', 'name'];}},
   'node_type': {get: function() {return 'StaticDispatch';}}
 });
 
-StaticDispatch.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'expr', 'node': this.expr});
-  for (var i = 0; i < this.actual.length; i++) {
-    children.push({'name': 'actual[' + i.toString() + ']', 'node': this.actual[i]});
+StaticDispatch.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.expr, 'expr', -1);
+  var actual = this.actual;
+  for (var i = 0; i < actual.length; i++) {
+    callback.call(ctx, actual[i], 'actual', i);
+  }
+}
+
+StaticDispatch.prototype.transformChildren = function(fn, ctx) {
+  var expr = fn.call(ctx, this.expr);
+  var actual = _transform_seq(this.actual, fn, ctx);
+  if (expr === this.expr && actual === this.actual) {
+    return this;
+  }
+  return new StaticDispatch(expr, this.type_name, this.name, actual, this.loc);
+}
+
+StaticDispatch.prototype._dump = function(d, depth) {
+  d.line(depth, 'StaticDispatch(type_name=' + this.type_name +
+                ', name=' + this.name + ')', this.loc);
+  this.expr._dump(d, depth + 1);
+  var actual = this.actual;
+  for (var i = 0; i < actual.length; i++) {
+    actual[i]._dump(d, depth + 1);
+  }
+}
+
+StaticDispatch.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.expr.equals(other.expr, options) &&
+         this.type_name === other.type_name &&
+         this.name === other.name &&
+         _nodes_equal(this.actual, other.actual, options);
+}
+
+StaticDispatch.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 4;
+    h = _mix_hash(h, this.expr.structuralHash());
+    h = _mix_hash(h, _hash_value(this.type_name));
+    h = _mix_hash(h, _hash_value(this.name));
+    h = _mix_hash(h, _hash_nodes(this.actual));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+StaticDispatch.prototype._serialize = function(w) {
+  w.node(this.expr);
+  w.string(this.type_name);
+  w.string(this.name);
+  var actual = this.actual;
+  w.uint(actual.length);
+  for (var i = 0; i < actual.length; i++) {
+    w.node(actual[i]);
   }
-  return children;
 }
 
 //
@@ -246,23 +629,73 @@ var Dispatch = exports.Dispatch = function(expr, name, actual, loc) {
   this.actual = actual;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Dispatch.prototype = Object.create(Expression.prototype);
 Dispatch.prototype.constructor = Dispatch;
+Dispatch.prototype.kind = 4;
 
 Object.defineProperties(Dispatch, {
   'attributes': {get: function() {return ['name'];}},
   'node_type': {get: function() {return 'Dispatch';}}
 });
 
-Dispatch.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'expr', 'node': this.expr});
-  for (var i = 0; i < this.actual.length; i++) {
-    children.push({'name': 'actual[' + i.toString() + ']', 'node': this.actual[i]});
+Dispatch.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.expr, 'expr', -1);
+  var actual = this.actual;
+  for (var i = 0; i < actual.length; i++) {
+    callback.call(ctx, actual[i], 'actual', i);
+  }
+}
+
+Dispatch.prototype.transformChildren = function(fn, ctx) {
+  var expr = fn.call(ctx, this.expr);
+  var actual = _transform_seq(this.actual, fn, ctx);
+  if (expr === this.expr && actual === this.actual) {
+    return this;
+  }
+  return new Dispatch(expr, this.name, actual, this.loc);
+}
+
+Dispatch.prototype._dump = function(d, depth) {
+  d.line(depth, 'Dispatch(name=' + this.name + ')', this.loc);
+  this.expr._dump(d, depth + 1);
+  var actual = this.actual;
+  for (var i = 0; i < actual.length; i++) {
+    actual[i]._dump(d, depth + 1);
+  }
+}
+
+Dispatch.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.expr.equals(other.expr, options) &&
+         this.name === other.name &&
+         _nodes_equal(this.actual, other.actual, options);
+}
+
+Dispatch.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 5;
+    h = _mix_hash(h, this.expr.structuralHash());
+    h = _mix_hash(h, _hash_value(this.name));
+    h = _mix_hash(h, _hash_nodes(this.actual));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Dispatch.prototype._serialize = function(w) {
+  w.node(this.expr);
+  w.string(this.name);
+  var actual = this.actual;
+  w.uint(actual.length);
+  for (var i = 0; i < actual.length; i++) {
+    w.node(actual[i]);
   }
-  return children;
 }
 
 //
@@ -286,22 +719,74 @@ var Cond = exports.Cond = function(pred, then_exp, else_exp, loc) {
   this.else_exp = else_exp;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Cond.prototype = Object.create(Expression.prototype);
 Cond.prototype.constructor = Cond;
+Cond.prototype.kind = 5;
 
 Object.defineProperties(Cond, {
   'attributes': {get: function() {return [];}},
   'node_type': {get: function() {return 'Cond';}}
 });
 
-Cond.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'pred', 'node': this.pred});
-  children.push({'name': 'then_exp', 'node': this.then_exp});
-  children.push({'name': 'else_exp', 'node': this.else_exp});
-  return children;
+Cond.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.pred, 'pred', -1);
+  callback.call(ctx, this.then_exp, 'then_exp', -1);
+  callback.call(ctx, this.else_exp, 'else_exp', -1);
+}
+
+Cond.prototype.children = function() {
+  return [{'name': 'pred', 'node': this.pred},
+          {'name': 'then_exp', 'node': this.then_exp},
+          {'name': 'else_exp', 'node': this.else_exp}];
+}
+
+Cond.prototype.transformChildren = function(fn, ctx) {
+  var pred = fn.call(ctx, this.pred);
+  var then_exp = fn.call(ctx, this.then_exp);
+  var else_exp = fn.call(ctx, this.else_exp);
+  if (pred === this.pred &&
+      then_exp === this.then_exp &&
+      else_exp === this.else_exp) {
+    return this;
+  }
+  return new Cond(pred, then_exp, else_exp, this.loc);
+}
+
+Cond.prototype._dump = function(d, depth) {
+  d.line(depth, 'Cond()', this.loc);
+  this.pred._dump(d, depth + 1);
+  this.then_exp._dump(d, depth + 1);
+  this.else_exp._dump(d, depth + 1);
+}
+
+Cond.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.pred.equals(other.pred, options) &&
+         this.then_exp.equals(other.then_exp, options) &&
+         this.else_exp.equals(other.else_exp, options);
+}
+
+Cond.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 6;
+    h = _mix_hash(h, this.pred.structuralHash());
+    h = _mix_hash(h, this.then_exp.structuralHash());
+    h = _mix_hash(h, this.else_exp.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Cond.prototype._serialize = function(w) {
+  w.node(this.pred);
+  w.node(this.then_exp);
+  w.node(this.else_exp);
 }
 
 //
@@ -320,21 +805,65 @@ var Loop = exports.Loop = function(pred, body, loc) {
   this.body = body;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Loop.prototype = Object.create(Expression.prototype);
 Loop.prototype.constructor = Loop;
+Loop.prototype.kind = 6;
 
 Object.defineProperties(Loop, {
   'attributes': {get: function() {return [];}},
   'node_type': {get: function() {return 'Loop';}}
 });
 
-Loop.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'pred', 'node': this.pred});
-  children.push({'name': 'body', 'node': this.body});
-  return children;
+Loop.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.pred, 'pred', -1);
+  callback.call(ctx, this.body, 'body', -1);
+}
+
+Loop.prototype.children = function() {
+  return [{'name': 'pred', 'node': this.pred},
+          {'name': 'body', 'node': this.body}];
+}
+
+Loop.prototype.transformChildren = function(fn, ctx) {
+  var pred = fn.call(ctx, this.pred);
+  var body = fn.call(ctx, this.body);
+  if (pred === this.pred && body === this.body) {
+    return this;
+  }
+  return new Loop(pred, body, this.loc);
+}
+
+Loop.prototype._dump = function(d, depth) {
+  d.line(depth, 'Loop()', this.loc);
+  this.pred._dump(d, depth + 1);
+  this.body._dump(d, depth + 1);
+}
+
+Loop.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.pred.equals(other.pred, options) &&
+         this.body.equals(other.body, options);
+}
+
+Loop.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 7;
+    h = _mix_hash(h, this.pred.structuralHash());
+    h = _mix_hash(h, this.body.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Loop.prototype._serialize = function(w) {
+  w.node(this.pred);
+  w.node(this.body);
 }
 
 //
@@ -356,23 +885,70 @@ var Typcase = exports.Typcase = function(expr, cases, loc) {
   this.cases = cases;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Typcase.prototype = Object.create(Expression.prototype);
 Typcase.prototype.constructor = Typcase;
+Typcase.prototype.kind = 7;
 
 Object.defineProperties(Typcase, {
   'attributes': {get: function() {return [];}},
   'node_type': {get: function() {return 'Typcase';}}
 });
 
-Typcase.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'expr', 'node': this.expr});
-  for (var i = 0; i < this.cases.length; i++) {
-    children.push({'name': 'cases[' + i.toString() + ']', 'node': this.cases[i]});
+Typcase.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.expr, 'expr', -1);
+  var cases = this.cases;
+  for (var i = 0; i < cases.length; i++) {
+    callback.call(ctx, cases[i], 'cases', i);
+  }
+}
+
+Typcase.prototype.transformChildren = function(fn, ctx) {
+  var expr = fn.call(ctx, this.expr);
+  var cases = _transform_seq(this.cases, fn, ctx);
+  if (expr === this.expr && cases === this.cases) {
+    return this;
+  }
+  return new Typcase(expr, cases, this.loc);
+}
+
+Typcase.prototype._dump = function(d, depth) {
+  d.line(depth, 'Typcase()', this.loc);
+  this.expr._dump(d, depth + 1);
+  var cases = this.cases;
+  for (var i = 0; i < cases.length; i++) {
+    cases[i]._dump(d, depth + 1);
+  }
+}
+
+Typcase.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.expr.equals(other.expr, options) &&
+         _nodes_equal(this.cases, other.cases, options);
+}
+
+Typcase.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 8;
+    h = _mix_hash(h, this.expr.structuralHash());
+    h = _mix_hash(h, _hash_nodes(this.cases));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Typcase.prototype._serialize = function(w) {
+  w.node(this.expr);
+  var cases = this.cases;
+  w.uint(cases.length);
+  for (var i = 0; i < cases.length; i++) {
+    w.node(cases[i]);
   }
-  return children;
 }
 
 //
@@ -389,22 +965,64 @@ var Block = exports.Block = function(body, loc) {
   this.body = body;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Block.prototype = Object.create(Expression.prototype);
 Block.prototype.constructor = Block;
+Block.prototype.kind = 8;
 
 Object.defineProperties(Block, {
   'attributes': {get: function() {return [];}},
   'node_type': {get: function() {return 'Block';}}
 });
 
-Block.prototype.children = function () {
-  var children = [];
-  for (var i = 0; i < this.body.length; i++) {
-    children.push({'name': 'body[' + i.toString() + ']', 'node': this.body[i]});
+Block.prototype.forEachChild = function(callback, ctx) {
+  var body = this.body;
+  for (var i = 0; i < body.length; i++) {
+    callback.call(ctx, body[i], 'body', i);
+  }
+}
+
+Block.prototype.transformChildren = function(fn, ctx) {
+  var body = _transform_seq(this.body, fn, ctx);
+  if (body === this.body) {
+    return this;
+  }
+  return new Block(body, this.loc);
+}
+
+Block.prototype._dump = function(d, depth) {
+  d.line(depth, 'Block()', this.loc);
+  var body = this.body;
+  for (var i = 0; i < body.length; i++) {
+    body[i]._dump(d, depth + 1);
+  }
+}
+
+Block.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         _nodes_equal(this.body, other.body, options);
+}
+
+Block.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 9;
+    h = _mix_hash(h, _hash_nodes(this.body));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Block.prototype._serialize = function(w) {
+  var body = this.body;
+  w.uint(body.length);
+  for (var i = 0; i < body.length; i++) {
+    w.node(body[i]);
   }
-  return children;
 }
 
 //
@@ -426,23 +1044,70 @@ var Let = exports.Let = function(init, body, loc) {
   this.body = body;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Let.prototype = Object.create(Expression.prototype);
 Let.prototype.constructor = Let;
+Let.prototype.kind = 9;
 
 Object.defineProperties(Let, {
   'attributes': {get: function() {return [];}},
   'node_type': {get: function() {return 'Let';}}
 });
 
-Let.prototype.children = function () {
-  var children = [];
-  for (var i = 0; i < this.init.length; i++) {
-    children.push({'name': 'init[' + i.toString() + ']', 'node': this.init[i]});
+Let.prototype.forEachChild = function(callback, ctx) {
+  var init = this.init;
+  for (var i = 0; i < init.length; i++) {
+    callback.call(ctx, init[i], 'init', i);
   }
-  children.push({'name': 'body', 'node': this.body});
-  return children;
+  callback.call(ctx, this.body, 'body', -1);
+}
+
+Let.prototype.transformChildren = function(fn, ctx) {
+  var init = _transform_seq(this.init, fn, ctx);
+  var body = fn.call(ctx, this.body);
+  if (init === this.init && body === this.body) {
+    return this;
+  }
+  return new Let(init, body, this.loc);
+}
+
+Let.prototype._dump = function(d, depth) {
+  d.line(depth, 'Let()', this.loc);
+  var init = this.init;
+  for (var i = 0; i < init.length; i++) {
+    init[i]._dump(d, depth + 1);
+  }
+  this.body._dump(d, depth + 1);
+}
+
+Let.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         _nodes_equal(this.init, other.init, options) &&
+         this.body.equals(other.body, options);
+}
+
+Let.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 10;
+    h = _mix_hash(h, _hash_nodes(this.init));
+    h = _mix_hash(h, this.body.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Let.prototype._serialize = function(w) {
+  var init = this.init;
+  w.uint(init.length);
+  for (var i = 0; i < init.length; i++) {
+    w.node(init[i]);
+  }
+  w.node(this.body);
 }
 
 //
@@ -464,30 +1129,77 @@ var BinaryOp = exports.BinaryOp = function(op, left, right, loc) {
   this.right = right;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 BinaryOp.prototype = Object.create(Expression.prototype);
 BinaryOp.prototype.constructor = BinaryOp;
+BinaryOp.prototype.kind = 10;
 
 Object.defineProperties(BinaryOp, {
   'attributes': {get: function() {return ['op'];}},
   'node_type': {get: function() {return 'BinaryOp';}}
 });
 
-BinaryOp.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'left', 'node': this.left});
-  children.push({'name': 'right', 'node': this.right});
-  return children;
+BinaryOp.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.left, 'left', -1);
+  callback.call(ctx, this.right, 'right', -1);
 }
 
-//
-// UnaryOp is-a Expression
-// Constructor(UnaryOp, [Field(identifier, op), Field(expression, expr)])
-//
-var UnaryOp = exports.UnaryOp = function(op, expr, loc) {
-  _check_identifier(op, 'UnaryOp', 'op', loc);
-  this.op = op;
+BinaryOp.prototype.children = function() {
+  return [{'name': 'left', 'node': this.left},
+          {'name': 'right', 'node': this.right}];
+}
+
+BinaryOp.prototype.transformChildren = function(fn, ctx) {
+  var left = fn.call(ctx, this.left);
+  var right = fn.call(ctx, this.right);
+  if (left === this.left && right === this.right) {
+    return this;
+  }
+  return new BinaryOp(this.op, left, right, this.loc);
+}
+
+BinaryOp.prototype._dump = function(d, depth) {
+  d.line(depth, 'BinaryOp(op=' + this.op + ')', this.loc);
+  this.left._dump(d, depth + 1);
+  this.right._dump(d, depth + 1);
+}
+
+BinaryOp.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.op === other.op &&
+         this.left.equals(other.left, options) &&
+         this.right.equals(other.right, options);
+}
+
+BinaryOp.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 11;
+    h = _mix_hash(h, _hash_value(this.op));
+    h = _mix_hash(h, this.left.structuralHash());
+    h = _mix_hash(h, this.right.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+BinaryOp.prototype._serialize = function(w) {
+  w.string(this.op);
+  w.node(this.left);
+  w.node(this.right);
+}
+
+//
+// UnaryOp is-a Expression
+// Constructor(UnaryOp, [Field(identifier, op), Field(expression, expr)])
+//
+var UnaryOp = exports.UnaryOp = function(op, expr, loc) {
+  _check_identifier(op, 'UnaryOp', 'op', loc);
+  this.op = op;
 
   if (!(expr instanceof Expression)) {
     throw new ASTError('UnaryOp expects expr to be a Expression');
@@ -495,20 +1207,61 @@ var UnaryOp = exports.UnaryOp = function(op, expr, loc) {
   this.expr = expr;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 UnaryOp.prototype = Object.create(Expression.prototype);
 UnaryOp.prototype.constructor = UnaryOp;
+UnaryOp.prototype.kind = 11;
 
 Object.defineProperties(UnaryOp, {
   'attributes': {get: function() {return ['op'];}},
   'node_type': {get: function() {return 'UnaryOp';}}
 });
 
-UnaryOp.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'expr', 'node': this.expr});
-  return children;
+UnaryOp.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.expr, 'expr', -1);
+}
+
+UnaryOp.prototype.children = function() {
+  return [{'name': 'expr', 'node': this.expr}];
+}
+
+UnaryOp.prototype.transformChildren = function(fn, ctx) {
+  var expr = fn.call(ctx, this.expr);
+  if (expr === this.expr) {
+    return this;
+  }
+  return new UnaryOp(this.op, expr, this.loc);
+}
+
+UnaryOp.prototype._dump = function(d, depth) {
+  d.line(depth, 'UnaryOp(op=' + this.op + ')', this.loc);
+  this.expr._dump(d, depth + 1);
+}
+
+UnaryOp.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.op === other.op &&
+         this.expr.equals(other.expr, options);
+}
+
+UnaryOp.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 12;
+    h = _mix_hash(h, _hash_value(this.op));
+    h = _mix_hash(h, this.expr.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+UnaryOp.prototype._serialize = function(w) {
+  w.string(this.op);
+  w.node(this.expr);
 }
 
 //
@@ -520,19 +1273,77 @@ var IntConst = exports.IntConst = function(token, loc) {
   this.token = token;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 IntConst.prototype = Object.create(Expression.prototype);
 IntConst.prototype.constructor = IntConst;
+IntConst.prototype.kind = 12;
 
 Object.defineProperties(IntConst, {
   'attributes': {get: function() {return ['token'];}},
   'node_type': {get: function() {return 'IntConst';}}
 });
 
-IntConst.prototype.children = function () {
-  var children = [];
-  return children;
+IntConst.prototype.forEachChild = function(callback, ctx) {
+}
+
+IntConst.prototype.children = function() {
+  return _no_children;
+}
+
+IntConst.prototype.transformChildren = function(fn, ctx) {
+  return this;
+}
+
+IntConst.prototype._dump = function(d, depth) {
+  d.line(depth, 'IntConst(token=' + this.token + ')', this.loc);
+}
+
+IntConst.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.token === other.token;
+}
+
+IntConst.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 13;
+    h = _mix_hash(h, _hash_value(this.token));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+IntConst.prototype._serialize = function(w) {
+  w.int(this.token);
+}
+
+IntConst.of = function(token, loc) {
+  if (_interning.mode === 0) {
+    return new IntConst(token, loc);
+  } else if (_interning.mode === 2) {
+    loc = undefined;
+  }
+  var t0 = _interning_table(IntConst, false);
+  var t1 = t0.get(token);
+  if (t1 === undefined) {
+    t1 = new Map();
+    t0.set(token, t1);
+  }
+  var node = t1.get(loc);
+  if (node === undefined) {
+    if (IntConst._interned_count >= _interning.limit) {
+      _interning_table(IntConst, true);
+      return IntConst.of(token, loc);
+    }
+    node = _freeze_node(new IntConst(token, loc));
+    t1.set(loc, node);
+    IntConst._interned_count++;
+  }
+  return node;
 }
 
 //
@@ -544,19 +1355,77 @@ var BoolConst = exports.BoolConst = function(value, loc) {
   this.value = value;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 BoolConst.prototype = Object.create(Expression.prototype);
 BoolConst.prototype.constructor = BoolConst;
+BoolConst.prototype.kind = 13;
 
 Object.defineProperties(BoolConst, {
   'attributes': {get: function() {return ['value'];}},
   'node_type': {get: function() {return 'BoolConst';}}
 });
 
-BoolConst.prototype.children = function () {
-  var children = [];
-  return children;
+BoolConst.prototype.forEachChild = function(callback, ctx) {
+}
+
+BoolConst.prototype.children = function() {
+  return _no_children;
+}
+
+BoolConst.prototype.transformChildren = function(fn, ctx) {
+  return this;
+}
+
+BoolConst.prototype._dump = function(d, depth) {
+  d.line(depth, 'BoolConst(value=' + this.value + ')', this.loc);
+}
+
+BoolConst.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.value === other.value;
+}
+
+BoolConst.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 14;
+    h = _mix_hash(h, _hash_value(this.value));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+BoolConst.prototype._serialize = function(w) {
+  w.boolean(this.value);
+}
+
+BoolConst.of = function(value, loc) {
+  if (_interning.mode === 0) {
+    return new BoolConst(value, loc);
+  } else if (_interning.mode === 2) {
+    loc = undefined;
+  }
+  var t0 = _interning_table(BoolConst, false);
+  var t1 = t0.get(value);
+  if (t1 === undefined) {
+    t1 = new Map();
+    t0.set(value, t1);
+  }
+  var node = t1.get(loc);
+  if (node === undefined) {
+    if (BoolConst._interned_count >= _interning.limit) {
+      _interning_table(BoolConst, true);
+      return BoolConst.of(value, loc);
+    }
+    node = _freeze_node(new BoolConst(value, loc));
+    t1.set(loc, node);
+    BoolConst._interned_count++;
+  }
+  return node;
 }
 
 //
@@ -568,19 +1437,77 @@ var StringConst = exports.StringConst = function(str, loc) {
   this.str = str;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 StringConst.prototype = Object.create(Expression.prototype);
 StringConst.prototype.constructor = StringConst;
+StringConst.prototype.kind = 14;
 
 Object.defineProperties(StringConst, {
   'attributes': {get: function() {return ['str'];}},
   'node_type': {get: function() {return 'StringConst';}}
 });
 
-StringConst.prototype.children = function () {
-  var children = [];
-  return children;
+StringConst.prototype.forEachChild = function(callback, ctx) {
+}
+
+StringConst.prototype.children = function() {
+  return _no_children;
+}
+
+StringConst.prototype.transformChildren = function(fn, ctx) {
+  return this;
+}
+
+StringConst.prototype._dump = function(d, depth) {
+  d.line(depth, 'StringConst(str=' + this.str + ')', this.loc);
+}
+
+StringConst.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.str === other.str;
+}
+
+StringConst.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 15;
+    h = _mix_hash(h, _hash_value(this.str));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+StringConst.prototype._serialize = function(w) {
+  w.string(this.str);
+}
+
+StringConst.of = function(str, loc) {
+  if (_interning.mode === 0) {
+    return new StringConst(str, loc);
+  } else if (_interning.mode === 2) {
+    loc = undefined;
+  }
+  var t0 = _interning_table(StringConst, false);
+  var t1 = t0.get(str);
+  if (t1 === undefined) {
+    t1 = new Map();
+    t0.set(str, t1);
+  }
+  var node = t1.get(loc);
+  if (node === undefined) {
+    if (StringConst._interned_count >= _interning.limit) {
+      _interning_table(StringConst, true);
+      return StringConst.of(str, loc);
+    }
+    node = _freeze_node(new StringConst(str, loc));
+    t1.set(loc, node);
+    StringConst._interned_count++;
+  }
+  return node;
 }
 
 //
@@ -592,19 +1519,77 @@ var New = exports.New = function(type_name, loc) {
   this.type_name = type_name;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 New.prototype = Object.create(Expression.prototype);
 New.prototype.constructor = New;
+New.prototype.kind = 15;
 
 Object.defineProperties(New, {
   'attributes': {get: function() {return ['type_name'];}},
   'node_type': {get: function() {return 'New';}}
 });
 
-New.prototype.children = function () {
-  var children = [];
-  return children;
+New.prototype.forEachChild = function(callback, ctx) {
+}
+
+New.prototype.children = function() {
+  return _no_children;
+}
+
+New.prototype.transformChildren = function(fn, ctx) {
+  return this;
+}
+
+New.prototype._dump = function(d, depth) {
+  d.line(depth, 'New(type_name=' + this.type_name + ')', this.loc);
+}
+
+New.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.type_name === other.type_name;
+}
+
+New.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 16;
+    h = _mix_hash(h, _hash_value(this.type_name));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+New.prototype._serialize = function(w) {
+  w.string(this.type_name);
+}
+
+New.of = function(type_name, loc) {
+  if (_interning.mode === 0) {
+    return new New(type_name, loc);
+  } else if (_interning.mode === 2) {
+    loc = undefined;
+  }
+  var t0 = _interning_table(New, false);
+  var t1 = t0.get(type_name);
+  if (t1 === undefined) {
+    t1 = new Map();
+    t0.set(type_name, t1);
+  }
+  var node = t1.get(loc);
+  if (node === undefined) {
+    if (New._interned_count >= _interning.limit) {
+      _interning_table(New, true);
+      return New.of(type_name, loc);
+    }
+    node = _freeze_node(new New(type_name, loc));
+    t1.set(loc, node);
+    New._interned_count++;
+  }
+  return node;
 }
 
 //
@@ -618,20 +1603,58 @@ var IsVoid = exports.IsVoid = function(expr, loc) {
   this.expr = expr;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 IsVoid.prototype = Object.create(Expression.prototype);
 IsVoid.prototype.constructor = IsVoid;
+IsVoid.prototype.kind = 16;
 
 Object.defineProperties(IsVoid, {
   'attributes': {get: function() {return [];}},
   'node_type': {get: function() {return 'IsVoid';}}
 });
 
-IsVoid.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'expr', 'node': this.expr});
-  return children;
+IsVoid.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.expr, 'expr', -1);
+}
+
+IsVoid.prototype.children = function() {
+  return [{'name': 'expr', 'node': this.expr}];
+}
+
+IsVoid.prototype.transformChildren = function(fn, ctx) {
+  var expr = fn.call(ctx, this.expr);
+  if (expr === this.expr) {
+    return this;
+  }
+  return new IsVoid(expr, this.loc);
+}
+
+IsVoid.prototype._dump = function(d, depth) {
+  d.line(depth, 'IsVoid()', this.loc);
+  this.expr._dump(d, depth + 1);
+}
+
+IsVoid.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.expr.equals(other.expr, options);
+}
+
+IsVoid.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 17;
+    h = _mix_hash(h, this.expr.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+IsVoid.prototype._serialize = function(w) {
+  w.node(this.expr);
 }
 
 //
@@ -640,19 +1663,69 @@ IsVoid.prototype.children = function () {
 //
 var NoExpr = exports.NoExpr = function(loc) {
   this.loc = loc;
+  this._hash = 0;
 }
 
 NoExpr.prototype = Object.create(Expression.prototype);
 NoExpr.prototype.constructor = NoExpr;
+NoExpr.prototype.kind = 17;
 
 Object.defineProperties(NoExpr, {
   'attributes': {get: function() {return [];}},
   'node_type': {get: function() {return 'NoExpr';}}
 });
 
-NoExpr.prototype.children = function () {
-  var children = [];
-  return children;
+NoExpr.prototype.forEachChild = function(callback, ctx) {
+}
+
+NoExpr.prototype.children = function() {
+  return _no_children;
+}
+
+NoExpr.prototype.transformChildren = function(fn, ctx) {
+  return this;
+}
+
+NoExpr.prototype._dump = function(d, depth) {
+  d.line(depth, 'NoExpr()', this.loc);
+}
+
+NoExpr.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options);
+}
+
+NoExpr.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 18;
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+NoExpr.prototype._serialize = function(w) {
+}
+
+NoExpr.of = function(loc) {
+  if (_interning.mode === 0) {
+    return new NoExpr(loc);
+  } else if (_interning.mode === 2) {
+    loc = undefined;
+  }
+  var t0 = _interning_table(NoExpr, false);
+  var node = t0.get(loc);
+  if (node === undefined) {
+    if (NoExpr._interned_count >= _interning.limit) {
+      _interning_table(NoExpr, true);
+      return NoExpr.of(loc);
+    }
+    node = _freeze_node(new NoExpr(loc));
+    t0.set(loc, node);
+    NoExpr._interned_count++;
+  }
+  return node;
 }
 
 //
@@ -664,19 +1737,77 @@ var Obj = exports.Obj = function(name, loc) {
   this.name = name;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Obj.prototype = Object.create(Expression.prototype);
 Obj.prototype.constructor = Obj;
+Obj.prototype.kind = 18;
 
 Object.defineProperties(Obj, {
   'attributes': {get: function() {return ['name'];}},
   'node_type': {get: function() {return 'Obj';}}
 });
 
-Obj.prototype.children = function () {
-  var children = [];
-  return children;
+Obj.prototype.forEachChild = function(callback, ctx) {
+}
+
+Obj.prototype.children = function() {
+  return _no_children;
+}
+
+Obj.prototype.transformChildren = function(fn, ctx) {
+  return this;
+}
+
+Obj.prototype._dump = function(d, depth) {
+  d.line(depth, 'Obj(name=' + this.name + ')', this.loc);
+}
+
+Obj.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.name === other.name;
+}
+
+Obj.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 19;
+    h = _mix_hash(h, _hash_value(this.name));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Obj.prototype._serialize = function(w) {
+  w.string(this.name);
+}
+
+Obj.of = function(name, loc) {
+  if (_interning.mode === 0) {
+    return new Obj(name, loc);
+  } else if (_interning.mode === 2) {
+    loc = undefined;
+  }
+  var t0 = _interning_table(Obj, false);
+  var t1 = t0.get(name);
+  if (t1 === undefined) {
+    t1 = new Map();
+    t0.set(name, t1);
+  }
+  var node = t1.get(loc);
+  if (node === undefined) {
+    if (Obj._interned_count >= _interning.limit) {
+      _interning_table(Obj, true);
+      return Obj.of(name, loc);
+    }
+    node = _freeze_node(new Obj(name, loc));
+    t1.set(loc, node);
+    Obj._interned_count++;
+  }
+  return node;
 }
 
 //
@@ -714,23 +1845,77 @@ var Method = exports.Method = function(name, formals, return_type, expr, loc) {
   this.expr = expr;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Method.prototype = Object.create(Feature.prototype);
 Method.prototype.constructor = Method;
+Method.prototype.kind = 19;
 
 Object.defineProperties(Method, {
   'attributes': {get: function() {return ['name', 'return_type'];}},
   'node_type': {get: function() {return 'Method';}}
 });
 
-Method.prototype.children = function () {
-  var children = [];
-  for (var i = 0; i < this.formals.length; i++) {
-    children.push({'name': 'formals[' + i.toString() + ']', 'node': this.formals[i]});
+Method.prototype.forEachChild = function(callback, ctx) {
+  var formals = this.formals;
+  for (var i = 0; i < formals.length; i++) {
+    callback.call(ctx, formals[i], 'formals', i);
   }
-  children.push({'name': 'expr', 'node': this.expr});
-  return children;
+  callback.call(ctx, this.expr, 'expr', -1);
+}
+
+Method.prototype.transformChildren = function(fn, ctx) {
+  var formals = _transform_seq(this.formals, fn, ctx);
+  var expr = fn.call(ctx, this.expr);
+  if (formals === this.formals && expr === this.expr) {
+    return this;
+  }
+  return new Method(this.name, formals, this.return_type, expr, this.loc);
+}
+
+Method.prototype._dump = function(d, depth) {
+  d.line(depth, 'Method(name=' + this.name +
+                ', return_type=' + this.return_type + ')', this.loc);
+  var formals = this.formals;
+  for (var i = 0; i < formals.length; i++) {
+    formals[i]._dump(d, depth + 1);
+  }
+  this.expr._dump(d, depth + 1);
+}
+
+Method.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.name === other.name &&
+         _nodes_equal(this.formals, other.formals, options) &&
+         this.return_type === other.return_type &&
+         this.expr.equals(other.expr, options);
+}
+
+Method.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 20;
+    h = _mix_hash(h, _hash_value(this.name));
+    h = _mix_hash(h, _hash_nodes(this.formals));
+    h = _mix_hash(h, _hash_value(this.return_type));
+    h = _mix_hash(h, this.expr.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Method.prototype._serialize = function(w) {
+  w.string(this.name);
+  var formals = this.formals;
+  w.uint(formals.length);
+  for (var i = 0; i < formals.length; i++) {
+    w.node(formals[i]);
+  }
+  w.string(this.return_type);
+  w.node(this.expr);
 }
 
 //
@@ -750,20 +1935,65 @@ var Attr = exports.Attr = function(name, type_decl, init, loc) {
   this.init = init;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Attr.prototype = Object.create(Feature.prototype);
 Attr.prototype.constructor = Attr;
+Attr.prototype.kind = 20;
 
 Object.defineProperties(Attr, {
   'attributes': {get: function() {return ['name', 'type_decl'];}},
   'node_type': {get: function() {return 'Attr';}}
 });
 
-Attr.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'init', 'node': this.init});
-  return children;
+Attr.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.init, 'init', -1);
+}
+
+Attr.prototype.children = function() {
+  return [{'name': 'init', 'node': this.init}];
+}
+
+Attr.prototype.transformChildren = function(fn, ctx) {
+  var init = fn.call(ctx, this.init);
+  if (init === this.init) {
+    return this;
+  }
+  return new Attr(this.name, this.type_decl, init, this.loc);
+}
+
+Attr.prototype._dump = function(d, depth) {
+  d.line(depth, 'Attr(name=' + this.name +
+                ', type_decl=' + this.type_decl + ')', this.loc);
+  this.init._dump(d, depth + 1);
+}
+
+Attr.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.name === other.name &&
+         this.type_decl === other.type_decl &&
+         this.init.equals(other.init, options);
+}
+
+Attr.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 21;
+    h = _mix_hash(h, _hash_value(this.name));
+    h = _mix_hash(h, _hash_value(this.type_decl));
+    h = _mix_hash(h, this.init.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Attr.prototype._serialize = function(w) {
+  w.string(this.name);
+  w.string(this.type_decl);
+  w.node(this.init);
 }
 
 //
@@ -778,19 +2008,86 @@ var Formal = exports.Formal = function(name, type_decl, loc) {
   this.type_decl = type_decl;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Formal.prototype = Object.create(Node.prototype);
 Formal.prototype.constructor = Formal;
+Formal.prototype.kind = 21;
 
 Object.defineProperties(Formal, {
   'attributes': {get: function() {return ['name', 'type_decl'];}},
   'node_type': {get: function() {return 'Formal';}}
 });
 
-Formal.prototype.children = function () {
-  var children = [];
-  return children;
+Formal.prototype.forEachChild = function(callback, ctx) {
+}
+
+Formal.prototype.children = function() {
+  return _no_children;
+}
+
+Formal.prototype.transformChildren = function(fn, ctx) {
+  return this;
+}
+
+Formal.prototype._dump = function(d, depth) {
+  d.line(depth, 'Formal(name=' + this.name +
+                ', type_decl=' + this.type_decl + ')', this.loc);
+}
+
+Formal.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.name === other.name &&
+         this.type_decl === other.type_decl;
+}
+
+Formal.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 22;
+    h = _mix_hash(h, _hash_value(this.name));
+    h = _mix_hash(h, _hash_value(this.type_decl));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Formal.prototype._serialize = function(w) {
+  w.string(this.name);
+  w.string(this.type_decl);
+}
+
+Formal.of = function(name, type_decl, loc) {
+  if (_interning.mode === 0) {
+    return new Formal(name, type_decl, loc);
+  } else if (_interning.mode === 2) {
+    loc = undefined;
+  }
+  var t0 = _interning_table(Formal, false);
+  var t1 = t0.get(name);
+  if (t1 === undefined) {
+    t1 = new Map();
+    t0.set(name, t1);
+  }
+  var t2 = t1.get(type_decl);
+  if (t2 === undefined) {
+    t2 = new Map();
+    t1.set(type_decl, t2);
+  }
+  var node = t2.get(loc);
+  if (node === undefined) {
+    if (Formal._interned_count >= _interning.limit) {
+      _interning_table(Formal, true);
+      return Formal.of(name, type_decl, loc);
+    }
+    node = _freeze_node(new Formal(name, type_decl, loc));
+    t2.set(loc, node);
+    Formal._interned_count++;
+  }
+  return node;
 }
 
 //
@@ -810,20 +2107,65 @@ var Letinit = exports.Letinit = function(id, type_decl, init, loc) {
   this.init = init;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Letinit.prototype = Object.create(Node.prototype);
 Letinit.prototype.constructor = Letinit;
+Letinit.prototype.kind = 22;
 
 Object.defineProperties(Letinit, {
   'attributes': {get: function() {return ['id', 'type_decl'];}},
   'node_type': {get: function() {return 'Letinit';}}
 });
 
-Letinit.prototype.children = function () {
-  var children = [];
-  children.push({'name': 'init', 'node': this.init});
-  return children;
+Letinit.prototype.forEachChild = function(callback, ctx) {
+  callback.call(ctx, this.init, 'init', -1);
+}
+
+Letinit.prototype.children = function() {
+  return [{'name': 'init', 'node': this.init}];
+}
+
+Letinit.prototype.transformChildren = function(fn, ctx) {
+  var init = fn.call(ctx, this.init);
+  if (init === this.init) {
+    return this;
+  }
+  return new Letinit(this.id, this.type_decl, init, this.loc);
+}
+
+Letinit.prototype._dump = function(d, depth) {
+  d.line(depth, 'Letinit(id=' + this.id +
+                ', type_decl=' + this.type_decl + ')', this.loc);
+  this.init._dump(d, depth + 1);
+}
+
+Letinit.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         this.id === other.id &&
+         this.type_decl === other.type_decl &&
+         this.init.equals(other.init, options);
+}
+
+Letinit.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 23;
+    h = _mix_hash(h, _hash_value(this.id));
+    h = _mix_hash(h, _hash_value(this.type_decl));
+    h = _mix_hash(h, this.init.structuralHash());
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Letinit.prototype._serialize = function(w) {
+  w.string(this.id);
+  w.string(this.type_decl);
+  w.node(this.init);
 }
 
 //
@@ -840,21 +2182,1230 @@ var Program = exports.Program = function(classes, loc) {
   this.classes = classes;
 
   this.loc = loc;
+  this._hash = 0;
 }
 
 Program.prototype = Object.create(Node.prototype);
 Program.prototype.constructor = Program;
+Program.prototype.kind = 23;
 
 Object.defineProperties(Program, {
   'attributes': {get: function() {return [];}},
   'node_type': {get: function() {return 'Program';}}
 });
 
-Program.prototype.children = function () {
-  var children = [];
-  for (var i = 0; i < this.classes.length; i++) {
-    children.push({'name': 'classes[' + i.toString() + ']', 'node': this.classes[i]});
+Program.prototype.forEachChild = function(callback, ctx) {
+  var classes = this.classes;
+  for (var i = 0; i < classes.length; i++) {
+    callback.call(ctx, classes[i], 'classes', i);
+  }
+}
+
+Program.prototype.transformChildren = function(fn, ctx) {
+  var classes = _transform_seq(this.classes, fn, ctx);
+  if (classes === this.classes) {
+    return this;
+  }
+  return new Program(classes, this.loc);
+}
+
+Program.prototype._dump = function(d, depth) {
+  d.line(depth, 'Program()', this.loc);
+  var classes = this.classes;
+  for (var i = 0; i < classes.length; i++) {
+    classes[i]._dump(d, depth + 1);
+  }
+}
+
+Program.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options) &&
+         _nodes_equal(this.classes, other.classes, options);
+}
+
+Program.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = 24;
+    h = _mix_hash(h, _hash_nodes(this.classes));
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+Program.prototype._serialize = function(w) {
+  var classes = this.classes;
+  w.uint(classes.length);
+  for (var i = 0; i < classes.length; i++) {
+    w.node(classes[i]);
+  }
+}
+
+// Names and classes of the concrete node types, indexed by kind.
+var node_types = exports.node_types = [
+  'Case',
+  'Class',
+  'Assign',
+  'StaticDispatch',
+  'Dispatch',
+  'Cond',
+  'Loop',
+  'Typcase',
+  'Block',
+  'Let',
+  'BinaryOp',
+  'UnaryOp',
+  'IntConst',
+  'BoolConst',
+  'StringConst',
+  'New',
+  'IsVoid',
+  'NoExpr',
+  'Obj',
+  'Method',
+  'Attr',
+  'Formal',
+  'Letinit',
+  'Program'];
+
+var node_classes = exports.node_classes = [
+  Case, Class, Assign, StaticDispatch, Dispatch, Cond, Loop, Typcase, Block,
+  Let, BinaryOp, UnaryOp, IntConst, BoolConst, StringConst, New, IsVoid, NoExpr,
+  Obj, Method, Attr, Formal, Letinit, Program];
+
+//
+//-------------------- Visitor --------------------
+//
+
+// GeneratedVisitor is the base for visitors of these ASTs. To create a
+// visitor, inherit from GeneratedVisitor and define visit_Type methods for
+// visiting nodes of type Type; nodes without such a method are handled by
+// visit_children, which visits all their children.
+//
+// visit dispatches on node.kind through a table of methods, built the first
+// time the visitor visits a node. The table of a visitor class is shared by all
+// its instances; a visitor with visit_ methods of its own (assigned to it
+// rather than to its class, before its first visit) gets its own table.
+var GeneratedVisitor = exports.GeneratedVisitor = function() {
+  this._dispatch = null;
+}
+
+GeneratedVisitor.prototype.visit = function(node) {
+  var dispatch = this._dispatch || (this._dispatch = _dispatch_table(
+      this, 'visit_', 'visit_children'));
+  return dispatch[node.kind].call(this, node);
+}
+
+GeneratedVisitor.prototype.visit_children = function(node) {
+  node.forEachChild(this.visit, this);
+}
+
+// The methods of obj named prefix + node type, indexed by kind, with the method
+// named fallback for the node types without one. The table is cached on obj's
+// class's prototype, unless obj has methods starting with prefix of its own.
+var _dispatch_table = function(obj, prefix, fallback) {
+  var own = Object.keys(obj).some(function(name) {
+    return name.lastIndexOf(prefix, 0) === 0;
+  });
+  if (own) {
+    return _method_table(obj, prefix, fallback);
+  }
+  var proto = Object.getPrototypeOf(obj);
+  var cache = '_' + prefix + 'table';
+  if (!Object.prototype.hasOwnProperty.call(proto, cache)) {
+    proto[cache] = _method_table(proto, prefix, fallback);
+  }
+  return proto[cache];
+}
+
+var _method_table = function(obj, prefix, fallback) {
+  var table = [];
+  for (var kind = 0; kind < node_types.length; kind++) {
+    var method = obj[prefix + node_types[kind]];
+    table.push(method === undefined ? obj[fallback] : method);
+  }
+  return table;
+}
+
+//
+//-------------------- Transformer --------------------
+//
+
+// GeneratedTransformer is the base for passes rewriting these ASTs without
+// modifying them. To create a transformer, inherit from GeneratedTransformer
+// and define transform_Type methods returning the node replacing a node of
+// type Type (possibly the node itself); nodes without such a method are handled
+// by transform_children, which transforms their children. transform(root)
+// returns the new tree. Nodes are only rebuilt if one of their children
+// changed, so the new tree shares all the unchanged subtrees with the old one,
+// and transforming a tree without changing anything returns it as is.
+//
+// Dispatch goes through a table of methods, as for visitors.
+var GeneratedTransformer = exports.GeneratedTransformer = function() {
+  this._dispatch = null;
+}
+
+GeneratedTransformer.prototype.transform = function(node) {
+  var dispatch = this._dispatch || (this._dispatch = _dispatch_table(
+      this, 'transform_', 'transform_children'));
+  return dispatch[node.kind].call(this, node);
+}
+
+GeneratedTransformer.prototype.transform_children = function(node) {
+  return node.transformChildren(this.transform, this);
+}
+
+//
+//-------------------- Dumping --------------------
+//
+
+// dump(node, show_loc, write) dumps the tree rooted at node as
+// ast_visitor.NodeDumper does: a line "Type(attr=value, ...)" per node,
+// followed by " @ loc: " and its loc if show_loc is set, indented by 4 spaces
+// per level. Each node class has a _dump method appending its line to a shared
+// _Dumper and then dumping its children, so nothing is allocated per node but
+// the line itself. Being recursive, dump overflows the stack on trees about
+// 10000 levels deep.
+//
+// Without write, the dump is returned as a string. Otherwise it's passed to
+// write(chunk) in chunks of about _DUMP_CHUNK characters as it's produced, so
+// that large trees can be streamed (e.g. to fs.writeSync) without building the
+// whole string, and nothing is returned.
+var dump = exports.dump = function(node, show_loc, write) {
+  var d = new _Dumper(show_loc || false, write || null);
+  node._dump(d, 0);
+  return d.finish();
+}
+
+var _DUMP_CHUNK = 65536;
+
+// Indentation strings by depth, shared by all the dumps
+var _indents = [''];
+
+var _Dumper = function(show_loc, write) {
+  this.show_loc = show_loc;
+  this.write = write;
+  this.buf = '';
+  this.sep = '';
+}
+
+_Dumper.prototype.line = function(depth, s, loc) {
+  while (_indents.length <= depth) {
+    _indents.push(_indents[_indents.length - 1] + '    ');
+  }
+  if (this.show_loc) {
+    s += ' @ loc: ' + loc;
+  }
+  this.buf += this.sep + _indents[depth] + s;
+  this.sep = '\n';
+  if (this.write !== null && this.buf.length >= _DUMP_CHUNK) {
+    this.write(this.buf);
+    this.buf = '';
+  }
+}
+
+_Dumper.prototype.finish = function() {
+  if (this.write === null) {
+    return this.buf;
+  }
+  if (this.buf.length > 0) {
+    this.write(this.buf);
+    this.buf = '';
+  }
+}
+
+//
+//-------------------- Walkers --------------------
+//
+
+// walkPreorder(root, fn, ctx) and walkPostorder(root, fn, ctx) call
+// fn.call(ctx, node) for every node of the tree rooted at root, parents
+// before their children or after them, respectively. Children are walked in
+// the order of their fields, like forEachChild. The walk uses an explicit
+// stack rather than recursion, so it works on trees of any depth.
+//
+// fn can return SKIP to have the children of the node skipped (walkPreorder
+// only), or STOP to end the walk. The walkers return false if the walk was
+// stopped and true otherwise.
+var SKIP = exports.SKIP = {};
+var STOP = exports.STOP = {};
+
+// Marks the position of a node whose children are being walked by
+// walkPostorder.
+var _POSTORDER_MARK = {};
+
+var walkPreorder = exports.walkPreorder = function(root, fn, ctx) {
+  var stack = [root];
+  while (stack.length > 0) {
+    var node = stack.pop();
+    var action = fn.call(ctx, node);
+    if (action === STOP) {
+      return false;
+    } else if (action === SKIP) {
+      continue;
+    }
+    switch (node.kind) {
+      case 0:  // Case
+        stack.push(node.expr);
+        break;
+      case 1:  // Class
+        for (var i = node.features.length - 1; i >= 0; i--) {
+          stack.push(node.features[i]);
+        }
+        break;
+      case 2:  // Assign
+        stack.push(node.expr);
+        break;
+      case 3:  // StaticDispatch
+        for (var i = node.actual.length - 1; i >= 0; i--) {
+          stack.push(node.actual[i]);
+        }
+        stack.push(node.expr);
+        break;
+      case 4:  // Dispatch
+        for (var i = node.actual.length - 1; i >= 0; i--) {
+          stack.push(node.actual[i]);
+        }
+        stack.push(node.expr);
+        break;
+      case 5:  // Cond
+        stack.push(node.else_exp, node.then_exp, node.pred);
+        break;
+      case 6:  // Loop
+        stack.push(node.body, node.pred);
+        break;
+      case 7:  // Typcase
+        for (var i = node.cases.length - 1; i >= 0; i--) {
+          stack.push(node.cases[i]);
+        }
+        stack.push(node.expr);
+        break;
+      case 8:  // Block
+        for (var i = node.body.length - 1; i >= 0; i--) {
+          stack.push(node.body[i]);
+        }
+        break;
+      case 9:  // Let
+        stack.push(node.body);
+        for (var i = node.init.length - 1; i >= 0; i--) {
+          stack.push(node.init[i]);
+        }
+        break;
+      case 10:  // BinaryOp
+        stack.push(node.right, node.left);
+        break;
+      case 11:  // UnaryOp
+        stack.push(node.expr);
+        break;
+      case 16:  // IsVoid
+        stack.push(node.expr);
+        break;
+      case 19:  // Method
+        stack.push(node.expr);
+        for (var i = node.formals.length - 1; i >= 0; i--) {
+          stack.push(node.formals[i]);
+        }
+        break;
+      case 20:  // Attr
+        stack.push(node.init);
+        break;
+      case 22:  // Letinit
+        stack.push(node.init);
+        break;
+      case 23:  // Program
+        for (var i = node.classes.length - 1; i >= 0; i--) {
+          stack.push(node.classes[i]);
+        }
+        break;
+    }
+  }
+  return true;
+}
+
+var walkPostorder = exports.walkPostorder = function(root, fn, ctx) {
+  var stack = [root];
+  while (stack.length > 0) {
+    var node = stack.pop();
+    if (node === _POSTORDER_MARK) {
+      if (fn.call(ctx, stack.pop()) === STOP) {
+        return false;
+      }
+      continue;
+    }
+    stack.push(node, _POSTORDER_MARK);
+    switch (node.kind) {
+      case 0:  // Case
+        stack.push(node.expr);
+        break;
+      case 1:  // Class
+        for (var i = node.features.length - 1; i >= 0; i--) {
+          stack.push(node.features[i]);
+        }
+        break;
+      case 2:  // Assign
+        stack.push(node.expr);
+        break;
+      case 3:  // StaticDispatch
+        for (var i = node.actual.length - 1; i >= 0; i--) {
+          stack.push(node.actual[i]);
+        }
+        stack.push(node.expr);
+        break;
+      case 4:  // Dispatch
+        for (var i = node.actual.length - 1; i >= 0; i--) {
+          stack.push(node.actual[i]);
+        }
+        stack.push(node.expr);
+        break;
+      case 5:  // Cond
+        stack.push(node.else_exp, node.then_exp, node.pred);
+        break;
+      case 6:  // Loop
+        stack.push(node.body, node.pred);
+        break;
+      case 7:  // Typcase
+        for (var i = node.cases.length - 1; i >= 0; i--) {
+          stack.push(node.cases[i]);
+        }
+        stack.push(node.expr);
+        break;
+      case 8:  // Block
+        for (var i = node.body.length - 1; i >= 0; i--) {
+          stack.push(node.body[i]);
+        }
+        break;
+      case 9:  // Let
+        stack.push(node.body);
+        for (var i = node.init.length - 1; i >= 0; i--) {
+          stack.push(node.init[i]);
+        }
+        break;
+      case 10:  // BinaryOp
+        stack.push(node.right, node.left);
+        break;
+      case 11:  // UnaryOp
+        stack.push(node.expr);
+        break;
+      case 16:  // IsVoid
+        stack.push(node.expr);
+        break;
+      case 19:  // Method
+        stack.push(node.expr);
+        for (var i = node.formals.length - 1; i >= 0; i--) {
+          stack.push(node.formals[i]);
+        }
+        break;
+      case 20:  // Attr
+        stack.push(node.init);
+        break;
+      case 22:  // Letinit
+        stack.push(node.init);
+        break;
+      case 23:  // Program
+        for (var i = node.classes.length - 1; i >= 0; i--) {
+          stack.push(node.classes[i]);
+        }
+        break;
+    }
+  }
+  return true;
+}
+
+//
+//-------------------- Kind index --------------------
+//
+
+// buildKindIndex(root) walks the tree rooted at root once and returns a
+// KindIndex of it, which passes can share to find all the nodes of a kind
+// without walking the tree again.
+//
+// Each position in the tree gets an id, in preorder; the root's is 0. The
+// index has side arrays mapping ids to:
+//
+//   nodes: the node at the position (null once removed by replace).
+//   parents: the id of the parent, -1 for the root.
+//   fields: the name of the parent's field holding the node.
+//   slots: the index of the node in that field, -1 if it's not a sequence.
+//   sizes: the number of ids in the subtree of the node.
+//
+// ofKind(kind) returns the nodes of a kind, given as a kind number or a node
+// class; forEachOfKind(kind, fn, ctx) calls fn.call(ctx, node, id) for them.
+// An abstract class (such as Node itself) stands for all its concrete
+// subclasses, whose nodes come kind by kind.
+// parentOf(node) and idOf(node) map nodes to their positions. Interned nodes
+// can appear at several positions; these methods throw an ASTError for them,
+// and the side arrays must be used instead.
+//
+// replace(node, replacement) replaces a subtree, both in the tree and in the
+// index: the ids of the old subtree are retired and the new one is indexed
+// with fresh ids, without walking the rest of the tree. node can also be
+// given by id. The replacement must be of the type the field holding node is
+// declared with. The cached structural hashes of the ancestors are reset.
+// Nodes of a kind come in preorder, followed by those added by replacements.
+var KindIndex = exports.KindIndex = function(root) {
+  this.root = root;
+  this.nodes = [];
+  this.parents = [];
+  this.fields = [];
+  this.slots = [];
+  this.sizes = [];
+  this._kinds = [];
+  for (var k = 0; k < node_classes.length; k++) {
+    this._kinds.push([]);
+  }
+  // id -> id of the root of the subtree that replaced it
+  this._replaced = new Map();
+  // node -> its id, or the array of its ids if it has several. Built by the
+  // first idOf, and then kept up to date by replace.
+  this._positions = null;
+  this._add(root, -1, null, -1);
+}
+
+var buildKindIndex = exports.buildKindIndex = function(root) {
+  return new KindIndex(root);
+}
+
+// The kinds of the nodes of kind, given as for ofKind.
+var _kinds_of = function(kind) {
+  if (typeof kind === 'number') {
+    if (kind >= 0 && kind < node_classes.length && kind % 1 === 0) {
+      return [kind];
+    }
+  } else if (typeof kind === 'function' &&
+             (kind === Node || kind.prototype instanceof Node)) {
+    if (kind !== Node && kind.prototype.hasOwnProperty('kind')) {
+      return [kind.prototype.kind];
+    }
+    var kinds = [];
+    for (var k = 0; k < node_classes.length; k++) {
+      if (node_classes[k].prototype instanceof kind) {
+        kinds.push(k);
+      }
+    }
+    return kinds;
+  }
+  throw new ASTError('Not a node kind or class: ' + kind);
+}
+
+KindIndex.prototype.ofKind = function(kind) {
+  var result = [];
+  this.forEachOfKind(kind, function(node) { result.push(node); });
+  return result;
+}
+
+KindIndex.prototype.forEachOfKind = function(kind, fn, ctx) {
+  var kinds = _kinds_of(kind);
+  for (var k = 0; k < kinds.length; k++) {
+    var ids = this._kinds[kinds[k]];
+    // Drop the ids retired by replace along the way
+    var live = 0;
+    for (var i = 0; i < ids.length; i++) {
+      var node = this.nodes[ids[i]];
+      if (node !== null) {
+        ids[live++] = ids[i];
+        fn.call(ctx, node, ids[i]);
+      }
+    }
+    ids.length = live;
+  }
+}
+
+KindIndex.prototype.idOf = function(node) {
+  if (this._positions === null) {
+    this._positions = new Map();
+    for (var id = 0; id < this.nodes.length; id++) {
+      if (this.nodes[id] !== null) {
+        this._add_position(this.nodes[id], id);
+      }
+    }
+  }
+  var id = this._positions.get(node);
+  if (id === undefined) {
+    return -1;
+  } else if (typeof id !== 'number') {
+    throw new ASTError('KindIndex: node occurs at several positions');
+  }
+  return id;
+}
+
+KindIndex.prototype._add_position = function(node, id) {
+  var ids = this._positions.get(node);
+  if (ids === undefined) {
+    this._positions.set(node, id);
+  } else if (typeof ids === 'number') {
+    this._positions.set(node, [ids, id]);
+  } else {
+    ids.push(id);
+  }
+}
+
+KindIndex.prototype._remove_position = function(node, id) {
+  var ids = this._positions.get(node);
+  if (typeof ids === 'number') {
+    this._positions.delete(node);
+  } else {
+    ids.splice(ids.indexOf(id), 1);
+    if (ids.length === 1) {
+      this._positions.set(node, ids[0]);
+    }
+  }
+}
+
+KindIndex.prototype.parentOf = function(node) {
+  var id = this.idOf(node);
+  if (id < 0) {
+    throw new ASTError('KindIndex: node is not in the tree');
+  }
+  return this.parents[id] < 0 ? null : this.nodes[this.parents[id]];
+}
+
+KindIndex.prototype.replace = function(node, replacement) {
+  var id = typeof node === 'number' ? node : this.idOf(node);
+  if (id < 0 || id >= this.nodes.length || this.nodes[id] === null) {
+    throw new ASTError('KindIndex: node is not in the tree');
+  }
+  var parent = this.parents[id];
+  if (parent < 0) {
+    if (!(replacement instanceof Node)) {
+      throw new ASTError('KindIndex: replacement is not a node');
+    }
+    this.root = replacement;
+  } else {
+    var holder = this.nodes[parent];
+    if (!(replacement instanceof
+          _field_classes[holder.kind][this.fields[id]])) {
+      throw new ASTError('KindIndex: replacement has the wrong type');
+    }
+    if (this.slots[id] < 0) {
+      holder[this.fields[id]] = replacement;
+    } else {
+      holder[this.fields[id]][this.slots[id]] = replacement;
+    }
+    for (var a = parent; a >= 0; a = this.parents[a]) {
+      this.nodes[a]._hash = 0;
+    }
+  }
+  this._retire(id);
+  this._replaced.set(id, this._add(replacement, parent, this.fields[id],
+                                   this.slots[id]));
+}
+
+// Retire the ids of the subtree at id, and of the subtrees that replaced
+// parts of it.
+KindIndex.prototype._retire = function(id) {
+  var pending = [id];
+  while (pending.length > 0) {
+    var first = pending.pop();
+    var end = first + this.sizes[first];
+    for (var i = first; i < end; i++) {
+      if (this._positions !== null && this.nodes[i] !== null) {
+        this._remove_position(this.nodes[i], i);
+      }
+      this.nodes[i] = null;
+      var moved = this._replaced.get(i);
+      if (moved !== undefined) {
+        this._replaced.delete(i);
+        pending.push(moved);
+      }
+    }
+  }
+}
+
+// Index the subtree of root, at the given position, with fresh ids. Return the
+// id of root.
+KindIndex.prototype._add = function(root, root_parent, root_field,
+                                    root_slot) {
+  var first = this.nodes.length;
+  var stack = [root, root_parent, root_field, root_slot];
+  while (stack.length > 0) {
+    var slot = stack.pop();
+    var field = stack.pop();
+    var parent = stack.pop();
+    var node = stack.pop();
+    var id = this.nodes.length;
+    this.nodes.push(node);
+    this.parents.push(parent);
+    this.fields.push(field);
+    this.slots.push(slot);
+    this.sizes.push(1);
+    this._kinds[node.kind].push(id);
+    if (this._positions !== null) {
+      this._add_position(node, id);
+    }
+    _push_indexed_children(node, id, stack);
+  }
+  for (var i = this.nodes.length - 1; i > first; i--) {
+    this.sizes[this.parents[i]] += this.sizes[i];
+  }
+  return first;
+}
+
+var _push_indexed_children = function(node, id, stack) {
+  switch (node.kind) {
+    case 0:  // Case
+      stack.push(node.expr, id, 'expr', -1);
+      break;
+    case 1:  // Class
+      for (var i = node.features.length - 1; i >= 0; i--) {
+        stack.push(node.features[i], id, 'features', i);
+      }
+      break;
+    case 2:  // Assign
+      stack.push(node.expr, id, 'expr', -1);
+      break;
+    case 3:  // StaticDispatch
+      for (var i = node.actual.length - 1; i >= 0; i--) {
+        stack.push(node.actual[i], id, 'actual', i);
+      }
+      stack.push(node.expr, id, 'expr', -1);
+      break;
+    case 4:  // Dispatch
+      for (var i = node.actual.length - 1; i >= 0; i--) {
+        stack.push(node.actual[i], id, 'actual', i);
+      }
+      stack.push(node.expr, id, 'expr', -1);
+      break;
+    case 5:  // Cond
+      stack.push(node.else_exp, id, 'else_exp', -1);
+      stack.push(node.then_exp, id, 'then_exp', -1);
+      stack.push(node.pred, id, 'pred', -1);
+      break;
+    case 6:  // Loop
+      stack.push(node.body, id, 'body', -1);
+      stack.push(node.pred, id, 'pred', -1);
+      break;
+    case 7:  // Typcase
+      for (var i = node.cases.length - 1; i >= 0; i--) {
+        stack.push(node.cases[i], id, 'cases', i);
+      }
+      stack.push(node.expr, id, 'expr', -1);
+      break;
+    case 8:  // Block
+      for (var i = node.body.length - 1; i >= 0; i--) {
+        stack.push(node.body[i], id, 'body', i);
+      }
+      break;
+    case 9:  // Let
+      stack.push(node.body, id, 'body', -1);
+      for (var i = node.init.length - 1; i >= 0; i--) {
+        stack.push(node.init[i], id, 'init', i);
+      }
+      break;
+    case 10:  // BinaryOp
+      stack.push(node.right, id, 'right', -1);
+      stack.push(node.left, id, 'left', -1);
+      break;
+    case 11:  // UnaryOp
+      stack.push(node.expr, id, 'expr', -1);
+      break;
+    case 16:  // IsVoid
+      stack.push(node.expr, id, 'expr', -1);
+      break;
+    case 19:  // Method
+      stack.push(node.expr, id, 'expr', -1);
+      for (var i = node.formals.length - 1; i >= 0; i--) {
+        stack.push(node.formals[i], id, 'formals', i);
+      }
+      break;
+    case 20:  // Attr
+      stack.push(node.init, id, 'init', -1);
+      break;
+    case 22:  // Letinit
+      stack.push(node.init, id, 'init', -1);
+      break;
+    case 23:  // Program
+      for (var i = node.classes.length - 1; i >= 0; i--) {
+        stack.push(node.classes[i], id, 'classes', i);
+      }
+      break;
+  }
+}
+
+// The classes of the nodes held by the node fields of each kind, by field name
+var _field_classes = [
+  {expr: Expression},  // Case
+  {features: Feature},  // Class
+  {expr: Expression},  // Assign
+  {expr: Expression, actual: Expression},  // StaticDispatch
+  {expr: Expression, actual: Expression},  // Dispatch
+  {pred: Expression, then_exp: Expression, else_exp: Expression},  // Cond
+  {pred: Expression, body: Expression},  // Loop
+  {expr: Expression, cases: Case},  // Typcase
+  {body: Expression},  // Block
+  {init: Letinit, body: Expression},  // Let
+  {left: Expression, right: Expression},  // BinaryOp
+  {expr: Expression},  // UnaryOp
+  {},  // IntConst
+  {},  // BoolConst
+  {},  // StringConst
+  {},  // New
+  {expr: Expression},  // IsVoid
+  {},  // NoExpr
+  {},  // Obj
+  {formals: Formal, expr: Expression},  // Method
+  {init: Expression},  // Attr
+  {},  // Formal
+  {init: Expression},  // Letinit
+  {classes: Class}  // Program
+];
+
+//
+//-------------------- Builder --------------------
+//
+
+// builder exposes the node constructors and field accessors of this module as
+// plain functions: builder.Obj(name, loc) creates an Obj node and
+// builder.name(node) reads the name field of a node. The arena backend
+// exposes the same interface over node handles, so code written against a
+// builder (such as the parser) can target either representation.
+var builder = exports.builder = {
+  kinds: {
+    Case: 0,
+    Class: 1,
+    Assign: 2,
+    StaticDispatch: 3,
+    Dispatch: 4,
+    Cond: 5,
+    Loop: 6,
+    Typcase: 7,
+    Block: 8,
+    Let: 9,
+    BinaryOp: 10,
+    UnaryOp: 11,
+    IntConst: 12,
+    BoolConst: 13,
+    StringConst: 14,
+    New: 15,
+    IsVoid: 16,
+    NoExpr: 17,
+    Obj: 18,
+    Method: 19,
+    Attr: 20,
+    Formal: 21,
+    Letinit: 22,
+    Program: 23
+  },
+
+  kind: function(node) {return node.kind;},
+  loc: function(node) {return node.loc;},
+  node_type: function(node) {return node.constructor.node_type;},
+
+  Case: function(name, type_decl, expr, loc) {
+    return new Case(name, type_decl, expr, loc);
+  },
+  Class: function(name, parent, features, loc) {
+    return new Class(name, parent, features, loc);
+  },
+  Assign: function(name, expr, loc) {
+    return new Assign(name, expr, loc);
+  },
+  StaticDispatch: function(expr, type_name, name, actual, loc) {
+    return new StaticDispatch(expr, type_name, name, actual, loc);
+  },
+  Dispatch: function(expr, name, actual, loc) {
+    return new Dispatch(expr, name, actual, loc);
+  },
+  Cond: function(pred, then_exp, else_exp, loc) {
+    return new Cond(pred, then_exp, else_exp, loc);
+  },
+  Loop: function(pred, body, loc) {
+    return new Loop(pred, body, loc);
+  },
+  Typcase: function(expr, cases, loc) {
+    return new Typcase(expr, cases, loc);
+  },
+  Block: function(body, loc) {
+    return new Block(body, loc);
+  },
+  Let: function(init, body, loc) {
+    return new Let(init, body, loc);
+  },
+  BinaryOp: function(op, left, right, loc) {
+    return new BinaryOp(op, left, right, loc);
+  },
+  UnaryOp: function(op, expr, loc) {
+    return new UnaryOp(op, expr, loc);
+  },
+  IntConst: function(token, loc) {
+    return IntConst.of(token, loc);
+  },
+  BoolConst: function(value, loc) {
+    return BoolConst.of(value, loc);
+  },
+  StringConst: function(str, loc) {
+    return StringConst.of(str, loc);
+  },
+  New: function(type_name, loc) {
+    return New.of(type_name, loc);
+  },
+  IsVoid: function(expr, loc) {
+    return new IsVoid(expr, loc);
+  },
+  NoExpr: function(loc) {
+    return NoExpr.of(loc);
+  },
+  Obj: function(name, loc) {
+    return Obj.of(name, loc);
+  },
+  Method: function(name, formals, return_type, expr, loc) {
+    return new Method(name, formals, return_type, expr, loc);
+  },
+  Attr: function(name, type_decl, init, loc) {
+    return new Attr(name, type_decl, init, loc);
+  },
+  Formal: function(name, type_decl, loc) {
+    return Formal.of(name, type_decl, loc);
+  },
+  Letinit: function(id, type_decl, init, loc) {
+    return new Letinit(id, type_decl, init, loc);
+  },
+  Program: function(classes, loc) {
+    return new Program(classes, loc);
+  },
+
+  actual: function(node) {return node.actual;},
+  body: function(node) {return node.body;},
+  cases: function(node) {return node.cases;},
+  classes: function(node) {return node.classes;},
+  else_exp: function(node) {return node.else_exp;},
+  expr: function(node) {return node.expr;},
+  features: function(node) {return node.features;},
+  formals: function(node) {return node.formals;},
+  id: function(node) {return node.id;},
+  init: function(node) {return node.init;},
+  left: function(node) {return node.left;},
+  name: function(node) {return node.name;},
+  op: function(node) {return node.op;},
+  parent: function(node) {return node.parent;},
+  pred: function(node) {return node.pred;},
+  return_type: function(node) {return node.return_type;},
+  right: function(node) {return node.right;},
+  str: function(node) {return node.str;},
+  then_exp: function(node) {return node.then_exp;},
+  token: function(node) {return node.token;},
+  type_decl: function(node) {return node.type_decl;},
+  type_name: function(node) {return node.type_name;},
+  value: function(node) {return node.value;}
+};
+
+//
+//-------------------- Serialization --------------------
+//
+
+// serialize(node) encodes the tree rooted at node into a compact binary form,
+// returned as a Uint8Array. deserialize(bytes) decodes it back into a tree of
+// nodes (bytes can be a Uint8Array or a Buffer).
+//
+// The encoding, where all integers are unsigned LEB128 varints:
+// - The magic 'CAST', the format version and the schema id: a hash of the
+//   ASDL definition this module was generated from, so that ASTs are never
+//   decoded against a different schema.
+// - A string table: the number of strings, then the length in bytes and the
+//   UTF-8 encoding of each string. Identifiers and strings in the tree are
+//   stored as their index in the table plus 1, with 0 for null.
+// - The root node. A node is encoded as its kind plus 1 (0 for null), its loc
+//   plus 1 (0 for a missing loc), and then its fields in order. Sequences are
+//   their length followed by their elements. ints are zigzag-encoded, and
+//   booleans are a single 0 or 1 byte.
+//
+// Both recurse once per level of the tree, so trees a few thousand levels
+// deep (such as a left-deep chain of thousands of binary operators) overflow
+// node's default stack with a RangeError; deserialize gives up first, at about
+// half the depth serialize handles. The Python deserializer generated by
+// asdl_gen_py.py reads with an explicit stack and has no such limit.
+var serialize = exports.serialize = function(node) {
+  var body = new _Writer();
+  body.node(node);
+
+  var out = new _Writer();
+  for (var i = 0; i < _MAGIC.length; i++) {
+    out.byte(_MAGIC.charCodeAt(i));
+  }
+  out.uint(_FORMAT_VERSION);
+  out.uint(schema_id);
+  out.uint(body.strings.length);
+  for (var i = 0; i < body.strings.length; i++) {
+    var utf8 = _utf8_encode(body.strings[i]);
+    out.uint(utf8.length);
+    out.bytes(utf8);
+  }
+  out.bytes(body.buf.subarray(0, body.pos));
+  return out.buf.slice(0, out.pos);
+}
+
+var deserialize = exports.deserialize = function(bytes) {
+  var r = new _Reader(bytes);
+  for (var i = 0; i < _MAGIC.length; i++) {
+    if (r.byte() !== _MAGIC.charCodeAt(i)) {
+      throw new ASTError('Not a serialized AST');
+    }
+  }
+  var version = r.uint();
+  if (version !== _FORMAT_VERSION) {
+    throw new ASTError('Unsupported serialized AST version ' + version);
+  }
+  if (r.uint() !== schema_id) {
+    throw new ASTError('Serialized AST was built from a different schema');
+  }
+  var nstrings = r.uint();
+  for (var i = 0; i < nstrings; i++) {
+    var length = r.uint();
+    if (r.pos + length > bytes.length) {
+      throw new ASTError('Truncated serialized AST');
+    }
+    r.strings.push(_utf8_decode(bytes, r.pos, r.pos + length));
+    r.pos += length;
+  }
+  return r.node();
+}
+
+var _MAGIC = 'CAST';
+var _FORMAT_VERSION = 1;
+
+var _Writer = function() {
+  this.buf = new Uint8Array(256);
+  this.pos = 0;
+  this.strings = [];
+  this._string_index = Object.create(null);
+}
+
+_Writer.prototype._reserve = function(n) {
+  if (this.pos + n > this.buf.length) {
+    var buf = new Uint8Array(Math.max(this.buf.length * 2, this.pos + n));
+    buf.set(this.buf);
+    this.buf = buf;
+  }
+}
+
+_Writer.prototype.byte = function(b) {
+  this._reserve(1);
+  this.buf[this.pos++] = b;
+}
+
+_Writer.prototype.bytes = function(bytes) {
+  this._reserve(bytes.length);
+  this.buf.set(bytes, this.pos);
+  this.pos += bytes.length;
+}
+
+// Arithmetic rather than bitwise operations, so that values beyond 32 bits
+// are encoded correctly. Anything but the integers from 0 to 2^53 - 1 (such as
+// a negative or fractional loc) would be encoded as something else, and is
+// rejected.
+_Writer.prototype.uint = function(v) {
+  if (!Number.isSafeInteger(v) || v < 0) {
+    throw new ASTError('Can\'t serialize ' + v + ': not an unsigned integer');
+  }
+  this._reserve(10);
+  while (v >= 128) {
+    this.buf[this.pos++] = (v % 128) | 128;
+    v = Math.floor(v / 128);
+  }
+  this.buf[this.pos++] = v;
+}
+
+// Only ints as checked by _check_int have an exact zigzag encoding.
+_Writer.prototype.int = function(v) {
+  if (!Number.isInteger(v) || Math.abs(v) > 4503599627370495) {
+    throw new ASTError('Can\'t serialize ' + v + ': not an int');
+  }
+  this.uint(v >= 0 ? v * 2 : -v * 2 - 1);
+}
+
+_Writer.prototype.boolean = function(v) {
+  this.byte(v ? 1 : 0);
+}
+
+_Writer.prototype.string = function(s) {
+  if (s === null) {
+    this.uint(0);
+    return;
+  }
+  var index = this._string_index[s];
+  if (index === undefined) {
+    index = this._string_index[s] = this.strings.length;
+    this.strings.push(s);
+  }
+  this.uint(index + 1);
+}
+
+_Writer.prototype.node = function(node) {
+  if (node === null) {
+    this.uint(0);
+    return;
+  }
+  this.uint(node.kind + 1);
+  this.uint(node.loc === undefined || node.loc === null ? 0 : node.loc + 1);
+  node._serialize(this);
+}
+
+var _Reader = function(bytes) {
+  this.bytes = bytes;
+  this.pos = 0;
+  this.strings = [];
+}
+
+_Reader.prototype.byte = function() {
+  if (this.pos >= this.bytes.length) {
+    throw new ASTError('Truncated serialized AST');
+  }
+  return this.bytes[this.pos++];
+}
+
+_Reader.prototype.uint = function() {
+  var v = 0;
+  var scale = 1;
+  var b;
+  do {
+    b = this.byte();
+    v += (b & 127) * scale;
+    scale *= 128;
+  } while (b & 128);
+  return v;
+}
+
+_Reader.prototype.int = function() {
+  var v = this.uint();
+  return v % 2 === 0 ? v / 2 : -(v + 1) / 2;
+}
+
+_Reader.prototype.boolean = function() {
+  return this.byte() !== 0;
+}
+
+_Reader.prototype.string = function() {
+  var index = this.uint();
+  if (index === 0) {
+    return null;
+  }
+  if (index > this.strings.length) {
+    throw new ASTError('Unknown string index ' + (index - 1));
+  }
+  return this.strings[index - 1];
+}
+
+_Reader.prototype.node = function() {
+  var tag = this.uint();
+  if (tag === 0) {
+    return null;
+  }
+  var deserializer = _deserializers[tag - 1];
+  if (deserializer === undefined) {
+    throw new ASTError('Unknown node kind ' + (tag - 1));
+  }
+  var loc = this.uint();
+  return deserializer(this, loc === 0 ? undefined : loc - 1);
+}
+
+// Read a sequence whose elements are read by the given _Reader method.
+_Reader.prototype.seq = function(read) {
+  var length = this.uint();
+  var values = [];
+  for (var i = 0; i < length; i++) {
+    values.push(read.call(this));
+  }
+  return values;
+}
+
+// Strings are encoded and decoded with the standard UTF-8 codec. Strings
+// that have no UTF-8 encoding (with unpaired surrogates) aren't serialized,
+// and malformed UTF-8 isn't decoded, rather than replaced by U+FFFD.
+var _utf8_encoder = new TextEncoder();
+var _utf8_decoder = new TextDecoder('utf-8', {fatal: true, ignoreBOM: true});
+var _unpaired_surrogate =
+    /[\ud800-\udbff](?![\udc00-\udfff])|(?:^|[^\ud800-\udbff])[\udc00-\udfff]/;
+
+var _utf8_encode = function(s) {
+  if (_unpaired_surrogate.test(s)) {
+    throw new ASTError('Can\'t serialize ' + JSON.stringify(s) +
+                       ': not valid Unicode');
+  }
+  return _utf8_encoder.encode(s);
+}
+
+var _utf8_decode = function(bytes, start, end) {
+  try {
+    return _utf8_decoder.decode(bytes.subarray(start, end));
+  } catch (e) {
+    throw new ASTError('Invalid UTF-8 string in serialized AST');
   }
-  return children;
 }
 
+var schema_id = exports.schema_id = 1613439618;
+
+// Functions reading the fields of a node from a _Reader and creating the
+// node, indexed by kind.
+var _deserializers = [
+  function(r, loc) {
+    return new Case(r.string(), r.string(), r.node(), loc);
+  },
+  function(r, loc) {
+    return new Class(r.string(), r.string(), r.seq(r.node), loc);
+  },
+  function(r, loc) {
+    return new Assign(r.string(), r.node(), loc);
+  },
+  function(r, loc) {
+    return new StaticDispatch(r.node(), r.string(), r.string(), r.seq(r.node), loc);
+  },
+  function(r, loc) {
+    return new Dispatch(r.node(), r.string(), r.seq(r.node), loc);
+  },
+  function(r, loc) {
+    return new Cond(r.node(), r.node(), r.node(), loc);
+  },
+  function(r, loc) {
+    return new Loop(r.node(), r.node(), loc);
+  },
+  function(r, loc) {
+    return new Typcase(r.node(), r.seq(r.node), loc);
+  },
+  function(r, loc) {
+    return new Block(r.seq(r.node), loc);
+  },
+  function(r, loc) {
+    return new Let(r.seq(r.node), r.node(), loc);
+  },
+  function(r, loc) {
+    return new BinaryOp(r.string(), r.node(), r.node(), loc);
+  },
+  function(r, loc) {
+    return new UnaryOp(r.string(), r.node(), loc);
+  },
+  function(r, loc) {
+    return IntConst.of(r.int(), loc);
+  },
+  function(r, loc) {
+    return BoolConst.of(r.boolean(), loc);
+  },
+  function(r, loc) {
+    return StringConst.of(r.string(), loc);
+  },
+  function(r, loc) {
+    return New.of(r.string(), loc);
+  },
+  function(r, loc) {
+    return new IsVoid(r.node(), loc);
+  },
+  function(r, loc) {
+    return NoExpr.of(loc);
+  },
+  function(r, loc) {
+    return Obj.of(r.string(), loc);
+  },
+  function(r, loc) {
+    return new Method(r.string(), r.seq(r.node), r.string(), r.node(), loc);
+  },
+  function(r, loc) {
+    return new Attr(r.string(), r.string(), r.node(), loc);
+  },
+  function(r, loc) {
+    return Formal.of(r.string(), r.string(), loc);
+  },
+  function(r, loc) {
+    return new Letinit(r.string(), r.string(), r.node(), loc);
+  },
+  function(r, loc) {
+    return new Program(r.seq(r.node), loc);
+  }];
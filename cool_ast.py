@@ -0,0 +1,1075 @@
+#-------------------------------------------------------------------------------
+# AST for Cool.
+# NOTE: this code is auto-generated from the ASDL definition of the AST. Do
+#       not edit it directly.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+
+class ASTError(Exception):
+    """ The exception type used by this module to signal errors.
+    """
+    pass
+
+def _check_identifier(v, who, what, loc):
+    if not isinstance(v, str):
+        raise ASTError('Line %s: %s expects %s to be an identifier' % (
+            loc, who, what))
+
+def _check_string(v, who, what, loc):
+    if not isinstance(v, str) or v[:1] != '"' or v[-1:] != '"' or len(v) < 2:
+        raise ASTError('Line %s: %s expects %s to be a string' % (
+            loc, who, what))
+
+def _check_int(v, who, what, loc):
+    if not isinstance(v, int) or isinstance(v, bool):
+        raise ASTError('Line %s: %s expects %s to be an int' % (
+            loc, who, what))
+
+def _check_boolean(v, who, what, loc):
+    if not isinstance(v, bool):
+        raise ASTError('Line %s: %s expects %s to be a boolean' % (
+            loc, who, what))
+
+def _check_array(v, who, what, loc):
+    if not isinstance(v, list):
+        raise ASTError('Line %s: %s expects %s to be an array' % (
+            loc, who, what))
+
+class Node:
+    """ Node is an abstract interface implemented by all the AST nodes defined
+        here.
+
+        Each concrete node class has:
+        * _fields: names of its fields, in constructor order.
+        * attributes: names of its non-Node fields.
+        * node_type: its name.
+        * kind: a distinct integer, indexing node_types and node_classes.
+    """
+    __slots__ = ()
+    _fields = ()
+    attributes = ()
+    node_type = 'Node'
+    kind = -1
+
+    def __init__(self):
+        raise ASTError('Node is an abstract class')
+
+    def iter_child_nodes(self):
+        """ Iterate over the child nodes of this node, in order.
+        """
+        raise ASTError('Abstract method called')
+
+    def children(self):
+        """ Return a list of (name, node) pairs for the children of this node.
+            Names are like the ones used by the JS AST: 'expr', 'actual[0]'.
+        """
+        raise ASTError('Abstract method called')
+
+    def __repr__(self):
+        return '%s(%s)' % (self.node_type, ', '.join(
+            '%s=%r' % (name, getattr(self, name)) for name in self._fields))
+
+
+#
+#-------------------- AST nodes --------------------
+#
+
+class Case(Node):
+    """ Constructor(Case, [Field(identifier, name), Field(identifier, type_decl), Field(expression, expr)])
+    """
+    __slots__ = ('name', 'type_decl', 'expr', 'loc')
+    _fields = ('name', 'type_decl', 'expr')
+    attributes = ('name', 'type_decl')
+    node_type = 'Case'
+    kind = 0
+
+    def __init__(self, name, type_decl, expr, loc=None):
+        _check_identifier(name, 'Case', 'name', loc)
+        _check_identifier(type_decl, 'Case', 'type_decl', loc)
+        if not isinstance(expr, Expression):
+            raise ASTError('Case expects expr to be a Expression')
+        self.name = name
+        self.type_decl = type_decl
+        self.expr = expr
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.expr
+
+    def children(self):
+        children = []
+        children.append(('expr', self.expr))
+        return children
+
+
+class Class(Node):
+    """ Constructor(Class, [Field(identifier, name), Field(identifier, parent, opt=True), Field(feature, features, seq=True)])
+    """
+    __slots__ = ('name', 'parent', 'features', 'loc')
+    _fields = ('name', 'parent', 'features')
+    attributes = ('name', 'parent')
+    node_type = 'Class'
+    kind = 1
+
+    def __init__(self, name, parent, features, loc=None):
+        _check_identifier(name, 'Class', 'name', loc)
+        if parent is not None:
+            _check_identifier(parent, 'Class', 'parent', loc)
+        _check_array(features, 'Class', 'features', loc)
+        for item in features:
+            if not isinstance(item, Feature):
+                raise ASTError('Class expects features to be an array of Feature')
+        self.name = name
+        self.parent = parent
+        self.features = features
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield from self.features
+
+    def children(self):
+        children = []
+        children.extend(
+            ('features[%d]' % i, node) for i, node in enumerate(self.features))
+        return children
+
+
+class Expression(Node):
+    """ Expression is an abstract Node interface
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        raise ASTError('Expression is an abstract class')
+
+
+class Assign(Expression):
+    """ Constructor(Assign, [Field(identifier, name), Field(expression, expr)])
+    """
+    __slots__ = ('name', 'expr', 'loc')
+    _fields = ('name', 'expr')
+    attributes = ('name',)
+    node_type = 'Assign'
+    kind = 2
+
+    def __init__(self, name, expr, loc=None):
+        _check_identifier(name, 'Assign', 'name', loc)
+        if not isinstance(expr, Expression):
+            raise ASTError('Assign expects expr to be a Expression')
+        self.name = name
+        self.expr = expr
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.expr
+
+    def children(self):
+        children = []
+        children.append(('expr', self.expr))
+        return children
+
+
+class StaticDispatch(Expression):
+    """ Constructor(StaticDispatch, [Field(expression, expr), Field(identifier, type_name), Field(identifier, name), Field(expression, actual, seq=True)])
+    """
+    __slots__ = ('expr', 'type_name', 'name', 'actual', 'loc')
+    _fields = ('expr', 'type_name', 'name', 'actual')
+    attributes = ('type_name', 'name')
+    node_type = 'StaticDispatch'
+    kind = 3
+
+    def __init__(self, expr, type_name, name, actual, loc=None):
+        if not isinstance(expr, Expression):
+            raise ASTError('StaticDispatch expects expr to be a Expression')
+        _check_identifier(type_name, 'StaticDispatch', 'type_name', loc)
+        _check_identifier(name, 'StaticDispatch', 'name', loc)
+        _check_array(actual, 'StaticDispatch', 'actual', loc)
+        for item in actual:
+            if not isinstance(item, Expression):
+                raise ASTError('StaticDispatch expects actual to be an array of Expression')
+        self.expr = expr
+        self.type_name = type_name
+        self.name = name
+        self.actual = actual
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.expr
+        yield from self.actual
+
+    def children(self):
+        children = []
+        children.append(('expr', self.expr))
+        children.extend(
+            ('actual[%d]' % i, node) for i, node in enumerate(self.actual))
+        return children
+
+
+class Dispatch(Expression):
+    """ Constructor(Dispatch, [Field(expression, expr), Field(identifier, name), Field(expression, actual, seq=True)])
+    """
+    __slots__ = ('expr', 'name', 'actual', 'loc')
+    _fields = ('expr', 'name', 'actual')
+    attributes = ('name',)
+    node_type = 'Dispatch'
+    kind = 4
+
+    def __init__(self, expr, name, actual, loc=None):
+        if not isinstance(expr, Expression):
+            raise ASTError('Dispatch expects expr to be a Expression')
+        _check_identifier(name, 'Dispatch', 'name', loc)
+        _check_array(actual, 'Dispatch', 'actual', loc)
+        for item in actual:
+            if not isinstance(item, Expression):
+                raise ASTError('Dispatch expects actual to be an array of Expression')
+        self.expr = expr
+        self.name = name
+        self.actual = actual
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.expr
+        yield from self.actual
+
+    def children(self):
+        children = []
+        children.append(('expr', self.expr))
+        children.extend(
+            ('actual[%d]' % i, node) for i, node in enumerate(self.actual))
+        return children
+
+
+class Cond(Expression):
+    """ Constructor(Cond, [Field(expression, pred), Field(expression, then_exp), Field(expression, else_exp)])
+    """
+    __slots__ = ('pred', 'then_exp', 'else_exp', 'loc')
+    _fields = ('pred', 'then_exp', 'else_exp')
+    attributes = ()
+    node_type = 'Cond'
+    kind = 5
+
+    def __init__(self, pred, then_exp, else_exp, loc=None):
+        if not isinstance(pred, Expression):
+            raise ASTError('Cond expects pred to be a Expression')
+        if not isinstance(then_exp, Expression):
+            raise ASTError('Cond expects then_exp to be a Expression')
+        if not isinstance(else_exp, Expression):
+            raise ASTError('Cond expects else_exp to be a Expression')
+        self.pred = pred
+        self.then_exp = then_exp
+        self.else_exp = else_exp
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.pred
+        yield self.then_exp
+        yield self.else_exp
+
+    def children(self):
+        children = []
+        children.append(('pred', self.pred))
+        children.append(('then_exp', self.then_exp))
+        children.append(('else_exp', self.else_exp))
+        return children
+
+
+class Loop(Expression):
+    """ Constructor(Loop, [Field(expression, pred), Field(expression, body)])
+    """
+    __slots__ = ('pred', 'body', 'loc')
+    _fields = ('pred', 'body')
+    attributes = ()
+    node_type = 'Loop'
+    kind = 6
+
+    def __init__(self, pred, body, loc=None):
+        if not isinstance(pred, Expression):
+            raise ASTError('Loop expects pred to be a Expression')
+        if not isinstance(body, Expression):
+            raise ASTError('Loop expects body to be a Expression')
+        self.pred = pred
+        self.body = body
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.pred
+        yield self.body
+
+    def children(self):
+        children = []
+        children.append(('pred', self.pred))
+        children.append(('body', self.body))
+        return children
+
+
+class Typcase(Expression):
+    """ Constructor(Typcase, [Field(expression, expr), Field(case, cases, seq=True)])
+    """
+    __slots__ = ('expr', 'cases', 'loc')
+    _fields = ('expr', 'cases')
+    attributes = ()
+    node_type = 'Typcase'
+    kind = 7
+
+    def __init__(self, expr, cases, loc=None):
+        if not isinstance(expr, Expression):
+            raise ASTError('Typcase expects expr to be a Expression')
+        _check_array(cases, 'Typcase', 'cases', loc)
+        for item in cases:
+            if not isinstance(item, Case):
+                raise ASTError('Typcase expects cases to be an array of Case')
+        self.expr = expr
+        self.cases = cases
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.expr
+        yield from self.cases
+
+    def children(self):
+        children = []
+        children.append(('expr', self.expr))
+        children.extend(
+            ('cases[%d]' % i, node) for i, node in enumerate(self.cases))
+        return children
+
+
+class Block(Expression):
+    """ Constructor(Block, [Field(expression, body, seq=True)])
+    """
+    __slots__ = ('body', 'loc')
+    _fields = ('body',)
+    attributes = ()
+    node_type = 'Block'
+    kind = 8
+
+    def __init__(self, body, loc=None):
+        _check_array(body, 'Block', 'body', loc)
+        for item in body:
+            if not isinstance(item, Expression):
+                raise ASTError('Block expects body to be an array of Expression')
+        self.body = body
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield from self.body
+
+    def children(self):
+        children = []
+        children.extend(
+            ('body[%d]' % i, node) for i, node in enumerate(self.body))
+        return children
+
+
+class Let(Expression):
+    """ Constructor(Let, [Field(letinit, init, seq=True), Field(expression, body)])
+    """
+    __slots__ = ('init', 'body', 'loc')
+    _fields = ('init', 'body')
+    attributes = ()
+    node_type = 'Let'
+    kind = 9
+
+    def __init__(self, init, body, loc=None):
+        _check_array(init, 'Let', 'init', loc)
+        for item in init:
+            if not isinstance(item, Letinit):
+                raise ASTError('Let expects init to be an array of Letinit')
+        if not isinstance(body, Expression):
+            raise ASTError('Let expects body to be a Expression')
+        self.init = init
+        self.body = body
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield from self.init
+        yield self.body
+
+    def children(self):
+        children = []
+        children.extend(
+            ('init[%d]' % i, node) for i, node in enumerate(self.init))
+        children.append(('body', self.body))
+        return children
+
+
+class BinaryOp(Expression):
+    """ Constructor(BinaryOp, [Field(identifier, op), Field(expression, left), Field(expression, right)])
+    """
+    __slots__ = ('op', 'left', 'right', 'loc')
+    _fields = ('op', 'left', 'right')
+    attributes = ('op',)
+    node_type = 'BinaryOp'
+    kind = 10
+
+    def __init__(self, op, left, right, loc=None):
+        _check_identifier(op, 'BinaryOp', 'op', loc)
+        if not isinstance(left, Expression):
+            raise ASTError('BinaryOp expects left to be a Expression')
+        if not isinstance(right, Expression):
+            raise ASTError('BinaryOp expects right to be a Expression')
+        self.op = op
+        self.left = left
+        self.right = right
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.left
+        yield self.right
+
+    def children(self):
+        children = []
+        children.append(('left', self.left))
+        children.append(('right', self.right))
+        return children
+
+
+class UnaryOp(Expression):
+    """ Constructor(UnaryOp, [Field(identifier, op), Field(expression, expr)])
+    """
+    __slots__ = ('op', 'expr', 'loc')
+    _fields = ('op', 'expr')
+    attributes = ('op',)
+    node_type = 'UnaryOp'
+    kind = 11
+
+    def __init__(self, op, expr, loc=None):
+        _check_identifier(op, 'UnaryOp', 'op', loc)
+        if not isinstance(expr, Expression):
+            raise ASTError('UnaryOp expects expr to be a Expression')
+        self.op = op
+        self.expr = expr
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.expr
+
+    def children(self):
+        children = []
+        children.append(('expr', self.expr))
+        return children
+
+
+class IntConst(Expression):
+    """ Constructor(IntConst, [Field(int, token)])
+    """
+    __slots__ = ('token', 'loc')
+    _fields = ('token',)
+    attributes = ('token',)
+    node_type = 'IntConst'
+    kind = 12
+
+    def __init__(self, token, loc=None):
+        _check_int(token, 'IntConst', 'token', loc)
+        self.token = token
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        return iter(())
+
+    def children(self):
+        return []
+
+
+class BoolConst(Expression):
+    """ Constructor(BoolConst, [Field(boolean, value)])
+    """
+    __slots__ = ('value', 'loc')
+    _fields = ('value',)
+    attributes = ('value',)
+    node_type = 'BoolConst'
+    kind = 13
+
+    def __init__(self, value, loc=None):
+        _check_boolean(value, 'BoolConst', 'value', loc)
+        self.value = value
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        return iter(())
+
+    def children(self):
+        return []
+
+
+class StringConst(Expression):
+    """ Constructor(StringConst, [Field(string, str)])
+    """
+    __slots__ = ('str', 'loc')
+    _fields = ('str',)
+    attributes = ('str',)
+    node_type = 'StringConst'
+    kind = 14
+
+    def __init__(self, str, loc=None):
+        _check_string(str, 'StringConst', 'str', loc)
+        self.str = str
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        return iter(())
+
+    def children(self):
+        return []
+
+
+class New(Expression):
+    """ Constructor(New, [Field(identifier, type_name)])
+    """
+    __slots__ = ('type_name', 'loc')
+    _fields = ('type_name',)
+    attributes = ('type_name',)
+    node_type = 'New'
+    kind = 15
+
+    def __init__(self, type_name, loc=None):
+        _check_identifier(type_name, 'New', 'type_name', loc)
+        self.type_name = type_name
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        return iter(())
+
+    def children(self):
+        return []
+
+
+class IsVoid(Expression):
+    """ Constructor(IsVoid, [Field(expression, expr)])
+    """
+    __slots__ = ('expr', 'loc')
+    _fields = ('expr',)
+    attributes = ()
+    node_type = 'IsVoid'
+    kind = 16
+
+    def __init__(self, expr, loc=None):
+        if not isinstance(expr, Expression):
+            raise ASTError('IsVoid expects expr to be a Expression')
+        self.expr = expr
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.expr
+
+    def children(self):
+        children = []
+        children.append(('expr', self.expr))
+        return children
+
+
+class NoExpr(Expression):
+    """ Constructor(NoExpr, [])
+    """
+    __slots__ = ('loc',)
+    _fields = ()
+    attributes = ()
+    node_type = 'NoExpr'
+    kind = 17
+
+    def __init__(self, loc=None):
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        return iter(())
+
+    def children(self):
+        return []
+
+
+class Obj(Expression):
+    """ Constructor(Obj, [Field(identifier, name)])
+    """
+    __slots__ = ('name', 'loc')
+    _fields = ('name',)
+    attributes = ('name',)
+    node_type = 'Obj'
+    kind = 18
+
+    def __init__(self, name, loc=None):
+        _check_identifier(name, 'Obj', 'name', loc)
+        self.name = name
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        return iter(())
+
+    def children(self):
+        return []
+
+
+class Feature(Node):
+    """ Feature is an abstract Node interface
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        raise ASTError('Feature is an abstract class')
+
+
+class Method(Feature):
+    """ Constructor(Method, [Field(identifier, name), Field(formal, formals, seq=True), Field(identifier, return_type), Field(expression, expr)])
+    """
+    __slots__ = ('name', 'formals', 'return_type', 'expr', 'loc')
+    _fields = ('name', 'formals', 'return_type', 'expr')
+    attributes = ('name', 'return_type')
+    node_type = 'Method'
+    kind = 19
+
+    def __init__(self, name, formals, return_type, expr, loc=None):
+        _check_identifier(name, 'Method', 'name', loc)
+        _check_array(formals, 'Method', 'formals', loc)
+        for item in formals:
+            if not isinstance(item, Formal):
+                raise ASTError('Method expects formals to be an array of Formal')
+        _check_identifier(return_type, 'Method', 'return_type', loc)
+        if not isinstance(expr, Expression):
+            raise ASTError('Method expects expr to be a Expression')
+        self.name = name
+        self.formals = formals
+        self.return_type = return_type
+        self.expr = expr
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield from self.formals
+        yield self.expr
+
+    def children(self):
+        children = []
+        children.extend(
+            ('formals[%d]' % i, node) for i, node in enumerate(self.formals))
+        children.append(('expr', self.expr))
+        return children
+
+
+class Attr(Feature):
+    """ Constructor(Attr, [Field(identifier, name), Field(identifier, type_decl), Field(expression, init)])
+    """
+    __slots__ = ('name', 'type_decl', 'init', 'loc')
+    _fields = ('name', 'type_decl', 'init')
+    attributes = ('name', 'type_decl')
+    node_type = 'Attr'
+    kind = 20
+
+    def __init__(self, name, type_decl, init, loc=None):
+        _check_identifier(name, 'Attr', 'name', loc)
+        _check_identifier(type_decl, 'Attr', 'type_decl', loc)
+        if not isinstance(init, Expression):
+            raise ASTError('Attr expects init to be a Expression')
+        self.name = name
+        self.type_decl = type_decl
+        self.init = init
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.init
+
+    def children(self):
+        children = []
+        children.append(('init', self.init))
+        return children
+
+
+class Formal(Node):
+    """ Constructor(Formal, [Field(identifier, name), Field(identifier, type_decl)])
+    """
+    __slots__ = ('name', 'type_decl', 'loc')
+    _fields = ('name', 'type_decl')
+    attributes = ('name', 'type_decl')
+    node_type = 'Formal'
+    kind = 21
+
+    def __init__(self, name, type_decl, loc=None):
+        _check_identifier(name, 'Formal', 'name', loc)
+        _check_identifier(type_decl, 'Formal', 'type_decl', loc)
+        self.name = name
+        self.type_decl = type_decl
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        return iter(())
+
+    def children(self):
+        return []
+
+
+class Letinit(Node):
+    """ Constructor(Letinit, [Field(identifier, id), Field(identifier, type_decl), Field(expression, init)])
+    """
+    __slots__ = ('id', 'type_decl', 'init', 'loc')
+    _fields = ('id', 'type_decl', 'init')
+    attributes = ('id', 'type_decl')
+    node_type = 'Letinit'
+    kind = 22
+
+    def __init__(self, id, type_decl, init, loc=None):
+        _check_identifier(id, 'Letinit', 'id', loc)
+        _check_identifier(type_decl, 'Letinit', 'type_decl', loc)
+        if not isinstance(init, Expression):
+            raise ASTError('Letinit expects init to be a Expression')
+        self.id = id
+        self.type_decl = type_decl
+        self.init = init
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield self.init
+
+    def children(self):
+        children = []
+        children.append(('init', self.init))
+        return children
+
+
+class Program(Node):
+    """ Constructor(Program, [Field(class, classes, seq=True)])
+    """
+    __slots__ = ('classes', 'loc')
+    _fields = ('classes',)
+    attributes = ()
+    node_type = 'Program'
+    kind = 23
+
+    def __init__(self, classes, loc=None):
+        _check_array(classes, 'Program', 'classes', loc)
+        for item in classes:
+            if not isinstance(item, Class):
+                raise ASTError('Program expects classes to be an array of Class')
+        self.classes = classes
+        self.loc = loc
+
+    def iter_child_nodes(self):
+        yield from self.classes
+
+    def children(self):
+        children = []
+        children.extend(
+            ('classes[%d]' % i, node) for i, node in enumerate(self.classes))
+        return children
+
+
+# Names and classes of the concrete node types, indexed by kind.
+node_types = (
+    'Case',
+    'Class',
+    'Assign',
+    'StaticDispatch',
+    'Dispatch',
+    'Cond',
+    'Loop',
+    'Typcase',
+    'Block',
+    'Let',
+    'BinaryOp',
+    'UnaryOp',
+    'IntConst',
+    'BoolConst',
+    'StringConst',
+    'New',
+    'IsVoid',
+    'NoExpr',
+    'Obj',
+    'Method',
+    'Attr',
+    'Formal',
+    'Letinit',
+    'Program',
+)
+
+node_classes = (
+    Case,
+    Class,
+    Assign,
+    StaticDispatch,
+    Dispatch,
+    Cond,
+    Loop,
+    Typcase,
+    Block,
+    Let,
+    BinaryOp,
+    UnaryOp,
+    IntConst,
+    BoolConst,
+    StringConst,
+    New,
+    IsVoid,
+    NoExpr,
+    Obj,
+    Method,
+    Attr,
+    Formal,
+    Letinit,
+    Program,
+)
+
+
+class NodeVisitor:
+    """ Base for visitors of these ASTs. To create a visitor, inherit from
+        NodeVisitor and define visit_Type methods for visiting nodes of type
+        Type; nodes without such a method are handled by visit_children,
+        which visits all their children.
+
+        visit dispatches on node.kind through a table of methods computed once
+        per visitor class, rather than looking the method up by name for each
+        node. The table is fetched on the first visit, so subclasses don't
+        have to call NodeVisitor.__init__.
+    """
+    _dispatch = None
+
+    def visit(self, node):
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self._dispatch = _dispatch_table(type(self))
+        return dispatch[node.kind](self, node)
+
+    def visit_children(self, node):
+        for child in node.iter_child_nodes():
+            self.visit(child)
+
+_dispatch_tables = {}
+
+def _dispatch_table(cls):
+    table = _dispatch_tables.get(cls)
+    if table is None:
+        table = _dispatch_tables[cls] = [
+            getattr(cls, 'visit_' + node_class.node_type, cls.visit_children)
+            for node_class in node_classes]
+    return table
+
+
+#
+#-------------------- Serialization --------------------
+#
+
+def deserialize(data):
+    """ Decode an AST from the compact binary form produced by serialize() in
+        the JS AST module generated from the same ASDL, and return its root
+        node. data is a bytes-like object.
+    """
+    r = _Reader(data)
+    if bytes(r.data[:len(_MAGIC)]) != _MAGIC:
+        raise ASTError('Not a serialized AST')
+    r.pos = len(_MAGIC)
+    version = r.uint()
+    if version != _FORMAT_VERSION:
+        raise ASTError('Unsupported serialized AST version %s' % version)
+    if r.uint() != schema_id:
+        raise ASTError('Serialized AST was built from a different schema')
+    for _ in range(r.uint()):
+        length = r.uint()
+        if r.pos + length > len(r.data):
+            raise ASTError('Truncated serialized AST')
+        try:
+            r.strings.append(str(r.data[r.pos:r.pos + length], 'utf-8'))
+        except UnicodeDecodeError:
+            raise ASTError('Invalid UTF-8 string in serialized AST')
+        r.pos += length
+    return r.node()
+
+_MAGIC = b'CAST'
+_FORMAT_VERSION = 1
+
+class _Reader:
+    __slots__ = ('data', 'pos', 'strings')
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+        self.strings = []
+
+    def byte(self):
+        try:
+            b = self.data[self.pos]
+        except IndexError:
+            raise ASTError('Truncated serialized AST')
+        self.pos += 1
+        return b
+
+    def uint(self):
+        v = shift = 0
+        while True:
+            b = self.byte()
+            v |= (b & 127) << shift
+            if not b & 128:
+                return v
+            shift += 7
+
+    def int(self):
+        v = self.uint()
+        return v >> 1 if v % 2 == 0 else -((v + 1) >> 1)
+
+    def boolean(self):
+        return self.byte() != 0
+
+    def string(self):
+        index = self.uint()
+        if index == 0:
+            return None
+        if index > len(self.strings):
+            raise ASTError('Unknown string index %s' % (index - 1))
+        return self.strings[index - 1]
+
+    def node(self):
+        """ Read a node and its whole subtree. The nodes being read are kept
+            on an explicit stack of _Frames rather than on the Python stack,
+            so that deep trees (such as long chains of binary operators) don't
+            run into the recursion limit.
+        """
+        stack = []
+        frame = None
+        while True:
+            # Open a node: read its kind and loc, and then either the whole
+            # node if it has no node fields, or push its frame
+            tag = self.uint()
+            if tag == 0:
+                value = None
+            elif tag > len(node_classes):
+                raise ASTError('Unknown node kind %s' % (tag - 1))
+            else:
+                loc = self.uint()
+                loc = None if loc == 0 else loc - 1
+                kind = tag - 1
+                if _leaf_kinds[kind]:
+                    # No node fields: read the node at once
+                    args = [[read(self) for _ in range(self.uint())] if seq
+                            else read(self)
+                            for read, seq in _field_readers[kind]]
+                    args.append(loc)
+                    value = node_classes[kind](*args)
+                else:
+                    if frame is not None:
+                        stack.append(frame)
+                    frame = _Frame(kind, loc)
+                    value = _PENDING
+
+            # Read the fields of the innermost open node up to its next node
+            # field. value is a node (or None) read for the node field frame
+            # waits for, or _PENDING.
+            while True:
+                if value is not _PENDING:
+                    if frame is None:
+                        return value
+                    if frame.items is not None:
+                        frame.items.append(value)
+                        frame.left -= 1
+                    else:
+                        frame.args.append(value)
+                        frame.index += 1
+                    value = _PENDING
+                if frame.items is not None:
+                    if frame.left:
+                        break
+                    frame.args.append(frame.items)
+                    frame.items = None
+                    frame.index += 1
+                    continue
+                layout = frame.layout
+                if frame.index == len(layout):
+                    # All the fields are read: create the node, and deliver it
+                    # to its parent
+                    frame.args.append(frame.loc)
+                    value = node_classes[frame.kind](*frame.args)
+                    frame = stack.pop() if stack else None
+                    continue
+                read, seq = layout[frame.index]
+                if read is None:
+                    if not seq:
+                        break
+                    frame.items = []
+                    frame.left = self.uint()
+                elif seq:
+                    frame.args.append([read(self) for _ in range(self.uint())])
+                    frame.index += 1
+                else:
+                    frame.args.append(read(self))
+                    frame.index += 1
+
+class _Frame:
+    """ A node being read by _Reader.node: its kind and loc, the readers of
+        its fields (from _field_readers), the values of the fields read so
+        far, and the index of the next field. While a sequence of nodes is
+        read, items holds the nodes read so far and left the number of nodes
+        still to read.
+    """
+    __slots__ = ('kind', 'loc', 'layout', 'args', 'index', 'items', 'left')
+
+    def __init__(self, kind, loc):
+        self.kind = kind
+        self.loc = loc
+        self.layout = _field_readers[kind]
+        self.args = []
+        self.index = 0
+        self.items = None
+        self.left = 0
+
+# The value of a node field while it's being read
+_PENDING = object()
+
+schema_id = 1613439618
+
+# The fields of each node type, indexed by kind, as the _Reader method reading
+# a field and whether the field is a sequence.
+_layouts = (
+    # Case
+    (('string', False), ('string', False), ('node', False)),
+    # Class
+    (('string', False), ('string', False), ('node', True)),
+    # Assign
+    (('string', False), ('node', False)),
+    # StaticDispatch
+    (('node', False), ('string', False), ('string', False), ('node', True)),
+    # Dispatch
+    (('node', False), ('string', False), ('node', True)),
+    # Cond
+    (('node', False), ('node', False), ('node', False)),
+    # Loop
+    (('node', False), ('node', False)),
+    # Typcase
+    (('node', False), ('node', True)),
+    # Block
+    (('node', True),),
+    # Let
+    (('node', True), ('node', False)),
+    # BinaryOp
+    (('string', False), ('node', False), ('node', False)),
+    # UnaryOp
+    (('string', False), ('node', False)),
+    # IntConst
+    (('int', False),),
+    # BoolConst
+    (('boolean', False),),
+    # StringConst
+    (('string', False),),
+    # New
+    (('string', False),),
+    # IsVoid
+    (('node', False),),
+    # NoExpr
+    (),
+    # Obj
+    (('string', False),),
+    # Method
+    (('string', False), ('node', True), ('string', False), ('node', False)),
+    # Attr
+    (('string', False), ('string', False), ('node', False)),
+    # Formal
+    (('string', False), ('string', False)),
+    # Letinit
+    (('string', False), ('string', False), ('node', False)),
+    # Program
+    (('node', True),),
+)
+
+# _layouts with the _Reader methods reading the fields, None for nodes
+_field_readers = tuple(
+    tuple((None if method == 'node' else getattr(_Reader, method), seq)
+          for method, seq in layout)
+    for layout in _layouts)
+
+# Whether the nodes of each kind have no node fields, indexed by kind
+_leaf_kinds = tuple(
+    all(method != 'node' for method, _ in layout) for layout in _layouts)
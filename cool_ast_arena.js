@@ -0,0 +1,910 @@
+//------------------------------------------------------------------------------
+// Arena-backed AST for Cool.
+// NOTE: this code is auto-generated from the ASDL definition of the AST. Do
+//       not edit it directly.
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+
+'use strict';
+
+var object_ast = require('./cool_ast');
+
+var ASTError = exports.ASTError = object_ast.ASTError;
+
+// An Arena stores AST nodes in typed arrays instead of one JS object per node.
+// A node is an integer handle into the arena's columns: its kind (the same
+// kinds as in the object representation), its loc and one slot per field.
+// Sequence fields take two slots, holding the start and the length of a range
+// in the arena's shared child array. Identifiers and strings are interned in
+// the arena's string table and slots hold their index. Null nodes, identifiers
+// and strings are stored as -1. Ints and locs are stored as is, and have to be
+// 32-bit integers; the smallest one is reserved for null ints and locs, and the
+// next one for undefined locs.
+//
+// Arena has the same interface as the builder of the object representation:
+// arena.Obj(name, loc) creates an Obj node and returns its handle,
+// arena.name(handle) reads the name field of a node, and so on. Sequence
+// fields are passed to constructors and returned from accessors as arrays of
+// handles.
+var Arena = exports.Arena = function(capacity) {
+  capacity = capacity || 1024;
+  this.size = 0;
+  this.strings = [];
+  this._string_index = Object.create(null);
+  this._child = new Int32Array(capacity);
+  this._nchild = 0;
+  this._kinds = new Uint8Array(capacity);
+  this._locs = new Int32Array(capacity);
+  this._s0 = new Int32Array(capacity);
+  this._s1 = new Int32Array(capacity);
+  this._s2 = new Int32Array(capacity);
+  this._s3 = new Int32Array(capacity);
+  this._s4 = new Int32Array(capacity);
+  this._s5 = new Int32Array(capacity);
+}
+
+Arena.prototype._alloc = function(kind, loc) {
+  if (loc !== undefined && loc !== null) {
+    _check_int32(loc, node_types[kind], 'loc', _NO_LOC);
+  }
+  if (this.size === this._kinds.length) {
+    this._grow();
+  }
+  var handle = this.size++;
+  this._kinds[handle] = kind;
+  this._locs[handle] = loc === undefined ? _NO_LOC :
+                       loc === null ? _NULL_INT : loc;
+  return handle;
+}
+
+var _NULL_INT = -0x80000000;
+var _NO_LOC = -0x7fffffff;
+
+// Check that v is an integer storable in an Int32Array, and greater than min.
+var _check_int32 = function(v, who, what, min) {
+  if ((v | 0) !== v || v <= min) {
+    throw new ASTError(who + ' can\'t store ' + what + ' ' + v +
+                       ' in an arena: not a 32-bit integer');
+  }
+}
+
+Arena.prototype._grow = function() {
+  var capacity = this._kinds.length * 2;
+  this._kinds = _resized(this._kinds, capacity);
+  this._locs = _resized(this._locs, capacity);
+  this._s0 = _resized(this._s0, capacity);
+  this._s1 = _resized(this._s1, capacity);
+  this._s2 = _resized(this._s2, capacity);
+  this._s3 = _resized(this._s3, capacity);
+  this._s4 = _resized(this._s4, capacity);
+  this._s5 = _resized(this._s5, capacity);
+}
+
+var _resized = function(array, capacity) {
+  var resized = new array.constructor(capacity);
+  resized.set(array);
+  return resized;
+}
+
+Arena.prototype._intern = function(s) {
+  if (s === null) {
+    return -1;
+  }
+  var index = this._string_index[s];
+  if (index === undefined) {
+    index = this._string_index[s] = this.strings.length;
+    this.strings.push(s);
+  }
+  return index;
+}
+
+Arena.prototype._string = function(index) {
+  return index === -1 ? null : this.strings[index];
+}
+
+// Append values to the child array and return the start of their range.
+Arena.prototype._push_values = function(values) {
+  var start = this._nchild;
+  var end = start + values.length;
+  if (end > this._child.length) {
+    this._child = _resized(this._child, Math.max(end, this._child.length * 2));
+  }
+  for (var i = 0; i < values.length; i++) {
+    this._child[start + i] = values[i];
+  }
+  this._nchild = end;
+  return start;
+}
+
+Arena.prototype._push_ints = function(values, who, what) {
+  for (var i = 0; i < values.length; i++) {
+    _check_int32(values[i], who, what, -Infinity);
+  }
+  return this._push_values(values);
+}
+
+Arena.prototype._push_strings = function(values) {
+  var indices = [];
+  for (var i = 0; i < values.length; i++) {
+    indices.push(this._intern(values[i]));
+  }
+  return this._push_values(indices);
+}
+
+Arena.prototype._slice = function(start, length) {
+  var values = [];
+  for (var i = start; i < start + length; i++) {
+    values.push(this._child[i]);
+  }
+  return values;
+}
+
+Arena.prototype._string_slice = function(start, length) {
+  var values = [];
+  for (var i = start; i < start + length; i++) {
+    values.push(this.strings[this._child[i]]);
+  }
+  return values;
+}
+
+Arena.prototype._bool_slice = function(start, length) {
+  var values = [];
+  for (var i = start; i < start + length; i++) {
+    values.push(this._child[i] !== 0);
+  }
+  return values;
+}
+
+var _nullable = function(handle) {
+  return handle === -1 ? null : handle;
+}
+
+var _nullable_int = function(v) {
+  return v === _NULL_INT ? null : v;
+}
+
+var _no_field = function(arena, handle, field) {
+  throw new ASTError(arena.node_type(handle) + ' has no field ' + field);
+}
+
+Arena.prototype.kind = function(handle) {
+  return this._kinds[handle];
+}
+
+Arena.prototype.loc = function(handle) {
+  var loc = this._locs[handle];
+  return loc === _NO_LOC ? undefined : loc === _NULL_INT ? null : loc;
+}
+
+Arena.prototype.node_type = function(handle) {
+  return node_types[this._kinds[handle]];
+}
+
+// fromObject(node) copies the tree rooted at an object node into the arena
+// and returns the handle of its root. toObject(handle) does the opposite.
+Arena.prototype.fromObject = function(node) {
+  if (node === null) {
+    return -1;
+  }
+  switch (node.kind) {
+    case 0:
+      return this.Case(node.name, node.type_decl, this.fromObject(node.expr), node.loc);
+    case 1:
+      return this.Class(node.name, node.parent, this._fromObjects(node.features), node.loc);
+    case 2:
+      return this.Assign(node.name, this.fromObject(node.expr), node.loc);
+    case 3:
+      return this.StaticDispatch(this.fromObject(node.expr), node.type_name, node.name, this._fromObjects(node.actual), node.loc);
+    case 4:
+      return this.Dispatch(this.fromObject(node.expr), node.name, this._fromObjects(node.actual), node.loc);
+    case 5:
+      return this.Cond(this.fromObject(node.pred), this.fromObject(node.then_exp), this.fromObject(node.else_exp), node.loc);
+    case 6:
+      return this.Loop(this.fromObject(node.pred), this.fromObject(node.body), node.loc);
+    case 7:
+      return this.Typcase(this.fromObject(node.expr), this._fromObjects(node.cases), node.loc);
+    case 8:
+      return this.Block(this._fromObjects(node.body), node.loc);
+    case 9:
+      return this.Let(this._fromObjects(node.init), this.fromObject(node.body), node.loc);
+    case 10:
+      return this.BinaryOp(node.op, this.fromObject(node.left), this.fromObject(node.right), node.loc);
+    case 11:
+      return this.UnaryOp(node.op, this.fromObject(node.expr), node.loc);
+    case 12:
+      return this.IntConst(node.token, node.loc);
+    case 13:
+      return this.BoolConst(node.value, node.loc);
+    case 14:
+      return this.StringConst(node.str, node.loc);
+    case 15:
+      return this.New(node.type_name, node.loc);
+    case 16:
+      return this.IsVoid(this.fromObject(node.expr), node.loc);
+    case 17:
+      return this.NoExpr(node.loc);
+    case 18:
+      return this.Obj(node.name, node.loc);
+    case 19:
+      return this.Method(node.name, this._fromObjects(node.formals), node.return_type, this.fromObject(node.expr), node.loc);
+    case 20:
+      return this.Attr(node.name, node.type_decl, this.fromObject(node.init), node.loc);
+    case 21:
+      return this.Formal(node.name, node.type_decl, node.loc);
+    case 22:
+      return this.Letinit(node.id, node.type_decl, this.fromObject(node.init), node.loc);
+    case 23:
+      return this.Program(this._fromObjects(node.classes), node.loc);
+  }
+  throw new ASTError('Unknown node kind ' + node.kind);
+}
+
+Arena.prototype._fromObjects = function(nodes) {
+  var handles = [];
+  for (var i = 0; i < nodes.length; i++) {
+    handles.push(this.fromObject(nodes[i]));
+  }
+  return handles;
+}
+
+Arena.prototype.toObject = function(handle) {
+  if (handle === -1) {
+    return null;
+  }
+  var loc = this.loc(handle);
+  switch (this._kinds[handle]) {
+    case 0:
+      return new object_ast.Case(this._string(this._s0[handle]), this._string(this._s1[handle]), this.toObject(this._s2[handle]), loc);
+    case 1:
+      return new object_ast.Class(this._string(this._s0[handle]), this._string(this._s1[handle]), this._toObjects(this._slice(this._s2[handle], this._s3[handle])), loc);
+    case 2:
+      return new object_ast.Assign(this._string(this._s0[handle]), this.toObject(this._s1[handle]), loc);
+    case 3:
+      return new object_ast.StaticDispatch(this.toObject(this._s0[handle]), this._string(this._s1[handle]), this._string(this._s2[handle]), this._toObjects(this._slice(this._s3[handle], this._s4[handle])), loc);
+    case 4:
+      return new object_ast.Dispatch(this.toObject(this._s0[handle]), this._string(this._s1[handle]), this._toObjects(this._slice(this._s2[handle], this._s3[handle])), loc);
+    case 5:
+      return new object_ast.Cond(this.toObject(this._s0[handle]), this.toObject(this._s1[handle]), this.toObject(this._s2[handle]), loc);
+    case 6:
+      return new object_ast.Loop(this.toObject(this._s0[handle]), this.toObject(this._s1[handle]), loc);
+    case 7:
+      return new object_ast.Typcase(this.toObject(this._s0[handle]), this._toObjects(this._slice(this._s1[handle], this._s2[handle])), loc);
+    case 8:
+      return new object_ast.Block(this._toObjects(this._slice(this._s0[handle], this._s1[handle])), loc);
+    case 9:
+      return new object_ast.Let(this._toObjects(this._slice(this._s0[handle], this._s1[handle])), this.toObject(this._s2[handle]), loc);
+    case 10:
+      return new object_ast.BinaryOp(this._string(this._s0[handle]), this.toObject(this._s1[handle]), this.toObject(this._s2[handle]), loc);
+    case 11:
+      return new object_ast.UnaryOp(this._string(this._s0[handle]), this.toObject(this._s1[handle]), loc);
+    case 12:
+      return new object_ast.IntConst(this._s0[handle], loc);
+    case 13:
+      return new object_ast.BoolConst(this._s0[handle] !== 0, loc);
+    case 14:
+      return new object_ast.StringConst(this._string(this._s0[handle]), loc);
+    case 15:
+      return new object_ast.New(this._string(this._s0[handle]), loc);
+    case 16:
+      return new object_ast.IsVoid(this.toObject(this._s0[handle]), loc);
+    case 17:
+      return new object_ast.NoExpr(loc);
+    case 18:
+      return new object_ast.Obj(this._string(this._s0[handle]), loc);
+    case 19:
+      return new object_ast.Method(this._string(this._s0[handle]), this._toObjects(this._slice(this._s1[handle], this._s2[handle])), this._string(this._s3[handle]), this.toObject(this._s4[handle]), loc);
+    case 20:
+      return new object_ast.Attr(this._string(this._s0[handle]), this._string(this._s1[handle]), this.toObject(this._s2[handle]), loc);
+    case 21:
+      return new object_ast.Formal(this._string(this._s0[handle]), this._string(this._s1[handle]), loc);
+    case 22:
+      return new object_ast.Letinit(this._string(this._s0[handle]), this._string(this._s1[handle]), this.toObject(this._s2[handle]), loc);
+    case 23:
+      return new object_ast.Program(this._toObjects(this._slice(this._s0[handle], this._s1[handle])), loc);
+  }
+}
+
+Arena.prototype._toObjects = function(handles) {
+  var nodes = [];
+  for (var i = 0; i < handles.length; i++) {
+    nodes.push(this.toObject(handles[i]));
+  }
+  return nodes;
+}
+
+// forEachChild(handle, callback, ctx) calls callback.call(ctx, child, field,
+// index) for each child node of the node, like the forEachChild method of
+// object nodes.
+Arena.prototype.forEachChild = function(handle, callback, ctx) {
+  var start, i;
+  switch (this._kinds[handle]) {
+    case 0:
+      callback.call(ctx, this._s2[handle], 'expr', -1);
+      return;
+    case 1:
+      start = this._s2[handle];
+      for (i = 0; i < this._s3[handle]; i++) {
+        callback.call(ctx, this._child[start + i], 'features', i);
+      }
+      return;
+    case 2:
+      callback.call(ctx, this._s1[handle], 'expr', -1);
+      return;
+    case 3:
+      callback.call(ctx, this._s0[handle], 'expr', -1);
+      start = this._s3[handle];
+      for (i = 0; i < this._s4[handle]; i++) {
+        callback.call(ctx, this._child[start + i], 'actual', i);
+      }
+      return;
+    case 4:
+      callback.call(ctx, this._s0[handle], 'expr', -1);
+      start = this._s2[handle];
+      for (i = 0; i < this._s3[handle]; i++) {
+        callback.call(ctx, this._child[start + i], 'actual', i);
+      }
+      return;
+    case 5:
+      callback.call(ctx, this._s0[handle], 'pred', -1);
+      callback.call(ctx, this._s1[handle], 'then_exp', -1);
+      callback.call(ctx, this._s2[handle], 'else_exp', -1);
+      return;
+    case 6:
+      callback.call(ctx, this._s0[handle], 'pred', -1);
+      callback.call(ctx, this._s1[handle], 'body', -1);
+      return;
+    case 7:
+      callback.call(ctx, this._s0[handle], 'expr', -1);
+      start = this._s1[handle];
+      for (i = 0; i < this._s2[handle]; i++) {
+        callback.call(ctx, this._child[start + i], 'cases', i);
+      }
+      return;
+    case 8:
+      start = this._s0[handle];
+      for (i = 0; i < this._s1[handle]; i++) {
+        callback.call(ctx, this._child[start + i], 'body', i);
+      }
+      return;
+    case 9:
+      start = this._s0[handle];
+      for (i = 0; i < this._s1[handle]; i++) {
+        callback.call(ctx, this._child[start + i], 'init', i);
+      }
+      callback.call(ctx, this._s2[handle], 'body', -1);
+      return;
+    case 10:
+      callback.call(ctx, this._s1[handle], 'left', -1);
+      callback.call(ctx, this._s2[handle], 'right', -1);
+      return;
+    case 11:
+      callback.call(ctx, this._s1[handle], 'expr', -1);
+      return;
+    case 12:
+      return;
+    case 13:
+      return;
+    case 14:
+      return;
+    case 15:
+      return;
+    case 16:
+      callback.call(ctx, this._s0[handle], 'expr', -1);
+      return;
+    case 17:
+      return;
+    case 18:
+      return;
+    case 19:
+      start = this._s1[handle];
+      for (i = 0; i < this._s2[handle]; i++) {
+        callback.call(ctx, this._child[start + i], 'formals', i);
+      }
+      callback.call(ctx, this._s4[handle], 'expr', -1);
+      return;
+    case 20:
+      callback.call(ctx, this._s2[handle], 'init', -1);
+      return;
+    case 21:
+      return;
+    case 22:
+      callback.call(ctx, this._s2[handle], 'init', -1);
+      return;
+    case 23:
+      start = this._s0[handle];
+      for (i = 0; i < this._s1[handle]; i++) {
+        callback.call(ctx, this._child[start + i], 'classes', i);
+      }
+      return;
+  }
+}
+
+//
+//-------------------- Constructors --------------------
+//
+
+// Constructor(Case, [Field(identifier, name), Field(identifier, type_decl), Field(expression, expr)])
+Arena.prototype.Case = function(name, type_decl, expr, loc) {
+  var handle = this._alloc(0, loc);
+  this._s0[handle] = this._intern(name);
+  this._s1[handle] = this._intern(type_decl);
+  this._s2[handle] = expr;
+  return handle;
+}
+
+// Constructor(Class, [Field(identifier, name), Field(identifier, parent, opt=True), Field(feature, features, seq=True)])
+Arena.prototype.Class = function(name, parent, features, loc) {
+  var features_start = this._push_values(features);
+  var handle = this._alloc(1, loc);
+  this._s0[handle] = this._intern(name);
+  this._s1[handle] = this._intern(parent);
+  this._s2[handle] = features_start;
+  this._s3[handle] = features.length;
+  return handle;
+}
+
+// Constructor(Assign, [Field(identifier, name), Field(expression, expr)])
+Arena.prototype.Assign = function(name, expr, loc) {
+  var handle = this._alloc(2, loc);
+  this._s0[handle] = this._intern(name);
+  this._s1[handle] = expr;
+  return handle;
+}
+
+// Constructor(StaticDispatch, [Field(expression, expr), Field(identifier, type_name), Field(identifier, name), Field(expression, actual, seq=True)])
+Arena.prototype.StaticDispatch = function(expr, type_name, name, actual, loc) {
+  var actual_start = this._push_values(actual);
+  var handle = this._alloc(3, loc);
+  this._s0[handle] = expr;
+  this._s1[handle] = this._intern(type_name);
+  this._s2[handle] = this._intern(name);
+  this._s3[handle] = actual_start;
+  this._s4[handle] = actual.length;
+  return handle;
+}
+
+// Constructor(Dispatch, [Field(expression, expr), Field(identifier, name), Field(expression, actual, seq=True)])
+Arena.prototype.Dispatch = function(expr, name, actual, loc) {
+  var actual_start = this._push_values(actual);
+  var handle = this._alloc(4, loc);
+  this._s0[handle] = expr;
+  this._s1[handle] = this._intern(name);
+  this._s2[handle] = actual_start;
+  this._s3[handle] = actual.length;
+  return handle;
+}
+
+// Constructor(Cond, [Field(expression, pred), Field(expression, then_exp), Field(expression, else_exp)])
+Arena.prototype.Cond = function(pred, then_exp, else_exp, loc) {
+  var handle = this._alloc(5, loc);
+  this._s0[handle] = pred;
+  this._s1[handle] = then_exp;
+  this._s2[handle] = else_exp;
+  return handle;
+}
+
+// Constructor(Loop, [Field(expression, pred), Field(expression, body)])
+Arena.prototype.Loop = function(pred, body, loc) {
+  var handle = this._alloc(6, loc);
+  this._s0[handle] = pred;
+  this._s1[handle] = body;
+  return handle;
+}
+
+// Constructor(Typcase, [Field(expression, expr), Field(case, cases, seq=True)])
+Arena.prototype.Typcase = function(expr, cases, loc) {
+  var cases_start = this._push_values(cases);
+  var handle = this._alloc(7, loc);
+  this._s0[handle] = expr;
+  this._s1[handle] = cases_start;
+  this._s2[handle] = cases.length;
+  return handle;
+}
+
+// Constructor(Block, [Field(expression, body, seq=True)])
+Arena.prototype.Block = function(body, loc) {
+  var body_start = this._push_values(body);
+  var handle = this._alloc(8, loc);
+  this._s0[handle] = body_start;
+  this._s1[handle] = body.length;
+  return handle;
+}
+
+// Constructor(Let, [Field(letinit, init, seq=True), Field(expression, body)])
+Arena.prototype.Let = function(init, body, loc) {
+  var init_start = this._push_values(init);
+  var handle = this._alloc(9, loc);
+  this._s0[handle] = init_start;
+  this._s1[handle] = init.length;
+  this._s2[handle] = body;
+  return handle;
+}
+
+// Constructor(BinaryOp, [Field(identifier, op), Field(expression, left), Field(expression, right)])
+Arena.prototype.BinaryOp = function(op, left, right, loc) {
+  var handle = this._alloc(10, loc);
+  this._s0[handle] = this._intern(op);
+  this._s1[handle] = left;
+  this._s2[handle] = right;
+  return handle;
+}
+
+// Constructor(UnaryOp, [Field(identifier, op), Field(expression, expr)])
+Arena.prototype.UnaryOp = function(op, expr, loc) {
+  var handle = this._alloc(11, loc);
+  this._s0[handle] = this._intern(op);
+  this._s1[handle] = expr;
+  return handle;
+}
+
+// Constructor(IntConst, [Field(int, token)])
+Arena.prototype.IntConst = function(token, loc) {
+  _check_int32(token, 'IntConst', 'token', -Infinity);
+  var handle = this._alloc(12, loc);
+  this._s0[handle] = token;
+  return handle;
+}
+
+// Constructor(BoolConst, [Field(boolean, value)])
+Arena.prototype.BoolConst = function(value, loc) {
+  var handle = this._alloc(13, loc);
+  this._s0[handle] = value ? 1 : 0;
+  return handle;
+}
+
+// Constructor(StringConst, [Field(string, str)])
+Arena.prototype.StringConst = function(str, loc) {
+  var handle = this._alloc(14, loc);
+  this._s0[handle] = this._intern(str);
+  return handle;
+}
+
+// Constructor(New, [Field(identifier, type_name)])
+Arena.prototype.New = function(type_name, loc) {
+  var handle = this._alloc(15, loc);
+  this._s0[handle] = this._intern(type_name);
+  return handle;
+}
+
+// Constructor(IsVoid, [Field(expression, expr)])
+Arena.prototype.IsVoid = function(expr, loc) {
+  var handle = this._alloc(16, loc);
+  this._s0[handle] = expr;
+  return handle;
+}
+
+// Constructor(NoExpr, [])
+Arena.prototype.NoExpr = function(loc) {
+  var handle = this._alloc(17, loc);
+  return handle;
+}
+
+// Constructor(Obj, [Field(identifier, name)])
+Arena.prototype.Obj = function(name, loc) {
+  var handle = this._alloc(18, loc);
+  this._s0[handle] = this._intern(name);
+  return handle;
+}
+
+// Constructor(Method, [Field(identifier, name), Field(formal, formals, seq=True), Field(identifier, return_type), Field(expression, expr)])
+Arena.prototype.Method = function(name, formals, return_type, expr, loc) {
+  var formals_start = this._push_values(formals);
+  var handle = this._alloc(19, loc);
+  this._s0[handle] = this._intern(name);
+  this._s1[handle] = formals_start;
+  this._s2[handle] = formals.length;
+  this._s3[handle] = this._intern(return_type);
+  this._s4[handle] = expr;
+  return handle;
+}
+
+// Constructor(Attr, [Field(identifier, name), Field(identifier, type_decl), Field(expression, init)])
+Arena.prototype.Attr = function(name, type_decl, init, loc) {
+  var handle = this._alloc(20, loc);
+  this._s0[handle] = this._intern(name);
+  this._s1[handle] = this._intern(type_decl);
+  this._s2[handle] = init;
+  return handle;
+}
+
+// Constructor(Formal, [Field(identifier, name), Field(identifier, type_decl)])
+Arena.prototype.Formal = function(name, type_decl, loc) {
+  var handle = this._alloc(21, loc);
+  this._s0[handle] = this._intern(name);
+  this._s1[handle] = this._intern(type_decl);
+  return handle;
+}
+
+// Constructor(Letinit, [Field(identifier, id), Field(identifier, type_decl), Field(expression, init)])
+Arena.prototype.Letinit = function(id, type_decl, init, loc) {
+  var handle = this._alloc(22, loc);
+  this._s0[handle] = this._intern(id);
+  this._s1[handle] = this._intern(type_decl);
+  this._s2[handle] = init;
+  return handle;
+}
+
+// Constructor(Program, [Field(class, classes, seq=True)])
+Arena.prototype.Program = function(classes, loc) {
+  var classes_start = this._push_values(classes);
+  var handle = this._alloc(23, loc);
+  this._s0[handle] = classes_start;
+  this._s1[handle] = classes.length;
+  return handle;
+}
+
+//
+//-------------------- Field accessors --------------------
+//
+
+Arena.prototype.actual = function(handle) {
+  switch (this._kinds[handle]) {
+    case 3:
+      return this._slice(this._s3[handle], this._s4[handle]);
+    case 4:
+      return this._slice(this._s2[handle], this._s3[handle]);
+  }
+  return _no_field(this, handle, 'actual');
+}
+
+Arena.prototype.body = function(handle) {
+  switch (this._kinds[handle]) {
+    case 6:
+      return this._s1[handle];
+    case 8:
+      return this._slice(this._s0[handle], this._s1[handle]);
+    case 9:
+      return this._s2[handle];
+  }
+  return _no_field(this, handle, 'body');
+}
+
+Arena.prototype.cases = function(handle) {
+  switch (this._kinds[handle]) {
+    case 7:
+      return this._slice(this._s1[handle], this._s2[handle]);
+  }
+  return _no_field(this, handle, 'cases');
+}
+
+Arena.prototype.classes = function(handle) {
+  switch (this._kinds[handle]) {
+    case 23:
+      return this._slice(this._s0[handle], this._s1[handle]);
+  }
+  return _no_field(this, handle, 'classes');
+}
+
+Arena.prototype.else_exp = function(handle) {
+  switch (this._kinds[handle]) {
+    case 5:
+      return this._s2[handle];
+  }
+  return _no_field(this, handle, 'else_exp');
+}
+
+Arena.prototype.expr = function(handle) {
+  switch (this._kinds[handle]) {
+    case 0:
+      return this._s2[handle];
+    case 2:
+      return this._s1[handle];
+    case 3:
+      return this._s0[handle];
+    case 4:
+      return this._s0[handle];
+    case 7:
+      return this._s0[handle];
+    case 11:
+      return this._s1[handle];
+    case 16:
+      return this._s0[handle];
+    case 19:
+      return this._s4[handle];
+  }
+  return _no_field(this, handle, 'expr');
+}
+
+Arena.prototype.features = function(handle) {
+  switch (this._kinds[handle]) {
+    case 1:
+      return this._slice(this._s2[handle], this._s3[handle]);
+  }
+  return _no_field(this, handle, 'features');
+}
+
+Arena.prototype.formals = function(handle) {
+  switch (this._kinds[handle]) {
+    case 19:
+      return this._slice(this._s1[handle], this._s2[handle]);
+  }
+  return _no_field(this, handle, 'formals');
+}
+
+Arena.prototype.id = function(handle) {
+  switch (this._kinds[handle]) {
+    case 22:
+      return this._string(this._s0[handle]);
+  }
+  return _no_field(this, handle, 'id');
+}
+
+Arena.prototype.init = function(handle) {
+  switch (this._kinds[handle]) {
+    case 9:
+      return this._slice(this._s0[handle], this._s1[handle]);
+    case 20:
+      return this._s2[handle];
+    case 22:
+      return this._s2[handle];
+  }
+  return _no_field(this, handle, 'init');
+}
+
+Arena.prototype.left = function(handle) {
+  switch (this._kinds[handle]) {
+    case 10:
+      return this._s1[handle];
+  }
+  return _no_field(this, handle, 'left');
+}
+
+Arena.prototype.name = function(handle) {
+  switch (this._kinds[handle]) {
+    case 0:
+      return this._string(this._s0[handle]);
+    case 1:
+      return this._string(this._s0[handle]);
+    case 2:
+      return this._string(this._s0[handle]);
+    case 3:
+      return this._string(this._s2[handle]);
+    case 4:
+      return this._string(this._s1[handle]);
+    case 18:
+      return this._string(this._s0[handle]);
+    case 19:
+      return this._string(this._s0[handle]);
+    case 20:
+      return this._string(this._s0[handle]);
+    case 21:
+      return this._string(this._s0[handle]);
+  }
+  return _no_field(this, handle, 'name');
+}
+
+Arena.prototype.op = function(handle) {
+  switch (this._kinds[handle]) {
+    case 10:
+      return this._string(this._s0[handle]);
+    case 11:
+      return this._string(this._s0[handle]);
+  }
+  return _no_field(this, handle, 'op');
+}
+
+Arena.prototype.parent = function(handle) {
+  switch (this._kinds[handle]) {
+    case 1:
+      return this._string(this._s1[handle]);
+  }
+  return _no_field(this, handle, 'parent');
+}
+
+Arena.prototype.pred = function(handle) {
+  switch (this._kinds[handle]) {
+    case 5:
+      return this._s0[handle];
+    case 6:
+      return this._s0[handle];
+  }
+  return _no_field(this, handle, 'pred');
+}
+
+Arena.prototype.return_type = function(handle) {
+  switch (this._kinds[handle]) {
+    case 19:
+      return this._string(this._s3[handle]);
+  }
+  return _no_field(this, handle, 'return_type');
+}
+
+Arena.prototype.right = function(handle) {
+  switch (this._kinds[handle]) {
+    case 10:
+      return this._s2[handle];
+  }
+  return _no_field(this, handle, 'right');
+}
+
+Arena.prototype.str = function(handle) {
+  switch (this._kinds[handle]) {
+    case 14:
+      return this._string(this._s0[handle]);
+  }
+  return _no_field(this, handle, 'str');
+}
+
+Arena.prototype.then_exp = function(handle) {
+  switch (this._kinds[handle]) {
+    case 5:
+      return this._s1[handle];
+  }
+  return _no_field(this, handle, 'then_exp');
+}
+
+Arena.prototype.token = function(handle) {
+  switch (this._kinds[handle]) {
+    case 12:
+      return this._s0[handle];
+  }
+  return _no_field(this, handle, 'token');
+}
+
+Arena.prototype.type_decl = function(handle) {
+  switch (this._kinds[handle]) {
+    case 0:
+      return this._string(this._s1[handle]);
+    case 20:
+      return this._string(this._s1[handle]);
+    case 21:
+      return this._string(this._s1[handle]);
+    case 22:
+      return this._string(this._s1[handle]);
+  }
+  return _no_field(this, handle, 'type_decl');
+}
+
+Arena.prototype.type_name = function(handle) {
+  switch (this._kinds[handle]) {
+    case 3:
+      return this._string(this._s1[handle]);
+    case 15:
+      return this._string(this._s0[handle]);
+  }
+  return _no_field(this, handle, 'type_name');
+}
+
+Arena.prototype.value = function(handle) {
+  switch (this._kinds[handle]) {
+    case 13:
+      return this._s0[handle] !== 0;
+  }
+  return _no_field(this, handle, 'value');
+}
+
+// Names of the concrete node types, indexed by kind.
+var node_types = exports.node_types = [
+  'Case', 'Class', 'Assign', 'StaticDispatch', 'Dispatch', 'Cond', 'Loop',
+  'Typcase', 'Block', 'Let', 'BinaryOp', 'UnaryOp', 'IntConst', 'BoolConst',
+  'StringConst', 'New', 'IsVoid', 'NoExpr', 'Obj', 'Method', 'Attr', 'Formal',
+  'Letinit', 'Program'];
+
+Arena.prototype.kinds = {
+  Case: 0,
+  Class: 1,
+  Assign: 2,
+  StaticDispatch: 3,
+  Dispatch: 4,
+  Cond: 5,
+  Loop: 6,
+  Typcase: 7,
+  Block: 8,
+  Let: 9,
+  BinaryOp: 10,
+  UnaryOp: 11,
+  IntConst: 12,
+  BoolConst: 13,
+  StringConst: 14,
+  New: 15,
+  IsVoid: 16,
+  NoExpr: 17,
+  Obj: 18,
+  Method: 19,
+  Attr: 20,
+  Formal: 21,
+  Letinit: 22,
+  Program: 23
+};
@@ -0,0 +1,50 @@
+//------------------------------------------------------------------------------
+// AST for Cool, built at load time from the table below by the shared runtime.
+// NOTE: this code is auto-generated from the ASDL definition of the AST. Do
+//       not edit it directly.
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+
+'use strict';
+
+require('./asdl_runtime').define(exports, {
+  schema_id: 1613439618,
+  profile: 'debug',
+  intern: true,
+  abstract: ['Expression', 'Feature'],
+  classes: [
+    ['Case', 'Node', 'identifier name', 'identifier type_decl',
+     'Expression expr'],
+    ['Class', 'Node', 'identifier name', 'identifier? parent',
+     'Feature* features'],
+    ['Assign', 'Expression', 'identifier name', 'Expression expr'],
+    ['StaticDispatch', 'Expression', 'Expression expr', 'identifier type_name',
+     'identifier name', 'Expression* actual'],
+    ['Dispatch', 'Expression', 'Expression expr', 'identifier name',
+     'Expression* actual'],
+    ['Cond', 'Expression', 'Expression pred', 'Expression then_exp',
+     'Expression else_exp'],
+    ['Loop', 'Expression', 'Expression pred', 'Expression body'],
+    ['Typcase', 'Expression', 'Expression expr', 'Case* cases'],
+    ['Block', 'Expression', 'Expression* body'],
+    ['Let', 'Expression', 'Letinit* init', 'Expression body'],
+    ['BinaryOp', 'Expression', 'identifier op', 'Expression left',
+     'Expression right'],
+    ['UnaryOp', 'Expression', 'identifier op', 'Expression expr'],
+    ['IntConst', 'Expression', 'int token'],
+    ['BoolConst', 'Expression', 'boolean value'],
+    ['StringConst', 'Expression', 'string str'],
+    ['New', 'Expression', 'identifier type_name'],
+    ['IsVoid', 'Expression', 'Expression expr'],
+    ['NoExpr', 'Expression'],
+    ['Obj', 'Expression', 'identifier name'],
+    ['Method', 'Feature', 'identifier name', 'Formal* formals',
+     'identifier return_type', 'Expression expr'],
+    ['Attr', 'Feature', 'identifier name', 'identifier type_decl',
+     'Expression init'],
+    ['Formal', 'Node', 'identifier name', 'identifier type_decl'],
+    ['Letinit', 'Node', 'identifier id', 'identifier type_decl',
+     'Expression init'],
+    ['Program', 'Node', 'Class* classes']]});
@@ -0,0 +1,455 @@
+//------------------------------------------------------------------------------
+// Lexer for Cool.
+// NOTE: this code is auto-generated from the token spec in cool_tokens.json.
+//       Do not edit it directly.
+//
+// Splits a buffer of source code into a stream of tokens, by running a
+// minimized DFA over classes of chars. Has the same interface as lexer.js.
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+//
+// Rules, by priority:
+//  0: line comment (skip)
+//  1: block comment (block_comment)
+//  2: CLASS (token)
+//  3: ELSE (token)
+//  4: FI (token)
+//  5: IF (token)
+//  6: IN (token)
+//  7: INHERITS (token)
+//  8: LET (token)
+//  9: LOOP (token)
+//  10: POOL (token)
+//  11: THEN (token)
+//  12: WHILE (token)
+//  13: CASE (token)
+//  14: ESAC (token)
+//  15: OF (token)
+//  16: NEW (token)
+//  17: ISVOID (token)
+//  18: NOT (token)
+//  19: TRUE (token)
+//  20: FALSE (token)
+//  21: L_PAREN (token)
+//  22: R_PAREN (token)
+//  23: MULTIPLY (token)
+//  24: PLUS (token)
+//  25: COMMA (token)
+//  26: MINUS (token)
+//  27: PERIOD (token)
+//  28: DIVIDE (token)
+//  29: COLON (token)
+//  30: SEMI (token)
+//  31: LE (token)
+//  32: ASSIGN_ARROW (token)
+//  33: LEQ (token)
+//  34: EQ (token)
+//  35: CASE_ARROW (token)
+//  36: AT (token)
+//  37: L_BRACKET (token)
+//  38: R_BRACKET (token)
+//  39: L_BRACE (token)
+//  40: R_BRACE (token)
+//  41: TILDE (token)
+//  42: STRING (string)
+//  43: unterminated string (unterminated_string)
+//  44: TYPE (token)
+//  45: IDENTIFIER (token)
+//  46: NUMBER (token)
+//  47: whitespace (skip)
+//  48: newline (newline)
+//
+// 192 NFA states, 104 DFA states, 98 after minimization; 44 char classes.
+//
+
+// Actions of the rules
+var _TOKEN = 0;  // Return a token for the match
+var _SKIP = 1;  // Skip the match
+var _NEWLINE = 2;  // Skip the match and count a line
+var _BLOCK_COMMENT = 3;  // Skip a block comment, whose opener was matched
+var _STRING = 4;  // Return a string token, reporting unescaped newlines
+var _UNTERMINATED_STRING = 5;  // Report an unterminated string
+
+var _RULE_NAMES = [
+  'line comment', 'block comment', 'CLASS', 'ELSE', 'FI', 'IF', 'IN',
+  'INHERITS', 'LET', 'LOOP', 'POOL', 'THEN', 'WHILE', 'CASE', 'ESAC', 'OF',
+  'NEW', 'ISVOID', 'NOT', 'TRUE', 'FALSE', 'L_PAREN', 'R_PAREN', 'MULTIPLY',
+  'PLUS', 'COMMA', 'MINUS', 'PERIOD', 'DIVIDE', 'COLON', 'SEMI', 'LE',
+  'ASSIGN_ARROW', 'LEQ', 'EQ', 'CASE_ARROW', 'AT', 'L_BRACKET', 'R_BRACKET',
+  'L_BRACE', 'R_BRACE', 'TILDE', 'STRING', 'unterminated string', 'TYPE',
+  'IDENTIFIER', 'NUMBER', 'whitespace', 'newline'];
+var _RULE_ACTIONS = new Uint8Array([
+  1, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4, 5, 0, 0, 0, 1, 2]);
+
+// The char class of each ASCII char; all the other chars are in class 0.
+var _NUM_CLASSES = 44;
+var _CLASS = new Uint8Array([
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 2, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 1, 0, 3, 0, 0, 0, 0, 0, 4, 5, 6, 7, 8, 9, 10, 11, 12, 12,
+  12, 12, 12, 12, 12, 12, 12, 12, 13, 14, 15, 16, 17, 0, 18, 19, 19, 19, 19, 19,
+  19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19,
+  19, 19, 20, 21, 22, 0, 23, 0, 24, 23, 25, 26, 27, 28, 23, 29, 30, 23, 23, 31,
+  23, 32, 33, 34, 23, 35, 36, 37, 38, 39, 40, 23, 23, 23, 41, 0, 42, 43, 0]);
+
+// The next state of state s on a char of class c is
+// _NEXT[s * _NUM_CLASSES + c]. State 0 is the dead state and state 1 the
+// start state. _ACCEPT holds the rule accepted in each state, or -1.
+var _NEXT = new Uint8Array([
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 3, 4, 5, 6, 7, 8,
+  9, 10, 11, 12, 13, 14, 15, 16, 17, 0, 18, 19, 20, 0, 21, 22, 22, 23, 22, 24,
+  25, 22, 26, 27, 28, 29, 30, 22, 22, 31, 22, 22, 32, 33, 34, 35, 0, 2, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 36, 36, 36, 37, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36,
+  36, 36, 36, 36, 36, 38, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36,
+  36, 36, 36, 36, 36, 36, 36, 36, 36, 0, 0, 0, 0, 0, 0, 39, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 40, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 13, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 41, 0, 0, 0, 0, 0, 0, 42, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 43, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 19, 0, 0, 0, 0, 0, 0, 19,
+  0, 0, 0, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19, 19,
+  19, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22,
+  0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 44, 22, 22, 22, 22, 22, 22, 45, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0,
+  0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 46, 22, 22, 22, 22,
+  47, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0,
+  0, 0, 0, 22, 0, 0, 0, 22, 48, 22, 22, 22, 22, 22, 49, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0,
+  0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 50, 22, 22, 22, 51, 22, 22, 22, 52, 22,
+  22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0,
+  22, 0, 0, 0, 22, 22, 22, 22, 53, 22, 22, 22, 22, 22, 54, 22, 22, 22, 22, 22,
+  22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22,
+  0, 0, 0, 22, 22, 22, 22, 55, 22, 22, 22, 22, 22, 56, 22, 22, 22, 22, 22, 22,
+  22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0,
+  0, 0, 22, 22, 22, 22, 22, 57, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0,
+  0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 58, 22, 22, 22, 22, 22, 22, 22, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0,
+  22, 22, 22, 22, 22, 22, 59, 22, 22, 22, 22, 22, 60, 22, 22, 22, 22, 22, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22,
+  22, 22, 22, 22, 22, 61, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 36, 36, 36, 37, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36,
+  36, 36, 36, 38, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36,
+  36, 36, 36, 36, 36, 36, 36, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36,
+  36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36, 36,
+  36, 36, 36, 36, 36, 36, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  40, 40, 0, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
+  40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40, 40,
+  40, 40, 40, 40, 40, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0,
+  0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 62, 22,
+  22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0,
+  22, 0, 0, 0, 22, 63, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22,
+  0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 64, 22, 22, 22,
+  22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0,
+  0, 0, 22, 65, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0,
+  0, 22, 22, 22, 22, 22, 22, 22, 22, 66, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22,
+  22, 22, 22, 22, 67, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 68, 22, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 69, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 70, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 71, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 72, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 73, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 74, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 75, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22,
+  0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 76, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0,
+  0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 77, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0,
+  0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 78,
+  22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0,
+  0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 79, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0,
+  22, 0, 0, 0, 22, 22, 80, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22,
+  0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 81, 22, 22, 22,
+  22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0,
+  0, 0, 22, 22, 22, 22, 82, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0,
+  0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 83, 22, 22, 22, 22, 22, 22, 22, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 84, 22, 22, 22, 22, 22, 22, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22,
+  22, 22, 22, 22, 85, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 86, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 87, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22,
+  22, 88, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 89, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22,
+  0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 90, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0,
+  0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 91,
+  22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0,
+  0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 92, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0,
+  0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0,
+  22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22,
+  0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0,
+  0, 0, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0,
+  0, 22, 22, 22, 22, 93, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22,
+  22, 22, 22, 22, 22, 94, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22,
+  95, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 96, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 97, 22, 22, 22, 22, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 22, 0, 0, 0, 0, 0, 0, 22, 0, 0, 0, 22, 22, 22, 22, 22, 22, 22, 22,
+  22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 0, 0, 0]);
+var _ACCEPT = new Int8Array([
+  -1, -1, 47, 48, 43, 21, 22, 23, 24, 25, 26, 27, 28, 46, 29, 30, 31, 34, 36,
+  44, 37, 38, 45, 45, 45, 45, 45, 45, 45, 45, 45, 45, 45, 39, 40, 41, -1, 42,
+  -1, 1, 0, 32, 33, 35, 45, 45, 45, 45, 45, 4, 5, 6, 45, 45, 45, 45, 45, 15, 45,
+  45, 45, 45, 45, 45, 45, 45, 45, 45, 45, 8, 45, 16, 18, 45, 45, 45, 45, 13, 45,
+  3, 14, 45, 45, 45, 9, 10, 11, 19, 45, 2, 20, 45, 45, 12, 45, 17, 45, 7]);
+
+var _ESCAPE = '\\';
+var _COMMENT_OPEN = '(*';
+var _COMMENT_OPEN_0 = 40;
+var _COMMENT_CLOSE = '*)';
+var _COMMENT_CLOSE_0 = 42;
+var _COMMENT_NESTED = true;
+
+var Lexer = exports.Lexer = function() {
+  this.pos = 0;
+  this.buf = null;
+  this.buflen = 0;
+
+  // List of errors accumulated (and recovered from) during lexing.
+  this.errors = [];
+}
+
+// Initialize the Lexer's buffer. This resets the lexer's internal
+// state and subsequent tokens will be returned starting with the
+// beginning of the new buffer.
+Lexer.prototype.input = function(buf) {
+  this.pos = 0;
+  this.buf = buf;
+  this.buflen = buf.length;
+  this.lineno = 1;
+}
+
+// Get the next token from the current buffer. A token is an object with
+// the following properties:
+// - name: name of the pattern that this token matched.
+// - value: actual string value of the token.
+// - pos: offset in the current buffer where the token starts.
+// - lineno: line number.
+//
+// If there are no more tokens in the buffer, returns null. In case of
+// an error, returns a token with name 'ERROR' and adds an error string to the
+// errors attribute.
+Lexer.prototype.token = function() {
+  var buf = this.buf;
+  var buflen = this.buflen;
+  while (this.pos < buflen) {
+    // Run the DFA for the longest match from start
+    var start = this.pos;
+    var state = 1;
+    var rule = -1;
+    var end = start;
+    for (var i = start; i < buflen; i++) {
+      var c = buf.charCodeAt(i);
+      state = _NEXT[state * _NUM_CLASSES + (c < 128 ? _CLASS[c] : 0)];
+      if (state === 0) {
+        break;
+      }
+      if (_ACCEPT[state] >= 0) {
+        rule = _ACCEPT[state];
+        end = i + 1;
+      }
+    }
+
+    if (rule < 0) {
+      this._add_error("Unknown token '" + buf.charAt(start) + "'");
+      return this._maketoken('ERROR', '', this.pos++);
+    }
+    this.pos = end;
+    switch (_RULE_ACTIONS[rule]) {
+      case _TOKEN:
+        return this._maketoken(_RULE_NAMES[rule], buf.substring(start, end),
+                               start);
+      case _SKIP:
+        break;
+      case _NEWLINE:
+        this.lineno++;
+        break;
+      case _BLOCK_COMMENT:
+        this._skip_block_comment();
+        break;
+      case _STRING:
+        return this._string_token(_RULE_NAMES[rule], start, end);
+      case _UNTERMINATED_STRING:
+        // Lexing can't go on past the quote
+        this.pos = start;
+        this._add_error('Unterminated string');
+        return null;
+    }
+  }
+  return null;
+}
+
+// Creates a new token with the given name, value and pos. pos and lineno are is
+// optional: if not provided, the object attributes are used
+Lexer.prototype._maketoken = function(name, value, pos, lineno) {
+  var realpos = (typeof pos === "undefined") ? this.pos : pos;
+  var reallineno = (typeof lineno === "undefined") ? this.lineno : lineno;
+  return {name: name, value: value, pos: realpos, lineno: reallineno};
+}
+
+Lexer.prototype._add_error = function(str) {
+  this.errors.push('Line ' + this.lineno.toString() + ': ' + str);
+}
+
+// The string token between start and end. Newlines inside strings have to be
+// escaped; each one counts a line.
+Lexer.prototype._string_token = function(name, start, end) {
+  var string_lineno = this.lineno;
+  var nindex = start + 1;
+  while ((nindex = this.buf.indexOf('\n', nindex)) > 0 && nindex < end) {
+    if (this.buf.charAt(nindex - 1) !== _ESCAPE) {
+      this._add_error('Unescaped newline inside a string');
+    }
+    this.lineno++;
+    nindex++;
+  }
+  return this._maketoken(name, this.buf.substring(start, end), start,
+                         string_lineno);
+}
+
+// Skip a block comment whose opener was just matched. Comments can
+// be nested.
+Lexer.prototype._skip_block_comment = function() {
+  var buf = this.buf;
+  var nestcount = 0;
+  while (this.pos < this.buflen) {
+    var c = buf.charCodeAt(this.pos);
+    if (c === _COMMENT_OPEN_0 && buf.startsWith(_COMMENT_OPEN, this.pos) &&
+        _COMMENT_NESTED) {
+      this.pos += _COMMENT_OPEN.length;
+      nestcount++;
+    } else if (c === _COMMENT_CLOSE_0 &&
+               buf.startsWith(_COMMENT_CLOSE, this.pos)) {
+      this.pos += _COMMENT_CLOSE.length;
+      if (nestcount === 0) {
+        return;
+      }
+      nestcount--;
+    } else {
+      if (c === 10) {
+        this.lineno++;
+      }
+      this.pos++;
+    }
+  }
+
+  this._add_error('Unterminated multi-line comment at EOF');
+}
+
+// Utility function to lex all tokens from a given string. Returns tokens and
+// lexer errors packed into an object.
+var lex_all = exports.lex_all = function(str) {
+  var lex = new Lexer();
+  lex.input(str);
+
+  var toks = [];
+  while (true) {
+    var tok = lex.token();
+    if (tok === null) {
+      break;
+    } else {
+      toks.push(tok);
+    }
+  }
+  return {'tokens': toks, 'errors': lex.errors};
+}
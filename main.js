@@ -1,9 +1,41 @@
 'use strict';
 
 var ast_visitor = require('./ast_visitor');
+var cool_ast = require('./cool_ast');
 var lexer = require('./lexer');
 var parser = require('./parser');
+var crypto = require('crypto');
 var fs = require('fs');
+var path = require('path');
+
+
+// Parses the Cool source code in buf and returns its AST, going through an
+// on-disk cache of serialized ASTs in cache_dir, keyed by a hash of the
+// source. Unchanged sources are deserialized rather than lexed and parsed.
+var parse_cached = exports.parse_cached = function(buf, cache_dir) {
+  var hash = crypto.createHash('sha1').update(buf).digest('hex');
+  var cache_file = path.join(cache_dir, hash + '.cast');
+  try {
+    return cool_ast.deserialize(fs.readFileSync(cache_file));
+  } catch (e) {
+    // A missing entry, or one written for another version of the AST, is
+    // simply replaced.
+    if (e.code !== 'ENOENT' && !(e instanceof cool_ast.ASTError)) {
+      throw e;
+    }
+  }
+
+  var ast = new parser.Parser().parse(buf);
+  if (!fs.existsSync(cache_dir)) {
+    fs.mkdirSync(cache_dir);
+  }
+  // Write to a temporary file and rename, so that concurrent runs never read
+  // a partial entry.
+  var tmp_file = cache_file + '.' + process.pid + '.tmp';
+  fs.writeFileSync(tmp_file, cool_ast.serialize(ast));
+  fs.renameSync(tmp_file, cache_file);
+  return ast;
+}
 
 
 // The main compiler driver will be here. For now just some sample driving code
@@ -21,10 +53,12 @@ var testdrive = function() {
                    //case joe of foo : Foo => 20; joo : Joo => true;  esac\n\
                    //while ~ not 10 loop 10 pool; "je"}';
   try {
-    var prsr = new parser.Parser();
     console.log('----> Parsing:');
     console.log(fileinput);
-    var ast = prsr.parse(fileinput);
+    // Set COOL_AST_CACHE to a directory to cache parsed ASTs there.
+    var ast = process.env.COOL_AST_CACHE ?
+      parse_cached(fileinput, process.env.COOL_AST_CACHE) :
+      new parser.Parser().parse(fileinput);
     console.log('----> Result:');
     console.log(ast);
     console.log('----');
@@ -44,7 +44,9 @@
 // Operator precedence, from highest to lowest:
 //   .  @  ~  isvoid  *  /  +  -  <=  <  =  not  <-
 
-var lexer = require('./lexer');
+// The table-driven lexer generated from cool_tokens.json. lexer.js is the
+// hand-written reference it is tested against.
+var lexer = require('./cool_lexer');
 var cool_ast = require('./cool_ast');
 
 
@@ -60,7 +62,12 @@ ParseError.prototype = Object.create(Error.prototype);
 ParseError.prototype.constructor = ParseError;
 
 // Parser constructor.
-var Parser = exports.Parser = function() {
+// builder: optional; the interface through which AST nodes are created and
+// inspected. Defaults to cool_ast.builder, which creates the usual node
+// objects. Pass a cool_ast_arena.Arena to build the AST in an arena instead;
+// the parse methods then return node handles.
+var Parser = exports.Parser = function(builder) {
+  this.builder = builder || cool_ast.builder;
   this.lexer = null;
   this.cur_token = null;
 
@@ -178,7 +185,7 @@ Parser.prototype._parse_program = function() {
     this._skip_token('SEMI');
   }
 
-  return new cool_ast.Program(classes);
+  return this.builder.Program(classes);
 }
 
 Parser.prototype._parse_class = function() {
@@ -199,7 +206,7 @@ Parser.prototype._parse_class = function() {
   this._advance();
 
   var parent_name = parent_tok ? parent_tok.value : null;
-  return new cool_ast.Class(type_tok.value, parent_name, features,
+  return this.builder.Class(type_tok.value, parent_name, features,
                             type_tok.lineno);
 }
 
@@ -212,7 +219,7 @@ Parser.prototype._parse_feature = function() {
       var name_tok = this._match('IDENTIFIER');
       this._match('COLON');
       var type_tok = this._match('TYPE');
-      formals.push(new cool_ast.Formal(name_tok.value, type_tok.value,
+      formals.push(this.builder.Formal(name_tok.value, type_tok.value,
                                        name_tok.lineno));
       this._skip_token('COMMA');
     }
@@ -223,17 +230,17 @@ Parser.prototype._parse_feature = function() {
     this._match('L_BRACE');
     var expr = this._parse_expression();
     this._match('R_BRACE');
-    return new cool_ast.Method(feature_name_tok.value, formals,
+    return this.builder.Method(feature_name_tok.value, formals,
                                return_tok.value, expr, feature_name_tok.lineno);
   } else if (this.cur_token.name === 'COLON') {
     this._advance();
     var type_tok = this._match('TYPE');
-    var init_node = new cool_ast.NoExpr();
+    var init_node = this.builder.NoExpr();
     if (this.cur_token.name === 'ASSIGN_ARROW') {
       this._advance();
       init_node = this._parse_expression();
     }
-    return new cool_ast.Attr(feature_name_tok.value, type_tok.value, init_node,
+    return this.builder.Attr(feature_name_tok.value, type_tok.value, init_node,
                              feature_name_tok.lineno);
   } else {
     this._error("expected a '(' or ':' after feature name, got '" +
@@ -269,14 +276,16 @@ Parser.prototype._parse_expression = function(min_prec) {
       var next_min_prec = op_info.assoc === 'left' ? op_info.prec + 1 :
                                                      op_info.prec;
       var rhs = this._parse_expression(next_min_prec);
-      // Build the BinaryOp node to represent the result so far
-      result_node = new cool_ast.BinaryOp(op_tok.value, result_node, rhs,
-                                          op_tok.lineno);
-      // Create a better AST node for dispatches
+      // Build the node to represent the result so far. Dispatches get
+      // proper AST nodes rather than a BinaryOp.
       if (op_tok.name === 'PERIOD') {
-        result_node = this._fixup_binary_dispatch(result_node);
+        result_node = this._fixup_binary_dispatch(result_node, rhs,
+                                                  op_tok.lineno);
       } else if (op_tok.name === 'AT') {
-        result_node = this._fixup_binary_static_dispatch(result_node);
+        result_node = this._fixup_binary_static_dispatch(result_node, rhs);
+      } else {
+        result_node = this.builder.BinaryOp(op_tok.value, result_node, rhs,
+                                            op_tok.lineno);
       }
     } else {
       break;
@@ -298,7 +307,7 @@ Parser.prototype._parse_atom = function() {
   // It's not starting with one of the known tokens. So the next token must be
   // a valid ID or constant.
   if (tok.name === 'IDENTIFIER') {
-    var id_node = new cool_ast.Obj(tok.value, tok.lineno);
+    var id_node = this.builder.Obj(tok.value, tok.lineno);
     this._advance();
 
     // This can be a dispatch.
@@ -309,19 +318,19 @@ Parser.prototype._parse_atom = function() {
     return id_node;
   } else if (tok.name === 'TYPE') {
     this._advance();
-    return new cool_ast.Obj(tok.value, tok.lineno);
+    return this.builder.Obj(tok.value, tok.lineno);
   } else if (tok.name === 'NUMBER') {
     this._advance();
-    return new cool_ast.IntConst(parseInt(tok.value, 10), tok.lineno);
+    return this.builder.IntConst(parseInt(tok.value, 10), tok.lineno);
   } else if (tok.name === 'STRING') {
     this._advance();
-    return new cool_ast.StringConst(tok.value, tok.lineno);
+    return this.builder.StringConst(tok.value, tok.lineno);
   } else if (tok.name === 'TRUE') {
     this._advance();
-    return new cool_ast.BoolConst(true, tok.lineno);
+    return this.builder.BoolConst(true, tok.lineno);
   } else if (tok.name === 'FALSE') {
     this._advance();
-    return new cool_ast.BoolConst(false, tok.lineno);
+    return this.builder.BoolConst(false, tok.lineno);
   }
 
   this._error("Unexpected token while parsing an atom: '" + tok.name + "'");
@@ -336,7 +345,7 @@ Parser.prototype._parse_expr_block = function() {
     this._skip_token('SEMI');
   }
   this._advance();
-  return new cool_ast.Block(exprs, exprs[0].loc);
+  return this.builder.Block(exprs, this.builder.loc(exprs[0]));
 }
 
 Parser.prototype._parse_parenthesized_expr = function() {
@@ -354,7 +363,8 @@ Parser.prototype._parse_if_expr = function() {
   this._match('ELSE');
   var else_expr = this._parse_expression();
   this._match('FI');
-  return new cool_ast.Cond(pred_expr, then_expr, else_expr, pred_expr.loc);
+  return this.builder.Cond(pred_expr, then_expr, else_expr,
+                           this.builder.loc(pred_expr));
 }
 
 Parser.prototype._parse_while_expr = function() {
@@ -363,7 +373,7 @@ Parser.prototype._parse_while_expr = function() {
   this._match('LOOP');
   var body_expr = this._parse_expression();
   this._match('POOL');
-  return new cool_ast.Loop(pred_expr, body_expr, pred_expr.loc);
+  return this.builder.Loop(pred_expr, body_expr, this.builder.loc(pred_expr));
 }
 
 Parser.prototype._parse_isvoid_expr = function() {
@@ -371,14 +381,14 @@ Parser.prototype._parse_isvoid_expr = function() {
   // ISVOID binds stronger than all binary operators, so it can simply
   // parse the atom following it.
   var atom = this._parse_atom();
-  return new cool_ast.IsVoid(atom, isvoid_tok.lineno);
+  return this.builder.IsVoid(atom, isvoid_tok.lineno);
 }
 
 Parser.prototype._parse_not_expr = function() {
   var not_tok = this._match('NOT');
   // NOT has to pass forward its precedence so the parsing doesn't go too far.
   var expr = this._parse_expression(Parser._operator_info['NOT'].prec);
-  return new cool_ast.UnaryOp('NOT', expr, not_tok.lineno);
+  return this.builder.UnaryOp('NOT', expr, not_tok.lineno);
 }
 
 Parser.prototype._parse_tilde_expr = function() {
@@ -386,13 +396,13 @@ Parser.prototype._parse_tilde_expr = function() {
   // TILDE binds stronger than all binary operators, so it can simply
   // parse the atom following it.
   var negated_atom = this._parse_atom();
-  return new cool_ast.UnaryOp('~', negated_atom, tilde_tok.lineno);
+  return this.builder.UnaryOp('~', negated_atom, tilde_tok.lineno);
 }
 
 Parser.prototype._parse_new_expr = function() {
   var new_tok = this._match('NEW');
   var type_tok = this._match('TYPE');
-  return new cool_ast.New(type_tok.value, new_tok.lineno);
+  return this.builder.New(type_tok.value, new_tok.lineno);
 }
 
 Parser.prototype._parse_let_expr = function() {
@@ -403,12 +413,12 @@ Parser.prototype._parse_let_expr = function() {
     var id_tok = this._match('IDENTIFIER');
     this._match('COLON');
     var type_decl_tok = this._match('TYPE');
-    var init_node = new cool_ast.NoExpr();
+    var init_node = this.builder.NoExpr();
     if (this.cur_token.name === 'ASSIGN_ARROW') {
       this._advance();
       init_node = this._parse_expression();
     }
-    let_inits.push(new cool_ast.Letinit(id_tok.value, type_decl_tok.value,
+    let_inits.push(this.builder.Letinit(id_tok.value, type_decl_tok.value,
                                         init_node, id_tok.lineno));
 
     this._skip_token('COMMA');
@@ -417,7 +427,7 @@ Parser.prototype._parse_let_expr = function() {
 
   // Now we can parse the body of the let
   var body = this._parse_expression();
-  return new cool_ast.Let(let_inits, body, body.loc);
+  return this.builder.Let(let_inits, body, this.builder.loc(body));
 }
 
 Parser.prototype._parse_case_expr = function() {
@@ -432,12 +442,13 @@ Parser.prototype._parse_case_expr = function() {
     this._match('CASE_ARROW');
     var expr_value_node = this._parse_expression();
     this._skip_token('SEMI');
-    cases.push(new cool_ast.Case(name_tok.value, type_decl_tok.value,
+    cases.push(this.builder.Case(name_tok.value, type_decl_tok.value,
                                  expr_value_node, name_tok.lineno));
   }
   this._advance();
 
-  return new cool_ast.Typcase(expr_node, cases, expr_node.loc);
+  return this.builder.Typcase(expr_node, cases,
+                              this.builder.loc(expr_node));
 }
 
 // Parse a dispatch. We know that the current token begins a dispatch, and atom
@@ -474,42 +485,41 @@ Parser.prototype._parse_dispatch = function(atom) {
   // If we have a name_tok, that's the name of the dispatch. Otherwise atom is
   // the name (but in that case, atom itself must be an identifier). If we also
   // have a type_tok, it's a static dispatch.
+  var b = this.builder;
   if (name_tok === null) {
-    if (!(atom instanceof cool_ast.Obj)) {
-      this._error("bad dispatch on " + atom.constructor.node_type);
+    if (b.kind(atom) !== b.kinds.Obj) {
+      this._error("bad dispatch on " + b.node_type(atom));
     }
-    return new cool_ast.Dispatch(new cool_ast.NoExpr(), atom.name,
-                                 args, atom.loc);
+    return b.Dispatch(b.NoExpr(), b.name(atom), args, b.loc(atom));
   } else {
     if (type_tok === null) {
-      return new cool_ast.Dispatch(atom, name_tok.value, args, atom.loc)
+      return b.Dispatch(atom, name_tok.value, args, b.loc(atom))
     } else {
-      return new cool_ast.StaticDispatch(atom, type_tok.value,
-                                         name_tok.value, args, atom.loc);
+      return b.StaticDispatch(atom, type_tok.value, name_tok.value, args,
+                              b.loc(atom));
     }
   }
 }
 
-// A dot dispatch can be cascaded and thus participate in a BinaryOp tree.
-// Fix up BinaryOp(left=someexpr, right=Dispatch(zzz)) to its real meaning of
-// Dispatch(expr=someexpr, ... zzz)
-Parser.prototype._fixup_binary_dispatch = function(binop) {
-  if (!(binop.right instanceof cool_ast.Dispatch)) {
+// A dot dispatch can be cascaded and thus participate in a binary operator
+// tree. Instead of BinaryOp(left=someexpr, right=Dispatch(zzz)), create a node
+// with its real meaning of Dispatch(expr=someexpr, ... zzz)
+Parser.prototype._fixup_binary_dispatch = function(left, right, loc) {
+  var b = this.builder;
+  if (b.kind(right) !== b.kinds.Dispatch) {
     this._error("invalid dispatch");
   }
-  return new cool_ast.Dispatch(binop.left, binop.right.name, binop.right.actual,
-                               binop.loc);
+  return b.Dispatch(left, b.name(right), b.actual(right), loc);
 }
 
 // When an expression is dispatched on statically with a @, it's interpreted
 // as a binary operator. Create a proper StaticDispatch node instead.
-Parser.prototype._fixup_binary_static_dispatch = function(binop) {
-  //if (
-  if (!(binop.right instanceof cool_ast.Dispatch) ||
-      !(binop.right.expr instanceof cool_ast.Obj)) {
+Parser.prototype._fixup_binary_static_dispatch = function(left, right) {
+  var b = this.builder;
+  if (b.kind(right) !== b.kinds.Dispatch ||
+      b.kind(b.expr(right)) !== b.kinds.Obj) {
     this._error("invalid static dispatch");
   }
-  return new cool_ast.StaticDispatch(binop.left, binop.right.expr.name,
-                                     binop.right.name, binop.right.actual);
+  return b.StaticDispatch(left, b.name(b.expr(right)), b.name(right),
+                          b.actual(right));
 }
-
@@ -0,0 +1,99 @@
+// Unit tests for the arena-backed AST
+
+'use strict';
+
+var assert = require('assert');
+var fs = require('fs');
+var path = require('path');
+var ast = require('../cool_ast');
+var arena_ast = require('../cool_ast_arena');
+var parser = require('../parser');
+
+
+var test = function() {
+  basic_tests();
+  conversion_tests();
+  parser_tests();
+}
+
+var basic_tests = function() {
+  // A tiny capacity makes the arena grow while nodes are added.
+  var arena = new arena_ast.Arena(2);
+  var form = arena.Formal('oshu', 'java', 3);
+  var obj = arena.Obj('foo', 4);
+  var meth = arena.Method('fibo', [form], 'int', obj, 5);
+
+  assert.equal(arena.size, 3);
+  assert.equal(arena.kind(meth), arena.kinds.Method);
+  assert.equal(arena.kind(meth), ast.Method.prototype.kind);
+  assert.equal(arena.node_type(meth), 'Method');
+  assert.equal(arena.loc(meth), 5);
+  assert.equal(arena.name(meth), 'fibo');
+  assert.deepEqual(arena.formals(meth), [form]);
+  assert.equal(arena.return_type(meth), 'int');
+  assert.equal(arena.expr(meth), obj);
+  assert.equal(arena.type_decl(form), 'java');
+
+  // Identifiers are interned
+  arena.Obj('foo', 6);
+  assert.deepEqual(arena.strings, ['oshu', 'java', 'foo', 'fibo', 'int']);
+
+  // Optional fields, missing locs, booleans
+  var cls = arena.Class('C', null, [meth]);
+  assert.strictEqual(arena.parent(cls), null);
+  assert.strictEqual(arena.loc(cls), undefined);
+  assert.strictEqual(arena.value(arena.BoolConst(true, 1)), true);
+  assert.strictEqual(arena.value(arena.BoolConst(false, 1)), false);
+
+  assert.throws(function() { arena.name(arena.NoExpr(1)); }, ast.ASTError);
+
+  // Null locs stay null; ints and locs that don't fit in the Int32Array
+  // columns are rejected without adding a node
+  assert.strictEqual(arena.loc(arena.NoExpr(null)), null);
+  assert.strictEqual(arena.loc(arena.NoExpr(-1)), -1);
+  assert.strictEqual(arena.token(arena.IntConst(-0x80000000, 1)), -0x80000000);
+  var size = arena.size;
+  [Math.pow(2, 31), 1.5, NaN].forEach(function(v) {
+    assert.throws(function() { arena.IntConst(v, 1); }, ast.ASTError);
+    assert.throws(function() { arena.Obj('x', v); }, ast.ASTError);
+  });
+  assert.equal(arena.size, size);
+
+  var visited = [];
+  arena.forEachChild(meth, function(child, field, index) {
+    this.push([ast.child_name(field, index), child]);
+  }, visited);
+  assert.deepEqual(visited, [['formals[0]', form], ['expr', obj]]);
+}
+
+var conversion_tests = function() {
+  var attr1 = new ast.Attr('attr1', 'f', new ast.New('int', 8), 10);
+  var attr2 = new ast.Attr('attr2', 'ff', new ast.NoExpr(8), 10);
+  var cls = new ast.Class('c', 'p', [attr1, attr2], 9);
+
+  var arena = new arena_ast.Arena();
+  var handle = arena.fromObject(cls);
+  assert.equal(arena.node_type(handle), 'Class');
+  assert.equal(arena.features(handle).length, 2);
+  assert.ok(arena.toObject(handle).equals(cls));
+  assert.strictEqual(arena.toObject(arena.fromObject(new ast.NoExpr(null))).loc,
+                     null);
+}
+
+var parser_tests = function() {
+  // Parsing into an arena produces the same AST as parsing into objects
+  var samples_dir = path.join(__dirname, '..', 'cool_code_samples');
+  fs.readdirSync(samples_dir).forEach(function(name) {
+    var source = fs.readFileSync(path.join(samples_dir, name), 'utf8');
+    var expected = new parser.Parser().parse(source);
+
+    var arena = new arena_ast.Arena();
+    var root = new parser.Parser(arena).parse(source);
+    assert.equal(arena.node_type(root), 'Program');
+    assert.ok(arena.toObject(root).equals(expected));
+  });
+}
+
+if (module.parent === null) {
+  test();
+}
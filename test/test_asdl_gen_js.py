@@ -0,0 +1,75 @@
+#-------------------------------------------------------------------------------
+# Tests of tools/asdl_gen_js.py, the JS AST generator.
+#
+# Run with: python -m pytest test/test_asdl_gen_js.py
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import asdl_gen_js
+
+
+def _split(asdl, directory):
+    subprocess.check_call([
+        sys.executable, os.path.join(ROOT, 'tools', 'asdl_gen_js.py'), asdl,
+        '--no-cache', '--split', directory])
+
+
+def test_split_keeps_other_files(tmpdir):
+    """ Splitting into a directory holding other generated files leaves them
+        alone, while the split files dropped from the output are removed.
+    """
+    directory = str(tmpdir)
+    others = ['cool_ast.js', 'cool_lexer.js', 'asdl_runtime.js']
+    for name in others:
+        shutil.copy(os.path.join(ROOT, name), directory)
+    with open(os.path.join(ROOT, 'cool_ast.asdl')) as f:
+        schema = f.read()
+    asdl = str(tmpdir.join('ast.asdl'))
+    with open(asdl, 'w') as f:
+        f.write(schema)
+
+    _split(asdl, directory)
+    files = set(os.listdir(directory))
+    assert {'index.js', 'runtime.js', 'expression.js', 'formal.js'} <= files
+    assert set(others) <= files
+
+    # Rename the formal type
+    with open(asdl, 'w') as f:
+        f.write(schema.replace('formal* formals', 'param* formals')
+                      .replace('formal = Formal(', 'param = Formal('))
+    _split(asdl, directory)
+    files = set(os.listdir(directory))
+    assert 'formal.js' not in files
+    assert {'index.js', 'param.js'} <= files
+    assert set(others) <= files
+    for name in others:
+        with open(os.path.join(ROOT, name), 'rb') as f1, \
+             open(os.path.join(directory, name), 'rb') as f2:
+            assert f1.read() == f2.read()
+
+
+def test_write_split(tmpdir):
+    directory = str(tmpdir.join('out'))
+    assert asdl_gen_js.write_split(directory, {'a.js': 'a', 'b.js': 'b'}) == [
+        'a.js', 'b.js']
+    tmpdir.join('out', 'c.js').write('// NOTE: this code is auto-generated')
+    assert asdl_gen_js.write_split(directory, {'a.js': 'a'}) == ['b.js']
+    assert sorted(os.listdir(directory)) == [
+        asdl_gen_js.SPLIT_MANIFEST, 'a.js', 'c.js']
+    assert asdl_gen_js.write_split(directory, {'a.js': 'a2'}) == ['a.js']
+    # A file of the previous output deleted by hand
+    os.unlink(os.path.join(directory, 'a.js'))
+    assert asdl_gen_js.write_split(directory, {'d.js': 'd'}) == ['d.js']
+    assert sorted(os.listdir(directory)) == [
+        asdl_gen_js.SPLIT_MANIFEST, 'c.js', 'd.js']
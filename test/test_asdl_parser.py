@@ -0,0 +1,76 @@
+#-------------------------------------------------------------------------------
+# Tests of the ASDL tokenizer and parser in tools/asdl_parser.py.
+#
+# Run with: python -m pytest test/test_asdl_parser.py
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import asdl_parser
+import asdl_synth
+
+SCHEMAS = [
+    os.path.join(ROOT, 'cool_ast.asdl'),
+    asdl_synth.synthesize(100, comment_lines=2),
+    # Non-ASCII identifiers and comments
+    'module Ünïcode {\n  -- ½ comment\n  ëxpr = Çall(ëxpr* årgs, int n)\n'
+    '       | Nöthing\n}\n',
+]
+
+
+def _read(schema, tmpdir):
+    """ (text, filename) of a schema given as a filename or as text.
+    """
+    if os.path.exists(schema):
+        with open(schema, encoding='utf-8') as f:
+            return f.read(), schema
+    filename = str(tmpdir.join('schema.asdl'))
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(schema)
+    return schema, filename
+
+
+@pytest.mark.parametrize('schema', SCHEMAS)
+def test_parse_file(schema, tmpdir):
+    """ Parsing a mapped file gives the same tokens and module as parsing the
+        decoded text.
+    """
+    text, filename = _read(schema, tmpdir)
+    tokens = list(asdl_parser.tokenize_asdl(text))
+    with asdl_parser.mapped_file(filename) as buf:
+        assert list(asdl_parser.tokenize_asdl(buf)) == tokens
+    assert all(type(t.value) is str for t in tokens)
+    assert (str(asdl_parser.parse_file(filename)) ==
+            str(asdl_parser.ASDLParser().parse(text)))
+
+
+@pytest.mark.parametrize('text, lineno, c', [
+    ('module M {\n  t = T(int ½)\n}', 2, '½'),
+    ('module M {\n\n  t = T(int - x)\n}', 3, '-'),
+    ('module M {\n  t = T(int €)\n}', 2, '€'),
+])
+def test_invalid_operator(text, lineno, c, tmpdir):
+    filename = str(tmpdir.join('schema.asdl'))
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(text)
+    for parse in (asdl_parser.ASDLParser().parse,
+                  lambda text: asdl_parser.parse_file(filename)):
+        with pytest.raises(asdl_parser.ASDLSyntaxError) as info:
+            parse(text)
+        assert str(info.value) == (
+            'Syntax error on line %d: Invalid operator %s' % (lineno, c))
+
+
+def test_empty_file(tmpdir):
+    filename = str(tmpdir.join('empty.asdl'))
+    open(filename, 'w').close()
+    with asdl_parser.mapped_file(filename) as buf:
+        assert list(asdl_parser.tokenize_asdl(buf)) == []
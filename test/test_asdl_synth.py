@@ -0,0 +1,41 @@
+#-------------------------------------------------------------------------------
+# Tests of the synthetic ASDL schemas of tools/asdl_synth.py.
+#
+# Run with: python -m pytest test/test_asdl_synth.py
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import asdl_analysis
+import asdl_ast
+import asdl_bench
+import asdl_parser
+import asdl_synth
+
+
+# The schemas benchmarked by asdl_bench.py, and a few more
+SCHEMAS = list(asdl_bench.SYNTHETIC_INPUTS.values()) + [
+    dict(num_types=1), dict(num_types=50, seed=3)]
+
+
+@pytest.mark.parametrize('kwargs', SCHEMAS)
+def test_reachable(kwargs):
+    """ All the types of the schemas are reachable from type0, so that
+        analyzing them doesn't warn.
+    """
+    text = asdl_synth.synthesize(**kwargs)
+    assert text == asdl_synth.synthesize(**kwargs)
+    module = asdl_parser.ASDLParser().parse(text)
+    assert asdl_ast.check(module)
+    assert len(module.dfns) == kwargs['num_types']
+    analysis = asdl_analysis.analyze(module)
+    assert analysis.root == 'type0'
+    assert analysis.unreachable == []
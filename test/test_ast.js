@@ -3,14 +3,23 @@
 'use strict';
 
 var assert = require('assert');
+var fs = require('fs');
+var path = require('path');
 var ast = require('../cool_ast');
 var ast_visitor = require('../ast_visitor');
+var parser = require('../parser');
 
 
 var test = function() {
   basic_tests();
   error_tests();
+  equality_tests();
+  interning_tests();
   visitor_tests();
+  transformer_tests();
+  dump_tests();
+  walker_tests();
+  kind_index_tests();
 }
 
 var error_tests = function() {
@@ -74,6 +83,129 @@ var basic_tests = function() {
   var children = meth.children();
   assert.equal(children[0].name, 'formals[0]');
   assert.equal(children[0].node, form);
+  assert.equal(children[1].name, 'expr');
+  assert.equal(children[1].node, obj);
+
+  // forEachChild visits the same children in the same order
+  var visited = [];
+  meth.forEachChild(function(node, field, index) {
+    assert.equal(this, visited);
+    this.push([ast.child_name(field, index), node]);
+  }, visited);
+  assert.deepEqual(visited, [['formals[0]', form], ['expr', obj]]);
+
+  assert.deepEqual(new ast.Class('c', null, [], 1).children(), []);
+  assert.deepEqual(new ast.NoExpr(1).children(), []);
+
+  // Leaves share a frozen empty list of children
+  assert.strictEqual(obj.children(), form.children());
+  assert.ok(Object.isFrozen(obj.children()));
+
+  // Fixed-arity nodes have the same children as through forEachChild
+  var cond = new ast.Cond(obj, new ast.IntConst(1, 2), new ast.NoExpr(), 3);
+  visited = [];
+  cond.forEachChild(function(node, field, index) {
+    visited.push({'name': ast.child_name(field, index), 'node': node});
+  });
+  assert.deepEqual(cond.children(), visited);
+
+  // Kinds are dense and index node_types and node_classes
+  assert.equal(ast.node_types.length, ast.node_classes.length);
+  for (var kind = 0; kind < ast.node_classes.length; kind++) {
+    assert.equal(ast.node_classes[kind].prototype.kind, kind);
+    assert.equal(ast.node_classes[kind].node_type, ast.node_types[kind]);
+  }
+  assert.equal(ast.node_types[obj.kind], 'Obj');
+}
+
+var equality_tests = function() {
+  var make_meth = function(param_type, expr_loc) {
+    return new ast.Method('fibo', [new ast.Formal('x', param_type, 1)], 'Int',
+                          new ast.Block([new ast.Obj('x', expr_loc),
+                                         new ast.NoExpr()], 2), 1);
+  }
+  var meth = make_meth('Int', 3);
+  assert.ok(meth.equals(meth));
+  assert.ok(meth.equals(make_meth('Int', 3)));
+  assert.ok(!meth.equals(make_meth('Bool', 3)));
+  assert.ok(!meth.equals(null));
+  assert.ok(!meth.equals(new ast.Obj('fibo', 1)));
+
+  // locs are compared unless ignoreLoc is set
+  assert.ok(!meth.equals(make_meth('Int', 4)));
+  assert.ok(meth.equals(make_meth('Int', 4), {ignoreLoc: true}));
+
+  // Sequences of different lengths
+  assert.ok(!new ast.Block([new ast.NoExpr()], 1).equals(
+      new ast.Block([new ast.NoExpr(), new ast.NoExpr()], 1)));
+
+  // Hashes are consistent with equals and ignore locs
+  assert.equal(meth.structuralHash(), make_meth('Int', 3).structuralHash());
+  assert.equal(meth.structuralHash(), make_meth('Int', 4).structuralHash());
+  assert.notEqual(meth.structuralHash(), make_meth('Bool', 3).structuralHash());
+  assert.notEqual(new ast.IntConst(1, 1).structuralHash(),
+                  new ast.IntConst(2, 1).structuralHash());
+  // Cached hashes still give the right answer for equals
+  var meth2 = make_meth('Bool', 3);
+  meth2.structuralHash();
+  assert.ok(!meth.equals(meth2));
+  assert.ok(meth.equals(make_meth('Int', 3)));
+}
+
+var interning_tests = function() {
+  // Interning is off by default, for nodes without fields too
+  assert.notStrictEqual(ast.IntConst.of(1, 2), ast.IntConst.of(1, 2));
+  assert.ok(!Object.isFrozen(ast.builder.Obj('x', 1)));
+  assert.notStrictEqual(ast.NoExpr.of(), ast.NoExpr.of());
+  assert.ok(!Object.isFrozen(ast.builder.NoExpr(1)));
+  var tree = new parser.Parser().parse(
+      'class A { a : Int; b : Int; f() : Int { { 1; } }; };');
+  var features = tree.classes[0].features;
+  assert.notStrictEqual(features[0].init, features[1].init);
+  features[0].init.static_type = 'Int';
+
+  try {
+    ast.set_interning('loc');
+    var n1 = ast.NoExpr.of();
+    assert.strictEqual(ast.builder.NoExpr(), n1);
+    assert.ok(Object.isFrozen(n1));
+    assert.ok(n1.equals(new ast.NoExpr()));
+    assert.equal(n1.structuralHash(), new ast.NoExpr().structuralHash());
+    assert.strictEqual(ast.NoExpr.of(5), ast.NoExpr.of(5));
+    assert.notStrictEqual(ast.NoExpr.of(5), n1);
+    assert.equal(ast.NoExpr.of(5).loc, 5);
+
+    var i1 = ast.IntConst.of(1, 2);
+    assert.strictEqual(ast.builder.IntConst(1, 2), i1);
+    assert.ok(Object.isFrozen(i1));
+    assert.notStrictEqual(ast.IntConst.of(1, 3), i1);
+    assert.notStrictEqual(ast.IntConst.of(2, 2), i1);
+    assert.equal(ast.IntConst.of(1, 3).loc, 3);
+    assert.strictEqual(ast.Formal.of('a', 'Int', 4),
+                       ast.Formal.of('a', 'Int', 4));
+    assert.notStrictEqual(ast.Formal.of('a', 'Int', 4),
+                          ast.Formal.of('a', 'String', 4));
+    assert.throws(function() { ast.IntConst.of('1', 2); }, ast.ASTError);
+
+    ast.set_interning('noloc');
+    assert.strictEqual(ast.NoExpr.of(5), ast.NoExpr.of());
+    var o1 = ast.Obj.of('self', 7);
+    assert.strictEqual(ast.Obj.of('self', 8), o1);
+    assert.strictEqual(o1.loc, undefined);
+
+    // Full tables are emptied when a node has to be added
+    ast.set_interning('noloc', 2);
+    var s1 = ast.StringConst.of('"a"');
+    var s2 = ast.StringConst.of('"b"');
+    assert.strictEqual(ast.StringConst.of('"a"'), s1);
+    var s3 = ast.StringConst.of('"c"');
+    assert.strictEqual(ast.StringConst.of('"c"'), s3);
+    assert.notStrictEqual(ast.StringConst.of('"a"'), s1);
+
+    assert.throws(function() { ast.set_interning('all'); }, ast.ASTError);
+  } finally {
+    ast.set_interning('off');
+  }
 }
 
 // Used for testing NodeVisitor
@@ -93,6 +225,19 @@ CustomVisitor.prototype.visit_New = function(node) {
   this.stuff.push(['new', node.type_name]);
 }
 
+// Used for testing GeneratedVisitor directly
+var NewCollector = function() {
+  ast.GeneratedVisitor.call(this);
+  this.types = [];
+}
+
+NewCollector.prototype = Object.create(ast.GeneratedVisitor.prototype);
+NewCollector.prototype.constructor = NewCollector;
+
+NewCollector.prototype.visit_New = function(node) {
+  this.types.push(node.type_name);
+}
+
 var visitor_tests = function() {
   var attr1 = new ast.Attr('attr1', 'f', new ast.New('int', 8), 10);
   var attr2 = new ast.Attr('attr2', 'ff', new ast.NoExpr(8), 10);
@@ -103,6 +248,29 @@ var visitor_tests = function() {
   assert.deepEqual(cv.stuff,
       [['attr', 'attr1'], ['new', 'int'], ['attr', 'attr2']]);
 
+  var nc = new NewCollector();
+  nc.visit(cls);
+  nc.visit(new ast.Block([new ast.New('B', 1), attr1.init], 1));
+  assert.deepEqual(nc.types, ['int', 'B', 'int']);
+
+  // visit_ methods assigned to a visitor override those of its class for that
+  // visitor only
+  var own = new NewCollector();
+  var attrs = [];
+  own.visit_Attr = function(node) {
+    attrs.push(node.name);
+    this.visit_children(node);
+  }
+  own.visit_New = function(node) {
+    this.types.push(node.type_name.toUpperCase());
+  }
+  own.visit(cls);
+  assert.deepEqual(attrs, ['attr1', 'attr2']);
+  assert.deepEqual(own.types, ['INT']);
+  var plain = new NewCollector();
+  plain.visit(cls);
+  assert.deepEqual(plain.types, ['int']);
+
   var dumper = new ast_visitor.NodeDumper(true);
   var s = dumper.visit(cls);
   assert.deepEqual(s.split("\n"), [
@@ -113,6 +281,339 @@ var visitor_tests = function() {
       "        NoExpr() @ loc: 8"]);
 }
 
+// Renames the objects named from to to, and folds additions of constants
+var Renamer = function(from, to) {
+  ast_visitor.NodeTransformer.call(this);
+  this.from = from;
+  this.to = to;
+}
+
+Renamer.prototype = Object.create(ast_visitor.NodeTransformer.prototype);
+Renamer.prototype.constructor = Renamer;
+
+Renamer.prototype.transform_Obj = function(node) {
+  return node.name === this.from ? new ast.Obj(this.to, node.loc) : node;
+}
+
+Renamer.prototype.transform_BinaryOp = function(node) {
+  node = this.transform_children(node);
+  if (node.op === '+' && node.left instanceof ast.IntConst &&
+      node.right instanceof ast.IntConst) {
+    return new ast.IntConst(node.left.token + node.right.token, node.loc);
+  }
+  return node;
+}
+
+var transformer_tests = function() {
+  var untouched = new ast.Cond(new ast.BoolConst(true, 2), new ast.Obj('b', 2),
+                               new ast.NoExpr(2), 2);
+  var block = new ast.Block([
+      untouched,
+      new ast.Obj('a', 3),
+      new ast.Dispatch(new ast.Obj('self', 4), 'f', [new ast.Obj('c', 4)], 4),
+      new ast.BinaryOp('+', new ast.IntConst(1, 5), new ast.IntConst(2, 5), 5)],
+      1);
+  var method = new ast.Method('m', [], 'Int', block, 1);
+  var tree = new ast.Class('C', null, [method], 1);
+  var before = ast_visitor.dump_ast(tree, true);
+
+  // Nothing to change: the tree itself comes back
+  assert.strictEqual(new Renamer('z', 'y').transform(block.body[2]),
+                     block.body[2]);
+  assert.strictEqual(new ast_visitor.NodeTransformer().transform(tree), tree);
+
+  var result = new Renamer('a', 'x').transform(tree);
+  assert.strictEqual(ast_visitor.dump_ast(tree, true), before);
+  assert.notStrictEqual(result, tree);
+  assert.strictEqual(result.loc, 1);
+  assert.strictEqual(result.name, 'C');
+  var new_block = result.features[0].expr;
+  assert.notStrictEqual(new_block, block);
+  // The unchanged subtrees are shared, including the prefix of the sequence
+  // before the first change
+  assert.strictEqual(new_block.body[0], untouched);
+  assert.strictEqual(new_block.body[2], block.body[2]);
+  assert.deepEqual(new_block.body.map(function(node) {
+    return ast.node_types[node.kind];
+  }), ['Cond', 'Obj', 'Dispatch', 'IntConst']);
+  assert.strictEqual(new_block.body[1].name, 'x');
+  assert.strictEqual(new_block.body[3].token, 3);
+  assert.ok(result.equals(new ast.Class('C', null, [
+      new ast.Method('m', [], 'Int', new ast.Block([
+          untouched, new ast.Obj('x', 3), block.body[2],
+          new ast.IntConst(3, 5)], 1), 1)], 1)));
+
+  // Only the changed element and the ones after it are transformed anew
+  var seq = [new ast.Obj('a', 1), new ast.Obj('b', 1), new ast.Obj('c', 1)];
+  var d = new ast.Dispatch(new ast.Obj('self', 1), 'f', seq, 1);
+  var seen = [];
+  var d2 = d.transformChildren(function(child) {
+    seen.push(child.name);
+    return child.name === 'b' ? new ast.Obj('bb', 1) : child;
+  });
+  assert.deepEqual(seen, ['self', 'a', 'b', 'c']);
+  assert.notStrictEqual(d2.actual, seq);
+  assert.deepEqual(d2.actual.map(function(node) { return node.name; }),
+                   ['a', 'bb', 'c']);
+  assert.strictEqual(d2.expr, d.expr);
+  assert.deepEqual(seq.map(function(node) { return node.name; }),
+                   ['a', 'b', 'c']);
+
+  // Leaves and interned nodes are returned as is
+  var leaf = new ast.IntConst(1, 1);
+  assert.strictEqual(leaf.transformChildren(function() { throw 'no'; }), leaf);
+  try {
+    ast.set_interning('loc');
+    var interned = ast.NoExpr.of();
+    assert.strictEqual(interned.transformChildren(null), interned);
+  } finally {
+    ast.set_interning('off');
+  }
+
+  // The rebuilt nodes are checked like any others
+  assert.throws(function() {
+    new ast.Loop(new ast.NoExpr(1), new ast.NoExpr(1), 1).transformChildren(
+        function() { return new ast.Formal('a', 'b', 1); });
+  }, ast.ASTError);
+}
+
+var reference_dump = function(tree, show_loc) {
+  return new ast_visitor.NodeDumper(show_loc).visit(tree);
+}
+
+var dump_tests = function() {
+  var tree = new ast.Class('c', null, [
+      new ast.Attr('a', 'Bool', new ast.BoolConst(false, 3), 3),
+      new ast.Method('m', [new ast.Formal('x', 'Int', 4)], 'Int',
+                     new ast.IntConst(7), 4)], 2);
+  assert.strictEqual(ast_visitor.dump_ast(tree, true), [
+      'Class(name=c, parent=null) @ loc: 2',
+      '    Attr(name=a, type_decl=Bool) @ loc: 3',
+      '        BoolConst(value=false) @ loc: 3',
+      '    Method(name=m, return_type=Int) @ loc: 4',
+      '        Formal(name=x, type_decl=Int) @ loc: 4',
+      '        IntConst(token=7) @ loc: undefined'].join('\n'));
+
+  var samples_dir = path.join(__dirname, '..', 'cool_code_samples');
+  var sources = fs.readdirSync(samples_dir).map(function(name) {
+    return fs.readFileSync(path.join(samples_dir, name), 'utf8');
+  });
+  sources.forEach(function(source) {
+    var tree = new parser.Parser().parse(source);
+    [false, true].forEach(function(show_loc) {
+      assert.strictEqual(ast_visitor.dump_ast(tree, show_loc),
+                         reference_dump(tree, show_loc));
+    });
+  });
+
+  // Streamed in chunks, a large dump is the same
+  var large = new parser.Parser().parse(
+      new Array(21).join(sources.join('\n') + '\n'));
+  var chunks = [];
+  var result = ast_visitor.dump_ast(large, true, function(chunk) {
+    chunks.push(chunk);
+  });
+  assert.strictEqual(result, undefined);
+  assert.ok(chunks.length > 1);
+  assert.strictEqual(chunks.join(''), reference_dump(large, true));
+}
+
+var walker_tests = function() {
+  var cond = new ast.Cond(
+      new ast.BinaryOp('<', new ast.IntConst(1, 1), new ast.IntConst(2, 1), 1),
+      new ast.Block([new ast.Obj('a', 2), new ast.Obj('b', 2)], 2),
+      new ast.NoExpr(3), 1);
+  var names = function(nodes) {
+    return nodes.map(function(node) { return ast.node_types[node.kind]; });
+  }
+
+  // Same order as the recursive walks over forEachChild
+  var recursive_pre = [], recursive_post = [];
+  var walk = function(node) {
+    recursive_pre.push(node);
+    node.forEachChild(walk);
+    recursive_post.push(node);
+  }
+  walk(cond);
+  var pre = [], post = [];
+  assert.strictEqual(ast.walkPreorder(cond, function(node) {
+    pre.push(node);
+  }), true);
+  assert.strictEqual(ast.walkPostorder(cond, function(node) {
+    post.push(node);
+  }), true);
+  assert.deepEqual(pre, recursive_pre);
+  assert.deepEqual(post, recursive_post);
+  pre.forEach(function(node, i) {
+    assert.strictEqual(node, recursive_pre[i]);
+  });
+  assert.deepEqual(names(post), ['IntConst', 'IntConst', 'BinaryOp', 'Obj',
+                                 'Obj', 'Block', 'NoExpr', 'Cond']);
+
+  // Sequences come before the following fields
+  var let_ = new ast.Let([new ast.Letinit('x', 'Int', new ast.IntConst(1, 1), 1),
+                          new ast.Letinit('y', 'Int', new ast.NoExpr(), 1)],
+                         new ast.Obj('x', 2), 1);
+  var lets = [];
+  ast.walkPreorder(let_, function(node) { lets.push(node); });
+  assert.deepEqual(names(lets), ['Let', 'Letinit', 'IntConst', 'Letinit',
+                                 'NoExpr', 'Obj']);
+
+  // SKIP, STOP and the this argument
+  var ctx = {nodes: []};
+  ast.walkPreorder(cond, function(node) {
+    this.nodes.push(node);
+    if (node instanceof ast.BinaryOp) {
+      return ast.SKIP;
+    }
+  }, ctx);
+  assert.deepEqual(names(ctx.nodes), ['Cond', 'BinaryOp', 'Block', 'Obj',
+                                      'Obj', 'NoExpr']);
+  var stop_at_block = function(node) {
+    this.push(node);
+    return node instanceof ast.Block ? ast.STOP : undefined;
+  }
+  var seen = [];
+  assert.strictEqual(ast.walkPreorder(cond, stop_at_block, seen), false);
+  assert.deepEqual(names(seen), ['Cond', 'BinaryOp', 'IntConst', 'IntConst',
+                                 'Block']);
+  seen = [];
+  assert.strictEqual(ast.walkPostorder(cond, stop_at_block, seen), false);
+  assert.deepEqual(names(seen), ['IntConst', 'IntConst', 'BinaryOp', 'Obj',
+                                 'Obj', 'Block']);
+
+  // Trees too deep for recursion
+  var depth = 200000;
+  var tree = new ast.IntConst(0, 1);
+  for (var i = 0; i < depth; i++) {
+    tree = new ast.UnaryOp('~', tree, 1);
+  }
+  var count = 0;
+  ast.walkPreorder(tree, function() { count++; });
+  assert.strictEqual(count, depth + 1);
+  var last = null;
+  ast.walkPostorder(tree, function(node) { last = node; });
+  assert.strictEqual(last, tree);
+}
+
+var kind_index_tests = function() {
+  var make_tree = function() {
+    var call = new ast.Dispatch(new ast.Obj('self', 2), 'f',
+                                [new ast.IntConst(1, 2), new ast.Obj('x', 2)], 2);
+    return new ast.Method('m', [new ast.Formal('x', 'Int', 1)], 'Int',
+        new ast.Block([call, new ast.New('A', 3), new ast.New('B', 4)], 2), 1);
+  }
+  var tree = make_tree();
+  var index = ast.buildKindIndex(tree);
+  var body = tree.expr;
+  var call = body.body[0];
+
+  assert.deepEqual(index.ofKind(ast.New), [body.body[1], body.body[2]]);
+  assert.deepEqual(index.ofKind(ast.Obj.prototype.kind),
+                   [call.expr, call.actual[1]]);
+  assert.deepEqual(index.ofKind(ast.Typcase), []);
+  // Abstract classes stand for their concrete subclasses, kind by kind
+  assert.deepEqual(index.ofKind(ast.Expression),
+                   [call, body, call.actual[0], body.body[1], body.body[2],
+                    call.expr, call.actual[1]]);
+  assert.deepEqual(index.ofKind(ast.Feature), [tree]);
+  assert.strictEqual(index.ofKind(ast.Node).length, 9);
+  [-1, 1.5, ast.node_classes.length, 'Obj', Object, null].forEach(
+      function(kind) {
+        assert.throws(function() { index.ofKind(kind); },
+                      /Not a node kind or class/);
+      });
+  assert.strictEqual(index.nodes.length, 9);
+  assert.strictEqual(index.nodes[0], tree);
+  assert.strictEqual(index.sizes[0], 9);
+  assert.strictEqual(index.parentOf(tree), null);
+  assert.strictEqual(index.parentOf(call), body);
+  assert.strictEqual(index.parentOf(call.actual[1]), call);
+  var id = index.idOf(call.actual[1]);
+  assert.strictEqual(index.fields[id], 'actual');
+  assert.strictEqual(index.slots[id], 1);
+  id = index.idOf(call.expr);
+  assert.strictEqual(index.fields[id], 'expr');
+  assert.strictEqual(index.slots[id], -1);
+  assert.strictEqual(index.idOf(new ast.NoExpr()), -1);
+  var ids = [];
+  index.forEachOfKind(ast.New, function(node, id) {
+    assert.strictEqual(this, ids);
+    this.push(id);
+  }, ids);
+  assert.deepEqual(ids, [7, 8]);
+
+  // Replacing subtrees updates the tree, its hashes and the index
+  var hash = tree.structuralHash();
+  var new_call = new ast.Dispatch(new ast.Obj('y', 5), 'g',
+                                  [new ast.New('C', 5)], 5);
+  index.replace(call, new_call);
+  assert.strictEqual(body.body[0], new_call);
+  assert.notEqual(tree.structuralHash(), hash);
+  assert.strictEqual(tree.structuralHash(),
+                     ast.buildKindIndex(tree).root.structuralHash());
+  assert.deepEqual(index.ofKind(ast.New).map(function(node) {
+    return node.type_name;
+  }), ['A', 'B', 'C']);
+  assert.deepEqual(index.ofKind(ast.Obj), [new_call.expr]);
+  assert.deepEqual(index.ofKind(ast.IntConst), []);
+  assert.strictEqual(index.parentOf(new_call.actual[0]), new_call);
+  assert.strictEqual(index.parentOf(new_call), body);
+  assert.strictEqual(index.idOf(call), -1);
+
+  // Replacing an ancestor retires the earlier replacement too
+  index.replace(body, new ast.IntConst(7, 6));
+  assert.strictEqual(tree.expr.token, 7);
+  assert.deepEqual(index.ofKind(ast.New), []);
+  assert.deepEqual(index.ofKind(ast.Dispatch), []);
+  assert.deepEqual(index.ofKind(ast.Formal), [tree.formals[0]]);
+  assert.ok(tree.equals(new ast.Method('m', [new ast.Formal('x', 'Int', 1)],
+                                       'Int', new ast.IntConst(7, 6), 1)));
+
+  // The root can be replaced too, by id
+  var root = new ast.Obj('z', 1);
+  index.replace(0, root);
+  assert.strictEqual(index.root, root);
+  assert.deepEqual(index.ofKind(ast.Method), []);
+  assert.deepEqual(index.ofKind(ast.Obj), [root]);
+
+  assert.throws(function() { index.replace(tree, root); }, ast.ASTError);
+  index = ast.buildKindIndex(make_tree());
+  assert.throws(function() {
+    index.replace(index.root.expr, new ast.Formal('x', 'Int', 1));
+  }, ast.ASTError);
+  // Replacements must have the type their field is declared with, not just
+  // share a base class with the replaced node
+  assert.throws(function() {
+    index.replace(index.root.formals[0], new ast.Obj('x', 1));
+  }, ast.ASTError);
+  index.replace(index.root.formals[0], new ast.Formal('y', 'Int', 1));
+  assert.strictEqual(index.root.formals[0].name, 'y');
+
+  // Positions are kept up to date by replacements
+  var first = index.ofKind(ast.New)[0];
+  assert.strictEqual(index.parentOf(first), index.root.expr);
+  var isvoid = new ast.IsVoid(first, 3);
+  index.replace(index.root.expr.body[2], isvoid);
+  assert.strictEqual(index.parentOf(isvoid), index.root.expr);
+  assert.throws(function() { index.parentOf(first); }, ast.ASTError);
+  var replacement = new ast.New('D', 3);
+  index.replace(isvoid, replacement);
+  assert.strictEqual(index.idOf(isvoid), -1);
+  assert.strictEqual(index.parentOf(first), index.root.expr);
+  assert.strictEqual(index.idOf(replacement),
+                     index.nodes.lastIndexOf(replacement));
+  assert.strictEqual(index.parentOf(replacement), index.root.expr);
+
+  // Nodes shared by interning have no single position
+  var shared = new ast.NoExpr();
+  index = ast.buildKindIndex(new ast.Block([shared, shared], 1));
+  assert.deepEqual(index.ofKind(ast.NoExpr), [shared, shared]);
+  assert.throws(function() { index.parentOf(shared); }, ast.ASTError);
+  index.replace(2, new ast.IntConst(1, 1));
+  assert.strictEqual(index.parentOf(shared).kind, ast.Block.prototype.kind);
+}
+
 if (module.parent === null) {
   test();
 }
@@ -0,0 +1,43 @@
+#-------------------------------------------------------------------------------
+# Tests of ast_stats.js, run on an AST module generated with --instrument.
+#
+# Run with: python -m pytest test/test_ast_stats.py
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_stats(tmpdir):
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip('node is not installed')
+    instrumented = str(tmpdir.join('cool_ast_instrumented.js'))
+    subprocess.check_call([
+        sys.executable, os.path.join(ROOT, 'tools', 'asdl_gen_js.py'),
+        os.path.join(ROOT, 'cool_ast.asdl'), '--instrument', '--no-cache',
+        '-o', instrumented])
+    samples = sorted(glob.glob(os.path.join(ROOT, 'cool_code_samples', '*.cl')))
+    output = subprocess.check_output(
+        [node, os.path.join(ROOT, 'ast_stats.js'), instrumented] + samples)
+    stats = json.loads(output.decode('utf-8'))
+
+    # Every node of the ASTs is walked once by the dump
+    assert stats['Program']['constructed'] == len(samples)
+    assert stats['Program']['forEachChild'] == len(samples)
+    for name in ('Class', 'Method', 'Dispatch', 'Obj'):
+        assert stats[name]['constructed'] > 0
+        assert stats[name]['forEachChild'] > 0
+    # Most constructed types first
+    constructed = [stats[name]['constructed'] for name in stats]
+    assert constructed == sorted(constructed, reverse=True)
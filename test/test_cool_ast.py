@@ -0,0 +1,260 @@
+#-------------------------------------------------------------------------------
+# Unit tests for cool_ast.py, the Python version of the AST.
+#
+# Run with: python -m pytest test/test_cool_ast.py
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import base64
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import cool_ast
+
+
+def test_construction():
+    obj = cool_ast.Obj('x', 3)
+    assert (obj.name, obj.loc) == ('x', 3)
+    assert cool_ast.NoExpr().loc is None
+    meth = cool_ast.Method('m', [cool_ast.Formal('a', 'Int', 1)], 'Int', obj, 2)
+    assert isinstance(meth, cool_ast.Feature)
+    assert meth.node_type == 'Method'
+    assert cool_ast.node_classes[meth.kind] is cool_ast.Method
+    assert cool_ast.node_types[meth.kind] == 'Method'
+    assert meth._fields == ('name', 'formals', 'return_type', 'expr')
+    assert meth.attributes == ('name', 'return_type')
+    assert list(meth.iter_child_nodes()) == [meth.formals[0], obj]
+    assert meth.children() == [('formals[0]', meth.formals[0]), ('expr', obj)]
+    assert cool_ast.Class('C', None, [], 1).children() == []
+    assert repr(obj) == "Obj(name='x')"
+
+    # Slotted: no per-instance dict
+    assert not hasattr(obj, '__dict__')
+    with pytest.raises(AttributeError):
+        obj.static_type = 'Int'
+
+    with pytest.raises(cool_ast.ASTError):
+        cool_ast.Expression()
+    with pytest.raises(cool_ast.ASTError):
+        cool_ast.Obj(1, 3)
+    with pytest.raises(cool_ast.ASTError):
+        cool_ast.IntConst(True, 3)
+    with pytest.raises(cool_ast.ASTError):
+        cool_ast.StringConst('no quotes', 3)
+    with pytest.raises(cool_ast.ASTError):
+        cool_ast.Block(cool_ast.NoExpr(), 3)
+    with pytest.raises(cool_ast.ASTError):
+        cool_ast.Block([cool_ast.Formal('a', 'Int')], 3)
+    with pytest.raises(cool_ast.ASTError):
+        cool_ast.Attr('a', 'Int', cool_ast.Formal('a', 'Int'))
+
+
+class ObjCollector(cool_ast.NodeVisitor):
+    # Doesn't call NodeVisitor.__init__
+    def __init__(self):
+        self.names = []
+
+    def visit_Obj(self, node):
+        self.names.append(node.name)
+
+    def visit_Let(self, node):
+        # Not visiting the children
+        return 'let'
+
+
+def test_visitor():
+    tree = cool_ast.Block([
+        cool_ast.Obj('a', 1),
+        cool_ast.Dispatch(cool_ast.Obj('b', 2), 'f', [cool_ast.Obj('c', 2)], 2),
+        cool_ast.Let([], cool_ast.Obj('d', 3), 3)], 1)
+    collector = ObjCollector()
+    collector.visit(tree)
+    assert collector.names == ['a', 'b', 'c']
+    assert collector.visit(tree.body[2]) == 'let'
+
+    # Subclasses get tables of their own
+    class AllObjs(ObjCollector):
+        visit_Let = cool_ast.NodeVisitor.visit_children
+    all_objs = AllObjs()
+    all_objs.visit(tree)
+    assert all_objs.names == ['a', 'b', 'c', 'd']
+
+    cool_ast.NodeVisitor().visit(tree)
+
+
+def _uint(v):
+    """ v as an LEB128 varint.
+    """
+    out = bytearray()
+    while v >= 128:
+        out.append(v % 128 | 128)
+        v //= 128
+    out.append(v)
+    return bytes(out)
+
+
+def _serialized(strings, body, version=1, schema_id=None):
+    """ A serialized AST with the given string table and encoded root node.
+    """
+    if schema_id is None:
+        schema_id = cool_ast.schema_id
+    data = b'CAST' + _uint(version) + _uint(schema_id) + _uint(len(strings))
+    for s in strings:
+        data += _uint(len(s)) + s
+    return data + body
+
+
+def test_deserialize():
+    obj = _uint(cool_ast.Obj.kind + 1) + _uint(5) + _uint(1)
+    node = cool_ast.deserialize(_serialized([b'foo'], obj))
+    assert isinstance(node, cool_ast.Obj)
+    assert (node.name, node.loc) == ('foo', 4)
+
+    block = (_uint(cool_ast.Block.kind + 1) + _uint(0) + _uint(2) +
+             _uint(cool_ast.IntConst.kind + 1) + _uint(1) + _uint(9) +
+             _uint(cool_ast.BoolConst.kind + 1) + _uint(1) + b'\x01')
+    node = cool_ast.deserialize(_serialized([], block))
+    assert node.loc is None
+    assert [n.node_type for n in node.body] == ['IntConst', 'BoolConst']
+    assert node.body[0].token == -5
+    assert node.body[1].value is True
+
+
+def test_deserialize_deep():
+    """ Trees far deeper than the recursion limit are read.
+    """
+    depth = 100000
+    # Left-deep chain of depth BinaryOps: x + 1 + 1 + ...
+    binop = _uint(cool_ast.BinaryOp.kind + 1) + _uint(0) + _uint(1)
+    body = (binop * depth +
+            _uint(cool_ast.Obj.kind + 1) + _uint(0) + _uint(2) +
+            (_uint(cool_ast.IntConst.kind + 1) + _uint(0) + _uint(2)) * depth)
+    node = cool_ast.deserialize(_serialized([b'+', b'x'], body))
+    for _ in range(depth):
+        assert (node.op, node.right.token) == ('+', 1)
+        node = node.left
+    assert node.name == 'x'
+
+    # Nested blocks, each with one Obj before the nested block
+    block = (_uint(cool_ast.Block.kind + 1) + _uint(0) + _uint(2) +
+             _uint(cool_ast.Obj.kind + 1) + _uint(0) + _uint(1))
+    body = block * depth + _uint(cool_ast.NoExpr.kind + 1) + _uint(0)
+    node = cool_ast.deserialize(_serialized([b'x'], body))
+    for _ in range(depth):
+        assert node.body[0].name == 'x'
+        node = node.body[1]
+    assert isinstance(node, cool_ast.NoExpr)
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'TSAC',
+    _serialized([], b'', version=2),
+    _serialized([], b'', schema_id=cool_ast.schema_id + 1),
+    # Truncated node, varint and string
+    _serialized([b'foo'], _uint(cool_ast.Obj.kind + 1) + _uint(5)),
+    _serialized([b'foo'], _uint(cool_ast.Obj.kind + 1) + b'\x85'),
+    _serialized([b'foo'], b'')[:-2],
+    # Bad string index, kind and UTF-8
+    _serialized([b'foo'], _uint(cool_ast.Obj.kind + 1) + _uint(5) + _uint(2)),
+    _serialized([], _uint(len(cool_ast.node_classes) + 1) + _uint(0)),
+    _serialized([b'\xff'], _uint(cool_ast.Obj.kind + 1) + _uint(0) + _uint(1)),
+])
+def test_deserialize_errors(data):
+    with pytest.raises(cool_ast.ASTError):
+        cool_ast.deserialize(data)
+
+
+def _js_value(v):
+    """ v as the JS AST prints it in dumps.
+    """
+    if v is None:
+        return 'null'
+    elif isinstance(v, bool):
+        return 'true' if v else 'false'
+    return str(v)
+
+
+def dump(node, depth=0):
+    """ The lines of ast_visitor.dump_ast(node, true) in the JS AST.
+    """
+    lines = ['%s%s(%s) @ loc: %s' % (
+        ' ' * depth, node.node_type,
+        ', '.join('%s=%s' % (name, _js_value(getattr(node, name)))
+                  for name in node.attributes),
+        'undefined' if node.loc is None else node.loc)]
+    for child in node.iter_child_nodes():
+        lines.extend(dump(child, depth + 4))
+    return lines
+
+
+# Serializes the Cool samples and a tree of all the attribute types with the JS
+# AST, printing a JSON list of [name, base64 bytes, dump] entries.
+_JS_SERIALIZE = r'''
+var fs = require('fs');
+var path = require('path');
+var ast = require('./cool_ast');
+var ast_visitor = require('./ast_visitor');
+var parser = require('./parser');
+
+var trees = [['attributes', new ast.Class('C', null, [
+    new ast.Attr('a', 'Int', new ast.Block([
+        new ast.IntConst(-5, 1), new ast.IntConst(Math.pow(2, 52) - 1, 2),
+        new ast.BoolConst(true), new ast.BoolConst(false, 0),
+        new ast.StringConst('"héllo 😀"', 300)], 1), 2)], 3)]];
+fs.readdirSync('cool_code_samples').sort().forEach(function(name) {
+  var source = fs.readFileSync(path.join('cool_code_samples', name), 'utf8');
+  trees.push([name, new parser.Parser().parse(source)]);
+});
+console.log(JSON.stringify(trees.map(function(entry) {
+  return [entry[0], Buffer.from(ast.serialize(entry[1])).toString('base64'),
+          ast_visitor.dump_ast(entry[1], true)];
+})));
+'''
+
+
+def test_deserialize_js():
+    """ ASTs serialized by the JS AST load as the same trees in Python.
+    """
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip('node is not installed')
+    output = subprocess.check_output([node, '-e', _JS_SERIALIZE], cwd=ROOT)
+    entries = json.loads(output.decode('utf-8'))
+    assert len(entries) > 1
+    for name, data, expected in entries:
+        tree = cool_ast.deserialize(base64.b64decode(data))
+        assert '\n'.join(dump(tree)) == expected, name
+
+
+def test_deserialize_js_deep():
+    """ A long chain of binary operators serialized by the JS AST loads in
+        Python.
+    """
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip('node is not installed')
+    terms = 4000
+    output = subprocess.check_output([node, '-e', r'''
+        var ast = require('./cool_ast');
+        var parser = require('./parser');
+        var source = 'class Main { main() : Int { 1' +
+                     new Array(%d).join(' + 1') + ' }; };';
+        var bytes = ast.serialize(new parser.Parser().parse(source));
+        console.log(Buffer.from(bytes).toString('base64'));
+        ''' % terms], cwd=ROOT)
+    program = cool_ast.deserialize(base64.b64decode(output))
+    expr = program.classes[0].features[0].expr
+    for _ in range(terms - 1):
+        assert expr.op == '+' and expr.right.token == 1
+        expr = expr.left
+    assert expr.token == 1
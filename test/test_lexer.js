@@ -3,7 +3,14 @@
 'use strict';
 
 var assert = require('assert');
-var lexer = require('../lexer');
+var fs = require('fs');
+var path = require('path');
+var reference_lexer = require('../lexer');
+var generated_lexer = require('../cool_lexer');
+
+// The lexer module under test: the tests run over both the hand-written lexer
+// and the table-driven one generated from cool_tokens.json.
+var lexer = null;
 
 // Assert that lexing str produces the expected tokens, without any errors.
 // The expected tokens is an array of objects. These objects must have .name
@@ -42,6 +49,14 @@ var assert_lexer_errors = function(str, expected_errors) {
 
 
 var test = function() {
+  [reference_lexer, generated_lexer].forEach(function(m) {
+    lexer = m;
+    token_tests();
+  });
+  equivalence_tests();
+}
+
+var token_tests = function() {
   // Basic tokens
   assert_lexer_tokens('foobar 123', [
     {"name":"IDENTIFIER","value":"foobar"},
@@ -127,6 +142,35 @@ var test = function() {
     { name: 'IDENTIFIER', value: 'out', lineno: 3 }]);
 }
 
+// The generated lexer produces exactly the tokens and errors of the reference
+// one, on the samples and on random strings of chars that start tokens,
+// comments and strings.
+var equivalence_tests = function() {
+  var assert_same = function(str) {
+    assert.deepEqual(generated_lexer.lex_all(str),
+                     reference_lexer.lex_all(str), JSON.stringify(str));
+  };
+  var samples_dir = path.join(__dirname, '..', 'cool_code_samples');
+  fs.readdirSync(samples_dir).forEach(function(name) {
+    assert_same(fs.readFileSync(path.join(samples_dir, name), 'utf8'));
+  });
+
+  var chars = ['a', 'f', 'i', 's', 'Z', '_', '1', ' ', '\t', '\n', '"', '\\',
+               '(', '*', ')', '-', '<', '=', '>', '$', '\u00e9'];
+  var seed = 1;
+  var random = function(n) {
+    seed = (seed * 1103515245 + 12345) % 2147483648;
+    return seed % n;
+  };
+  for (var i = 0; i < 5000; i++) {
+    var str = '';
+    for (var len = random(30); len > 0; len--) {
+      str += chars[random(chars.length)];
+    }
+    assert_same(str);
+  }
+}
+
 
 if (module.parent === null) {
   test();
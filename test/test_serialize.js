@@ -0,0 +1,120 @@
+// Unit tests for AST serialization
+
+'use strict';
+
+var assert = require('assert');
+var fs = require('fs');
+var path = require('path');
+var ast = require('../cool_ast');
+var parser = require('../parser');
+
+
+var test = function() {
+  basic_tests();
+  error_tests();
+  samples_roundtrip_tests();
+}
+
+// Serializes node, deserializes the result and checks that the same tree came
+// back. Returns the serialized bytes.
+var assert_roundtrip = function(node) {
+  var bytes = ast.serialize(node);
+  assert.ok(bytes instanceof Uint8Array);
+  var node2 = ast.deserialize(bytes);
+  assert.ok(node2.equals(node));
+  // Serialization is deterministic
+  assert.deepEqual(ast.serialize(node2), bytes);
+  return bytes;
+}
+
+var basic_tests = function() {
+  var attr1 = new ast.Attr('attr1', 'f', new ast.New('int', 8), 10);
+  var attr2 = new ast.Attr('attr2', 'ff', new ast.NoExpr(), 10);
+  var cls = new ast.Class('c', null, [attr1, attr2], 9);
+  assert_roundtrip(cls);
+
+  // Attribute types and missing locs
+  var node = ast.deserialize(ast.serialize(new ast.Block([
+      new ast.IntConst(-5, 1), new ast.IntConst(1e12, 2),
+      new ast.BoolConst(true), new ast.BoolConst(false, 0),
+      new ast.StringConst('"héllo 😀"', 300)], 1)));
+  assert.strictEqual(node.body[0].token, -5);
+  assert.strictEqual(node.body[1].token, 1e12);
+  assert.strictEqual(node.body[2].value, true);
+  assert.strictEqual(node.body[2].loc, undefined);
+  assert.strictEqual(node.body[3].value, false);
+  assert.strictEqual(node.body[3].loc, 0);
+  assert.strictEqual(node.body[4].str, '"héllo 😀"');
+  assert.strictEqual(node.body[4].loc, 300);
+
+  // Identifiers are stored once
+  var obj = new ast.Obj('a_rather_long_identifier', 1);
+  var one = ast.serialize(new ast.Block([obj], 1)).length;
+  var two = ast.serialize(new ast.Block([obj, obj], 1)).length;
+  assert.equal(two - one, 3);
+}
+
+var error_tests = function() {
+  var bytes = ast.serialize(new ast.Obj('foo', 1));
+  assert.throws(function() { ast.deserialize(bytes.subarray(1)); },
+                ast.ASTError);
+  assert.throws(function() {
+                  ast.deserialize(bytes.subarray(0, bytes.length - 1));
+                },
+                ast.ASTError);
+
+  // Corrupt string table and string index
+  var foo = Buffer.from(bytes).indexOf('foo');
+  assert.throws(function() { ast.deserialize(bytes.subarray(0, foo + 2)); },
+                /Truncated serialized AST/);
+  var corrupt = bytes.slice();
+  corrupt[foo] = 0xff;
+  assert.throws(function() { ast.deserialize(corrupt); },
+                /Invalid UTF-8 string/);
+  corrupt = bytes.slice();
+  corrupt[corrupt.length - 1] = 2;
+  assert.throws(function() { ast.deserialize(corrupt); },
+                /Unknown string index 1/);
+  // A BOM is kept as any other character
+  var bom = new ast.StringConst('"\ufeff"', 1);
+  assert.ok(ast.deserialize(ast.serialize(bom)).equals(bom));
+  // Unpaired surrogates have no UTF-8 encoding
+  ['"\ud800"', '"\udc00x"', '"a\ud83d"'].forEach(function(str) {
+    assert.throws(function() { ast.serialize(new ast.StringConst(str, 1)); },
+                  ast.ASTError);
+  });
+
+  // Values the encoding can't represent exactly are rejected rather than
+  // encoded as something else
+  assert.throws(function() { new ast.IntConst(1.5, 1); }, ast.ASTError);
+  assert.throws(function() { new ast.IntConst(Math.pow(2, 53), 1); },
+                ast.ASTError);
+  var bad_int = new ast.IntConst(1, 1);
+  bad_int.token = 1.5;
+  assert.throws(function() { ast.serialize(bad_int); }, ast.ASTError);
+  bad_int.token = -Math.pow(2, 60);
+  assert.throws(function() { ast.serialize(bad_int); }, ast.ASTError);
+  assert.throws(function() { ast.serialize(new ast.Obj('x', -2)); },
+                ast.ASTError);
+  assert.throws(function() { ast.serialize(new ast.Obj('x', 0.5)); },
+                ast.ASTError);
+  var big = Math.pow(2, 52) - 1;
+  [big, -big].forEach(function(token) {
+    assert.strictEqual(
+        ast.deserialize(ast.serialize(new ast.IntConst(token, 1))).token,
+        token);
+  });
+}
+
+var samples_roundtrip_tests = function() {
+  var samples_dir = path.join(__dirname, '..', 'cool_code_samples');
+  fs.readdirSync(samples_dir).forEach(function(name) {
+    var source = fs.readFileSync(path.join(samples_dir, name), 'utf8');
+    var bytes = assert_roundtrip(new parser.Parser().parse(source));
+    assert.ok(bytes.length < source.length);
+  });
+}
+
+if (module.parent === null) {
+  test();
+}
@@ -0,0 +1,211 @@
+// Unit tests for the table-driven AST module, checked against the object one
+
+'use strict';
+
+var assert = require('assert');
+var fs = require('fs');
+var path = require('path');
+var ast = require('../cool_ast');
+var table_ast = require('../cool_ast_table');
+var ast_visitor = require('../ast_visitor');
+var parser = require('../parser');
+
+
+var test = function() {
+  interface_tests();
+  node_tests();
+  error_tests();
+  interning_tests();
+  samples_tests();
+}
+
+var interface_tests = function() {
+  assert.deepEqual(Object.keys(table_ast).sort(), Object.keys(ast).sort());
+  assert.deepEqual(table_ast.node_types, ast.node_types);
+  assert.deepEqual(table_ast.builder.kinds, ast.builder.kinds);
+  assert.deepEqual(Object.keys(table_ast.builder).sort(),
+                   Object.keys(ast.builder).sort());
+  assert.strictEqual(table_ast.schema_id, ast.schema_id);
+  table_ast.node_types.forEach(function(name, kind) {
+    var cls = table_ast.node_classes[kind];
+    assert.strictEqual(table_ast[name], cls);
+    assert.strictEqual(cls.prototype.kind, kind);
+    assert.strictEqual(cls.node_type, name);
+    assert.deepEqual(cls.attributes, ast[name].attributes);
+  });
+  assert.ok(new table_ast.Cond(new table_ast.NoExpr(), new table_ast.NoExpr(),
+                               new table_ast.NoExpr(), 1)
+            instanceof table_ast.Expression);
+  assert.ok(table_ast.Expression.prototype instanceof table_ast.Node);
+  assert.throws(function() { new table_ast.Expression(); }, table_ast.ASTError);
+  assert.throws(function() { new table_ast.Node(); }, table_ast.ASTError);
+}
+
+var node_tests = function() {
+  var make = function(m) {
+    var args = [new m.IntConst(1, 2), new m.StringConst('"s"', 2)];
+    var call = new m.Dispatch(new m.Obj('self', 2), 'f', args, 2);
+    return new m.Class('C', null, [
+        new m.Method('m', [new m.Formal('x', 'Int', 1)], 'Int',
+                     new m.Cond(new m.BoolConst(true, 3), call,
+                                new m.NoExpr(4), 3), 1),
+        new m.Attr('a', 'Int', new m.IsVoid(new m.New('A', 5), 5), 5)], 1);
+  }
+  var tree = make(ast);
+  var table_tree = make(table_ast);
+  var cond = table_tree.features[0].expr;
+
+  assert.strictEqual(table_tree.name, 'C');
+  assert.strictEqual(table_tree.parent, null);
+  assert.strictEqual(table_tree.loc, 1);
+  assert.strictEqual(ast_visitor.dump_ast(table_tree, true),
+                     ast_visitor.dump_ast(tree, true));
+  assert.strictEqual(table_tree.structuralHash(), tree.structuralHash());
+  assert.ok(table_tree.equals(make(table_ast)));
+  assert.ok(!table_tree.equals(cond));
+  assert.ok(!cond.equals(new table_ast.Cond(cond.pred, cond.then_exp,
+                                            cond.else_exp, 4)));
+  assert.ok(cond.equals(new table_ast.Cond(cond.pred, cond.then_exp,
+                                           cond.else_exp, 4),
+                        {ignoreLoc: true}));
+
+  // Children, from the specialized children() methods too
+  assert.deepEqual(cond.children().map(function(child) {
+    return child.name;
+  }), ['pred', 'then_exp', 'else_exp']);
+  assert.strictEqual(new table_ast.Obj('x', 1).children().length, 0);
+  assert.deepEqual(cond.then_exp.children().map(function(child) {
+    return child.name;
+  }), ['expr', 'actual[0]', 'actual[1]']);
+
+  // Serialization is compatible both ways
+  var bytes = ast.serialize(tree);
+  assert.deepEqual(table_ast.serialize(table_tree), bytes);
+  assert.ok(table_ast.deserialize(bytes).equals(table_tree));
+  assert.ok(ast.deserialize(table_ast.serialize(table_tree)).equals(tree));
+
+  // Transformations
+  var rename = function(m) {
+    var Renamer = function() {
+      m.GeneratedTransformer.call(this);
+    };
+    Renamer.prototype = Object.create(m.GeneratedTransformer.prototype);
+    Renamer.prototype.transform_Obj = function(node) {
+      return new m.Obj('other', node.loc);
+    };
+    return Renamer;
+  };
+  var TableRenamer = rename(table_ast);
+  var renamed = new TableRenamer().transform(table_tree);
+  assert.ok(renamed instanceof table_ast.Class);
+  assert.strictEqual(ast_visitor.dump_ast(renamed, true),
+                     ast_visitor.dump_ast(new (rename(ast))().transform(tree),
+                                          true));
+  assert.strictEqual(renamed.features[1], table_tree.features[1]);
+  assert.strictEqual(renamed.features[0].formals,
+                     table_tree.features[0].formals);
+  assert.strictEqual(new table_ast.GeneratedTransformer().transform(table_tree),
+                     table_tree);
+
+  // Walkers and kind index
+  var types = function(m, walk, root) {
+    var result = [];
+    m[walk](root, function(node) { result.push(m.node_types[node.kind]); });
+    return result;
+  };
+  ['walkPreorder', 'walkPostorder'].forEach(function(walk) {
+    assert.deepEqual(types(table_ast, walk, table_tree),
+                     types(ast, walk, tree));
+  });
+  var index = table_ast.buildKindIndex(table_tree);
+  assert.deepEqual(index.ofKind(table_ast.Obj), [cond.then_exp.expr]);
+  assert.deepEqual(index.ofKind(table_ast.Expression).map(function(node) {
+                     return table_ast.node_types[node.kind];
+                   }),
+                   ast.buildKindIndex(tree).ofKind(ast.Expression).map(
+                       function(node) { return ast.node_types[node.kind]; }));
+  assert.strictEqual(index.parentOf(cond), table_tree.features[0]);
+  index.replace(cond.pred, new table_ast.BoolConst(false, 3));
+  assert.strictEqual(cond.pred.value, false);
+  assert.deepEqual(index.ofKind(table_ast.BoolConst), [cond.pred]);
+}
+
+var error_tests = function() {
+  // The same checks and messages as in the object module
+  var message = function(m, make) {
+    try {
+      make(m);
+    } catch (e) {
+      assert.ok(e instanceof m.ASTError);
+      return e.message;
+    }
+    assert.fail('no ASTError');
+  };
+  [function(m) { return new m.Cond(1, new m.NoExpr(), new m.NoExpr(), 1); },
+   function(m) { return new m.Obj(42, 7); },
+   function(m) { return new m.Class('C', 5, [], 1); },
+   function(m) { return new m.Block('x', 1); },
+   function(m) { return new m.Block([new m.Formal('a', 'b', 1)], 1); },
+   function(m) { return new m.StringConst('no quotes', 2); },
+   function(m) { return new m.BoolConst(0, 2); },
+   function(m) { return m.deserialize(new Uint8Array([1, 2, 3])); }
+  ].forEach(function(make) {
+    assert.strictEqual(message(table_ast, make), message(ast, make));
+  });
+  // Class's parent is optional
+  new table_ast.Class('C', null, [], 1);
+}
+
+var interning_tests = function() {
+  assert.notStrictEqual(table_ast.NoExpr.of(), table_ast.NoExpr.of());
+  assert.strictEqual(table_ast.NoExpr.of(3).loc, 3);
+  assert.notStrictEqual(table_ast.IntConst.of(1, 2),
+                        table_ast.IntConst.of(1, 2));
+  try {
+    table_ast.set_interning('loc', 2);
+    var n1 = table_ast.NoExpr.of();
+    assert.strictEqual(table_ast.builder.NoExpr(), n1);
+    assert.ok(Object.isFrozen(n1));
+    assert.strictEqual(table_ast.NoExpr.of(3).loc, 3);
+    var i1 = table_ast.IntConst.of(1, 2);
+    assert.strictEqual(table_ast.builder.IntConst(1, 2), i1);
+    assert.ok(Object.isFrozen(i1));
+    assert.notStrictEqual(table_ast.IntConst.of(1, 3), i1);
+    // The table is full: emptied for the next new node
+    table_ast.IntConst.of(2, 2);
+    assert.notStrictEqual(table_ast.IntConst.of(1, 2), i1);
+    table_ast.set_interning('noloc');
+    assert.strictEqual(table_ast.Formal.of('a', 'Int', 4).loc, undefined);
+    assert.strictEqual(table_ast.Formal.of('a', 'Int', 4),
+                       table_ast.Formal.of('a', 'Int', 5));
+  } finally {
+    table_ast.set_interning('off');
+  }
+  assert.throws(function() { table_ast.set_interning('on'); },
+                table_ast.ASTError);
+  // Only leaves with builtin fields are interned
+  assert.strictEqual(table_ast.Cond.of, undefined);
+}
+
+var samples_tests = function() {
+  var samples_dir = path.join(__dirname, '..', 'cool_code_samples');
+  fs.readdirSync(samples_dir).forEach(function(name) {
+    var source = fs.readFileSync(path.join(samples_dir, name), 'utf8');
+    var tree = new parser.Parser().parse(source);
+    var table_tree = new parser.Parser(table_ast.builder).parse(source);
+    assert.ok(table_tree instanceof table_ast.Program, name);
+    assert.strictEqual(ast_visitor.dump_ast(table_tree, true),
+                       ast_visitor.dump_ast(tree, true), name);
+    assert.strictEqual(ast_visitor.dump_ast(table_tree, true),
+                       new ast_visitor.NodeDumper(true).visit(table_tree),
+                       name);
+    assert.strictEqual(table_tree.structuralHash(), tree.structuralHash(),
+                       name);
+    assert.deepEqual(table_ast.serialize(table_tree), ast.serialize(tree),
+                     name);
+  });
+}
+
+if (module.parent === null) {
+  test();
+}
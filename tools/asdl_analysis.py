@@ -0,0 +1,190 @@
+#-------------------------------------------------------------------------------
+# Analysis of the type graph of an ASDL module.
+#
+# asdl_ast.check verifies that a module is well formed; this pass computes
+# facts about the shape of its types that the generators use to specialize
+# the code they emit:
+#
+# * Leaves: constructors without node-typed fields, i.e. without children.
+# * Maximum static child count of each constructor: the number of its
+#   node-typed fields, or None if one of them is a sequence.
+# * Recursive types: types that can (indirectly) contain themselves, i.e.
+#   types in a cycle of the graph whose edges go from each type to the types
+#   of its constructors' fields.
+# * Reachability of the types from a root type.
+#
+# Everything is computed in time linear in the size of the module.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import sys
+
+import asdl_ast
+
+
+class Analysis:
+    """ The facts computed for a module. Constructors are identified by
+        name; a product type is its own single constructor.
+
+        root: the type reachability is computed from.
+        type_edges: type name -> list of the node types its fields refer to,
+            without duplicates.
+        leaves: set of the names of constructors without children.
+        max_children: constructor name -> maximum number of children, or None
+            if unbounded.
+        recursive: set of the names of recursive types.
+        reachable: set of the names of types reachable from root (including
+            root itself).
+        unreachable: sorted list of the names of the other types.
+    """
+    def __init__(self, module, root=None):
+        if root is None:
+            root = module.dfns[0].name if module.dfns else None
+        elif root not in module.types:
+            raise ValueError('Unknown root type %s' % root)
+        self.root = root
+        self.type_edges = {}
+        self.leaves = set()
+        self.max_children = {}
+        self._index(module)
+        self.recursive = self._recursive_types()
+        self.reachable = self._reachable_from(root)
+        self.unreachable = sorted(name for name in self.type_edges
+                                  if name not in self.reachable)
+
+    def is_leaf(self, constructor):
+        return constructor.name in self.leaves
+
+    def is_fixed_arity(self, constructor):
+        """ Does constructor have a bounded number of children (no sequences
+            of nodes)?
+        """
+        return self.max_children[constructor.name] is not None
+
+    def _index(self, module):
+        for dfn in module.dfns:
+            self.type_edges[dfn.name] = []
+            for constructor in _constructors(dfn):
+                count = 0
+                for field in constructor.fields:
+                    if field.type in asdl_ast.builtin_types:
+                        continue
+                    if count is not None:
+                        count = None if field.seq else count + 1
+                self.max_children[constructor.name] = count
+                if count == 0:
+                    self.leaves.add(constructor.name)
+        # The edges come from the module's index of the fields of each type:
+        # module.uses lists the constructors and product types with fields of
+        # a type, and module.constructor_type maps the constructors to their
+        # types.
+        for type, owners in module.uses.items():
+            if type in asdl_ast.builtin_types:
+                continue
+            for owner in owners:
+                edges = self.type_edges[module.constructor_type.get(owner,
+                                                                    owner)]
+                if not edges or edges[-1] != type:
+                    edges.append(type)
+
+    def _recursive_types(self):
+        """ Find the types in cycles with Tarjan's strongly connected
+            components algorithm, iteratively so that deep schemas don't
+            overflow the stack.
+        """
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        recursive = set()
+        counter = 0
+        for start in self.type_edges:
+            if start in index:
+                continue
+            work = [(start, iter(self.type_edges[start]))]
+            index[start] = lowlink[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                name, edges = work[-1]
+                for target in edges:
+                    if target not in self.type_edges:
+                        continue
+                    if target not in index:
+                        index[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.type_edges[target])))
+                        break
+                    elif target in on_stack:
+                        lowlink[name] = min(lowlink[name], index[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[name])
+                    if lowlink[name] == index[name]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == name:
+                                break
+                        if (len(component) > 1 or
+                                name in self.type_edges[name]):
+                            recursive.update(component)
+        return recursive
+
+    def _reachable_from(self, root):
+        if root is None:
+            return set()
+        reachable = {root}
+        pending = [root]
+        while pending:
+            for target in self.type_edges.get(pending.pop(), ()):
+                if target in self.type_edges and target not in reachable:
+                    reachable.add(target)
+                    pending.append(target)
+        return reachable
+
+
+def _constructors(dfn):
+    """ The constructors of a type definition; a product is treated as a
+        constructor named after its type.
+    """
+    if isinstance(dfn.value, asdl_ast.Sum):
+        return dfn.value.types
+    return [asdl_ast.Constructor(dfn.name, dfn.value.fields)]
+
+
+def analyze(module, root=None):
+    """ Analyze module, computing reachability from the type named root
+        (default: the first type defined). Return an Analysis.
+    """
+    return Analysis(module, root)
+
+
+def strip_unreachable(module, analysis):
+    """ Return a copy of module without the types analysis found unreachable.
+    """
+    return asdl_ast.Module(module.name, [dfn for dfn in module.dfns
+                                         if dfn.name in analysis.reachable])
+
+
+if __name__ == '__main__':
+    import asdl_parser
+    module = asdl_parser.parse_file(sys.argv[1])
+    if not asdl_ast.check(module):
+        sys.exit(1)
+    analysis = analyze(module, sys.argv[2] if len(sys.argv) > 2 else None)
+    print('root: %s' % analysis.root)
+    print('recursive types: %s' % ', '.join(sorted(analysis.recursive)))
+    print('unreachable types: %s' % ', '.join(analysis.unreachable))
+    print('leaves: %s' % ', '.join(sorted(analysis.leaves)))
+    for name, count in sorted(analysis.max_children.items()):
+        print('  %s: %s children' % (name, 'any' if count is None else
+                                     'at most %d' % count))
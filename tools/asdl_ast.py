@@ -5,40 +5,98 @@
 #
 # Taken from Python's Parser/asdl.py and adapted a bit for 3.4+.
 
+import sys
+
 builtin_types = set(
     ['boolean', 'identifier', 'string', 'bytes', 'int', 'object', 'singleton'])
 
-class AST: pass # a marker class
+# The meta-AST classes have __slots__, and the names they hold are interned:
+# schemas can have tens of thousands of fields, whose type names are mostly
+# the same few strings.
+
+def _intern(name):
+    return None if name is None else sys.intern(name)
+
+class AST: # a marker class
+    __slots__ = ()
 
 class Module(AST):
+    """ A parsed ASDL module. types maps type names to their values (Sum or
+        Product). The module is indexed when created:
+
+        constructor_type: constructor name -> name of the type defining it
+            (the first one, if the constructor is defined several times).
+        uses: type name -> names of the constructors (or product types) with
+            a field of that type, once per field, for all the field types,
+            including the builtin and undefined ones.
+        fields_by_type: type name -> the fields of that type.
+    """
+    __slots__ = ('name', 'dfns', 'types', 'constructor_type', 'uses',
+                 'fields_by_type', '_redefinitions')
+
     def __init__(self, name, dfns):
-        self.name = name
+        self.name = _intern(name)
         self.dfns = dfns
         self.types = {type.name: type.value for type in dfns}
+        self._index()
+
+    def _index(self):
+        self.constructor_type = {}
+        self.uses = {}
+        self.fields_by_type = {}
+        # (constructor, first type, other type) for each redefinition
+        self._redefinitions = []
+        for dfn in self.dfns:
+            if isinstance(dfn.value, Sum):
+                for cons in dfn.value.types:
+                    first = self.constructor_type.get(cons.name)
+                    if first is None:
+                        self.constructor_type[cons.name] = dfn.name
+                    else:
+                        self._redefinitions.append((cons.name, first,
+                                                    dfn.name))
+                    self._index_fields(cons.name, cons.fields)
+            else:
+                self._index_fields(dfn.name, dfn.value.fields)
+
+    def _index_fields(self, owner, fields):
+        for field in fields:
+            uses = self.uses.get(field.type)
+            if uses is None:
+                uses = self.uses[field.type] = []
+                self.fields_by_type[field.type] = []
+            uses.append(owner)
+            self.fields_by_type[field.type].append(field)
 
     def __repr__(self):
         return "Module(%s, %s)" % (self.name, self.dfns)
 
 class Type(AST):
+    __slots__ = ('name', 'value')
+
     def __init__(self, name, value):
-        self.name = name
+        self.name = _intern(name)
         self.value = value
 
     def __repr__(self):
         return "Type(%s, %s)" % (self.name, self.value)
 
 class Constructor(AST):
+    __slots__ = ('name', 'fields')
+
     def __init__(self, name, fields=None):
-        self.name = name
+        self.name = _intern(name)
         self.fields = fields or []
 
     def __repr__(self):
         return "Constructor(%s, %s)" % (self.name, self.fields)
 
 class Field(AST):
+    __slots__ = ('type', 'name', 'seq', 'opt')
+
     def __init__(self, type, name=None, seq=False, opt=False):
-        self.type = type
-        self.name = name
+        self.type = _intern(type)
+        self.name = _intern(name)
         self.seq = seq
         self.opt = opt
 
@@ -55,6 +113,8 @@ class Field(AST):
             return "Field(%s, %s%s)" % (self.type, self.name, extra)
 
 class Sum(AST):
+    __slots__ = ('types', 'attributes')
+
     def __init__(self, types, attributes=None):
         self.types = types
         self.attributes = attributes or []
@@ -66,6 +126,8 @@ class Sum(AST):
             return "Sum(%s)" % self.types
 
 class Product(AST):
+    __slots__ = ('fields', 'attributes')
+
     def __init__(self, fields, attributes=None):
         self.fields = fields
         self.attributes = attributes or []
@@ -96,44 +158,42 @@ class VisitorBase:
                 print("Error visiting %r: %s" % (obj, e))
                 raise
 
-class Check(VisitorBase):
-    def __init__(self):
-        super().__init__()
-        self.cons = {}
-        self.errors = 0
-        self.types = {}
-
-    def visitModule(self, mod):
-        for dfn in mod.dfns:
-            self.visit(dfn)
-
-    def visitType(self, type):
-        self.visit(type.value, str(type.name))
-
-    def visitSum(self, sum, name):
-        for t in sum.types:
-            self.visit(t, name)
-
-    def visitConstructor(self, cons, name):
-        key = str(cons.name)
-        conflict = self.cons.get(key)
-        if conflict is None:
-            self.cons[key] = name
-        else:
-            print("Redefinition of constructor %s" % key)
-            print("Defined in %s and %s" % (conflict, name))
-            self.errors += 1
-        for f in cons.fields:
-            self.visit(f, key)
+class CheckError:
+    """ An error found by validate. kind is 'redefinition' for a constructor
+        defined more than once, with sites the names of the first type
+        defining it and of another one; or 'undefined' for an undefined type,
+        with sites the names of the constructors using it. name is the name
+        of the constructor or type.
+    """
+    __slots__ = ('kind', 'name', 'sites')
 
-    def visitField(self, field, name):
-        key = str(field.type)
-        l = self.types.setdefault(key, [])
-        l.append(name)
+    def __init__(self, kind, name, sites):
+        self.kind = kind
+        self.name = name
+        self.sites = sites
+
+    def __str__(self):
+        if self.kind == 'redefinition':
+            return "Redefinition of constructor %s\nDefined in %s and %s" % (
+                self.name, self.sites[0], self.sites[1])
+        return "Undefined type %s, used in %s" % (self.name,
+                                                  ", ".join(self.sites))
 
-    def visitProduct(self, prod, name):
-        for f in prod.fields:
-            self.visit(f, name)
+    def __repr__(self):
+        return "CheckError(%s, %s, %s)" % (self.kind, self.name, self.sites)
+
+def validate(mod):
+    """Check the parsed ASDL tree for correctness, from the indexes of mod.
+
+    Return the list of CheckErrors found, in the order of the definitions
+    for redefinitions, then of the first uses for undefined types.
+    """
+    errors = [CheckError('redefinition', name, [first, other])
+              for name, first, other in mod._redefinitions]
+    for t, uses in mod.uses.items():
+        if t not in mod.types and t not in builtin_types:
+            errors.append(CheckError('undefined', t, uses))
+    return errors
 
 def check(mod):
     """Check the parsed ASDL tree for correctness.
@@ -141,14 +201,7 @@ def check(mod):
     Return True if success. For failure, the errors are printed out and False
     is returned.
     """
-    v = Check()
-    v.visit(mod)
-
-    for t in v.types:
-        if t not in mod.types and not t in builtin_types:
-            v.errors += 1
-            uses = ", ".join(v.types[t])
-            print("Undefined type %s, used in %s" % (t, uses))
-
-    return not v.errors
-
+    errors = validate(mod)
+    for error in errors:
+        print(error)
+    return not errors
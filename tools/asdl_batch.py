@@ -0,0 +1,223 @@
+#-------------------------------------------------------------------------------
+# Batch generation of AST code from ASDL.
+#
+# Runs many generation jobs in one process instead of one interpreter launch
+# per output. The jobs are listed in a JSON manifest:
+#
+#   {"jobs": [
+#     {"schema": "cool_ast.asdl", "output": "cool_ast.js"},
+#     {"schema": "cool_ast.asdl", "output": "cool_ast_arena.js",
+#      "backend": "arena"},
+#     {"schema": "cool_ast.asdl", "output": "cool_ast.py", "generator": "py"}
+#   ]}
+#
+# "generator" is "js" (asdl_gen_js, the default) or "py" (asdl_gen_py). All
+# other keys besides "schema" and "output" are passed to the generator's
+# EmitOptions ("profile", "backend"...). Relative paths are relative to the
+# manifest's directory.
+#
+# Each schema is parsed and checked once, in the main process, and shared by
+# all the jobs using it. Emission runs on a pool of worker processes; the
+# outputs are written atomically and only if they change. A failing job is
+# reported without stopping the others.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import io
+import json
+import os
+import sys
+import time
+
+import asdl_cache
+import asdl_gen_js
+import asdl_gen_py
+import asdl_parser
+
+GENERATORS = {'js': asdl_gen_js, 'py': asdl_gen_py}
+
+
+class Job:
+    """ One generation job of the manifest. error is set to a message if the
+        job fails; seconds is the time its emission took.
+    """
+    def __init__(self, schema, output, generator, options):
+        self.schema = schema
+        self.output = output
+        self.generator = generator
+        self.options = options
+        self.error = None
+        self.seconds = 0.0
+        self.cached = False
+        self.written = False
+
+
+def load_manifest(filename):
+    """ Read the manifest in filename and return a list of Jobs. Jobs with
+        invalid entries come back with their error already set.
+    """
+    with open(filename) as f:
+        manifest = json.load(f)
+    basedir = os.path.dirname(os.path.abspath(filename))
+    jobs = []
+    for entry in manifest['jobs']:
+        entry = dict(entry)
+        schema = os.path.join(basedir, entry.pop('schema'))
+        output = os.path.join(basedir, entry.pop('output'))
+        generator = entry.pop('generator', 'js')
+        job = Job(schema, output, generator, None)
+        try:
+            job.options = GENERATORS[generator].EmitOptions(**entry)
+        except KeyError:
+            job.error = 'unknown generator %r' % generator
+        except (TypeError, ValueError) as e:
+            job.error = 'bad options: %s' % e
+        jobs.append(job)
+    return jobs
+
+
+def _captured(func, *args):
+    """ Call func(*args), capturing what it prints (the toolchain reports
+        errors by printing them, and exits on some). Return (result, text),
+        with result None if func exits.
+    """
+    out = io.StringIO()
+    saved = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = out
+    try:
+        return func(*args), out.getvalue()
+    except SystemExit:
+        return None, out.getvalue()
+    finally:
+        sys.stdout, sys.stderr = saved
+
+
+def _emit(generator, ast, options):
+    stream = io.StringIO()
+    GENERATORS[generator].emit_ast(stream, ast, options)
+    return stream.getvalue().encode('utf-8')
+
+
+def emit_job(generator, ast, options):
+    """ Run in a worker process: emit the code for ast. Return (output bytes
+        or None, error text, seconds).
+    """
+    start = time.perf_counter()
+    try:
+        output, text = _captured(_emit, generator, ast, options)
+    except Exception as e:
+        output, text = None, '%s: %s' % (type(e).__name__, e)
+    return output, text.strip(), time.perf_counter() - start
+
+
+def run_batch(jobs, cache, workers=None):
+    """ Run the jobs, filling in their results. Schemas are loaded through
+        cache; emission runs on a pool of the given number of worker
+        processes (default: one per core), or in this process if workers is
+        1. Return a dict mapping schema filenames to their parse times.
+    """
+    modules = {}
+    parse_times = {}
+    for job in jobs:
+        if job.error is None and job.schema not in modules:
+            start = time.perf_counter()
+            try:
+                (key, ast), text = _captured(cache.load_module, job.schema)
+            except asdl_parser.ASDLSyntaxError as e:
+                key, ast, text = None, None, str(e)
+            except Exception as e:
+                key, ast, text = None, None, '%s: %s' % (type(e).__name__, e)
+            parse_times[job.schema] = time.perf_counter() - start
+            modules[job.schema] = key, ast, text.strip()
+
+    pending = []
+    for job in jobs:
+        if job.error is not None:
+            continue
+        key, ast, text = modules[job.schema]
+        if ast is None:
+            job.error = 'schema %s: %s' % (os.path.relpath(job.schema),
+                                               text or 'invalid')
+            continue
+        output = cache.get_output(key, (job.generator, job.options))
+        if output is not None:
+            job.cached = True
+            job.written = asdl_cache.write_if_changed(job.output, output)
+        else:
+            pending.append(job)
+
+    def finish(job, result):
+        output, text, job.seconds = result
+        if output is None:
+            job.error = text or 'emission failed'
+            return
+        key = modules[job.schema][0]
+        cache.put_output(key, (job.generator, job.options), output)
+        job.written = asdl_cache.write_if_changed(job.output, output)
+
+    if workers == 1 or len(pending) <= 1:
+        for job in pending:
+            finish(job, emit_job(job.generator, modules[job.schema][1],
+                                 job.options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(emit_job, job.generator,
+                                   modules[job.schema][1], job.options)
+                       for job in pending]
+            for job, future in zip(pending, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = None, '%s: %s' % (type(e).__name__, e), 0.0
+                finish(job, result)
+    return parse_times
+
+
+def format_report(jobs, parse_times):
+    lines = []
+    for schema, seconds in sorted(parse_times.items()):
+        lines.append('parsed  %s (%.1fms)' % (os.path.relpath(schema),
+                                              seconds * 1000))
+    for job in jobs:
+        name = os.path.relpath(job.output)
+        if job.error is not None:
+            lines.append('FAILED  %s: %s' % (name, job.error))
+        else:
+            lines.append('%s %s (%s)' % (
+                'wrote  ' if job.written else 'same   ', name,
+                'cached' if job.cached else '%.1fms' % (job.seconds * 1000)))
+    failed = sum(1 for job in jobs if job.error is not None)
+    lines.append('%d jobs, %d failed' % (len(jobs), failed))
+    return lines
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description='Generate AST code for all the jobs of a manifest.')
+    argparser.add_argument('manifest', help='JSON manifest of the jobs')
+    argparser.add_argument('-j', '--jobs', type=int, default=None,
+        help='number of worker processes (default: one per core)')
+    argparser.add_argument('--no-cache', action='store_true',
+        help="don't read or write the on-disk cache")
+    argparser.add_argument('--cache-dir', default=asdl_cache.DEFAULT_CACHE_DIR,
+        help='directory of the on-disk cache (default: %(default)s)')
+    argparser.add_argument('-q', '--quiet', action='store_true',
+        help='only report failures')
+    args = argparser.parse_args()
+
+    jobs = load_manifest(args.manifest)
+    cache = asdl_cache.Cache(
+        asdl_cache.toolchain_fingerprint(asdl_gen_js, asdl_gen_py,
+                                         sys.modules[__name__]),
+        directory=args.cache_dir, enabled=not args.no_cache)
+    parse_times = run_batch(jobs, cache, args.jobs)
+    for line in format_report(jobs, parse_times):
+        if not args.quiet or line.startswith('FAILED'):
+            print(line)
+    return 1 if any(job.error is not None for job in jobs) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
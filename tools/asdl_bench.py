@@ -0,0 +1,243 @@
+#-------------------------------------------------------------------------------
+# Benchmarks of the ASDL toolchain.
+#
+# Times tokenize_asdl, ASDLParser.parse, asdl_ast.check and emit_ast
+# separately on a set of inputs: synthetic schemas of growing size and shape
+# (see asdl_synth.py) and real ASDL files such as cool_ast.asdl. For each phase
+# the best time of several repetitions is reported, with the throughput in
+# tokens/s (tokenizing and parsing) or types/s (checking and emitting), and
+# the peak memory allocated while it ran. emit_ast can be run with several
+# worker processes (--jobs) to measure concurrent emission; peak memory only
+# covers the main process then.
+#
+# Results can be saved as a JSON baseline, and later runs compared against
+# it; phases that got slower or hungrier by more than a threshold are flagged
+# as regressions, and the exit status is then 1.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import argparse
+from collections import OrderedDict
+import io
+import json
+import os
+import platform
+import sys
+import tracemalloc
+
+import asdl_ast
+import asdl_cache
+import asdl_gen_js
+import asdl_parser
+import asdl_profile
+import asdl_synth
+
+PHASES = ('tokenize_asdl', 'ASDLParser.parse', 'asdl_ast.check', 'emit_ast')
+
+_toolsdir = os.path.dirname(os.path.abspath(__file__))
+
+REAL_INPUTS = [os.path.join(os.path.dirname(_toolsdir), 'cool_ast.asdl')]
+
+# name -> keyword arguments of asdl_synth.synthesize
+SYNTHETIC_INPUTS = OrderedDict([
+    ('synth-10', dict(num_types=10)),
+    ('synth-100', dict(num_types=100)),
+    ('synth-1000', dict(num_types=1000)),
+    ('synth-wide-sums', dict(num_types=100, constructors_per_sum=32)),
+    ('synth-wide-products', dict(num_types=100, product_every=1,
+                                 product_width=128)),
+    ('synth-comments', dict(num_types=100, comment_lines=8)),
+])
+
+
+def run_phases(buf, options, timer, jobs=1):
+    """ Run all the phases on the ASDL in buf (bytes), timing them with timer
+        and emitting with jobs processes. Return (number of tokens, number of
+        types).
+    """
+    with timer.phase('tokenize_asdl'):
+        tokens = list(asdl_parser.tokenize_asdl(buf))
+    with timer.phase('ASDLParser.parse'):
+        module = asdl_parser.ASDLParser().parse_tokens(tokens)
+    with timer.phase('asdl_ast.check'):
+        ok = asdl_ast.check(module)
+    if not ok:
+        raise ValueError('ASDL input fails asdl_ast.check')
+    with timer.phase('emit_ast'):
+        asdl_gen_js.emit_ast(io.StringIO(), module, options, jobs)
+    return len(tokens), len(module.dfns)
+
+
+def peak_memory(buf, options, jobs=1):
+    """ The peak memory in bytes allocated by each phase on buf, as measured
+        by tracemalloc. Each phase is traced on its own, with its inputs
+        prepared beforehand.
+    """
+    peaks = {}
+    def traced(phase, func):
+        tracemalloc.start()
+        try:
+            result = func()
+            peaks[phase] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return result
+    tokens = traced('tokenize_asdl',
+                    lambda: list(asdl_parser.tokenize_asdl(buf)))
+    module = traced('ASDLParser.parse',
+                    lambda: asdl_parser.ASDLParser().parse_tokens(tokens))
+    traced('asdl_ast.check', lambda: asdl_ast.check(module))
+    traced('emit_ast',
+           lambda: asdl_gen_js.emit_ast(io.StringIO(), module, options,
+                                        jobs))
+    return peaks
+
+
+def bench_input(buf, options, repeat, jobs=1):
+    """ Benchmark all phases on buf. Return a dict with the input's sizes and
+        per-phase results.
+    """
+    best = {}
+    for i in range(repeat):
+        timer = asdl_profile.PhaseTimer()
+        num_tokens, num_types = run_phases(buf, options, timer, jobs)
+        for phase, times in timer.phases.items():
+            if phase not in best or times['wall'] < best[phase]['wall']:
+                best[phase] = times
+    peaks = peak_memory(buf, options, jobs)
+
+    phases = OrderedDict()
+    for phase in PHASES:
+        if phase in ('tokenize_asdl', 'ASDLParser.parse'):
+            count, unit = num_tokens, 'tokens/s'
+        else:
+            count, unit = num_types, 'types/s'
+        wall = best[phase]['wall']
+        phases[phase] = OrderedDict([
+            ('wall', wall),
+            ('cpu', best[phase]['cpu']),
+            ('throughput', count / wall if wall > 0 else None),
+            ('unit', unit),
+            ('peak_memory', peaks[phase])])
+    return OrderedDict([('bytes', len(buf)), ('tokens', num_tokens),
+                        ('types', num_types), ('phases', phases)])
+
+
+def run(inputs, options, repeat, jobs=1):
+    """ Benchmark the given (name, buf) inputs. Return the results as a dict
+        ready to be saved as JSON.
+    """
+    results = OrderedDict([
+        ('python', platform.python_version()),
+        ('repeat', repeat),
+        ('options', repr(options)),
+        ('jobs', jobs),
+        ('inputs', OrderedDict())])
+    for name, buf in inputs:
+        results['inputs'][name] = bench_input(buf, options, repeat, jobs)
+    return results
+
+
+def compare(baseline, results, threshold):
+    """ Compare results against baseline. Return a list of lines describing
+        every phase present in both, and the number of regressions: phases
+        whose wall time or peak memory grew by more than threshold (a
+        fraction).
+    """
+    lines = []
+    regressions = 0
+    for name, result in results['inputs'].items():
+        if name not in baseline['inputs']:
+            lines.append('%s: not in baseline' % name)
+            continue
+        base = baseline['inputs'][name]
+        if base['bytes'] != result['bytes']:
+            lines.append('%s: input changed since the baseline (%d -> %d '
+                         'bytes)' % (name, base['bytes'], result['bytes']))
+        for phase, current in result['phases'].items():
+            if phase not in base['phases']:
+                continue
+            old = base['phases'][phase]
+            flags = []
+            for metric in ('wall', 'peak_memory'):
+                limit = old[metric] * (1 + threshold)
+                if old[metric] and current[metric] > limit:
+                    flags.append(metric)
+            time_change = (current['wall'] / old['wall'] - 1 if old['wall']
+                           else 0.0)
+            lines.append('%-20s %-17s %9.3fms -> %9.3fms (%+6.1f%%) %s' % (
+                name, phase, old['wall'] * 1000, current['wall'] * 1000,
+                time_change * 100,
+                'REGRESSION: ' + ', '.join(flags) if flags else ''))
+            if flags:
+                regressions += 1
+    return lines, regressions
+
+
+def format_results(results):
+    lines = []
+    for name, result in results['inputs'].items():
+        lines.append('%s: %d bytes, %d tokens, %d types' % (
+            name, result['bytes'], result['tokens'], result['types']))
+        for phase, r in result['phases'].items():
+            lines.append('  %-17s %9.3fms %12.0f %-8s peak %8d bytes' % (
+                phase, r['wall'] * 1000, r['throughput'] or 0, r['unit'],
+                r['peak_memory']))
+    return lines
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description='Benchmark the ASDL toolchain phases.')
+    argparser.add_argument('asdl', nargs='*',
+        help='ASDL files to benchmark in addition to the synthetic schemas '
+             '(default: %s)' % ', '.join(os.path.relpath(f)
+                                         for f in REAL_INPUTS))
+    argparser.add_argument('--repeat', type=int, default=5,
+        help='repetitions of each measurement; the best time is kept '
+             '(default: %(default)s)')
+    argparser.add_argument('--only', metavar='NAME', action='append',
+        help='only run the inputs with this name (repeatable)')
+    argparser.add_argument('--emit-profile',
+        choices=asdl_gen_js.EmitOptions.PROFILES, default='debug',
+        help='emission profile (default: %(default)s)')
+    argparser.add_argument('-j', '--jobs', type=int, default=1,
+        help='number of processes emitting the node classes in emit_ast '
+             '(default: %(default)s)')
+    argparser.add_argument('--save', metavar='FILE',
+        help='save the results as JSON to FILE')
+    argparser.add_argument('--compare', metavar='FILE',
+        help='compare the results against the baseline saved in FILE')
+    argparser.add_argument('--threshold', type=float, default=0.10,
+        help='with --compare, the relative slowdown or memory growth past '
+             'which a phase is flagged (default: %(default)s)')
+    args = argparser.parse_args()
+
+    inputs = [(name, asdl_synth.synthesize(**kwargs).encode('ascii'))
+              for name, kwargs in SYNTHETIC_INPUTS.items()]
+    for filename in args.asdl or REAL_INPUTS:
+        with open(filename, 'rb') as f:
+            inputs.append((os.path.basename(filename), f.read()))
+    if args.only:
+        inputs = [(name, buf) for name, buf in inputs if name in args.only]
+
+    results = run(inputs, asdl_gen_js.EmitOptions(args.emit_profile),
+                  args.repeat, args.jobs)
+    print('\n'.join(format_results(results)))
+    if args.save:
+        asdl_cache.write_atomic(args.save, (json.dumps(results, indent=2) +
+                                            '\n').encode('utf-8'))
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines, regressions = compare(baseline, results, args.threshold)
+        print()
+        print('\n'.join(lines))
+        if regressions:
+            print('%d regression(s) past %.0f%%' % (
+                regressions, args.threshold * 100))
+            return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
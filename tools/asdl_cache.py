@@ -0,0 +1,150 @@
+#-------------------------------------------------------------------------------
+# Content-addressed on-disk cache for the ASDL toolchain.
+#
+# Parsing and checking an ASDL file and emitting code from it are pure
+# functions of the file's bytes and of the toolchain's own source, so both
+# results can be cached under a hash of the two:
+#
+# * The checked asdl_ast.Module is pickled, keyed by the hash of the ASDL bytes
+#   and the toolchain fingerprint.
+# * Generated output is stored keyed by the module's key plus whatever options
+#   the generator was given.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import hashlib
+import os
+import pickle
+import tempfile
+
+import asdl_analysis
+import asdl_ast
+import asdl_parser
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 '__asdlcache__')
+
+# mkstemp creates files readable only by their owner; written files get the
+# usual permissions instead.
+_umask = os.umask(0)
+os.umask(_umask)
+
+def toolchain_fingerprint(*modules):
+    """ Compute a fingerprint of the toolchain: a hash of the source of the
+        ASDL parser, meta-AST and analysis, plus the source of the given
+        modules (typically the generator using the cache). Any edit to these
+        files invalidates every cache entry.
+    """
+    h = hashlib.sha256()
+    for mod in (asdl_analysis, asdl_ast, asdl_parser) + modules:
+        with open(mod.__file__, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+class Cache:
+    """ Cache of parsed modules and generated output in a directory.
+
+        When created with enabled=False, nothing is read from or written to
+        the directory, but the statistics are still kept.
+    """
+    def __init__(self, fingerprint, directory=DEFAULT_CACHE_DIR, enabled=True):
+        self.fingerprint = fingerprint
+        self.directory = directory
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def load_module(self, filename):
+        """ Parse and check the ASDL file with the given name, or fetch the
+            result from the cache. Return a (key, module) pair; module is None
+            if the file doesn't pass asdl_ast.check (such results are not
+            cached, so the errors are reported every time).
+        """
+        with asdl_parser.mapped_file(filename) as buf:
+            key = self._key(buf)
+            data = self._get(key + '.module')
+            if data is not None:
+                return key, pickle.loads(data)
+            module = asdl_parser.ASDLParser().parse(buf)
+        if not asdl_ast.check(module):
+            return key, None
+        self._put(key + '.module',
+                  pickle.dumps(module, protocol=pickle.HIGHEST_PROTOCOL))
+        return key, module
+
+    def get_output(self, key, options):
+        """ Fetch the output generated from the module with the given key
+            under the given options (any object with a stable repr). Return
+            None if it's not cached.
+        """
+        return self._get(self._output_key(key, options))
+
+    def put_output(self, key, options, data):
+        self._put(self._output_key(key, options), data)
+
+    def stats(self):
+        return 'asdl cache: %d hits, %d misses, %d bytes read, %d bytes written' % (
+            self.hits, self.misses, self.bytes_read, self.bytes_written)
+
+    def _key(self, *parts):
+        h = hashlib.sha256(self.fingerprint.encode('ascii'))
+        for part in parts:
+            h.update(part)
+        return h.hexdigest()
+
+    def _output_key(self, key, options):
+        return self._key(key.encode('ascii'),
+                         repr(options).encode('utf-8')) + '.out'
+
+    def _get(self, name):
+        if self.enabled:
+            try:
+                with open(os.path.join(self.directory, name), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                pass
+            else:
+                self.hits += 1
+                self.bytes_read += len(data)
+                return data
+        self.misses += 1
+        return None
+
+    def _put(self, name, data):
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+            write_atomic(os.path.join(self.directory, name), data)
+            self.bytes_written += len(data)
+
+def write_atomic(filename, data):
+    """ Write data (bytes) to filename so that readers never see a partially
+        written file.
+    """
+    fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(filename) or '.',
+                                   prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmpname, 0o666 & ~_umask)
+        os.replace(tmpname, filename)
+    except BaseException:
+        os.unlink(tmpname)
+        raise
+
+def write_if_changed(filename, data):
+    """ Write data (bytes) to filename, unless the file already holds exactly
+        these bytes. Leaving an unchanged file alone keeps its timestamp, so
+        timestamp-driven build steps depending on it don't re-run. Return True
+        if the file was written.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    write_atomic(filename, data)
+    return True
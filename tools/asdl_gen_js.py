@@ -4,11 +4,23 @@
 # Eli Bendersky (eliben@gmail.com)
 # This code is in the public domain
 #-------------------------------------------------------------------------------
+import argparse
+import collections
+import concurrent.futures
+import hashlib
+import io
+import os
 import pprint
+import re
 import sys
+import textwrap
+import time
 
+import asdl_analysis
 import asdl_ast
+import asdl_cache
 import asdl_parser
+import asdl_profile
 
 CODE_PREFACE = r'''
 //------------------------------------------------------------------------------
@@ -22,14 +34,23 @@ CODE_PREFACE = r'''
 
 'use strict';
 
+'''.lstrip()
+
+CODE_AST_ERROR = r'''
 // ASTError is the exception type used by this module to signal errors
 var ASTError = exports.ASTError = function(message) {
+  Error.captureStackTrace(this, ASTError);
   this.message = message;
 }
 
 ASTError.prototype = new Error();
 ASTError.prototype.constructor = ASTError;
 
+'''.lstrip()
+
+# Helpers for the runtime checks in node constructors. Not needed by the
+# release profile, which emits no checks.
+CODE_CHECK_HELPERS = r'''
 // Some helper code used throughout the module
 var _check_identifier = function(v, who, what, loc) {
   if (Object.prototype.toString.call(v) !== '[object String]') {
@@ -44,8 +65,10 @@ var _check_string = function(v, who, what, loc) {
   }
 }
 
+// ints are integers of at most 52 bits plus a sign, so that they serialize
+// exactly.
 var _check_int = function(v, who, what, loc) {
-  if (Object.prototype.toString.call(v) !== '[object Number]') {
+  if (!Number.isInteger(v) || Math.abs(v) > 4503599627370495) {
     throw new ASTError('Line ' + loc + ': ' + who + ' expects ' + what + ' to be an int');
   }
 }
@@ -62,6 +85,17 @@ var _check_array = function(v, who, what, loc) {
   }
 }
 
+'''.lstrip()
+
+CODE_ASSERT_SWITCH = r'''
+// The checks in node constructors only run when the COOL_AST_CHECKS
+// environment variable is set.
+var _checks_enabled = typeof process !== 'undefined' &&
+                      !!process.env.COOL_AST_CHECKS;
+
+'''.lstrip()
+
+CODE_NODE_BASE = r'''
 var _abstractmethod = function() {
   throw new ASTError('Abstract method called');
 }
@@ -72,26 +106,634 @@ var Node = exports.Node = function() {
   throw new ASTError('Node is an abstract class');
 }
 
-Node.prototype.children = _abstractmethod;
+// forEachChild(callback, ctx) calls callback.call(ctx, child, field, index)
+// for each child node, in order. field is the name of the field holding the
+// child; index is its index for sequence fields and -1 otherwise. Use
+// child_name(field, index) to get a printable name for the child.
+Node.prototype.forEachChild = _abstractmethod;
+
+// children() returns an array of {'name': ..., 'node': ...} objects, one per
+// child node. It allocates; prefer forEachChild where possible.
+Node.prototype.children = function() {
+  var children = [];
+  this.forEachChild(_push_child, children);
+  return children;
+}
+
+var _push_child = function(node, field, index) {
+  this.push({'name': child_name(field, index), 'node': node});
+}
+
+// The children of all leaf nodes. Frozen, since it's shared.
+var _no_children = Object.freeze([]);
+
+var child_name = exports.child_name = function(field, index) {
+  return index < 0 ? field : field + '[' + index.toString() + ']';
+}
+
+// transformChildren(fn, ctx) returns the node with each child node replaced by
+// fn.call(ctx, child), without modifying it: if fn returns all the children
+// unchanged, the node itself is returned; otherwise, a new node of the same
+// class, with the same attributes and loc, sharing the unchanged children.
+Node.prototype.transformChildren = _abstractmethod;
+
+// _dump(d, depth) appends the dump of the node, at the given depth, and of its
+// descendants to the _Dumper d (see dump).
+Node.prototype._dump = _abstractmethod;
+
+// The result of fn.call(ctx, node) for each node of seq: seq itself if no node
+// changed, else a new array, built from the first changed node on.
+var _transform_seq = function(seq, fn, ctx) {
+  for (var i = 0; i < seq.length; i++) {
+    var node = fn.call(ctx, seq[i]);
+    if (node !== seq[i]) {
+      var result = seq.slice(0, i);
+      result.push(node);
+      for (i++; i < seq.length; i++) {
+        result.push(fn.call(ctx, seq[i]));
+      }
+      return result;
+    }
+  }
+  return seq;
+}
+
 Node.attributes = [];
 Node.node_type = 'Node';
 
+// Each concrete node class has a distinct integer kind on its prototype,
+// indexing node_types and node_classes.
+Node.prototype.kind = -1;
+
+// equals(other, options) compares two trees structurally: same node types and
+// equal attributes and children, field by field, stopping at the first
+// difference. locs are compared too, unless options.ignoreLoc is set.
+//
+// structuralHash() returns a 32-bit hash of the tree, consistent with equals
+// (locs are not hashed). It's cached in the node, so nodes must not be
+// modified after their hash has been computed. It recurses once per level of
+// the tree, and overflows the stack on trees about 10000 levels deep.
+Node.prototype.equals = _abstractmethod;
+Node.prototype.structuralHash = _abstractmethod;
+
+// Compare the headers of two nodes: true if their fields have to be compared,
+// false if they are known to differ.
+var _same_header = function(a, b, options) {
+  return b !== null && b !== undefined && a.kind === b.kind &&
+         (a._hash === 0 || b._hash === 0 || a._hash === b._hash) &&
+         ((options !== undefined && options.ignoreLoc) || a.loc === b.loc);
+}
+
+var _node_equals = function(a, b, options) {
+  return a === null ? b === null : a.equals(b, options);
+}
+
+var _nodes_equal = function(a, b, options) {
+  if (a.length !== b.length) {
+    return false;
+  }
+  for (var i = 0; i < a.length; i++) {
+    if (!a[i].equals(b[i], options)) {
+      return false;
+    }
+  }
+  return true;
+}
+
+var _values_equal = function(a, b) {
+  if (a.length !== b.length) {
+    return false;
+  }
+  for (var i = 0; i < a.length; i++) {
+    if (a[i] !== b[i]) {
+      return false;
+    }
+  }
+  return true;
+}
+
+var _mix_hash = function(h, v) {
+  return (Math.imul(h, 0x01000193) ^ v) | 0;
+}
+
+var _hash_value = function(v) {
+  if (v === null) {
+    return 0x2545f491;
+  } else if (typeof v === 'string') {
+    var h = 0x811c9dc5 | 0;
+    for (var i = 0; i < v.length; i++) {
+      h = _mix_hash(h, v.charCodeAt(i));
+    }
+    return h;
+  } else if (typeof v === 'boolean') {
+    return v ? 0x3c6ef372 : 0x1b873593;
+  } else {
+    return (v | 0) ^ ((v / 4294967296) | 0);
+  }
+}
+
+var _hash_node = function(node) {
+  return node === null ? 0x2545f491 : node.structuralHash();
+}
+
+var _hash_nodes = function(nodes) {
+  var h = nodes.length;
+  for (var i = 0; i < nodes.length; i++) {
+    h = _mix_hash(h, nodes[i].structuralHash());
+  }
+  return h;
+}
+
+var _hash_values = function(values) {
+  var h = values.length;
+  for (var i = 0; i < values.length; i++) {
+    h = _mix_hash(h, _hash_value(values[i]));
+  }
+  return h;
+}
+
+// Freeze a node that is going to be shared. Its hash is computed first, since
+// structuralHash can't cache it in a frozen node.
+var _freeze_node = function(node) {
+  node.structuralHash();
+  return Object.freeze(node);
+}
+
+'''.lstrip()
 
+CODE_NODES_BANNER = r'''
 //
 //-------------------- AST nodes --------------------
 //
 
-'''.lstrip()
+'''
 
 def die(msg):
     sys.stderr.write(msg + '\n')
     sys.exit(1)
 
 
-def emit_ast(stream, ast):
+class EmitOptions:
+    """ Options controlling the emitted code.
+
+        profile: one of PROFILES.
+            'debug' - node constructors check the types of all their
+                      arguments.
+            'assert' - the checks are emitted, but only run when the
+                       COOL_AST_CHECKS environment variable is set.
+            'release' - constructors only assign fields.
+
+        backend: one of BACKENDS.
+            'object' - one JS object per node.
+            'arena' - nodes are handles into a struct-of-arrays Arena.
+            'table' - the node classes are built at load time, by a runtime
+                      shared by all the schemas (asdl_runtime.js), from a
+                      compact table describing the schema.
+
+        object_module: for the arena backend, the module name under which the
+        object backend's code can be required; used for the conversions
+        between the two. Also the module benchmarked by default by the
+        scripts emitted by emit_bench.
+
+        runtime_module: for the table backend, the module name under which
+        the shared runtime can be required.
+
+        instrument: if True, the object backend's nodes count how many times
+        each node type is constructed and walked (children() and forEachChild
+        calls), readable through the exported stats() function. Meant for
+        finding out which node types dominate real programs, not for normal
+        use.
+
+        intern: if True, leaf node classes whose fields all have builtin types
+        get of() factories that can share equal nodes, controlled at run
+        time by the exported set_interning() function. The builder creates
+        these nodes through the factories. For the object and table
+        backends.
+
+        root: the root type of the ASTs (default: the first type defined).
+        Types not reachable from it are reported, and stripped from the
+        output if strip_unreachable is True.
+
+        split: if True, the code is meant for split output (see
+        IncrementalEmitter.emit_split), where the node classes of each type
+        live in their own module. Only for the object backend.
+    """
+    PROFILES = ('debug', 'assert', 'release')
+    BACKENDS = ('object', 'arena', 'table')
+
+    def __init__(self, profile='debug', backend='object',
+                 object_module='./cool_ast', instrument=False, intern=False,
+                 root=None, strip_unreachable=False, split=False,
+                 runtime_module='./asdl_runtime'):
+        if profile not in self.PROFILES:
+            raise ValueError('Unknown profile %r' % profile)
+        if backend not in self.BACKENDS:
+            raise ValueError('Unknown backend %r' % backend)
+        if instrument and backend != 'object':
+            raise ValueError('Only the object backend can be instrumented')
+        if intern and backend == 'arena':
+            raise ValueError('The arena backend has no interning')
+        if split and (backend != 'object' or instrument):
+            raise ValueError('Only the uninstrumented object backend can be '
+                             'split')
+        self.profile = profile
+        self.backend = backend
+        self.object_module = object_module
+        self.instrument = instrument
+        self.intern = intern
+        self.root = root
+        self.strip_unreachable = strip_unreachable
+        self.split = split
+        self.runtime_module = runtime_module
+
+    def __repr__(self):
+        return ('EmitOptions(profile=%r, backend=%r, object_module=%r, '
+                'instrument=%r, intern=%r, root=%r, strip_unreachable=%r, '
+                'split=%r, runtime_module=%r)' % (
+                    self.profile, self.backend, self.object_module,
+                    self.instrument, self.intern, self.root,
+                    self.strip_unreachable, self.split, self.runtime_module))
+
+
+CODE_INSTRUMENTATION = r'''
+//
+//-------------------- Instrumentation --------------------
+//
+
+// Per-kind counters of constructed nodes and of children() and forEachChild
+// calls. forEachChild counts include the calls made by children().
+var _stats_constructed = new Float64Array(%(num_kinds)d);
+var _stats_children = new Float64Array(%(num_kinds)d);
+var _stats_forEachChild = new Float64Array(%(num_kinds)d);
+
+var _uninstrumented_children = Node.prototype.children;
+Node.prototype.children = function() {
+  _stats_children[this.kind]++;
+  return _uninstrumented_children.call(this);
+}
+
+// stats() returns an object mapping the name of every node type that was
+// constructed or walked since the last reset_stats() to its counts:
+// {'constructed': ..., 'children': ..., 'forEachChild': ...}.
+exports.stats = function() {
+  var result = {};
+  for (var kind = 0; kind < node_types.length; kind++) {
+    if (_stats_constructed[kind] || _stats_children[kind] ||
+        _stats_forEachChild[kind]) {
+      result[node_types[kind]] = {
+        'constructed': _stats_constructed[kind],
+        'children': _stats_children[kind],
+        'forEachChild': _stats_forEachChild[kind]};
+    }
+  }
+  return result;
+}
+
+exports.reset_stats = function() {
+  _stats_constructed.fill(0);
+  _stats_children.fill(0);
+  _stats_forEachChild.fill(0);
+}
+
+'''
+
+
+CODE_INTERNING = r'''
+//
+//-------------------- Interning --------------------
+//
+
+// Leaf node classes whose fields all have builtin types (or that have no fields,
+// like NoExpr) have an of() factory taking the same arguments as their
+// constructor: IntConst.of(token, loc).
+// The builder creates these nodes through it. What of() does depends on the
+// interning mode set with set_interning(mode, limit):
+//
+// 'off' (the default): of() always creates a new node.
+// 'loc': nodes with the same fields and the same loc are shared.
+// 'noloc': nodes with the same fields are shared, whatever their loc; shared
+//   nodes have no loc. Only for passes that don't need locs of leaves.
+//
+// Shared nodes are frozen. limit bounds the number of nodes kept per class
+// (default: 4096); a class's table is emptied when a node has to be added to
+// it while it's full.
+var _interning = {mode: 0, limit: 4096, generation: 0};
+
+var set_interning = exports.set_interning = function(mode, limit) {
+  var modes = {'off': 0, 'loc': 1, 'noloc': 2};
+  if (!modes.hasOwnProperty(mode)) {
+    throw new ASTError('Unknown interning mode ' + mode);
+  }
+  _interning.mode = modes[mode];
+  _interning.limit = limit || 4096;
+  // Drop all the tables
+  _interning.generation++;
+}
+
+// The interning table of a node class: nested Maps keyed by the fields and
+// the loc. full empties it.
+var _interning_table = function(cls, full) {
+  if (full || cls._interned_generation !== _interning.generation) {
+    cls._interned = new Map();
+    cls._interned_count = 0;
+    cls._interned_generation = _interning.generation;
+  }
+  return cls._interned;
+}
+
+'''
+
+
+def emit_ast(stream, ast, options=None, jobs=1):
+    """ Emit the code of ast with the given EmitOptions. jobs is the number of
+        processes emitting the node classes (see types_code); the code is the
+        same whatever its value.
+    """
+    options = options or EmitOptions()
+    ast, analysis = analyze_module(ast, options)
+    if options.backend == 'arena':
+        emit_arena_ast(stream, ast, options)
+        return
+    elif options.backend == 'table':
+        emit_table_ast(stream, ast, options)
+        return
+    if options.split:
+        raise ValueError('Split output is emitted by '
+                         'IncrementalEmitter.emit_split')
+    classes = node_classes(ast)
+    kinds = {classname: kind for kind, (classname, _) in enumerate(classes)}
+    emit_runtime(stream, options, len(classes))
+    stream.write(CODE_NODES_BANNER)
+    stream.write(''.join(types_code(sorted(ast.types.items()), options,
+                                    kinds, analysis, jobs)))
+    emit_module_tail(stream, ast, classes, options)
+
+
+def analyze_module(ast, options):
+    """ Analyze the type graph of ast (see asdl_analysis), warning about the
+        types unreachable from options.root. Return (ast, analysis); the
+        unreachable types are stripped from the returned module if
+        options.strip_unreachable is set.
+    """
+    try:
+        analysis = asdl_analysis.analyze(ast, options.root)
+    except ValueError as e:
+        die('ERROR: %s' % e)
+    if analysis.unreachable:
+        sys.stderr.write('%s types unreachable from %s: %s\n' % (
+            'Stripping' if options.strip_unreachable else 'Warning:',
+            analysis.root, ', '.join(analysis.unreachable)))
+        if options.strip_unreachable:
+            ast = asdl_analysis.strip_unreachable(ast, analysis)
+            analysis = asdl_analysis.analyze(ast, options.root)
+    return ast, analysis
+
+
+def emit_runtime(stream, options, num_kinds):
+    """ Emit the code preceding the node classes: the module's header, helpers
+        and the Node base class.
+    """
     stream.write(CODE_PREFACE)
+    stream.write(CODE_AST_ERROR)
+    if options.profile != 'release':
+        stream.write(CODE_CHECK_HELPERS)
+    if options.profile == 'assert':
+        stream.write(CODE_ASSERT_SWITCH)
+    stream.write(CODE_NODE_BASE)
+    if options.instrument:
+        stream.write(CODE_INSTRUMENTATION % {'num_kinds': num_kinds})
+    if options.intern:
+        stream.write(CODE_INTERNING)
+
+
+def emit_module_tail(stream, ast, classes, options):
+    """ Emit the code following the node classes, which refers to all of them:
+        the visitor, the transformer, the dumper, the walkers, the kind index,
+        the builder and the serialization code.
+    """
+    emit_visitor(stream, [classname for classname, _ in classes])
+    stream.write(CODE_TRANSFORMER)
+    stream.write(CODE_DUMP)
+    emit_walkers(stream, classes)
+    emit_kind_index(stream, classes)
+    emit_builder(stream, classes, options)
+    stream.write(CODE_SERIALIZATION)
+    emit_deserializers(stream, classes, schema_id(ast), options)
+
+
+def node_classes(ast):
+    """ (classname, constructor) pairs for the concrete node classes emitted
+        for ast, in the order they are emitted. A class's index in this list
+        is its kind.
+    """
+    classes = []
     for typename, sum in sorted(ast.types.items()):
-        emit_ast_type(stream, typename, sum)
+        if len(sum.types) == 1:
+            classes.append((typename.capitalize(), sum.types[0]))
+        else:
+            classes.extend((constructor.name, constructor)
+                           for constructor in sum.types)
+    return classes
+
+
+def fields_by_name(classes):
+    """ Map each field name used in classes to a list of (kind, constructor,
+        field) for the constructors having a field of that name, sorted by
+        field name.
+    """
+    fields = {}
+    for kind, (_, constructor) in enumerate(classes):
+        for field in constructor.fields:
+            fields.setdefault(field.name, []).append((kind, constructor, field))
+    for name in fields:
+        if name in _builder_reserved_names:
+            die('ERROR: field name %s clashes with a builder method' % name)
+    return sorted(fields.items())
+
+
+# The code of the node classes is built from the templates below, filled in
+# with % and appended to a list that is joined once per type. Most templates
+# span several lines of the output, so that a class takes a few dozen
+# appends rather than a write per line.
+
+_T_CLASS_HEADER = '''\
+//
+// %(classname)s is-a %(parentname)s
+// %(constructor)s
+//
+var %(classname)s = exports.%(classname)s = function(%(args)s) {
+'''
+
+_T_CLASS_PROTOTYPE = '''\
+  this.loc = loc;
+  this._hash = 0;
+}
+
+%(classname)s.prototype = Object.create(%(parentname)s.prototype);
+%(classname)s.prototype.constructor = %(classname)s;
+%(classname)s.prototype.kind = %(kind)d;
+
+'''
+
+_T_DEBUG_PROPERTIES = '''\
+Object.defineProperties(%(classname)s, {
+  'attributes': {get: function() {return %(attrs)s;}},
+  'node_type': {get: function() {return '%(classname)s';}}
+});
+
+'''
+
+_T_PROPERTIES = '''\
+%(classname)s.attributes = %(attrs)s;
+%(classname)s.node_type = '%(classname)s';
+
+'''
+
+_T_ASSIGN = '  this.%s = %s;\n'
+_T_STAT = '  _stats_%s[%d]++;\n'
+
+_T_FOR_EACH_CHILD = '%s.prototype.forEachChild = function(callback, ctx) {\n'
+_T_FOR_EACH_SEQ = '''\
+  var %(name)s = this.%(name)s;
+  for (var i = 0; i < %(name)s.length; i++) {
+    callback.call(ctx, %(name)s[i], '%(name)s', i);
+  }
+'''
+_T_FOR_EACH_OPT = '''\
+  if (this.%(name)s !== null) {
+    callback.call(ctx, this.%(name)s, '%(name)s', -1);
+  }
+'''
+_T_FOR_EACH_NODE = "  callback.call(ctx, this.%(name)s, '%(name)s', -1);\n"
+
+_T_CHILDREN = '%s.prototype.children = function() {\n'
+_T_CHILD_ENTRY = "{'name': '%s', 'node': this.%s}"
+_T_CHILDREN_PUSH_OPT = '''\
+  if (this.%s !== null) {
+    children.push(%s);
+  }
+'''
+
+_T_TRANSFORM_CHILDREN = (
+    '%s.prototype.transformChildren = function(fn, ctx) {\n')
+_T_TRANSFORM_SEQ = '  var %(name)s = _transform_seq(this.%(name)s, fn, ctx);\n'
+_T_TRANSFORM_OPT = ('  var %(name)s = this.%(name)s === null ? null : '
+                    'fn.call(ctx, this.%(name)s);\n')
+_T_TRANSFORM_NODE = '  var %(name)s = fn.call(ctx, this.%(name)s);\n'
+_T_TRANSFORM_UNCHANGED = '''\
+  if (%s) {
+    return this;
+  }
+'''
+
+_T_DUMP = '%s.prototype._dump = function(d, depth) {\n'
+_T_DUMP_SEQ = '''\
+  var %(name)s = this.%(name)s;
+  for (var i = 0; i < %(name)s.length; i++) {
+    %(name)s[i]._dump(d, depth + 1);
+  }
+'''
+_T_DUMP_OPT = '''\
+  if (this.%(name)s !== null) {
+    this.%(name)s._dump(d, depth + 1);
+  }
+'''
+_T_DUMP_NODE = '  this.%(name)s._dump(d, depth + 1);\n'
+
+_T_INTERNING_HEAD = '''\
+%(classname)s.of = function(%(args)s) {
+  if (_interning.mode === 0) {
+    return new %(classname)s(%(args)s);
+  } else if (_interning.mode === 2) {
+    loc = undefined;
+  }
+  var t0 = _interning_table(%(classname)s, false);
+'''
+_T_INTERNING_LEVEL = '''\
+  var t%(next)d = t%(i)d.get(%(name)s);
+  if (t%(next)d === undefined) {
+    t%(next)d = new Map();
+    t%(i)d.set(%(name)s, t%(next)d);
+  }
+'''
+_T_INTERNING_TAIL = '''\
+  var node = t%(last)d.get(loc);
+  if (node === undefined) {
+    if (%(classname)s._interned_count >= _interning.limit) {
+      _interning_table(%(classname)s, true);
+      return %(classname)s.of(%(args)s);
+    }
+    node = _freeze_node(new %(classname)s(%(args)s));
+    t%(last)d.set(loc, node);
+    %(classname)s._interned_count++;
+  }
+  return node;
+}
+
+'''
+
+_T_EQUALS = '''\
+%s.prototype.equals = function(other, options) {
+  if (this === other) {
+    return true;
+  }
+  return _same_header(this, other, options)%s;
+}
+
+'''
+
+_T_HASH_HEAD = '''\
+%s.prototype.structuralHash = function() {
+  if (this._hash === 0) {
+    var h = %d;
+'''
+_T_HASH_MIX = '    h = _mix_hash(h, %s);\n'
+_T_HASH_TAIL = '''\
+    this._hash = h || 1;
+  }
+  return this._hash;
+}
+
+'''
+
+_T_SERIALIZE = '%s.prototype._serialize = function(w) {\n'
+_T_SERIALIZE_SEQ = '''\
+  var %(name)s = this.%(name)s;
+  w.uint(%(name)s.length);
+  for (var i = 0; i < %(name)s.length; i++) {
+    w.%(method)s(%(name)s[i]);
+  }
+'''
+_T_SERIALIZE_FIELD = '  w.%s(this.%s);\n'
+
+_T_CHECK_CALL = "%s%s_check_%s(%s, '%s', '%s', loc);\n"
+_T_CHECK_SEQ = '''\
+%(indent)sfor (var i = 0; i < %(name)s.length; i++) {
+%(indent)s  if (!(%(name)s[i] instanceof %(classref)s)) {
+%(indent)s    throw new ASTError('%(classname)s expects %(name)s to be an array \
+of %(type)s');
+%(indent)s  }
+%(indent)s}
+'''
+_T_CHECK_NODE = '''\
+%(indent)sif (%(nullcheck)s!(%(name)s instanceof %(classref)s)) {
+%(indent)s  throw new ASTError('%(classname)s expects %(name)s to be a \
+%(type)s');
+%(indent)s}
+'''
+
+_T_ABSTRACT_CLASS = '''\
+//
+// %(classname)s is an abstract Node interface
+//
+var %(classname)s = exports.%(classname)s = function() {
+  throw new ASTError('%(classname)s is an abstract class');
+}
+
+%(classname)s.prototype = Object.create(Node.prototype);
+%(classname)s.prototype.constructor = %(classname)s
+
+'''
 
 
 # typename will be the class name
@@ -102,136 +744,2615 @@ def emit_ast(stream, ast):
 # 2. The sum has multiple constructors. In this case, the typename will
 #    become an abstract class implemented by each constructor in
 #    the sum.
-def emit_ast_type(stream, typename, sum):
+def emit_ast_type(stream, typename, sum, options, kinds, analysis):
+    stream.write(type_code(typename, sum, options, kinds, analysis))
+
+
+def type_code(typename, sum, options, kinds, analysis):
+    """ The code of the classes of a type, as emitted by emit_ast_type.
+    """
+    out = []
     if len(sum.types) == 1:
-        emit_single_node(stream, typename, sum.types[0])
+        emit_single_node(out, typename, sum.types[0], options, kinds,
+                         analysis)
     elif len(sum.types) > 1:
-        emit_node_hierarchy(stream, typename, sum.types)
+        emit_node_hierarchy(out, typename, sum.types, options, kinds,
+                            analysis)
     else:
         die('ERROR in %s, no constructors in Sum' % typename)
+    return ''.join(out)
 
 
-def emit_class(stream, classname, parentname, constructor):
-    def emit(s=''):
-        stream.write((s or '') + '\n')
-    emit('//')
-    emit('// %s is-a %s' % (classname, parentname))
-    emit('// %s' % str(constructor))
-    emit('//')
+def types_code(types, options, kinds, analysis, jobs=1):
+    """ The code of the given (typename, sum) types, one string per type, in
+        the same order. With jobs > 1 the types are emitted in batches by
+        that many worker processes; the batches are consecutive runs of types
+        and their results are collected in order, so the code doesn't depend
+        on jobs or on the scheduling of the workers.
+    """
+    if jobs <= 1 or len(types) < 2 * jobs:
+        return [type_code(typename, sum, options, kinds, analysis)
+                for typename, sum in types]
+    # A few batches per worker, to even out their loads
+    size = -(-len(types) // (jobs * 4))
+    batches = [(types[i:i + size], options, kinds, analysis)
+               for i in range(0, len(types), size)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [code for codes in pool.map(_types_code_batch, batches)
+                for code in codes]
+
+
+def _types_code_batch(batch):
+    types, options, kinds, analysis = batch
+    return [type_code(typename, sum, options, kinds, analysis)
+            for typename, sum in types]
+
+
+def emit_class(out, classname, parentname, constructor, options, kind,
+               analysis):
+    """ Append the code of a node class to the list out.
+    """
     argnames = [field.name for field in constructor.fields] + ['loc']
-    emit('var %s = exports.%s = function(%s) {' % (
-        classname, classname, ', '.join(argnames)))
+    names = {'classname': classname, 'parentname': parentname, 'kind': kind,
+             'constructor': constructor, 'args': ', '.join(argnames)}
+    out.append(_T_CLASS_HEADER % names)
+    if options.instrument:
+        out.append(_T_STAT % ('constructed', kind))
 
     # Names of fields that are attributes (non-Nodes)
-    attrs = []
+    names['attrs'] = [field.name for field in constructor.fields
+                      if not field.seq and field.type in _attribute_types]
 
-    # Now type-checking and assignment of each constructor argument
-    for field in constructor.fields:
-        def make_check_call(ty):
-            s = '_check_' + ty
-            nullcheck = ('%s !== null && ' % field.name) if field.opt else ''
-            emit("  {nullcheck}{s}({field.name}, '{classname}', '{field.name}', loc);".format(
-                nullcheck=nullcheck, s=s, field=field, classname=classname))
+    # In split output, the classes of other types are reached through the
+    # runtime's registry of classes.
+    classref = '_classes.%s' if options.split else '%s'
+
+    # Now type-checking and assignment of each constructor argument. Fields
+    # are always assigned in the same order, so that all the instances of a
+    # class share a single shape.
+    if options.profile == 'debug':
+        for field in constructor.fields:
+            emit_field_check(out, classname, field, '  ', classref)
+            out.append(_T_ASSIGN % (field.name, field.name))
+            out.append('\n')
+    else:
+        if options.profile == 'assert' and constructor.fields:
+            out.append('  if (_checks_enabled) {\n')
+            for field in constructor.fields:
+                emit_field_check(out, classname, field, '    ', classref)
+            out.append('  }\n\n')
+        for field in constructor.fields:
+            out.append(_T_ASSIGN % (field.name, field.name))
+    out.append(_T_CLASS_PROTOTYPE % names)
 
+    if options.profile == 'debug':
+        out.append(_T_DEBUG_PROPERTIES % names)
+    else:
+        out.append(_T_PROPERTIES % names)
+
+    # forEachChild calls the callback directly for every child node, so
+    # walking the children allocates nothing.
+    out.append(_T_FOR_EACH_CHILD % classname)
+    if options.instrument:
+        out.append(_T_STAT % ('forEachChild', kind))
+    for field in constructor.fields:
         if field.seq:
-            make_check_call('array')
-            emit('  for (var i = 0; i < %s.length; i++) {' % field.name)
-            emit('    if (!(%s[i] instanceof %s)) {' % (
-                field.name, field.type.capitalize()))
-            emit("      throw new ASTError('%s expects %s to be an array of %s');" % (
-                classname, field.name, field.type.capitalize()))
-            emit('    }')
-            emit('  }')
+            out.append(_T_FOR_EACH_SEQ % {'name': field.name})
+        elif field.type not in asdl_ast.builtin_types:
+            out.append((_T_FOR_EACH_OPT if field.opt else _T_FOR_EACH_NODE) %
+                       {'name': field.name})
+    out.append('}\n\n')
+    emit_children_method(out, constructor, classname, options, kind,
+                         analysis)
+    emit_transform_children_method(out, constructor, classname)
+    emit_dump_method(out, constructor, classname, names['attrs'])
+
+    emit_equality_methods(out, classname, constructor, kind)
+    emit_serialize_method(out, classname, constructor)
+    if options.intern and internable(constructor):
+        emit_interning_factory(out, classname, constructor)
+
+
+def emit_children_method(out, constructor, classname, options, kind,
+                         analysis):
+    """ Emit a children method specialized for the class, if it has a fixed
+        number of children: leaves return a shared empty list, and the list
+        of other fixed-arity classes is built without a callback. Other
+        classes use Node.prototype.children.
+    """
+    if not analysis.is_fixed_arity(constructor):
+        return
+    out.append(_T_CHILDREN % classname)
+    if options.instrument:
+        out.append(_T_STAT % ('children', kind))
+    if analysis.is_leaf(constructor):
+        out.append('  return _no_children;\n')
+    else:
+        children = [field for field in constructor.fields
+                    if field.type not in asdl_ast.builtin_types]
+        entries = [_T_CHILD_ENTRY % (field.name, field.name)
+                   for field in children]
+        if not any(field.opt for field in children):
+            out.append('  return [%s];\n' % ',\n          '.join(entries))
         else:
-            if field.type in ('identifier', 'string', 'boolean', 'int'):
-                make_check_call(field.type)
-                attrs.append(field.name)
-            else:
-                nullcheck = ('%s !== null && ' % field.name) if field.opt else ''
-                emit('  if (%s!(%s instanceof %s)) {' % (
-                    nullcheck, field.name, field.type.capitalize()))
-                emit("    throw new ASTError('%s expects %s to be a %s');" % (
-                    classname, field.name, field.type.capitalize()))
-                emit('  }')
-        emit('  this.%s = %s;' % (field.name, field.name))
-        emit()
-    emit('  this.loc = loc;')
-    emit('}')
-    emit()
+            out.append('  var children = [];\n')
+            for field, entry in zip(children, entries):
+                if field.opt:
+                    out.append(_T_CHILDREN_PUSH_OPT % (field.name, entry))
+                else:
+                    out.append('  children.push(%s);\n' % entry)
+            out.append('  return children;\n')
+    out.append('}\n\n')
 
-    emit('%s.prototype = Object.create(%s.prototype);' % (
-        classname, parentname))
-    emit('%s.prototype.constructor = %s;' % (classname, classname))
-    emit()
 
-    emit("Object.defineProperties(%s, {" % classname)
-    emit("  'attributes': {get: function() {return %s;}}," % attrs)
-    emit("  'node_type': {get: function() {return '%s';}}" % classname)
-    emit("});")
-    emit()
+def emit_transform_children_method(out, constructor, classname):
+    """ Emit the transformChildren method of the class: each child is replaced
+        by the callback's result, and the node is rebuilt only if one of them
+        changed.
+    """
+    children = [field for field in constructor.fields
+                if field.type not in asdl_ast.builtin_types]
+    out.append(_T_TRANSFORM_CHILDREN % classname)
+    if not children:
+        out.append('  return this;\n}\n\n')
+        return
+    for field in children:
+        if field.seq:
+            template = _T_TRANSFORM_SEQ
+        elif field.opt:
+            template = _T_TRANSFORM_OPT
+        else:
+            template = _T_TRANSFORM_NODE
+        out.append(template % {'name': field.name})
+    unchanged = ['%s === this.%s' % (field.name, field.name)
+                 for field in children]
+    if len(' && '.join(unchanged)) > 70:
+        out.append(_T_TRANSFORM_UNCHANGED % ' &&\n      '.join(unchanged))
+    else:
+        out.append(_T_TRANSFORM_UNCHANGED % ' && '.join(unchanged))
+    args = [field.name if field in children else 'this.%s' % field.name
+            for field in constructor.fields] + ['this.loc']
+    out.append(wrapped_call('  ', 'return new %s(' % classname, args))
+    out.append('}\n\n')
 
-    emit("%s.prototype.children = function () {" % classname)
-    emit("  var children = [];")
+
+def emit_dump_method(out, constructor, classname, attrs):
+    """ Emit the _dump method of the class (see CODE_DUMP). The line of a node
+        is built by a single concatenation of its attributes.
+    """
+    out.append(_T_DUMP % classname)
+    parts = ["'%s(%s=' + this.%s" % (classname, attrs[0], attrs[0])
+             if attrs else "'%s()'" % classname]
+    parts.extend("', %s=' + this.%s" % (attr, attr) for attr in attrs[1:])
+    if attrs:
+        parts[-1] += " + ')'"
+    line = '  d.line(depth, '
+    align = ' ' * len(line)
+    for i, part in enumerate(parts):
+        item = part + (', this.loc);' if i == len(parts) - 1 else ' +')
+        if not line.endswith('(depth, ') and len(line) + len(item) > 80:
+            out.append(line.rstrip() + '\n')
+            line = align
+        line += item + ' '
+    out.append(line.rstrip() + '\n')
     for field in constructor.fields:
+        if field.type in asdl_ast.builtin_types:
+            continue
         if field.seq:
-            emit("  for (var i = 0; i < this.%s.length; i++) {" % field.name)
-            child = "{'name': '%s[' + i.toString() + ']', 'node': this.%s[i]}" % (
-                field.name, field.name)
-            emit("    children.push(%s);" % child)
-            emit("  }")
-        elif field.type not in asdl_ast.builtin_types:
-            if field.opt:
-                emit("  if (this.%s !== null) {" % field.name)
-                emit("    children.push({'name': '%s', 'node': this.%s});" % (
-                    field.name, field.name))
-                emit("  }")
+            template = _T_DUMP_SEQ
+        elif field.opt:
+            template = _T_DUMP_OPT
+        else:
+            template = _T_DUMP_NODE
+        out.append(template % {'name': field.name})
+    out.append('}\n\n')
+
+
+def internable(constructor):
+    """ Can nodes of constructor be interned: is it a leaf whose fields all
+        have builtin types?
+    """
+    return all(field.type in _attribute_types and not field.seq
+               for field in constructor.fields)
+
+
+def _creation(classname, constructor, options):
+    """ The expression to call to create a node of the given class: its of()
+        factory if it has one, else its constructor.
+    """
+    if options.intern and internable(constructor):
+        return '%s.of' % classname
+    return 'new %s' % classname
+
+
+def emit_interning_factory(out, classname, constructor):
+    """ Emit the of() factory of a class whose nodes can be interned (see
+        CODE_INTERNING).
+    """
+    argnames = [field.name for field in constructor.fields] + ['loc']
+    names = {'classname': classname, 'args': ', '.join(argnames),
+             'last': len(argnames) - 1}
+    out.append(_T_INTERNING_HEAD % names)
+    # One level of Maps per argument, the last one holding the node
+    for i, name in enumerate(argnames[:-1]):
+        out.append(_T_INTERNING_LEVEL % {'i': i, 'next': i + 1, 'name': name})
+    out.append(_T_INTERNING_TAIL % names)
+
+
+def emit_equality_methods(out, classname, constructor, kind):
+    """ Emit the equals and structuralHash methods of a node class.
+    """
+    comparisons = []
+    for field in constructor.fields:
+        a, b = 'this.' + field.name, 'other.' + field.name
+        if field.type in asdl_ast.builtin_types:
+            if field.seq:
+                comparisons.append('_values_equal(%s, %s)' % (a, b))
             else:
-                emit("  children.push({'name': '%s', 'node': this.%s});" % (
-                    field.name, field.name))
-    emit("  return children;")
-    emit("}")
-    emit()
+                comparisons.append('%s === %s' % (a, b))
+        elif field.seq:
+            comparisons.append('_nodes_equal(%s, %s, options)' % (a, b))
+        elif field.opt:
+            comparisons.append('_node_equals(%s, %s, options)' % (a, b))
+        else:
+            comparisons.append('%s.equals(%s, options)' % (a, b))
+    out.append(_T_EQUALS % (classname, ''.join(
+        ' &&\n         ' + comparison for comparison in comparisons)))
+
+    out.append(_T_HASH_HEAD % (classname, kind + 1))
+    for field in constructor.fields:
+        value = 'this.' + field.name
+        if field.type in asdl_ast.builtin_types:
+            hashed = ('_hash_values(%s)' if field.seq else
+                      '_hash_value(%s)') % value
+        elif field.seq:
+            hashed = '_hash_nodes(%s)' % value
+        elif field.opt:
+            hashed = '_hash_node(%s)' % value
+        else:
+            hashed = '%s.structuralHash()' % value
+        out.append(_T_HASH_MIX % hashed)
+    out.append(_T_HASH_TAIL)
+
+
+# Field types stored as attributes (non-Node values) of nodes
+_attribute_types = ('identifier', 'string', 'boolean', 'int')
 
 
-def emit_single_node(stream, typename, constructor):
+def emit_field_check(out, classname, field, indent, classref='%s'):
+    """ Emit the code checking the constructor argument for field. classref
+        is the format of the expression referring to a node class, given its
+        name.
+    """
+    nullcheck = ('%s !== null && ' % field.name) if field.opt else ''
+    if field.seq:
+        out.append(_T_CHECK_CALL % (indent, nullcheck, 'array', field.name,
+                                    classname, field.name))
+        template = _T_CHECK_SEQ
+    elif field.type in _attribute_types:
+        out.append(_T_CHECK_CALL % (indent, nullcheck, field.type, field.name,
+                                    classname, field.name))
+        return
+    else:
+        template = _T_CHECK_NODE
+    out.append(template % {
+        'indent': indent, 'nullcheck': nullcheck, 'name': field.name,
+        'classname': classname, 'type': field.type.capitalize(),
+        'classref': classref % field.type.capitalize()})
+
+
+def emit_single_node(out, typename, constructor, options, kinds, analysis):
     if typename.lower() != constructor.name.lower():
         print('Warning: Constructor name mismatch in single node : %s vs %s' %
                 (typename, constructor.name))
     classname = typename.capitalize()
-    emit_class(stream, classname, 'Node', constructor)
+    emit_class(out, classname, 'Node', constructor, options,
+               kinds[classname], analysis)
 
 
-def emit_node_hierarchy(stream, typename, constructors):
-    def emit(s=''):
-        stream.write((s or '') + '\n')
+def emit_node_hierarchy(out, typename, constructors, options, kinds,
+                        analysis):
     # Create the node for typename as the abstract base class for this
     # hierarchy, and then emit each constructor with this class as a parent.
     classname = typename.capitalize()
-    emit('//')
-    emit('// %s is an abstract Node interface' % classname)
-    emit('//')
-    emit('var %s = exports.%s = function() {' % (classname, classname))
-    emit("  throw new ASTError('%s is an abstract class');" % classname)
-    emit('}')
-    emit()
-    emit('%s.prototype = Object.create(Node.prototype);' % classname)
-    emit('%s.prototype.constructor = %s' % (classname, classname))
-    emit()
-
+    out.append(_T_ABSTRACT_CLASS % {'classname': classname})
     for constructor in constructors:
-        emit_class(stream, constructor.name, classname, constructor)
+        emit_class(out, constructor.name, classname, constructor, options,
+                   kinds[constructor.name], analysis)
 
 
-def main():
-    if len(sys.argv) < 2:
-        print('Usage: %s <input ASDL>' % sys.argv[0])
-        return 1
-    with open(sys.argv[1]) as asdl_file:
-        ast = asdl_parser.ASDLParser().parse(asdl_file.read())
-        if asdl_ast.check(ast):
-            emit_ast(sys.stdout, ast)
-        else:
-            return 1
+CODE_VISITOR = r'''
+//
+//-------------------- Visitor --------------------
+//
+
+// GeneratedVisitor is the base for visitors of these ASTs. To create a
+// visitor, inherit from GeneratedVisitor and define visit_Type methods for
+// visiting nodes of type Type; nodes without such a method are handled by
+// visit_children, which visits all their children.
+//
+// visit dispatches on node.kind through a table of methods, built the first
+// time the visitor visits a node. The table of a visitor class is shared by all
+// its instances; a visitor with visit_ methods of its own (assigned to it
+// rather than to its class, before its first visit) gets its own table.
+var GeneratedVisitor = exports.GeneratedVisitor = function() {
+  this._dispatch = null;
+}
+
+GeneratedVisitor.prototype.visit = function(node) {
+  var dispatch = this._dispatch || (this._dispatch = _dispatch_table(
+      this, 'visit_', 'visit_children'));
+  return dispatch[node.kind].call(this, node);
+}
+
+GeneratedVisitor.prototype.visit_children = function(node) {
+  node.forEachChild(this.visit, this);
+}
+
+// The methods of obj named prefix + node type, indexed by kind, with the method
+// named fallback for the node types without one. The table is cached on obj's
+// class's prototype, unless obj has methods starting with prefix of its own.
+var _dispatch_table = function(obj, prefix, fallback) {
+  var own = Object.keys(obj).some(function(name) {
+    return name.lastIndexOf(prefix, 0) === 0;
+  });
+  if (own) {
+    return _method_table(obj, prefix, fallback);
+  }
+  var proto = Object.getPrototypeOf(obj);
+  var cache = '_' + prefix + 'table';
+  if (!Object.prototype.hasOwnProperty.call(proto, cache)) {
+    proto[cache] = _method_table(proto, prefix, fallback);
+  }
+  return proto[cache];
+}
+
+var _method_table = function(obj, prefix, fallback) {
+  var table = [];
+  for (var kind = 0; kind < node_types.length; kind++) {
+    var method = obj[prefix + node_types[kind]];
+    table.push(method === undefined ? obj[fallback] : method);
+  }
+  return table;
+}
+'''
+
+
+CODE_TRANSFORMER = r'''
+//
+//-------------------- Transformer --------------------
+//
+
+// GeneratedTransformer is the base for passes rewriting these ASTs without
+// modifying them. To create a transformer, inherit from GeneratedTransformer
+// and define transform_Type methods returning the node replacing a node of
+// type Type (possibly the node itself); nodes without such a method are handled
+// by transform_children, which transforms their children. transform(root)
+// returns the new tree. Nodes are only rebuilt if one of their children
+// changed, so the new tree shares all the unchanged subtrees with the old one,
+// and transforming a tree without changing anything returns it as is.
+//
+// Dispatch goes through a table of methods, as for visitors.
+var GeneratedTransformer = exports.GeneratedTransformer = function() {
+  this._dispatch = null;
+}
+
+GeneratedTransformer.prototype.transform = function(node) {
+  var dispatch = this._dispatch || (this._dispatch = _dispatch_table(
+      this, 'transform_', 'transform_children'));
+  return dispatch[node.kind].call(this, node);
+}
+
+GeneratedTransformer.prototype.transform_children = function(node) {
+  return node.transformChildren(this.transform, this);
+}
+'''
+
+
+CODE_DUMP = r'''
+//
+//-------------------- Dumping --------------------
+//
+
+// dump(node, show_loc, write) dumps the tree rooted at node as
+// ast_visitor.NodeDumper does: a line "Type(attr=value, ...)" per node,
+// followed by " @ loc: " and its loc if show_loc is set, indented by 4 spaces
+// per level. Each node class has a _dump method appending its line to a shared
+// _Dumper and then dumping its children, so nothing is allocated per node but
+// the line itself. Being recursive, dump overflows the stack on trees about
+// 10000 levels deep.
+//
+// Without write, the dump is returned as a string. Otherwise it's passed to
+// write(chunk) in chunks of about _DUMP_CHUNK characters as it's produced, so
+// that large trees can be streamed (e.g. to fs.writeSync) without building the
+// whole string, and nothing is returned.
+var dump = exports.dump = function(node, show_loc, write) {
+  var d = new _Dumper(show_loc || false, write || null);
+  node._dump(d, 0);
+  return d.finish();
+}
+
+var _DUMP_CHUNK = 65536;
+
+// Indentation strings by depth, shared by all the dumps
+var _indents = [''];
+
+var _Dumper = function(show_loc, write) {
+  this.show_loc = show_loc;
+  this.write = write;
+  this.buf = '';
+  this.sep = '';
+}
+
+_Dumper.prototype.line = function(depth, s, loc) {
+  while (_indents.length <= depth) {
+    _indents.push(_indents[_indents.length - 1] + '    ');
+  }
+  if (this.show_loc) {
+    s += ' @ loc: ' + loc;
+  }
+  this.buf += this.sep + _indents[depth] + s;
+  this.sep = '\n';
+  if (this.write !== null && this.buf.length >= _DUMP_CHUNK) {
+    this.write(this.buf);
+    this.buf = '';
+  }
+}
+
+_Dumper.prototype.finish = function() {
+  if (this.write === null) {
+    return this.buf;
+  }
+  if (this.buf.length > 0) {
+    this.write(this.buf);
+    this.buf = '';
+  }
+}
+'''
+
+
+def emit_visitor(stream, classnames):
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    emit('// Names and classes of the concrete node types, indexed by kind.')
+    emit('var node_types = exports.node_types = [')
+    for classname in classnames[:-1]:
+        emit("  '%s'," % classname)
+    emit("  '%s'];" % classnames[-1])
+    emit()
+    emit('var node_classes = exports.node_classes = [')
+    emit(textwrap.fill(', '.join(classnames) + '];', width=80,
+                       initial_indent='  ', subsequent_indent='  '))
+    stream.write(CODE_VISITOR)
+
+
+CODE_WALKERS_HEADER = r'''
+//
+//-------------------- Walkers --------------------
+//
+
+// walkPreorder(root, fn, ctx) and walkPostorder(root, fn, ctx) call
+// fn.call(ctx, node) for every node of the tree rooted at root, parents
+// before their children or after them, respectively. Children are walked in
+// the order of their fields, like forEachChild. The walk uses an explicit
+// stack rather than recursion, so it works on trees of any depth.
+//
+// fn can return SKIP to have the children of the node skipped (walkPreorder
+// only), or STOP to end the walk. The walkers return false if the walk was
+// stopped and true otherwise.
+var SKIP = exports.SKIP = {};
+var STOP = exports.STOP = {};
+
+// Marks the position of a node whose children are being walked by
+// walkPostorder.
+var _POSTORDER_MARK = {};
+'''
+
+
+def emit_walkers(stream, classes):
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    stream.write(CODE_WALKERS_HEADER)
+    emit()
+    emit('var walkPreorder = exports.walkPreorder = function(root, fn, ctx) {')
+    emit('  var stack = [root];')
+    emit('  while (stack.length > 0) {')
+    emit('    var node = stack.pop();')
+    emit('    var action = fn.call(ctx, node);')
+    emit('    if (action === STOP) {')
+    emit('      return false;')
+    emit('    } else if (action === SKIP) {')
+    emit('      continue;')
+    emit('    }')
+    emit_push_children(emit, classes, '    ')
+    emit('  }')
+    emit('  return true;')
+    emit('}')
+    emit()
+    emit('var walkPostorder = exports.walkPostorder = function(root, fn, ctx) {')
+    emit('  var stack = [root];')
+    emit('  while (stack.length > 0) {')
+    emit('    var node = stack.pop();')
+    emit('    if (node === _POSTORDER_MARK) {')
+    emit('      if (fn.call(ctx, stack.pop()) === STOP) {')
+    emit('        return false;')
+    emit('      }')
+    emit('      continue;')
+    emit('    }')
+    emit('    stack.push(node, _POSTORDER_MARK);')
+    emit_push_children(emit, classes, '    ')
+    emit('  }')
+    emit('  return true;')
+    emit('}')
+
+
+def emit_push_children(emit, classes, indent, slots=False):
+    """ Emit a switch on node.kind pushing the children of node on stack, in
+        reverse order so that they are popped in order. Leaves have no case.
+        With slots, each child is pushed followed by id (the index of node),
+        the name of its field and its index in the field (-1 if the field
+        isn't a sequence).
+    """
+    def entry(field, index=None):
+        if not slots:
+            return 'node.%s%s' % (field.name,
+                                  '' if index is None else '[%s]' % index)
+        elif index is None:
+            return "node.%s, id, '%s', -1" % (field.name, field.name)
+        return "node.%s[%s], id, '%s', %s" % (field.name, index, field.name,
+                                              index)
+    emit('%sswitch (node.kind) {' % indent)
+    for kind, (classname, constructor) in enumerate(classes):
+        children = [field for field in constructor.fields
+                    if field.type not in asdl_ast.builtin_types]
+        if not children:
+            continue
+        emit('%s  case %d:  // %s' % (indent, kind, classname))
+        # Runs of plain fields are pushed with a single call
+        plain = []
+        def flush():
+            if plain:
+                emit('%s    stack.push(%s);' % (indent, ', '.join(plain)))
+                del plain[:]
+        for field in reversed(children):
+            if field.seq:
+                flush()
+                emit('%s    for (var i = node.%s.length - 1; i >= 0; i--) {' % (
+                    indent, field.name))
+                emit('%s      stack.push(%s);' % (indent, entry(field, 'i')))
+                emit('%s    }' % indent)
+            elif field.opt:
+                flush()
+                emit('%s    if (node.%s !== null) {' % (indent, field.name))
+                emit('%s      stack.push(%s);' % (indent, entry(field)))
+                emit('%s    }' % indent)
+            elif slots:
+                emit('%s    stack.push(%s);' % (indent, entry(field)))
+            else:
+                plain.append(entry(field))
+        flush()
+        emit('%s    break;' % indent)
+    emit('%s}' % indent)
+
+
+CODE_KIND_INDEX = r'''
+//
+//-------------------- Kind index --------------------
+//
+
+// buildKindIndex(root) walks the tree rooted at root once and returns a
+// KindIndex of it, which passes can share to find all the nodes of a kind
+// without walking the tree again.
+//
+// Each position in the tree gets an id, in preorder; the root's is 0. The
+// index has side arrays mapping ids to:
+//
+//   nodes: the node at the position (null once removed by replace).
+//   parents: the id of the parent, -1 for the root.
+//   fields: the name of the parent's field holding the node.
+//   slots: the index of the node in that field, -1 if it's not a sequence.
+//   sizes: the number of ids in the subtree of the node.
+//
+// ofKind(kind) returns the nodes of a kind, given as a kind number or a node
+// class; forEachOfKind(kind, fn, ctx) calls fn.call(ctx, node, id) for them.
+// An abstract class (such as Node itself) stands for all its concrete
+// subclasses, whose nodes come kind by kind.
+// parentOf(node) and idOf(node) map nodes to their positions. Interned nodes
+// can appear at several positions; these methods throw an ASTError for them,
+// and the side arrays must be used instead.
+//
+// replace(node, replacement) replaces a subtree, both in the tree and in the
+// index: the ids of the old subtree are retired and the new one is indexed
+// with fresh ids, without walking the rest of the tree. node can also be
+// given by id. The replacement must be of the type the field holding node is
+// declared with. The cached structural hashes of the ancestors are reset.
+// Nodes of a kind come in preorder, followed by those added by replacements.
+var KindIndex = exports.KindIndex = function(root) {
+  this.root = root;
+  this.nodes = [];
+  this.parents = [];
+  this.fields = [];
+  this.slots = [];
+  this.sizes = [];
+  this._kinds = [];
+  for (var k = 0; k < node_classes.length; k++) {
+    this._kinds.push([]);
+  }
+  // id -> id of the root of the subtree that replaced it
+  this._replaced = new Map();
+  // node -> its id, or the array of its ids if it has several. Built by the
+  // first idOf, and then kept up to date by replace.
+  this._positions = null;
+  this._add(root, -1, null, -1);
+}
+
+var buildKindIndex = exports.buildKindIndex = function(root) {
+  return new KindIndex(root);
+}
+
+// The kinds of the nodes of kind, given as for ofKind.
+var _kinds_of = function(kind) {
+  if (typeof kind === 'number') {
+    if (kind >= 0 && kind < node_classes.length && kind % 1 === 0) {
+      return [kind];
+    }
+  } else if (typeof kind === 'function' &&
+             (kind === Node || kind.prototype instanceof Node)) {
+    if (kind !== Node && kind.prototype.hasOwnProperty('kind')) {
+      return [kind.prototype.kind];
+    }
+    var kinds = [];
+    for (var k = 0; k < node_classes.length; k++) {
+      if (node_classes[k].prototype instanceof kind) {
+        kinds.push(k);
+      }
+    }
+    return kinds;
+  }
+  throw new ASTError('Not a node kind or class: ' + kind);
+}
+
+KindIndex.prototype.ofKind = function(kind) {
+  var result = [];
+  this.forEachOfKind(kind, function(node) { result.push(node); });
+  return result;
+}
+
+KindIndex.prototype.forEachOfKind = function(kind, fn, ctx) {
+  var kinds = _kinds_of(kind);
+  for (var k = 0; k < kinds.length; k++) {
+    var ids = this._kinds[kinds[k]];
+    // Drop the ids retired by replace along the way
+    var live = 0;
+    for (var i = 0; i < ids.length; i++) {
+      var node = this.nodes[ids[i]];
+      if (node !== null) {
+        ids[live++] = ids[i];
+        fn.call(ctx, node, ids[i]);
+      }
+    }
+    ids.length = live;
+  }
+}
+
+KindIndex.prototype.idOf = function(node) {
+  if (this._positions === null) {
+    this._positions = new Map();
+    for (var id = 0; id < this.nodes.length; id++) {
+      if (this.nodes[id] !== null) {
+        this._add_position(this.nodes[id], id);
+      }
+    }
+  }
+  var id = this._positions.get(node);
+  if (id === undefined) {
+    return -1;
+  } else if (typeof id !== 'number') {
+    throw new ASTError('KindIndex: node occurs at several positions');
+  }
+  return id;
+}
+
+KindIndex.prototype._add_position = function(node, id) {
+  var ids = this._positions.get(node);
+  if (ids === undefined) {
+    this._positions.set(node, id);
+  } else if (typeof ids === 'number') {
+    this._positions.set(node, [ids, id]);
+  } else {
+    ids.push(id);
+  }
+}
+
+KindIndex.prototype._remove_position = function(node, id) {
+  var ids = this._positions.get(node);
+  if (typeof ids === 'number') {
+    this._positions.delete(node);
+  } else {
+    ids.splice(ids.indexOf(id), 1);
+    if (ids.length === 1) {
+      this._positions.set(node, ids[0]);
+    }
+  }
+}
+
+KindIndex.prototype.parentOf = function(node) {
+  var id = this.idOf(node);
+  if (id < 0) {
+    throw new ASTError('KindIndex: node is not in the tree');
+  }
+  return this.parents[id] < 0 ? null : this.nodes[this.parents[id]];
+}
+
+KindIndex.prototype.replace = function(node, replacement) {
+  var id = typeof node === 'number' ? node : this.idOf(node);
+  if (id < 0 || id >= this.nodes.length || this.nodes[id] === null) {
+    throw new ASTError('KindIndex: node is not in the tree');
+  }
+  var parent = this.parents[id];
+  if (parent < 0) {
+    if (!(replacement instanceof Node)) {
+      throw new ASTError('KindIndex: replacement is not a node');
+    }
+    this.root = replacement;
+  } else {
+    var holder = this.nodes[parent];
+    if (!(replacement instanceof
+          _field_classes[holder.kind][this.fields[id]])) {
+      throw new ASTError('KindIndex: replacement has the wrong type');
+    }
+    if (this.slots[id] < 0) {
+      holder[this.fields[id]] = replacement;
+    } else {
+      holder[this.fields[id]][this.slots[id]] = replacement;
+    }
+    for (var a = parent; a >= 0; a = this.parents[a]) {
+      this.nodes[a]._hash = 0;
+    }
+  }
+  this._retire(id);
+  this._replaced.set(id, this._add(replacement, parent, this.fields[id],
+                                   this.slots[id]));
+}
+
+// Retire the ids of the subtree at id, and of the subtrees that replaced
+// parts of it.
+KindIndex.prototype._retire = function(id) {
+  var pending = [id];
+  while (pending.length > 0) {
+    var first = pending.pop();
+    var end = first + this.sizes[first];
+    for (var i = first; i < end; i++) {
+      if (this._positions !== null && this.nodes[i] !== null) {
+        this._remove_position(this.nodes[i], i);
+      }
+      this.nodes[i] = null;
+      var moved = this._replaced.get(i);
+      if (moved !== undefined) {
+        this._replaced.delete(i);
+        pending.push(moved);
+      }
+    }
+  }
+}
+
+// Index the subtree of root, at the given position, with fresh ids. Return the
+// id of root.
+KindIndex.prototype._add = function(root, root_parent, root_field,
+                                    root_slot) {
+  var first = this.nodes.length;
+  var stack = [root, root_parent, root_field, root_slot];
+  while (stack.length > 0) {
+    var slot = stack.pop();
+    var field = stack.pop();
+    var parent = stack.pop();
+    var node = stack.pop();
+    var id = this.nodes.length;
+    this.nodes.push(node);
+    this.parents.push(parent);
+    this.fields.push(field);
+    this.slots.push(slot);
+    this.sizes.push(1);
+    this._kinds[node.kind].push(id);
+    if (this._positions !== null) {
+      this._add_position(node, id);
+    }
+    _push_indexed_children(node, id, stack);
+  }
+  for (var i = this.nodes.length - 1; i > first; i--) {
+    this.sizes[this.parents[i]] += this.sizes[i];
+  }
+  return first;
+}
+'''
+
+
+def emit_kind_index(stream, classes):
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    stream.write(CODE_KIND_INDEX)
+    emit()
+    emit('var _push_indexed_children = function(node, id, stack) {')
+    emit_push_children(emit, classes, '  ', slots=True)
+    emit('}')
+    emit()
+    emit('// The classes of the nodes held by the node fields of each kind, by '
+         'field name')
+    emit('var _field_classes = [')
+    for kind, (classname, constructor) in enumerate(classes):
+        emit('  {%s}%s  // %s' % (', '.join(
+            '%s: %s' % (field.name, field.type.capitalize())
+            for field in constructor.fields
+            if field.type not in asdl_ast.builtin_types),
+            ',' if kind < len(classes) - 1 else '', classname))
+    emit('];')
+
+
+CODE_SERIALIZATION = r'''
+//
+//-------------------- Serialization --------------------
+//
+
+// serialize(node) encodes the tree rooted at node into a compact binary form,
+// returned as a Uint8Array. deserialize(bytes) decodes it back into a tree of
+// nodes (bytes can be a Uint8Array or a Buffer).
+//
+// The encoding, where all integers are unsigned LEB128 varints:
+// - The magic 'CAST', the format version and the schema id: a hash of the
+//   ASDL definition this module was generated from, so that ASTs are never
+//   decoded against a different schema.
+// - A string table: the number of strings, then the length in bytes and the
+//   UTF-8 encoding of each string. Identifiers and strings in the tree are
+//   stored as their index in the table plus 1, with 0 for null.
+// - The root node. A node is encoded as its kind plus 1 (0 for null), its loc
+//   plus 1 (0 for a missing loc), and then its fields in order. Sequences are
+//   their length followed by their elements. ints are zigzag-encoded, and
+//   booleans are a single 0 or 1 byte.
+//
+// Both recurse once per level of the tree, so trees a few thousand levels
+// deep (such as a left-deep chain of thousands of binary operators) overflow
+// node's default stack with a RangeError; deserialize gives up first, at about
+// half the depth serialize handles. The Python deserializer generated by
+// asdl_gen_py.py reads with an explicit stack and has no such limit.
+var serialize = exports.serialize = function(node) {
+  var body = new _Writer();
+  body.node(node);
+
+  var out = new _Writer();
+  for (var i = 0; i < _MAGIC.length; i++) {
+    out.byte(_MAGIC.charCodeAt(i));
+  }
+  out.uint(_FORMAT_VERSION);
+  out.uint(schema_id);
+  out.uint(body.strings.length);
+  for (var i = 0; i < body.strings.length; i++) {
+    var utf8 = _utf8_encode(body.strings[i]);
+    out.uint(utf8.length);
+    out.bytes(utf8);
+  }
+  out.bytes(body.buf.subarray(0, body.pos));
+  return out.buf.slice(0, out.pos);
+}
+
+var deserialize = exports.deserialize = function(bytes) {
+  var r = new _Reader(bytes);
+  for (var i = 0; i < _MAGIC.length; i++) {
+    if (r.byte() !== _MAGIC.charCodeAt(i)) {
+      throw new ASTError('Not a serialized AST');
+    }
+  }
+  var version = r.uint();
+  if (version !== _FORMAT_VERSION) {
+    throw new ASTError('Unsupported serialized AST version ' + version);
+  }
+  if (r.uint() !== schema_id) {
+    throw new ASTError('Serialized AST was built from a different schema');
+  }
+  var nstrings = r.uint();
+  for (var i = 0; i < nstrings; i++) {
+    var length = r.uint();
+    if (r.pos + length > bytes.length) {
+      throw new ASTError('Truncated serialized AST');
+    }
+    r.strings.push(_utf8_decode(bytes, r.pos, r.pos + length));
+    r.pos += length;
+  }
+  return r.node();
+}
+
+var _MAGIC = 'CAST';
+var _FORMAT_VERSION = 1;
+
+var _Writer = function() {
+  this.buf = new Uint8Array(256);
+  this.pos = 0;
+  this.strings = [];
+  this._string_index = Object.create(null);
+}
+
+_Writer.prototype._reserve = function(n) {
+  if (this.pos + n > this.buf.length) {
+    var buf = new Uint8Array(Math.max(this.buf.length * 2, this.pos + n));
+    buf.set(this.buf);
+    this.buf = buf;
+  }
+}
+
+_Writer.prototype.byte = function(b) {
+  this._reserve(1);
+  this.buf[this.pos++] = b;
+}
+
+_Writer.prototype.bytes = function(bytes) {
+  this._reserve(bytes.length);
+  this.buf.set(bytes, this.pos);
+  this.pos += bytes.length;
+}
+
+// Arithmetic rather than bitwise operations, so that values beyond 32 bits
+// are encoded correctly. Anything but the integers from 0 to 2^53 - 1 (such as
+// a negative or fractional loc) would be encoded as something else, and is
+// rejected.
+_Writer.prototype.uint = function(v) {
+  if (!Number.isSafeInteger(v) || v < 0) {
+    throw new ASTError('Can\'t serialize ' + v + ': not an unsigned integer');
+  }
+  this._reserve(10);
+  while (v >= 128) {
+    this.buf[this.pos++] = (v % 128) | 128;
+    v = Math.floor(v / 128);
+  }
+  this.buf[this.pos++] = v;
+}
+
+// Only ints as checked by _check_int have an exact zigzag encoding.
+_Writer.prototype.int = function(v) {
+  if (!Number.isInteger(v) || Math.abs(v) > 4503599627370495) {
+    throw new ASTError('Can\'t serialize ' + v + ': not an int');
+  }
+  this.uint(v >= 0 ? v * 2 : -v * 2 - 1);
+}
+
+_Writer.prototype.boolean = function(v) {
+  this.byte(v ? 1 : 0);
+}
+
+_Writer.prototype.string = function(s) {
+  if (s === null) {
+    this.uint(0);
+    return;
+  }
+  var index = this._string_index[s];
+  if (index === undefined) {
+    index = this._string_index[s] = this.strings.length;
+    this.strings.push(s);
+  }
+  this.uint(index + 1);
+}
+
+_Writer.prototype.node = function(node) {
+  if (node === null) {
+    this.uint(0);
+    return;
+  }
+  this.uint(node.kind + 1);
+  this.uint(node.loc === undefined || node.loc === null ? 0 : node.loc + 1);
+  node._serialize(this);
+}
+
+var _Reader = function(bytes) {
+  this.bytes = bytes;
+  this.pos = 0;
+  this.strings = [];
+}
+
+_Reader.prototype.byte = function() {
+  if (this.pos >= this.bytes.length) {
+    throw new ASTError('Truncated serialized AST');
+  }
+  return this.bytes[this.pos++];
+}
+
+_Reader.prototype.uint = function() {
+  var v = 0;
+  var scale = 1;
+  var b;
+  do {
+    b = this.byte();
+    v += (b & 127) * scale;
+    scale *= 128;
+  } while (b & 128);
+  return v;
+}
+
+_Reader.prototype.int = function() {
+  var v = this.uint();
+  return v % 2 === 0 ? v / 2 : -(v + 1) / 2;
+}
+
+_Reader.prototype.boolean = function() {
+  return this.byte() !== 0;
+}
+
+_Reader.prototype.string = function() {
+  var index = this.uint();
+  if (index === 0) {
+    return null;
+  }
+  if (index > this.strings.length) {
+    throw new ASTError('Unknown string index ' + (index - 1));
+  }
+  return this.strings[index - 1];
+}
+
+_Reader.prototype.node = function() {
+  var tag = this.uint();
+  if (tag === 0) {
+    return null;
+  }
+  var deserializer = _deserializers[tag - 1];
+  if (deserializer === undefined) {
+    throw new ASTError('Unknown node kind ' + (tag - 1));
+  }
+  var loc = this.uint();
+  return deserializer(this, loc === 0 ? undefined : loc - 1);
+}
+
+// Read a sequence whose elements are read by the given _Reader method.
+_Reader.prototype.seq = function(read) {
+  var length = this.uint();
+  var values = [];
+  for (var i = 0; i < length; i++) {
+    values.push(read.call(this));
+  }
+  return values;
+}
+
+// Strings are encoded and decoded with the standard UTF-8 codec. Strings
+// that have no UTF-8 encoding (with unpaired surrogates) aren't serialized,
+// and malformed UTF-8 isn't decoded, rather than replaced by U+FFFD.
+var _utf8_encoder = new TextEncoder();
+var _utf8_decoder = new TextDecoder('utf-8', {fatal: true, ignoreBOM: true});
+var _unpaired_surrogate =
+    /[\ud800-\udbff](?![\udc00-\udfff])|(?:^|[^\ud800-\udbff])[\udc00-\udfff]/;
+
+var _utf8_encode = function(s) {
+  if (_unpaired_surrogate.test(s)) {
+    throw new ASTError('Can\'t serialize ' + JSON.stringify(s) +
+                       ': not valid Unicode');
+  }
+  return _utf8_encoder.encode(s);
+}
+
+var _utf8_decode = function(bytes, start, end) {
+  try {
+    return _utf8_decoder.decode(bytes.subarray(start, end));
+  } catch (e) {
+    throw new ASTError('Invalid UTF-8 string in serialized AST');
+  }
+}
+'''
+
+
+def emit_serialize_method(out, classname, constructor):
+    """ Emit the _serialize method of a node class, which writes the fields of
+        a node to a _Writer.
+    """
+    out.append(_T_SERIALIZE % classname)
+    for field in constructor.fields:
+        method = _serialization_methods[field.type]
+        if field.seq:
+            out.append(_T_SERIALIZE_SEQ % {'name': field.name,
+                                           'method': method})
+        else:
+            out.append(_T_SERIALIZE_FIELD % (method, field.name))
+    out.append('}\n\n')
+
+
+def emit_deserializers(stream, classes, schema_id, options):
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    emit()
+    emit('var schema_id = exports.schema_id = %d;' % schema_id)
+    emit()
+    emit('// Functions reading the fields of a node from a _Reader and creating the')
+    emit('// node, indexed by kind.')
+    emit('var _deserializers = [')
+    for kind, (classname, constructor) in enumerate(classes):
+        args = []
+        for field in constructor.fields:
+            method = _serialization_methods[field.type]
+            if field.seq:
+                args.append('r.seq(r.%s)' % method)
+            else:
+                args.append('r.%s()' % method)
+        emit('  function(r, loc) {')
+        emit('    return %s(%s);' % (_creation(classname, constructor, options),
+                                     ', '.join(args + ['loc'])))
+        emit('  }%s' % (',' if kind < len(classes) - 1 else '];'))
+
+
+def schema_id(ast):
+    """ A 32-bit id of the ASDL definition of ast, identifying the schema of
+        serialized ASTs.
+    """
+    digest = hashlib.sha256(repr(ast).encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'big')
+
+
+class _SerializationMethods(dict):
+    """ Maps a field type to the name of the _Writer and _Reader methods
+        handling it; node types map to 'node'.
+    """
+    def __missing__(self, key):
+        return 'node'
+
+_serialization_methods = _SerializationMethods(
+    identifier='string', string='string', int='int', boolean='boolean')
+
+
+# Names of builder methods that aren't constructors or field accessors. Also
+# used by the arena backend.
+_builder_reserved_names = set([
+    'kinds', 'kind', 'loc', 'node_type', 'size', 'strings', 'forEachChild',
+    'fromObject', 'toObject'])
+
+
+def emit_builder(stream, classes, options):
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    emit()
+    emit('//')
+    emit('//-------------------- Builder --------------------')
+    emit('//')
+    emit()
+    emit('// builder exposes the node constructors and field accessors of this module as')
+    emit('// plain functions: builder.Obj(name, loc) creates an Obj node and')
+    emit('// builder.name(node) reads the name field of a node. The arena backend')
+    emit('// exposes the same interface over node handles, so code written against a')
+    emit('// builder (such as the parser) can target either representation.')
+    emit('var builder = exports.builder = {')
+    emit('  kinds: {')
+    for kind, (classname, _) in enumerate(classes):
+        emit('    %s: %d%s' % (classname, kind,
+                               ',' if kind < len(classes) - 1 else ''))
+    emit('  },')
+    emit()
+    emit('  kind: function(node) {return node.kind;},')
+    emit('  loc: function(node) {return node.loc;},')
+    emit('  node_type: function(node) {return node.constructor.node_type;},')
+    emit()
+    for classname, constructor in classes:
+        argnames = ', '.join([field.name for field in constructor.fields] +
+                             ['loc'])
+        emit('  %s: function(%s) {' % (classname, argnames))
+        emit('    return %s(%s);' % (_creation(classname, constructor, options),
+                                     argnames))
+        emit('  },')
+    emit()
+    entries = ['  %s: function(node) {return node.%s;}' % (name, name)
+               for name, _ in fields_by_name(classes)]
+    emit(',\n'.join(entries))
+    emit('};')
+
+
+CODE_ARENA_PREFACE = r'''
+//------------------------------------------------------------------------------
+// Arena-backed AST for Cool.
+// NOTE: this code is auto-generated from the ASDL definition of the AST. Do
+//       not edit it directly.
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+
+'use strict';
+
+var object_ast = require('%(object_module)s');
+
+var ASTError = exports.ASTError = object_ast.ASTError;
+
+// An Arena stores AST nodes in typed arrays instead of one JS object per node.
+// A node is an integer handle into the arena's columns: its kind (the same
+// kinds as in the object representation), its loc and one slot per field.
+// Sequence fields take two slots, holding the start and the length of a range
+// in the arena's shared child array. Identifiers and strings are interned in
+// the arena's string table and slots hold their index. Null nodes, identifiers
+// and strings are stored as -1. Ints and locs are stored as is, and have to be
+// 32-bit integers; the smallest one is reserved for null ints and locs, and the
+// next one for undefined locs.
+//
+// Arena has the same interface as the builder of the object representation:
+// arena.Obj(name, loc) creates an Obj node and returns its handle,
+// arena.name(handle) reads the name field of a node, and so on. Sequence
+// fields are passed to constructors and returned from accessors as arrays of
+// handles.
+var Arena = exports.Arena = function(capacity) {
+  capacity = capacity || 1024;
+  this.size = 0;
+  this.strings = [];
+  this._string_index = Object.create(null);
+  this._child = new Int32Array(capacity);
+  this._nchild = 0;
+  this._kinds = new %(kind_array)s(capacity);
+  this._locs = new Int32Array(capacity);
+%(slot_inits)s
+}
+
+Arena.prototype._alloc = function(kind, loc) {
+  if (loc !== undefined && loc !== null) {
+    _check_int32(loc, node_types[kind], 'loc', _NO_LOC);
+  }
+  if (this.size === this._kinds.length) {
+    this._grow();
+  }
+  var handle = this.size++;
+  this._kinds[handle] = kind;
+  this._locs[handle] = loc === undefined ? _NO_LOC :
+                       loc === null ? _NULL_INT : loc;
+  return handle;
+}
+
+var _NULL_INT = -0x80000000;
+var _NO_LOC = -0x7fffffff;
+
+// Check that v is an integer storable in an Int32Array, and greater than min.
+var _check_int32 = function(v, who, what, min) {
+  if ((v | 0) !== v || v <= min) {
+    throw new ASTError(who + ' can\'t store ' + what + ' ' + v +
+                       ' in an arena: not a 32-bit integer');
+  }
+}
+
+Arena.prototype._grow = function() {
+  var capacity = this._kinds.length * 2;
+  this._kinds = _resized(this._kinds, capacity);
+  this._locs = _resized(this._locs, capacity);
+%(slot_grows)s
+}
+
+var _resized = function(array, capacity) {
+  var resized = new array.constructor(capacity);
+  resized.set(array);
+  return resized;
+}
+
+Arena.prototype._intern = function(s) {
+  if (s === null) {
+    return -1;
+  }
+  var index = this._string_index[s];
+  if (index === undefined) {
+    index = this._string_index[s] = this.strings.length;
+    this.strings.push(s);
+  }
+  return index;
+}
+
+Arena.prototype._string = function(index) {
+  return index === -1 ? null : this.strings[index];
+}
+
+// Append values to the child array and return the start of their range.
+Arena.prototype._push_values = function(values) {
+  var start = this._nchild;
+  var end = start + values.length;
+  if (end > this._child.length) {
+    this._child = _resized(this._child, Math.max(end, this._child.length * 2));
+  }
+  for (var i = 0; i < values.length; i++) {
+    this._child[start + i] = values[i];
+  }
+  this._nchild = end;
+  return start;
+}
+
+Arena.prototype._push_ints = function(values, who, what) {
+  for (var i = 0; i < values.length; i++) {
+    _check_int32(values[i], who, what, -Infinity);
+  }
+  return this._push_values(values);
+}
+
+Arena.prototype._push_strings = function(values) {
+  var indices = [];
+  for (var i = 0; i < values.length; i++) {
+    indices.push(this._intern(values[i]));
+  }
+  return this._push_values(indices);
+}
+
+Arena.prototype._slice = function(start, length) {
+  var values = [];
+  for (var i = start; i < start + length; i++) {
+    values.push(this._child[i]);
+  }
+  return values;
+}
+
+Arena.prototype._string_slice = function(start, length) {
+  var values = [];
+  for (var i = start; i < start + length; i++) {
+    values.push(this.strings[this._child[i]]);
+  }
+  return values;
+}
+
+Arena.prototype._bool_slice = function(start, length) {
+  var values = [];
+  for (var i = start; i < start + length; i++) {
+    values.push(this._child[i] !== 0);
+  }
+  return values;
+}
+
+var _nullable = function(handle) {
+  return handle === -1 ? null : handle;
+}
+
+var _nullable_int = function(v) {
+  return v === _NULL_INT ? null : v;
+}
+
+var _no_field = function(arena, handle, field) {
+  throw new ASTError(arena.node_type(handle) + ' has no field ' + field);
+}
+
+Arena.prototype.kind = function(handle) {
+  return this._kinds[handle];
+}
+
+Arena.prototype.loc = function(handle) {
+  var loc = this._locs[handle];
+  return loc === _NO_LOC ? undefined : loc === _NULL_INT ? null : loc;
+}
+
+Arena.prototype.node_type = function(handle) {
+  return node_types[this._kinds[handle]];
+}
+
+// fromObject(node) copies the tree rooted at an object node into the arena
+// and returns the handle of its root. toObject(handle) does the opposite.
+Arena.prototype.fromObject = function(node) {
+  if (node === null) {
+    return -1;
+  }
+  switch (node.kind) {
+%(from_object_cases)s
+  }
+  throw new ASTError('Unknown node kind ' + node.kind);
+}
+
+Arena.prototype._fromObjects = function(nodes) {
+  var handles = [];
+  for (var i = 0; i < nodes.length; i++) {
+    handles.push(this.fromObject(nodes[i]));
+  }
+  return handles;
+}
+
+Arena.prototype.toObject = function(handle) {
+  if (handle === -1) {
+    return null;
+  }
+  var loc = this.loc(handle);
+  switch (this._kinds[handle]) {
+%(to_object_cases)s
+  }
+}
+
+Arena.prototype._toObjects = function(handles) {
+  var nodes = [];
+  for (var i = 0; i < handles.length; i++) {
+    nodes.push(this.toObject(handles[i]));
+  }
+  return nodes;
+}
+
+// forEachChild(handle, callback, ctx) calls callback.call(ctx, child, field,
+// index) for each child node of the node, like the forEachChild method of
+// object nodes.
+Arena.prototype.forEachChild = function(handle, callback, ctx) {
+  var start, i;
+  switch (this._kinds[handle]) {
+%(for_each_child_cases)s
+  }
+}
+'''.lstrip()
+
+
+def emit_arena_ast(stream, ast, options):
+    classes = node_classes(ast)
+    by_name = fields_by_name(classes)
+    # Slot assignment: slots[kind][i] is the first slot of the i-th field of
+    # the constructor with that kind.
+    slots = []
+    for classname, constructor in classes:
+        slot, field_slots = 0, []
+        for field in constructor.fields:
+            field_slots.append(slot)
+            slot += 2 if field.seq else 1
+        slots.append(field_slots)
+    nslots = max([len(s) and s[-1] + 2 for s in slots] + [0])
+
+    from_object_cases = []
+    to_object_cases = []
+    for_each_child_cases = []
+    for kind, (classname, constructor) in enumerate(classes):
+        args = []
+        for field in constructor.fields:
+            value = 'node.%s' % field.name
+            if field.type not in asdl_ast.builtin_types:
+                value = ('this._fromObjects(%s)' if field.seq else
+                         'this.fromObject(%s)') % value
+            args.append(value)
+        from_object_cases.append('    case %d:\n      return this.%s(%s);' % (
+            kind, classname, ', '.join(args + ['node.loc'])))
+
+        args = []
+        for field, slot in zip(constructor.fields, slots[kind]):
+            value = _arena_decode(field, slot)
+            if field.type not in asdl_ast.builtin_types:
+                value = ('this._toObjects(%s)' if field.seq else
+                         'this.toObject(%s)') % value
+            args.append(value)
+        to_object_cases.append(
+            '    case %d:\n      return new object_ast.%s(%s);' % (
+                kind, classname, ', '.join(args + ['loc'])))
+
+        lines = ['    case %d:' % kind]
+        for field, slot in zip(constructor.fields, slots[kind]):
+            if field.type in asdl_ast.builtin_types:
+                continue
+            if field.seq:
+                lines.append('      start = this._s%d[handle];' % slot)
+                lines.append('      for (i = 0; i < this._s%d[handle]; i++) {' % (
+                    slot + 1))
+                lines.append("        callback.call(ctx, this._child[start + i], '%s', i);" %
+                             field.name)
+                lines.append('      }')
+            elif field.opt:
+                lines.append('      if (this._s%d[handle] !== -1) {' % slot)
+                lines.append("        callback.call(ctx, this._s%d[handle], '%s', -1);" % (
+                    slot, field.name))
+                lines.append('      }')
+            else:
+                lines.append("      callback.call(ctx, this._s%d[handle], '%s', -1);" % (
+                    slot, field.name))
+        lines.append('      return;')
+        for_each_child_cases.append('\n'.join(lines))
+
+    stream.write(CODE_ARENA_PREFACE % {
+        'object_module': options.object_module,
+        'kind_array': 'Uint8Array' if len(classes) <= 256 else 'Uint16Array',
+        'slot_inits': '\n'.join('  this._s%d = new Int32Array(capacity);' % i
+                                for i in range(nslots)),
+        'slot_grows': '\n'.join('  this._s%d = _resized(this._s%d, capacity);' % (
+                                i, i) for i in range(nslots)),
+        'from_object_cases': '\n'.join(from_object_cases),
+        'to_object_cases': '\n'.join(to_object_cases),
+        'for_each_child_cases': '\n'.join(for_each_child_cases)})
+
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    emit()
+    emit('//')
+    emit('//-------------------- Constructors --------------------')
+    emit('//')
+    for kind, (classname, constructor) in enumerate(classes):
+        emit()
+        emit('// %s' % str(constructor))
+        argnames = [field.name for field in constructor.fields] + ['loc']
+        emit('Arena.prototype.%s = function(%s) {' % (
+            classname, ', '.join(argnames)))
+        # Ints are checked first, so that a failing check leaves no node behind.
+        for field in constructor.fields:
+            if field.type == 'int' and not field.seq:
+                check = "_check_int32(%s, '%s', '%s', %s);" % (
+                    field.name, classname, field.name,
+                    '_NULL_INT' if field.opt else '-Infinity')
+                emit('  %s' % ('%s !== null && %s' % (field.name, check)
+                               if field.opt else check))
+        # Sequences go to the child array before the node is allocated, since
+        # allocating may replace the slot arrays.
+        for field in constructor.fields:
+            if field.type in ('identifier', 'string') and field.seq:
+                emit('  var %s_start = this._push_strings(%s);' % (
+                    field.name, field.name))
+            elif field.type == 'int' and field.seq:
+                emit("  var %s_start = this._push_ints(%s, '%s', '%s');" % (
+                    field.name, field.name, classname, field.name))
+            elif field.seq:
+                emit('  var %s_start = this._push_values(%s);' % (
+                    field.name, field.name))
+        emit('  var handle = this._alloc(%d, loc);' % kind)
+        for field, slot in zip(constructor.fields, slots[kind]):
+            if field.seq:
+                emit('  this._s%d[handle] = %s_start;' % (slot, field.name))
+                emit('  this._s%d[handle] = %s.length;' % (slot + 1, field.name))
+            elif field.type in ('identifier', 'string'):
+                emit('  this._s%d[handle] = this._intern(%s);' % (
+                    slot, field.name))
+            elif field.type == 'boolean':
+                emit('  this._s%d[handle] = %s ? 1 : 0;' % (slot, field.name))
+            elif field.type == 'int' and field.opt:
+                emit('  this._s%d[handle] = %s === null ? _NULL_INT : %s;' % (
+                    slot, field.name, field.name))
+            elif field.opt:
+                emit('  this._s%d[handle] = %s === null ? -1 : %s;' % (
+                    slot, field.name, field.name))
+            else:
+                emit('  this._s%d[handle] = %s;' % (slot, field.name))
+        emit('  return handle;')
+        emit('}')
+
+    emit()
+    emit('//')
+    emit('//-------------------- Field accessors --------------------')
+    emit('//')
+    for name, uses in by_name:
+        emit()
+        emit('Arena.prototype.%s = function(handle) {' % name)
+        emit('  switch (this._kinds[handle]) {')
+        for kind, constructor, field in uses:
+            slot = slots[kind][constructor.fields.index(field)]
+            emit('    case %d:' % kind)
+            emit('      return %s;' % _arena_decode(field, slot))
+        emit('  }')
+        emit("  return _no_field(this, handle, '%s');" % name)
+        emit('}')
+
+    emit()
+    emit('// Names of the concrete node types, indexed by kind.')
+    emit('var node_types = exports.node_types = [')
+    emit(textwrap.fill(', '.join("'%s'" % classname
+                                 for classname, _ in classes) + '];',
+                       width=80, initial_indent='  ', subsequent_indent='  '))
+    emit()
+    emit('Arena.prototype.kinds = {')
+    for kind, (classname, _) in enumerate(classes):
+        emit('  %s: %d%s' % (classname, kind,
+                             ',' if kind < len(classes) - 1 else ''))
+    emit('};')
+
+
+def _arena_decode(field, slot):
+    """ JS expression reading field, stored from the given slot, of the node
+        'handle' in the arena 'this'.
+    """
+    value = 'this._s%d[handle]' % slot
+    if field.seq:
+        length = 'this._s%d[handle]' % (slot + 1)
+        if field.type in ('identifier', 'string'):
+            return 'this._string_slice(%s, %s)' % (value, length)
+        elif field.type == 'boolean':
+            return 'this._bool_slice(%s, %s)' % (value, length)
+        return 'this._slice(%s, %s)' % (value, length)
+    elif field.type in ('identifier', 'string'):
+        return 'this._string(%s)' % value
+    elif field.type == 'boolean':
+        return '%s !== 0' % value
+    elif field.opt and field.type == 'int':
+        return '_nullable_int(%s)' % value
+    elif field.opt and field.type not in asdl_ast.builtin_types:
+        return '_nullable(%s)' % value
+    return value
+
+
+CODE_TABLE_PREFACE = r'''
+//------------------------------------------------------------------------------
+// AST for Cool, built at load time from the table below by the shared runtime.
+// NOTE: this code is auto-generated from the ASDL definition of the AST. Do
+//       not edit it directly.
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+
+'use strict';
+
+'''.lstrip()
+
+
+def emit_table_ast(stream, ast, options):
+    """ Emit a module whose node classes are built by the shared runtime
+        (asdl_runtime.js) from a table describing ast.
+    """
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    classes = node_classes(ast)
+    # Dies on field names clashing with the builder's methods
+    fields_by_name(classes)
+    abstract = [typename.capitalize()
+                for typename, sum in sorted(ast.types.items())
+                if len(sum.types) > 1]
+    parents = {}
+    for typename, sum in ast.types.items():
+        for constructor in sum.types:
+            parents[constructor.name] = (typename.capitalize()
+                                         if len(sum.types) > 1 else 'Node')
+
+    stream.write(CODE_TABLE_PREFACE)
+    emit('require(%r).define(exports, {' % options.runtime_module)
+    emit('  schema_id: %d,' % schema_id(ast))
+    emit('  profile: %r,' % options.profile)
+    emit('  intern: %s,' % ('true' if options.intern else 'false'))
+    emit('  abstract: [%s],' % ', '.join("'%s'" % name for name in abstract))
+    emit('  classes: [')
+    for kind, (classname, constructor) in enumerate(classes):
+        entry = ["'%s'" % classname, "'%s'" % parents[constructor.name]]
+        for field in constructor.fields:
+            fieldtype = field.type
+            if fieldtype not in asdl_ast.builtin_types:
+                fieldtype = fieldtype.capitalize()
+            entry.append("'%s%s %s'" % (
+                fieldtype, '*' if field.seq else '?' if field.opt else '',
+                field.name))
+        entry = [item + ',' for item in entry[:-1]] + [entry[-1]]
+        entry[0] = '[' + entry[0]
+        entry[-1] += '],' if kind < len(classes) - 1 else ']]});'
+        # Wrapped between the strings, never inside them
+        line = '   '
+        for item in entry:
+            if len(line) + len(item) + 1 > 80 and line.strip():
+                emit(line.rstrip())
+                line = '    '
+            line += ' ' + item
+        emit(line)
+
+
+CODE_BENCH_PREFACE = r'''
+//------------------------------------------------------------------------------
+// Microbenchmarks of an AST module for the %(module)s ASDL module.
+// NOTE: this code is auto-generated from the ASDL definition of the AST by
+//       asdl_gen_js.py --bench. Do not edit it directly.
+//
+// Measures, for a module emitted by the object or table backend:
+// - construction: constructions/s of each node class.
+// - children: nodes/s of a traversal of trees through children().
+// - visitor: nodes/s of a visitor dispatching to a visit_Type method for
+//   every node type.
+// - dump: nodes/s and chars/s of dump_ast.
+//
+// The trees are parsed from source files (with --parser and --samples) and
+// grown at random from the schema, with a fixed seed, until they have at least
+// --synthetic nodes. Every measurement runs a fixed number of iterations, after
+// untimed warm-up runs; the best of --runs runs is reported. The results are
+// printed in JSON; --compare FILE reports the change of every throughput
+// against results saved earlier, for comparing profiles or commits.
+//
+// Run with: node %(script)s [options]; see usage() for the options.
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+var fs = require('fs');
+var path = require('path');
+
+var DEFAULT_MODULE = %(default_module)s;
+var ROOT_TYPE = '%(root)s';
+'''.lstrip()
+
+CODE_BENCH_RUNNER = r'''
+//
+//-------------------- Trees --------------------
+//
+
+// A seeded linear congruential generator, so that the synthetic trees are the
+// same from run to run.
+var _Random = function(seed) {
+  this.seed = seed;
+  this.loc = 1;
+}
+
+_Random.prototype.next = function(n) {
+  this.seed = (this.seed * 1103515245 + 12345) % 2147483648;
+  return this.seed % n;
+}
+
+_Random.prototype.identifier = function() {
+  return 'id' + this.next(100);
+}
+
+_Random.prototype.string = function() {
+  return '"s' + this.next(100) + '"';
+}
+
+// A sequence of 1 to 3 nodes grown by grow, empty below depth 0.
+_Random.prototype.seq = function(grow, m, depth) {
+  var result = [];
+  for (var n = depth < 0 ? 0 : 1 + this.next(3); n > 0; n--) {
+    result.push(grow(m, this, depth));
+  }
+  return result;
+}
+
+var count_nodes = function(m, roots) {
+  var count = 0;
+  roots.forEach(function(root) {
+    m.walkPreorder(root, function() { count++; });
+  });
+  return count;
+}
+
+// Grow trees of the root type until they have at least size nodes.
+var synthetic_trees = function(m, size, depth, seed) {
+  var g = new _Random(seed);
+  var roots = [];
+  var nodes = 0;
+  while (nodes < size) {
+    var root = _growers[ROOT_TYPE](m, g, depth);
+    roots.push(root);
+    nodes += count_nodes(m, [root]);
+  }
+  return roots;
+}
+
+var sample_trees = function(m, parser, samples_dir) {
+  return fs.readdirSync(samples_dir).sort().map(function(name) {
+    var source = fs.readFileSync(path.join(samples_dir, name), 'utf8');
+    return new parser.Parser(m.builder).parse(source);
+  });
+}
+
+//
+//-------------------- Measurements --------------------
+//
+
+// Run fn(iterations) settings.warmup times untimed and settings.runs times
+// timed, and return the best time in ms.
+var best_time = function(fn, iterations, settings) {
+  for (var i = 0; i < settings.warmup; i++) {
+    fn(iterations);
+  }
+  var best = Infinity;
+  for (var i = 0; i < settings.runs; i++) {
+    var start = process.hrtime();
+    fn(iterations);
+    var elapsed = process.hrtime(start);
+    best = Math.min(best, elapsed[0] * 1e3 + elapsed[1] / 1e6);
+  }
+  return best;
+}
+
+var round = function(v) {
+  return Math.round(v * 1000) / 1000;
+}
+
+var per_s = function(count, ms) {
+  return Math.round(count / ms * 1e3);
+}
+
+var bench_construction = function(m, settings) {
+  var minimal = _minimal_nodes(m);
+  var results = {};
+  Object.keys(_constructions).forEach(function(classname) {
+    var ms = best_time(function(iterations) {
+      _constructions[classname](m, minimal, iterations);
+    }, settings.constructions, settings);
+    results[classname] = {ms: round(ms),
+                          ops_per_s: per_s(settings.constructions, ms)};
+  });
+  return results;
+}
+
+var walk_children = function(roots) {
+  var count = 0;
+  var stack = roots.slice();
+  while (stack.length > 0) {
+    var node = stack.pop();
+    count++;
+    var children = node.children();
+    for (var i = children.length - 1; i >= 0; i--) {
+      stack.push(children[i].node);
+    }
+  }
+  return count;
+}
+
+// A visitor with a visit_Type method for every node type, on top of base (the
+// NodeVisitor of --visitor, or the module's GeneratedVisitor).
+var counting_visitor = function(m, base) {
+  var CountingVisitor = function() {
+    base.call(this);
+    this.count = 0;
+  }
+  CountingVisitor.prototype = Object.create(base.prototype);
+  CountingVisitor.prototype.constructor = CountingVisitor;
+  var visit = function(node) {
+    this.count++;
+    this.visit_children(node);
+  }
+  m.node_types.forEach(function(name) {
+    CountingVisitor.prototype['visit_' + name] = visit;
+  });
+  return CountingVisitor;
+}
+
+var bench_trees = function(m, visitor_module, roots, settings) {
+  var nodes = count_nodes(m, roots);
+  var passes = settings.passes;
+  var result = {trees: roots.length, nodes: nodes};
+  var measure = function(fn) {
+    var ms = best_time(function(n) {
+      for (var i = 0; i < n; i++) {
+        fn();
+      }
+    }, passes, settings);
+    return {ms: round(ms), nodes_per_s: per_s(nodes * passes, ms)};
+  }
+
+  result.children = measure(function() { walk_children(roots); });
+  var CountingVisitor = counting_visitor(
+      m, visitor_module ? visitor_module.NodeVisitor : m.GeneratedVisitor);
+  result.visitor = measure(function() {
+    var visitor = new CountingVisitor();
+    roots.forEach(function(root) { visitor.visit(root); });
+  });
+  if (visitor_module) {
+    var chars = 0;
+    result.dump = measure(function() {
+      chars = 0;
+      roots.forEach(function(root) {
+        chars += visitor_module.dump_ast(root, true).length;
+      });
+    });
+    result.dump.chars_per_s = per_s(chars * passes, result.dump.ms);
+  }
+  return result;
+}
+
+//
+//-------------------- Comparison --------------------
+//
+
+// Lines describing the change of every throughput (a *_per_s entry) of
+// results that is also in baseline.
+var compare = function(baseline, results) {
+  var lines = [];
+  var walk = function(old, current, where) {
+    Object.keys(current).forEach(function(key) {
+      if (old === null || typeof old !== 'object' || !(key in old)) {
+        return;
+      }
+      var name = where ? where + '.' + key : key;
+      if (typeof current[key] === 'object' && current[key] !== null) {
+        walk(old[key], current[key], name);
+      } else if (/_per_s$/.test(key) && old[key]) {
+        var change = (current[key] / old[key] - 1) * 100;
+        lines.push(name + ': ' + old[key] + ' -> ' + current[key] + ' (' +
+                   (change >= 0 ? '+' : '') + change.toFixed(1) + '%)');
+      }
+    });
+  }
+  walk(baseline.results, results.results, '');
+  return lines;
+}
+
+//
+//-------------------- Main --------------------
+//
+
+var usage = function() {
+  console.error([
+    'Usage: node ' + path.basename(__filename) + ' [options]',
+    '  --module FILE       AST module to benchmark (default: ' +
+        DEFAULT_MODULE + ', relative to this script)',
+    '  --label NAME        name of the configuration, recorded in the output',
+    '  --visitor FILE      module with the NodeVisitor and dump_ast to use',
+    '  --parser FILE       module with the Parser for the --samples files',
+    '  --samples DIR       source files to parse into trees',
+    '  --synthetic N       nodes of the synthetic trees (default: 100000)',
+    '  --depth N           depth of the synthetic trees (default: 10)',
+    '  --seed N            seed of the synthetic trees (default: 1)',
+    '  --constructions N   constructions per run (default: 100000)',
+    '  --passes N          passes over the trees per run (default: 10)',
+    '  --warmup N          untimed runs before the timed ones (default: 2)',
+    '  --runs N            timed runs, of which the best is kept (default: 5)',
+    '  --compare FILE      report the changes against results saved in FILE'
+  ].join('\n'));
+  process.exit(1);
+}
+
+var parse_args = function(argv) {
+  var settings = {module: null, label: null, visitor: null, parser: null,
+                  samples: null, synthetic: 100000, depth: 10, seed: 1,
+                  constructions: 100000, passes: 10, warmup: 2, runs: 5,
+                  compare: null};
+  for (var i = 0; i < argv.length; i += 2) {
+    var name = argv[i].replace(/^--/, '');
+    if (argv[i].indexOf('--') !== 0 || !(name in settings) ||
+        i + 1 >= argv.length) {
+      usage();
+    }
+    var value = argv[i + 1];
+    settings[name] = typeof settings[name] === 'number' ?
+                     parseInt(value, 10) : value;
+  }
+  if (!!settings.parser !== !!settings.samples) {
+    usage();
+  }
+  return settings;
+}
+
+var main = function() {
+  var settings = parse_args(process.argv.slice(2));
+  var module_path = settings.module ? path.resolve(settings.module) :
+                    path.resolve(__dirname, DEFAULT_MODULE);
+  var m = require(module_path);
+  var visitor_module = settings.visitor ?
+                       require(path.resolve(settings.visitor)) : null;
+
+  var results = {
+    module: path.relative(process.cwd(), module_path),
+    label: settings.label,
+    schema_id: m.schema_id,
+    node: process.version,
+    settings: {synthetic: settings.synthetic, depth: settings.depth,
+               seed: settings.seed, constructions: settings.constructions,
+               passes: settings.passes, warmup: settings.warmup,
+               runs: settings.runs},
+    results: {construction: bench_construction(m, settings), trees: {}}};
+  if (settings.samples) {
+    var parser = require(path.resolve(settings.parser));
+    results.results.trees.samples = bench_trees(
+        m, visitor_module, sample_trees(m, parser, settings.samples), settings);
+  }
+  results.results.trees.synthetic = bench_trees(
+      m, visitor_module,
+      synthetic_trees(m, settings.synthetic, settings.depth, settings.seed),
+      settings);
+
+  console.log(JSON.stringify(results, null, 2));
+  if (settings.compare) {
+    var baseline = JSON.parse(fs.readFileSync(settings.compare, 'utf8'));
+    if (baseline.schema_id !== results.schema_id) {
+      console.error('The baseline is for another schema');
+    }
+    if (JSON.stringify(baseline.settings) !==
+        JSON.stringify(results.settings)) {
+      console.error('The baseline was run with other settings');
+    }
+    compare(baseline, results).forEach(function(line) {
+      console.error(line);
+    });
+  }
+}
+
+if (module.parent === null) {
+  main();
+}
+'''
+
+# Builtin values passed to the constructors in the construction benchmarks
+_bench_values = {
+    'identifier': "'x'",
+    'string': '\'"s"\'',
+    'int': '1',
+    'boolean': 'true',
+}
+
+# Random builtin values of the synthetic trees; g is a _Random
+_bench_random_values = {
+    'identifier': 'g.identifier()',
+    'string': 'g.string()',
+    'int': 'g.next(1000)',
+    'boolean': 'g.next(2) === 0',
+}
+
+
+def minimal_constructors(ast):
+    """ Map each type of ast to the index of its constructor building the
+        shallowest trees, with empty sequences and null optional fields.
+        Return (the map, the types ordered by the height of these trees).
+    """
+    height = {}
+    choice = {}
+    changed = True
+    while changed:
+        changed = False
+        for typename, sum in ast.types.items():
+            for index, constructor in enumerate(sum.types):
+                required = [height.get(field.type)
+                            for field in constructor.fields
+                            if field.type not in asdl_ast.builtin_types and
+                               not field.seq and not field.opt]
+                if None in required:
+                    continue
+                h = 1 + max(required or [0])
+                if h < height.get(typename, h + 1):
+                    height[typename] = h
+                    choice[typename] = index
+                    changed = True
+    for typename in sorted(ast.types):
+        if typename not in height:
+            die('ERROR: type %s has no finite trees' % typename)
+    return choice, sorted(sorted(ast.types), key=lambda t: height[t])
+
+
+def emit_bench(stream, ast, options, script_name='bench.js'):
+    """ Emit a standalone Node script benchmarking the AST modules emitted
+        for ast by the object and table backends: constructions, children()
+        traversals, visitor dispatch and dumping (see CODE_BENCH_PREFACE).
+        options.object_module is the module benchmarked by default, relative
+        to the script.
+    """
+    def emit(s=''):
+        stream.write(s + '\n')
+    ast, _ = analyze_module(ast, options)
+    root = options.root or ast.dfns[0].name
+    choice, by_height = minimal_constructors(ast)
+    classes = node_classes(ast)
+    classname_of = {}
+    for typename, sum in ast.types.items():
+        for constructor in sum.types:
+            classname_of[constructor.name] = (typename.capitalize()
+                                              if len(sum.types) == 1
+                                              else constructor.name)
+    stream.write(CODE_BENCH_PREFACE % {
+        'module': ast.name, 'script': script_name,
+        'default_module': "'%s'" % options.object_module, 'root': root})
+
+    emit()
+    emit('//')
+    emit('//-------------------- Constructions --------------------')
+    emit('//')
+    emit()
+    emit('// For each type, a node of its shallowest kind.')
+    emit('var _minimal_nodes = function(m) {')
+    emit('  var minimal = {};')
+    for typename in by_height:
+        constructor = ast.types[typename].types[choice[typename]]
+        args = []
+        for field in constructor.fields:
+            if field.seq:
+                args.append('[]')
+            elif field.opt:
+                args.append('null')
+            elif field.type in asdl_ast.builtin_types:
+                args.append(_bench_values[field.type])
+            else:
+                args.append('minimal.%s' % field.type)
+        emit('  minimal.%s = new m.%s(%s);' % (
+            typename, classname_of[constructor.name], ', '.join(args + ['0'])))
+    emit('  return minimal;')
+    emit('}')
+    emit()
+    emit('// Construct iterations nodes of each class, with the same arguments.')
+    emit('var _constructions = {')
+    for kind, (classname, constructor) in enumerate(classes):
+        emit('  %s: function(m, minimal, iterations) {' % classname)
+        emit('    var cls = m.%s;' % classname)
+        args = []
+        for field in constructor.fields:
+            if field.type in asdl_ast.builtin_types:
+                # Sequences of builtins are left empty: the node checks and
+                # forEachChild of the object backend expect nodes in all
+                # sequences
+                args.append('[]' if field.seq else _bench_values[field.type])
+                continue
+            emit('    var %s = %s;' % (field.name, (
+                '[minimal.%s]' if field.seq else 'minimal.%s') % field.type))
+            args.append(field.name)
+        emit('    var node = null;')
+        emit('    for (var i = 0; i < iterations; i++) {')
+        emit('      node = new cls(%s);' % ', '.join(args + ['i']))
+        emit('    }')
+        emit('    return node;')
+        emit('  }%s' % (',' if kind < len(classes) - 1 else ''))
+    emit('};')
+    emit()
+    emit('// For each type, a function growing a random tree of the type, of at')
+    emit('// most about the given depth; below depth 0, only nodes of the')
+    emit('// shallowest kind are grown.')
+    emit('var _growers = {')
+    typenames = sorted(ast.types)
+    for i, typename in enumerate(typenames):
+        constructors = ast.types[typename].types
+        emit('  %s: function(m, g, depth) {' % typename)
+        indent = '    '
+        if len(constructors) > 1:
+            emit('    switch (depth > 0 ? g.next(%d) : %d) {' % (
+                len(constructors), choice[typename]))
+            indent = '        '
+        for index, constructor in enumerate(constructors):
+            args = []
+            for field in constructor.fields:
+                grower = '_growers.%s' % field.type
+                if field.type in asdl_ast.builtin_types:
+                    # Left empty if a sequence, as in _constructions
+                    args.append('[]' if field.seq else
+                                _bench_random_values[field.type])
+                elif field.seq:
+                    args.append('g.seq(%s, m, depth - 1)' % grower)
+                elif field.opt:
+                    args.append('depth > 0 && g.next(2) === 0 ? '
+                                '%s(m, g, depth - 1) : null' % grower)
+                else:
+                    args.append('%s(m, g, depth - 1)' % grower)
+            if len(constructors) > 1:
+                emit('      case %d:' % index)
+            call = 'return new m.%s(' % classname_of[constructor.name]
+            emit_wrapped_call(emit, indent, call, args + ['g.loc++'])
+        if len(constructors) > 1:
+            emit('    }')
+        emit('  }%s' % (',' if i < len(typenames) - 1 else ''))
+    emit('};')
+    stream.write(CODE_BENCH_RUNNER)
+
+
+def emit_wrapped_call(emit, indent, call, args):
+    """ Emit call (which ends with an opening parenthesis) with args, wrapped
+        at 80 columns with the continuation lines aligned after the
+        parenthesis.
+    """
+    emit(wrapped_call(indent, call, args)[:-1])
+
+
+def wrapped_call(indent, call, args):
+    """ The lines of call with args, as emitted by emit_wrapped_call, each
+        ending with a newline.
+    """
+    lines = []
+    line = indent + call
+    align = ' ' * len(line)
+    for i, arg in enumerate(args):
+        item = arg + (');' if i == len(args) - 1 else ',')
+        if not line.endswith('(') and len(line) + len(item) + 1 > 80:
+            lines.append(line + '\n')
+            line = align + item
+        else:
+            line += ('' if line.endswith('(') else ' ') + item
+    lines.append(line + '\n')
+    return ''.join(lines)
+
+
+CODE_SPLIT_HEADER = r'''
+//------------------------------------------------------------------------------
+// AST for Cool: %(what)s.
+// NOTE: this code is auto-generated from the ASDL definition of the AST. Do
+//       not edit it directly.
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+
+'use strict';
+
+'''.lstrip()
+
+# File names of the split output besides the per-type modules.
+SPLIT_RUNTIME = 'runtime.js'
+SPLIT_INDEX = 'index.js'
+# Lists the files of the split output last written to a directory, so that
+# the files dropped from it can be removed without touching any other files.
+SPLIT_MANIFEST = '.asdl_split'
+
+
+class IncrementalEmitter:
+    """ Emits code for successive versions of an ASDL module, keeping the code
+        of every type and re-emitting only the types whose definitions (or
+        the kinds of whose classes) changed since the previous version.
+
+        emit_module returns the code of a single module, like emit_ast.
+        With options.split set, emit_split returns the code as separate
+        modules instead: a runtime module with the helpers and the Node base
+        class, one module per type (the classes emitted by emit_ast_type for
+        it), and an index module that re-exports all the classes and holds
+        the code referring to all of them. Requiring the index is equivalent
+        to requiring the single module.
+
+        After each call, reemitted lists the names of the types whose code
+        was emitted anew. jobs is the number of processes emitting them (see
+        types_code).
+    """
+    def __init__(self, options, jobs=1):
+        self.options = options
+        self.jobs = jobs
+        self.reemitted = []
+        self._types = {}
+
+    def emit_module(self, ast):
+        if self.options.split:
+            raise ValueError('Split output is emitted by emit_split')
+        ast, analysis = analyze_module(ast, self.options)
+        classes, kinds = self._start(ast)
+        codes = self._emit_types(ast, kinds, analysis)
+        stream = io.StringIO()
+        emit_runtime(stream, self.options, len(classes))
+        stream.write(CODE_NODES_BANNER)
+        for typename in sorted(ast.types):
+            stream.write(codes[typename])
+        emit_module_tail(stream, ast, classes, self.options)
+        return stream.getvalue()
+
+    def emit_split(self, ast):
+        """ Return an OrderedDict mapping file names to their code.
+        """
+        options = self.options
+        if not options.split:
+            raise ValueError('emit_split needs EmitOptions with split set')
+        ast, analysis = analyze_module(ast, options)
+        classes, kinds = self._start(ast)
+        for typename in ast.types:
+            if typename + '.js' in (SPLIT_RUNTIME, SPLIT_INDEX):
+                die('ERROR: type %s clashes with the split output files' %
+                    typename)
+        codes = self._emit_types(ast, kinds, analysis)
+
+        stream = io.StringIO()
+        emit_runtime(stream, options, len(classes))
+        runtime = stream.getvalue()
+        public, private = _runtime_names(runtime)
+        # The other modules import all the names defined by the runtime, and
+        # the registry of node classes used by the constructors' checks.
+        prelude = ''.join(
+            ["var _runtime = require('./%s');\n" % SPLIT_RUNTIME[:-3]] +
+            ['var %s = _runtime.%s;\n' % (name, name)
+             for name in public + private + ['_classes']] + ['\n'])
+
+        files = collections.OrderedDict()
+        runtime += ''.join(
+            ['// Node classes by name, filled in by the modules of the node '
+             'types.\n', 'var _classes = exports._classes = {};\n\n'] +
+            ['exports.%s = %s;\n' % (name, name) for name in private])
+        files[SPLIT_RUNTIME] = runtime
+
+        index = io.StringIO()
+        index.write(CODE_SPLIT_HEADER % {'what': 'index of the node types'})
+        index.write(prelude)
+        for name in public:
+            index.write('exports.%s = %s;\n' % (name, name))
+        for typename, sum in sorted(ast.types.items()):
+            module = '_' + typename
+            code = io.StringIO()
+            code.write(CODE_SPLIT_HEADER % {'what': 'the %s nodes' % typename})
+            code.write(prelude)
+            code.write(codes[typename])
+            index.write('\nvar %s = require(%r);\n' % (module, './' + typename))
+            for classname in _type_classnames(typename, sum):
+                code.write('_classes.%s = %s;\n' % (classname, classname))
+                index.write('var %s = exports.%s = %s.%s;\n' % (
+                    classname, classname, module, classname))
+            files[typename + '.js'] = code.getvalue()
+        index.write('\n')
+        emit_module_tail(index, ast, classes, options)
+        files[SPLIT_INDEX] = index.getvalue()
+        return files
+
+    def _start(self, ast):
+        self.reemitted = []
+        classes = node_classes(ast)
+        kinds = {classname: kind for kind, (classname, _) in enumerate(classes)}
+        # Forget the types that are gone
+        for typename in list(self._types):
+            if typename not in ast.types:
+                del self._types[typename]
+        return classes, kinds
+
+    def _emit_types(self, ast, kinds, analysis):
+        """ Map the names of the types of ast to their code, emitting only the
+            types that changed.
+        """
+        stale, keys = [], {}
+        for typename, sum in sorted(ast.types.items()):
+            key = (repr(sum), [kinds.get(classname) for classname in
+                               _type_classnames(typename, sum)])
+            cached = self._types.get(typename)
+            if cached is None or cached[0] != key:
+                stale.append((typename, sum))
+                keys[typename] = key
+        codes = types_code(stale, self.options, kinds, analysis, self.jobs)
+        for (typename, _), code in zip(stale, codes):
+            self._types[typename] = keys[typename], code
+            self.reemitted.append(typename)
+        return {typename: self._types[typename][1] for typename in ast.types}
+
+
+def _type_classnames(typename, sum):
+    """ Names of the classes emitted for a type: its abstract base class, if
+        any, and its node classes.
+    """
+    if len(sum.types) == 1:
+        return [typename.capitalize()]
+    return ([typename.capitalize()] +
+            [constructor.name for constructor in sum.types])
+
+
+def _runtime_names(runtime):
+    """ The top-level names defined by the runtime code: a list of the
+        exported ones and a list of the private ones.
+    """
+    public, private = [], []
+    for m in re.finditer(r'^var (\w+) = (exports\.)?', runtime, re.MULTILINE):
+        (public if m.group(2) else private).append(m.group(1))
+    return public, private
+
+
+def write_split(directory, files):
+    """ Write split output to directory. Files whose contents didn't change
+        are left alone, and the files of the split output previously written
+        to directory (as listed in its SPLIT_MANIFEST) that are no longer
+        part of the output are removed; other files in directory are never
+        touched. Return the names of the files written or removed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = os.path.join(directory, SPLIT_MANIFEST)
+    try:
+        with open(manifest, encoding='utf-8') as f:
+            previous = f.read().split()
+    except FileNotFoundError:
+        previous = []
+    changed = []
+    for name, code in files.items():
+        if asdl_cache.write_if_changed(os.path.join(directory, name),
+                                       code.encode('utf-8')):
+            changed.append(name)
+    for name in sorted(set(previous) - set(files)):
+        # Only plain file names are ever listed
+        if os.path.basename(name) != name:
+            continue
+        try:
+            os.unlink(os.path.join(directory, name))
+        except FileNotFoundError:
+            continue
+        changed.append(name)
+    asdl_cache.write_if_changed(
+        manifest, ''.join(name + '\n' for name in files).encode('utf-8'))
+    return changed
+
+
+def watch(filename, options, output=None, split_dir=None, interval=0.5,
+          jobs=1):
+    """ Regenerate the code whenever the ASDL file changes, until interrupted.
+        The parsed module of the last good version of the file is kept, and
+        only the types changed since then are re-emitted. Errors in the file
+        are reported, and the last good output is left in place.
+    """
+    emitter = IncrementalEmitter(options, jobs)
+    ast = None
+    last_stat = None
+    try:
+        while True:
+            ast, last_stat = _watch_step(filename, emitter, ast, last_stat,
+                                         output, split_dir)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def _watch_step(filename, emitter, ast, last_stat, output, split_dir):
+    """ One step of watch: regenerate if the file changed since last_stat.
+        Return the new (ast, last_stat).
+    """
+    try:
+        st = os.stat(filename)
+        stat = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stat = None
+    if stat is not None and stat != last_stat:
+        last_stat = stat
+        start = time.perf_counter()
+        new_ast = _parse_for_watch(filename)
+        if new_ast is not None:
+            added, removed, changed = diff_types(ast, new_ast)
+            ast = new_ast
+            if split_dir:
+                written = write_split(split_dir, emitter.emit_split(ast))
+            else:
+                code = emitter.emit_module(ast).encode('utf-8')
+                written = ([output] if asdl_cache.write_if_changed(
+                    output, code) else [])
+            print('%s: %d added, %d removed, %d changed types; '
+                  're-emitted %s; wrote %s (%.1fms)' % (
+                      time.strftime('%H:%M:%S'), len(added), len(removed),
+                      len(changed), ', '.join(emitter.reemitted) or
+                      'nothing', ', '.join(written) or 'nothing',
+                      (time.perf_counter() - start) * 1000))
+            sys.stdout.flush()
+    return ast, last_stat
+
+
+def _parse_for_watch(filename):
+    try:
+        ast = asdl_parser.parse_file(filename)
+    except (OSError, asdl_parser.ASDLSyntaxError) as e:
+        print('%s: %s' % (filename, e))
+        return None
+    return ast if asdl_ast.check(ast) else None
+
+
+def diff_types(old, new):
+    """ Compare the types of two versions of a module (old may be None).
+        Return the lists of names of the added, removed and changed types.
+    """
+    old_types = old.types if old is not None else {}
+    added = sorted(set(new.types) - set(old_types))
+    removed = sorted(set(old_types) - set(new.types))
+    changed = sorted(name for name in set(new.types) & set(old_types)
+                     if repr(new.types[name]) != repr(old_types[name]))
+    return added, removed, changed
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description='Generate JavaScript AST-definition code from ASDL.')
+    argparser.add_argument('asdl', help='input ASDL file')
+    argparser.add_argument('-o', '--output',
+        help='output file (default: stdout). The file is only written if '
+             'its contents change')
+    argparser.add_argument('--emit-profile', choices=EmitOptions.PROFILES,
+        default='debug',
+        help='debug: node constructors check their arguments; assert: the '
+             'checks only run if COOL_AST_CHECKS is set in the environment; '
+             'release: no checks (default: %(default)s)')
+    argparser.add_argument('--backend', choices=EmitOptions.BACKENDS,
+        default='object',
+        help='object: a JS object per node; arena: nodes are handles into '
+             'typed arrays; table: like object, with the node classes built '
+             'at load time by a shared runtime from a table describing the '
+             'schema (default: %(default)s)')
+    argparser.add_argument('--object-module', default='./cool_ast',
+        help='with --backend=arena, the module to require for the object '
+             'representation; with --bench, the module benchmarked by '
+             'default (default: %(default)s)')
+    argparser.add_argument('--runtime-module', default='./asdl_runtime',
+        help='with --backend=table, the module to require for the shared '
+             'runtime (default: %(default)s)')
+    argparser.add_argument('--bench', action='store_true',
+        help='instead of the AST code, emit a Node script benchmarking the '
+             'AST module (--object-module, relative to the script) built for '
+             'the ASDL file')
+    argparser.add_argument('--instrument', action='store_true',
+        help='emit nodes that count their constructions and walks, '
+             'reported by the exported stats() function')
+    argparser.add_argument('--intern', action='store_true',
+        help='emit of() factories for leaf nodes with builtin fields, which '
+             'can share equal nodes (see set_interning in the output)')
+    argparser.add_argument('--root', metavar='TYPE',
+        help='root type of the ASTs, from which all the other types should '
+             'be reachable (default: the first type defined)')
+    argparser.add_argument('--strip-unreachable', action='store_true',
+        help="don't emit the types unreachable from the root type")
+    argparser.add_argument('--no-cache', action='store_true',
+        help="don't read or write the on-disk cache")
+    argparser.add_argument('--cache-dir', default=asdl_cache.DEFAULT_CACHE_DIR,
+        help='directory of the on-disk cache (default: %(default)s)')
+    argparser.add_argument('--cache-stats', action='store_true',
+        help='report cache hits, misses and bytes to stderr')
+    argparser.add_argument('--profile', action='store_true',
+        help='bypass the cache and report the wall and CPU time of each '
+             'phase of the generation to stderr, as JSON')
+    argparser.add_argument('--profile-out', metavar='FILE',
+        help='with --profile, also run the phases under cProfile and dump '
+             'the statistics (in pstats format) to FILE')
+    argparser.add_argument('--split', metavar='DIR',
+        help='instead of a single module, write a module per type, a '
+             'runtime module and an index module to DIR. Only the changed '
+             'files are written, and the files of the previous split output '
+             'to DIR that are no longer part of the output are removed')
+    argparser.add_argument('--watch', action='store_true',
+        help='keep running, and regenerate the output (-o or --split) '
+             'whenever the ASDL file changes, re-emitting only the changed '
+             'types')
+    argparser.add_argument('--watch-interval', type=float, default=0.5,
+        help='seconds between checks of the ASDL file with --watch '
+             '(default: %(default)s)')
+    argparser.add_argument('-j', '--jobs', type=int, default=1,
+        help='number of processes emitting the node classes; the output '
+             'is the same whatever their number (default: %(default)s)')
+    args = argparser.parse_args()
+
+    try:
+        options = EmitOptions(args.emit_profile, args.backend,
+                              args.object_module, args.instrument,
+                              args.intern, args.root, args.strip_unreachable,
+                              split=bool(args.split),
+                              runtime_module=args.runtime_module)
+    except ValueError as e:
+        argparser.error(str(e))
+    if args.bench:
+        cache = asdl_cache.Cache(
+            asdl_cache.toolchain_fingerprint(sys.modules[__name__]),
+            directory=args.cache_dir, enabled=not args.no_cache)
+        _, ast = cache.load_module(args.asdl)
+        if ast is None:
+            return 1
+        stream = io.StringIO()
+        emit_bench(stream, ast, options,
+                   os.path.basename(args.output or 'bench.js'))
+        output = stream.getvalue().encode('utf-8')
+        if args.output:
+            asdl_cache.write_if_changed(args.output, output)
+        else:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(output)
+        return 0
+    if args.split and args.output:
+        argparser.error('--split and -o are exclusive')
+    if args.split and args.profile:
+        argparser.error('--profile is not supported with --split')
+
+    if args.watch:
+        if not args.output and not args.split:
+            argparser.error('--watch needs -o or --split')
+        watch(args.asdl, options, args.output, args.split,
+              args.watch_interval, args.jobs)
+        return 0
+
+    if args.split:
+        cache = asdl_cache.Cache(
+            asdl_cache.toolchain_fingerprint(sys.modules[__name__]),
+            directory=args.cache_dir, enabled=not args.no_cache)
+        _, ast = cache.load_module(args.asdl)
+        if ast is None:
+            return 1
+        emitter = IncrementalEmitter(options, args.jobs)
+        write_split(args.split, emitter.emit_split(ast))
+        return 0
+
+    if args.profile:
+        timer = asdl_profile.PhaseTimer(profile=bool(args.profile_out))
+        output = generate_timed(timer, args.asdl, options, args.jobs)
+        sys.stderr.write(timer.to_json() + '\n')
+        if args.profile_out:
+            timer.dump_profile(args.profile_out)
+    else:
+        cache = asdl_cache.Cache(
+            asdl_cache.toolchain_fingerprint(sys.modules[__name__]),
+            directory=args.cache_dir, enabled=not args.no_cache)
+        output = generate(cache, args.asdl, options, args.jobs)
+        if args.cache_stats:
+            sys.stderr.write(cache.stats() + '\n')
+    if output is None:
+        return 1
+
+    if args.output:
+        asdl_cache.write_if_changed(args.output, output)
+    else:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output)
+
+
+def generate(cache, filename, options, jobs=1):
+    """ Generate the code for the ASDL file with the given name and the given
+        EmitOptions, through the cache, with jobs processes (see emit_ast).
+        Return the output as bytes, or None if the ASDL has errors.
+    """
+    key, ast = cache.load_module(filename)
+    if ast is None:
+        return None
+    output = cache.get_output(key, options)
+    if output is None:
+        stream = io.StringIO()
+        emit_ast(stream, ast, options, jobs)
+        output = stream.getvalue().encode('utf-8')
+        cache.put_output(key, options, output)
+    return output
+
+
+def generate_timed(timer, filename, options, jobs=1):
+    """ Like generate, but without the cache, timing each phase of the
+        generation with the given asdl_profile.PhaseTimer.
+    """
+    with timer.phase('read'):
+        with open(filename, 'rb') as f:
+            buf = f.read()
+    with timer.phase('tokenize_asdl'):
+        tokens = list(asdl_parser.tokenize_asdl(buf))
+    with timer.phase('ASDLParser.parse'):
+        ast = asdl_parser.ASDLParser().parse_tokens(tokens)
+    with timer.phase('asdl_ast.check'):
+        ok = asdl_ast.check(ast)
+    if not ok:
+        return None
+    with timer.phase('emit_ast'):
+        stream = io.StringIO()
+        emit_ast(stream, ast, options, jobs)
+        output = stream.getvalue().encode('utf-8')
+    return output
 
 if __name__ == '__main__':
     sys.exit(main())
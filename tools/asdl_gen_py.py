@@ -0,0 +1,565 @@
+#-------------------------------------------------------------------------------
+# Generator of Python AST-definition code from ASDL.
+#
+# The generated node classes mirror the ones generated by asdl_gen_js.py: same
+# class names and hierarchy, fields, attributes and kinds. Instances use
+# __slots__, so a node takes no per-instance dict.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import argparse
+import io
+import sys
+
+import asdl_ast
+import asdl_cache
+from asdl_gen_js import node_classes, schema_id, die
+
+CODE_PREFACE = r'''
+#-------------------------------------------------------------------------------
+# AST for Cool.
+# NOTE: this code is auto-generated from the ASDL definition of the AST. Do
+#       not edit it directly.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+
+class ASTError(Exception):
+    """ The exception type used by this module to signal errors.
+    """
+    pass
+
+'''.lstrip()
+
+# Helpers for the runtime checks in node constructors. Not needed by the
+# release profile, which emits no checks.
+CODE_CHECK_HELPERS = r'''
+def _check_identifier(v, who, what, loc):
+    if not isinstance(v, str):
+        raise ASTError('Line %s: %s expects %s to be an identifier' % (
+            loc, who, what))
+
+def _check_string(v, who, what, loc):
+    if not isinstance(v, str) or v[:1] != '"' or v[-1:] != '"' or len(v) < 2:
+        raise ASTError('Line %s: %s expects %s to be a string' % (
+            loc, who, what))
+
+def _check_int(v, who, what, loc):
+    if not isinstance(v, int) or isinstance(v, bool):
+        raise ASTError('Line %s: %s expects %s to be an int' % (
+            loc, who, what))
+
+def _check_boolean(v, who, what, loc):
+    if not isinstance(v, bool):
+        raise ASTError('Line %s: %s expects %s to be a boolean' % (
+            loc, who, what))
+
+def _check_array(v, who, what, loc):
+    if not isinstance(v, list):
+        raise ASTError('Line %s: %s expects %s to be an array' % (
+            loc, who, what))
+
+'''.lstrip()
+
+CODE_NODE_BASE = r'''
+class Node:
+    """ Node is an abstract interface implemented by all the AST nodes defined
+        here.
+
+        Each concrete node class has:
+        * _fields: names of its fields, in constructor order.
+        * attributes: names of its non-Node fields.
+        * node_type: its name.
+        * kind: a distinct integer, indexing node_types and node_classes.
+    """
+    __slots__ = ()
+    _fields = ()
+    attributes = ()
+    node_type = 'Node'
+    kind = -1
+
+    def __init__(self):
+        raise ASTError('Node is an abstract class')
+
+    def iter_child_nodes(self):
+        """ Iterate over the child nodes of this node, in order.
+        """
+        raise ASTError('Abstract method called')
+
+    def children(self):
+        """ Return a list of (name, node) pairs for the children of this node.
+            Names are like the ones used by the JS AST: 'expr', 'actual[0]'.
+        """
+        raise ASTError('Abstract method called')
+
+    def __repr__(self):
+        return '%s(%s)' % (self.node_type, ', '.join(
+            '%s=%r' % (name, getattr(self, name)) for name in self._fields))
+
+
+#
+#-------------------- AST nodes --------------------
+#
+
+'''.lstrip()
+
+CODE_VISITOR = r'''
+
+class NodeVisitor:
+    """ Base for visitors of these ASTs. To create a visitor, inherit from
+        NodeVisitor and define visit_Type methods for visiting nodes of type
+        Type; nodes without such a method are handled by visit_children,
+        which visits all their children.
+
+        visit dispatches on node.kind through a table of methods computed once
+        per visitor class, rather than looking the method up by name for each
+        node. The table is fetched on the first visit, so subclasses don't
+        have to call NodeVisitor.__init__.
+    """
+    _dispatch = None
+
+    def visit(self, node):
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self._dispatch = _dispatch_table(type(self))
+        return dispatch[node.kind](self, node)
+
+    def visit_children(self, node):
+        for child in node.iter_child_nodes():
+            self.visit(child)
+
+_dispatch_tables = {}
+
+def _dispatch_table(cls):
+    table = _dispatch_tables.get(cls)
+    if table is None:
+        table = _dispatch_tables[cls] = [
+            getattr(cls, 'visit_' + node_class.node_type, cls.visit_children)
+            for node_class in node_classes]
+    return table
+'''
+
+
+class EmitOptions:
+    """ Options controlling the emitted code.
+
+        profile: one of PROFILES.
+            'debug' - node constructors check the types of all their
+                      arguments.
+            'release' - constructors only assign fields.
+    """
+    PROFILES = ('debug', 'release')
+
+    def __init__(self, profile='debug'):
+        if profile not in self.PROFILES:
+            raise ValueError('Unknown profile %r' % profile)
+        self.profile = profile
+
+    def __repr__(self):
+        return 'EmitOptions(profile=%r)' % self.profile
+
+
+def emit_ast(stream, ast, options=None):
+    options = options or EmitOptions()
+    stream.write(CODE_PREFACE)
+    if options.profile != 'release':
+        stream.write(CODE_CHECK_HELPERS)
+    stream.write(CODE_NODE_BASE)
+
+    classes = node_classes(ast)
+    kinds = {classname: kind for kind, (classname, _) in enumerate(classes)}
+    for typename, sum in sorted(ast.types.items()):
+        if len(sum.types) == 1:
+            emit_class(stream, typename.capitalize(), 'Node', sum.types[0],
+                       options, kinds)
+        elif len(sum.types) > 1:
+            emit_abstract_class(stream, typename.capitalize())
+            for constructor in sum.types:
+                emit_class(stream, constructor.name, typename.capitalize(),
+                           constructor, options, kinds)
+        else:
+            die('ERROR in %s, no constructors in Sum' % typename)
+
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    emit('# Names and classes of the concrete node types, indexed by kind.')
+    emit('node_types = (')
+    for classname, _ in classes:
+        emit("    '%s'," % classname)
+    emit(')')
+    emit()
+    emit('node_classes = (')
+    for classname, _ in classes:
+        emit('    %s,' % classname)
+    emit(')')
+    stream.write(CODE_VISITOR)
+    stream.write(CODE_SERIALIZATION)
+    emit_deserializers(stream, classes, schema_id(ast))
+
+
+CODE_SERIALIZATION = r'''
+
+#
+#-------------------- Serialization --------------------
+#
+
+def deserialize(data):
+    """ Decode an AST from the compact binary form produced by serialize() in
+        the JS AST module generated from the same ASDL, and return its root
+        node. data is a bytes-like object.
+    """
+    r = _Reader(data)
+    if bytes(r.data[:len(_MAGIC)]) != _MAGIC:
+        raise ASTError('Not a serialized AST')
+    r.pos = len(_MAGIC)
+    version = r.uint()
+    if version != _FORMAT_VERSION:
+        raise ASTError('Unsupported serialized AST version %s' % version)
+    if r.uint() != schema_id:
+        raise ASTError('Serialized AST was built from a different schema')
+    for _ in range(r.uint()):
+        length = r.uint()
+        if r.pos + length > len(r.data):
+            raise ASTError('Truncated serialized AST')
+        try:
+            r.strings.append(str(r.data[r.pos:r.pos + length], 'utf-8'))
+        except UnicodeDecodeError:
+            raise ASTError('Invalid UTF-8 string in serialized AST')
+        r.pos += length
+    return r.node()
+
+_MAGIC = b'CAST'
+_FORMAT_VERSION = 1
+
+class _Reader:
+    __slots__ = ('data', 'pos', 'strings')
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+        self.strings = []
+
+    def byte(self):
+        try:
+            b = self.data[self.pos]
+        except IndexError:
+            raise ASTError('Truncated serialized AST')
+        self.pos += 1
+        return b
+
+    def uint(self):
+        v = shift = 0
+        while True:
+            b = self.byte()
+            v |= (b & 127) << shift
+            if not b & 128:
+                return v
+            shift += 7
+
+    def int(self):
+        v = self.uint()
+        return v >> 1 if v % 2 == 0 else -((v + 1) >> 1)
+
+    def boolean(self):
+        return self.byte() != 0
+
+    def string(self):
+        index = self.uint()
+        if index == 0:
+            return None
+        if index > len(self.strings):
+            raise ASTError('Unknown string index %s' % (index - 1))
+        return self.strings[index - 1]
+
+    def node(self):
+        """ Read a node and its whole subtree. The nodes being read are kept
+            on an explicit stack of _Frames rather than on the Python stack,
+            so that deep trees (such as long chains of binary operators) don't
+            run into the recursion limit.
+        """
+        stack = []
+        frame = None
+        while True:
+            # Open a node: read its kind and loc, and then either the whole
+            # node if it has no node fields, or push its frame
+            tag = self.uint()
+            if tag == 0:
+                value = None
+            elif tag > len(node_classes):
+                raise ASTError('Unknown node kind %s' % (tag - 1))
+            else:
+                loc = self.uint()
+                loc = None if loc == 0 else loc - 1
+                kind = tag - 1
+                if _leaf_kinds[kind]:
+                    # No node fields: read the node at once
+                    args = [[read(self) for _ in range(self.uint())] if seq
+                            else read(self)
+                            for read, seq in _field_readers[kind]]
+                    args.append(loc)
+                    value = node_classes[kind](*args)
+                else:
+                    if frame is not None:
+                        stack.append(frame)
+                    frame = _Frame(kind, loc)
+                    value = _PENDING
+
+            # Read the fields of the innermost open node up to its next node
+            # field. value is a node (or None) read for the node field frame
+            # waits for, or _PENDING.
+            while True:
+                if value is not _PENDING:
+                    if frame is None:
+                        return value
+                    if frame.items is not None:
+                        frame.items.append(value)
+                        frame.left -= 1
+                    else:
+                        frame.args.append(value)
+                        frame.index += 1
+                    value = _PENDING
+                if frame.items is not None:
+                    if frame.left:
+                        break
+                    frame.args.append(frame.items)
+                    frame.items = None
+                    frame.index += 1
+                    continue
+                layout = frame.layout
+                if frame.index == len(layout):
+                    # All the fields are read: create the node, and deliver it
+                    # to its parent
+                    frame.args.append(frame.loc)
+                    value = node_classes[frame.kind](*frame.args)
+                    frame = stack.pop() if stack else None
+                    continue
+                read, seq = layout[frame.index]
+                if read is None:
+                    if not seq:
+                        break
+                    frame.items = []
+                    frame.left = self.uint()
+                elif seq:
+                    frame.args.append([read(self) for _ in range(self.uint())])
+                    frame.index += 1
+                else:
+                    frame.args.append(read(self))
+                    frame.index += 1
+
+class _Frame:
+    """ A node being read by _Reader.node: its kind and loc, the readers of
+        its fields (from _field_readers), the values of the fields read so
+        far, and the index of the next field. While a sequence of nodes is
+        read, items holds the nodes read so far and left the number of nodes
+        still to read.
+    """
+    __slots__ = ('kind', 'loc', 'layout', 'args', 'index', 'items', 'left')
+
+    def __init__(self, kind, loc):
+        self.kind = kind
+        self.loc = loc
+        self.layout = _field_readers[kind]
+        self.args = []
+        self.index = 0
+        self.items = None
+        self.left = 0
+
+# The value of a node field while it's being read
+_PENDING = object()
+
+'''
+
+
+def emit_deserializers(stream, classes, schema_id):
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    emit('schema_id = %d' % schema_id)
+    emit()
+    emit('# The fields of each node type, indexed by kind, as the _Reader method reading')
+    emit('# a field and whether the field is a sequence.')
+    emit('_layouts = (')
+    for classname, constructor in classes:
+        emit('    # %s' % classname)
+        emit('    %r,' % (tuple(
+            (_serialization_methods.get(field.type, 'node'), field.seq)
+            for field in constructor.fields),))
+    emit(')')
+    emit()
+    emit('# _layouts with the _Reader methods reading the fields, None for nodes')
+    emit('_field_readers = tuple(')
+    emit("    tuple((None if method == 'node' else getattr(_Reader, method), seq)")
+    emit('          for method, seq in layout)')
+    emit('    for layout in _layouts)')
+    emit()
+    emit('# Whether the nodes of each kind have no node fields, indexed by kind')
+    emit('_leaf_kinds = tuple(')
+    emit("    all(method != 'node' for method, _ in layout) for layout in _layouts)")
+
+
+# Maps a field type to the name of the _Reader method reading it; node types
+# are read by 'node'.
+_serialization_methods = dict(
+    identifier='string', string='string', int='int', boolean='boolean')
+
+
+def emit_abstract_class(stream, classname):
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    emit('class %s(Node):' % classname)
+    emit('    """ %s is an abstract Node interface' % classname)
+    emit('    """')
+    emit('    __slots__ = ()')
+    emit()
+    emit('    def __init__(self):')
+    emit("        raise ASTError('%s is an abstract class')" % classname)
+    emit()
+    emit()
+
+
+def emit_class(stream, classname, parentname, constructor, options, kinds):
+    def emit(s=''):
+        stream.write((s or '') + '\n')
+    fieldnames = [field.name for field in constructor.fields]
+    attrs = [field.name for field in constructor.fields
+             if not field.seq and field.type in _attribute_types]
+
+    emit('class %s(%s):' % (classname, parentname))
+    emit('    """ %s' % str(constructor))
+    emit('    """')
+    emit('    __slots__ = %s' % _tuple(fieldnames + ['loc']))
+    emit('    _fields = %s' % _tuple(fieldnames))
+    emit('    attributes = %s' % _tuple(attrs))
+    emit("    node_type = '%s'" % classname)
+    emit('    kind = %d' % kinds[classname])
+    emit()
+
+    emit('    def __init__(%s):' % ', '.join(['self'] + fieldnames +
+                                             ['loc=None']))
+    if options.profile == 'debug':
+        for field in constructor.fields:
+            emit_field_check(emit, classname, field)
+    for field in constructor.fields:
+        emit('        self.%s = %s' % (field.name, field.name))
+    emit('        self.loc = loc')
+    emit()
+
+    child_fields = [field for field in constructor.fields
+                    if field.type not in asdl_ast.builtin_types]
+    emit('    def iter_child_nodes(self):')
+    if not child_fields:
+        emit('        return iter(())')
+    for field in child_fields:
+        if field.seq:
+            emit('        yield from self.%s' % field.name)
+        elif field.opt:
+            emit('        if self.%s is not None:' % field.name)
+            emit('            yield self.%s' % field.name)
+        else:
+            emit('        yield self.%s' % field.name)
+    emit()
+
+    emit('    def children(self):')
+    if not child_fields:
+        emit('        return []')
+    else:
+        emit('        children = []')
+        for field in child_fields:
+            if field.seq:
+                emit('        children.extend(')
+                emit("            ('%s[%%d]' %% i, node) for i, node in enumerate(self.%s))" % (
+                    field.name, field.name))
+            elif field.opt:
+                emit('        if self.%s is not None:' % field.name)
+                emit("            children.append(('%s', self.%s))" % (
+                    field.name, field.name))
+            else:
+                emit("        children.append(('%s', self.%s))" % (
+                    field.name, field.name))
+        emit('        return children')
+    emit()
+    emit()
+
+
+# Field types stored as attributes (non-Node values) of nodes
+_attribute_types = ('identifier', 'string', 'boolean', 'int')
+
+
+def emit_field_check(emit, classname, field):
+    """ Emit the code checking the constructor argument for field.
+    """
+    def make_check_call(ty):
+        call = "_check_%s(%s, '%s', '%s', loc)" % (
+            ty, field.name, classname, field.name)
+        if field.opt:
+            emit('        if %s is not None:' % field.name)
+            emit('            ' + call)
+        else:
+            emit('        ' + call)
+
+    fieldclass = field.type.capitalize()
+    if field.seq:
+        make_check_call('array')
+        emit('        for item in %s:' % field.name)
+        emit('            if not isinstance(item, %s):' % fieldclass)
+        emit("                raise ASTError('%s expects %s to be an array of %s')" % (
+            classname, field.name, fieldclass))
+    elif field.type in _attribute_types:
+        make_check_call(field.type)
+    else:
+        nullcheck = ('%s is not None and ' % field.name) if field.opt else ''
+        emit('        if %snot isinstance(%s, %s):' % (
+            nullcheck, field.name, fieldclass))
+        emit("            raise ASTError('%s expects %s to be a %s')" % (
+            classname, field.name, fieldclass))
+
+
+def _tuple(names):
+    """ Python source for a tuple of the given strings.
+    """
+    if len(names) == 1:
+        return "('%s',)" % names[0]
+    return '(%s)' % ', '.join("'%s'" % name for name in names)
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description='Generate Python AST-definition code from ASDL.')
+    argparser.add_argument('asdl', help='input ASDL file')
+    argparser.add_argument('-o', '--output',
+        help='output file (default: stdout). The file is only written if '
+             'its contents change')
+    argparser.add_argument('--emit-profile', choices=EmitOptions.PROFILES,
+        default='debug',
+        help='debug: node constructors check their arguments; release: no '
+             'checks (default: %(default)s)')
+    argparser.add_argument('--no-cache', action='store_true',
+        help="don't read or write the on-disk cache")
+    argparser.add_argument('--cache-dir', default=asdl_cache.DEFAULT_CACHE_DIR,
+        help='directory of the on-disk cache (default: %(default)s)')
+    args = argparser.parse_args()
+
+    cache = asdl_cache.Cache(
+        asdl_cache.toolchain_fingerprint(sys.modules['asdl_gen_js'],
+                                         sys.modules[__name__]),
+        directory=args.cache_dir, enabled=not args.no_cache)
+    key, ast = cache.load_module(args.asdl)
+    if ast is None:
+        return 1
+    options = EmitOptions(args.emit_profile)
+    output = cache.get_output(key, options)
+    if output is None:
+        stream = io.StringIO()
+        emit_ast(stream, ast, options)
+        output = stream.getvalue().encode('utf-8')
+        cache.put_output(key, options, output)
+
+    if args.output:
+        asdl_cache.write_if_changed(args.output, output)
+    else:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output)
+
+if __name__ == '__main__':
+    sys.exit(main())
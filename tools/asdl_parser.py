@@ -22,7 +22,9 @@
 # This code is in the public domain
 #-------------------------------------------------------------------------------
 from collections import namedtuple
+from contextlib import contextmanager
 from enum import Enum
+import mmap
 import re
 
 from asdl_ast import Product, Sum, Module, Type, Constructor, Field
@@ -43,52 +45,88 @@ class ASDLSyntaxError(Exception):
 
 def tokenize_asdl(buf):
     """ Tokenize the given buffer. Yield Token objects.
+
+        buf is either a str or a bytes-like object (bytes, bytearray, mmap)
+        holding UTF-8 text; the latter is decoded once, up front, and then
+        tokenized exactly as a str.
     """
-    buflen = len(buf)
-    pos = 0
+    if not isinstance(buf, str):
+        buf = str(buf, 'utf-8')
+    kinds = _scanner_kinds
     lineno = 1
 
-    while pos < buflen:
-        m = tokenize_asdl._re_skip_whitespace.search(buf, pos)
-        if not m: return
-        lineno += buf.count('\n', pos, m.start())
-        pos = m.start()
-        c = buf[pos]
-        if c.isalpha():
-            # Some kind of identifier
-            m = tokenize_asdl._re_nonword.search(buf, pos + 1)
-            end = m.end() - 1 if m else buflen
-            id = buf[pos:end]
-            if c.isupper():
-                yield Token(TokenKind.ConstructorId, id, lineno)
-            else:
-                yield Token(TokenKind.TypeId, id, lineno)
-            pos = end
-        elif c == '-':
-            # Potential comment, if followed by another '-'
-            if pos < buflen - 1 and buf[pos + 1] == '-':
-                pos = buf.find('\n', pos + 1)
-                if pos < 0: pos = buflen
-                continue
-            else:
-                raise ASDLSyntaxError('Invalid operator %s' % c, lineno)
+    # Every character of the buffer is covered by exactly one match of the
+    # master regex, so finditer walks the whole buffer with no gaps.
+    for m in _scanner.finditer(buf):
+        kind = kinds[m.lastindex]
+        if kind is _SKIP:
+            # Comments never contain newlines, so only whitespace is counted.
+            lineno += m.group().count('\n')
+        elif kind is _OTHER_ID:
+            # Non-ASCII identifier; classify it the slow way. The regex class
+            # also lets through numeric characters that aren't digits (such as
+            # '½'), which don't start identifiers.
+            id = m.group()
+            if not id[0].isalpha():
+                raise ASDLSyntaxError('Invalid operator %s' % id[0], lineno)
+            kind = (TokenKind.ConstructorId if id[0].isupper()
+                                            else TokenKind.TypeId)
+            yield Token(kind, id, lineno)
+        elif kind is _ERROR:
+            raise ASDLSyntaxError('Invalid operator %s' % m.group(), lineno)
         else:
-            # Operators
-            op_kind = tokenize_asdl._operator_table.get(c, None)
-            if op_kind:
-                yield Token(op_kind, c, lineno)
-            else:
-                raise ASDLSyntaxError('Invalid operator %s' % c, lineno)
-            pos += 1
-
-# Immutable helper objects for tokenize_asdl.
-tokenize_asdl._re_skip_whitespace = re.compile(r'\S')
-tokenize_asdl._re_nonword = re.compile(r'\W')
-tokenize_asdl._operator_table = {
-    '=': TokenKind.Equals,      ',': TokenKind.Comma,   '?': TokenKind.Question,
-    '|': TokenKind.Pipe,        '(': TokenKind.LParen,  ')': TokenKind.RParen,
-    '*': TokenKind.Asterisk,    '{': TokenKind.LBrace,  '}': TokenKind.RBrace}
+            yield Token(kind, m.group(), lineno)
+
+# Pseudo-kinds for matches of the master regex that don't produce tokens.
+_SKIP = object()
+_OTHER_ID = object()
+_ERROR = object()
+
+# The master regex of tokenize_asdl: one alternative per token kind, tried in
+# order. A match's lastindex is the group number of the alternative that
+# matched, and indexes _scanner_kinds.
+_scanner_alternatives = [
+    (r'(?:\s+|--[^\n]*)+',   _SKIP),
+    (r'[A-Z]\w*',            TokenKind.ConstructorId),
+    (r'[a-z]\w*',            TokenKind.TypeId),
+    (r'[^\W\d_]\w*',         _OTHER_ID),
+    (r'=',                   TokenKind.Equals),
+    (r',',                   TokenKind.Comma),
+    (r'\?',                  TokenKind.Question),
+    (r'\|',                  TokenKind.Pipe),
+    (r'\(',                  TokenKind.LParen),
+    (r'\)',                  TokenKind.RParen),
+    (r'\*',                  TokenKind.Asterisk),
+    (r'\{',                  TokenKind.LBrace),
+    (r'\}',                  TokenKind.RBrace),
+    (r'.',                   _ERROR)]
+
+_scanner_pattern = '|'.join('(%s)' % regex
+                            for regex, _ in _scanner_alternatives)
+_scanner_kinds = [None] + [kind for _, kind in _scanner_alternatives]
+_scanner = re.compile(_scanner_pattern, re.DOTALL)
+
+@contextmanager
+def mapped_file(filename):
+    """ Context manager giving the contents of the file with the given name as
+        a read-only bytes-like object, memory-mapped rather than read.
+    """
+    with open(filename, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            yield b''
+            return
+        with buf:
+            yield buf
 
+def parse_file(filename):
+    """ Parse the ASDL file with the given name and return an AST with a
+        Module root. The file is memory-mapped rather than read.
+    """
+    with mapped_file(filename) as buf:
+        return ASDLParser().parse(buf)
 
 class ASDLParser:
     def __init__(self):
@@ -98,7 +136,13 @@ class ASDLParser:
     def parse(self, buf):
         """ Parse the ASDL in the buffer and return an AST with a Module root.
         """
-        self._tokenizer = tokenize_asdl(buf)
+        return self.parse_tokens(tokenize_asdl(buf))
+
+    def parse_tokens(self, tokens):
+        """ Parse the ASDL from an iterable of Tokens, as produced by
+            tokenize_asdl, and return an AST with a Module root.
+        """
+        self._tokenizer = iter(tokens)
         self._advance()
         return self._parse_module()
 
@@ -224,10 +268,7 @@ if __name__ == '__main__':
             --kowo     '''
 
     import sys
-    with open(sys.argv[1]) as f:
-        buf = f.read()
-    p = ASDLParser()
-    ast = p.parse(buf)
+    ast = parse_file(sys.argv[1])
 
     from asdl_ast import check
     check(ast)
@@ -0,0 +1,68 @@
+#-------------------------------------------------------------------------------
+# Phase timing for the ASDL toolchain.
+#
+# A PhaseTimer records the wall-clock and CPU time spent in named phases of a
+# run (tokenizing, parsing, checking, emitting...), and reports them as JSON.
+# Optionally, the whole run is also profiled with cProfile.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+from collections import OrderedDict
+import cProfile
+from contextlib import contextmanager
+import json
+import time
+
+
+class PhaseTimer:
+    """ Times the phases of a run. Use as:
+
+            timer = PhaseTimer()
+            with timer.phase('parse'):
+                ...
+
+        A phase entered more than once accumulates its times. If profile is
+        True, the code inside phases also runs under cProfile; dump_profile
+        writes the collected statistics out.
+    """
+    def __init__(self, profile=False):
+        self.phases = OrderedDict()
+        self.profiler = cProfile.Profile() if profile else None
+
+    @contextmanager
+    def phase(self, name):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if self.profiler:
+            self.profiler.enable()
+        try:
+            yield
+        finally:
+            if self.profiler:
+                self.profiler.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            times = self.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0})
+            times['wall'] += wall
+            times['cpu'] += cpu
+
+    def report(self):
+        """ The recorded times in seconds, as a dict of phase name ->
+            {'wall': ..., 'cpu': ...}, plus a 'total' entry.
+        """
+        result = OrderedDict((name, dict(times))
+                             for name, times in self.phases.items())
+        result['total'] = {
+            'wall': sum(t['wall'] for t in self.phases.values()),
+            'cpu': sum(t['cpu'] for t in self.phases.values())}
+        return result
+
+    def to_json(self):
+        return json.dumps(self.report(), indent=2)
+
+    def dump_profile(self, filename):
+        """ Write the cProfile statistics to filename, in the format read by
+            the pstats module.
+        """
+        self.profiler.dump_stats(filename)
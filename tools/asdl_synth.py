@@ -0,0 +1,120 @@
+#-------------------------------------------------------------------------------
+# Generator of synthetic ASDL schemas, used for benchmarking the toolchain.
+#
+# A synthetic schema has a given number of types. Most of them are sums of a
+# given number of constructors; the rest are wide single-constructor types
+# (the emitters don't support ASDL products, so width is modeled this way).
+# Fields refer to builtin types and to later types in the schema, through
+# optional and sequence fields, which chains the types into deep hierarchies.
+# Each type has a field referring to the next one, so that all the types are
+# reachable from the first, type0, as in a real AST. Comments can be sprinkled
+# between the definitions and the constructors.
+#
+# The output is deterministic for a given set of parameters and seed, and
+# passes asdl_ast.check.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import argparse
+import random
+import sys
+
+_builtin_field_types = ('identifier', 'string', 'int', 'boolean')
+
+def synthesize(num_types, constructors_per_sum=4, fields_per_constructor=3,
+               product_every=4, product_width=16, comment_lines=0, seed=0):
+    """ Return the text of a synthetic ASDL module. All its types are
+        reachable from type0, unless some types have no fields at all (sums
+        of a single constructor, or constructors without fields).
+
+        num_types: number of types defined.
+        constructors_per_sum: number of constructors of each sum type.
+        fields_per_constructor: number of fields of each constructor.
+        product_every: every product_every-th type is a wide single-
+            constructor type (0 for none).
+        product_width: number of fields of the wide types.
+        comment_lines: number of comment lines before each definition and
+            between each pair of constructors.
+        seed: seed for the random choices of field types.
+    """
+    rng = random.Random(seed)
+    # Comments get their own generator, so that they don't change the fields
+    comment_rng = random.Random(seed + 1)
+    typenames = ['type%d' % i for i in range(num_types)]
+    lines = ['-- Synthetic ASDL schema: %d types' % num_types,
+             'module Synthetic', '{']
+
+    def comment(indent):
+        for i in range(comment_lines):
+            lines.append('%s-- comment %d: (a, b) | c* d? = e -- %s' % (
+                indent, i, 'x' * comment_rng.randrange(40)))
+
+    def fields(index, count, link=False):
+        """ The fields of a constructor of the type with the given index. If
+            link is set, the first field refers to the next type.
+        """
+        result = []
+        for i in range(count):
+            # Refer to a later type a third of the time, so that the types
+            # form chains down to the last one, which has only builtin fields.
+            if link and i == 0 and index + 1 < num_types:
+                fieldtype = typenames[index + 1]
+                suffix = rng.choice('?*')
+            elif index + 1 < num_types and rng.randrange(3) == 0:
+                fieldtype = typenames[rng.randrange(index + 1, num_types)]
+                # A required reference to a later type would make the schema
+                # uninhabitable, so these are always optional or sequences.
+                suffix = rng.choice('?*')
+            else:
+                fieldtype = rng.choice(_builtin_field_types)
+                suffix = rng.choice(('', '', '?', '*'))
+            result.append('%s%s f%d' % (fieldtype, suffix, i))
+        return '(%s)' % ', '.join(result)
+
+    for index, typename in enumerate(typenames):
+        comment('    ')
+        if product_every and index % product_every == product_every - 1:
+            lines.append('    %s = %s%s' % (
+                typename, typename.capitalize(),
+                fields(index, product_width, link=True)))
+            continue
+        for c in range(constructors_per_sum):
+            name = '%sCase%d' % (typename.capitalize(), c)
+            # Leave one constructor without fields, as NoExpr in Cool. The
+            # next one refers to the next type.
+            body = (fields(index, fields_per_constructor, link=c == 1) if c
+                    else '')
+            if c == 0:
+                lines.append('    %s = %s%s' % (typename, name, body))
+            else:
+                comment('        ')
+                lines.append('        | %s%s' % (name, body))
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description='Generate a synthetic ASDL schema.')
+    argparser.add_argument('types', type=int, help='number of types')
+    argparser.add_argument('--constructors', type=int, default=4,
+        help='constructors per sum type (default: %(default)s)')
+    argparser.add_argument('--fields', type=int, default=3,
+        help='fields per constructor (default: %(default)s)')
+    argparser.add_argument('--product-every', type=int, default=4,
+        help='make every N-th type a wide single-constructor type, 0 for '
+             'none (default: %(default)s)')
+    argparser.add_argument('--product-width', type=int, default=16,
+        help='fields of the wide types (default: %(default)s)')
+    argparser.add_argument('--comments', type=int, default=0,
+        help='comment lines between definitions and constructors '
+             '(default: %(default)s)')
+    argparser.add_argument('--seed', type=int, default=0)
+    args = argparser.parse_args()
+    sys.stdout.write(synthesize(args.types, args.constructors, args.fields,
+                                args.product_every, args.product_width,
+                                args.comments, args.seed))
+
+if __name__ == '__main__':
+    main()
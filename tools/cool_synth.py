@@ -0,0 +1,488 @@
+#-------------------------------------------------------------------------------
+# Generator of random Cool ASTs, used as workloads for benchmarking the lexer,
+# the parser and passes over ASTs.
+#
+# The trees are generated from the ASDL schema of the AST (cool_ast.asdl): each
+# node of a sum type is one of its constructors, picked at random with given
+# weights, and its fields are filled in according to their types. The
+# generation is steered by:
+#
+# * nodes: the approximate total number of nodes. Classes are added to the
+#   program until it's reached; the nodes generated after that are leaves,
+#   and their sequences are as short as possible.
+# * depth: the maximal depth of nodes; the nodes at that depth are leaves.
+# * fanout: the maximal length of sequence fields (features, arguments, ...).
+# * mix: relative weights of the constructors (1 by default, 0 to exclude).
+#
+# The trees are valid Cool, and only have the shapes the parser produces:
+# assignments are BinaryOp nodes with op '<-' (as parsed), not Assign nodes;
+# NoExpr only appears where the source can leave out an expression; sequences
+# the grammar requires to be non-empty are. A tree is written as Cool source,
+# which the parser reads back into the same tree (but for locs), and/or as a
+# JS module building it through a builder (see cool_ast.builder).
+#
+# The output is deterministic for a given set of parameters and seed.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import argparse
+import itertools
+import os
+import random
+import sys
+
+import asdl_analysis
+import asdl_ast
+import asdl_parser
+
+_toolsdir = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_ASDL = os.path.join(os.path.dirname(_toolsdir), 'cool_ast.asdl')
+
+# Precedence of the binary operators in the parser; all are left-associative
+# but '<-'.
+_BINARY_PRECEDENCE = {'<-': 80, '=': 100, '<': 110, '<=': 120, '-': 130,
+                      '+': 140, '/': 150, '*': 160}
+_BINARY_OPS = sorted(op for op in _BINARY_PRECEDENCE if op != '<-')
+_UNARY_OPS = ('NOT', '~')
+
+# Types the programs refer to, besides their own classes
+_BASIC_TYPES = ('Int', 'Bool', 'String', 'Object', 'IO', 'SELF_TYPE')
+
+# Identifier fields holding type names
+_TYPE_FIELDS = ('parent', 'type_decl', 'return_type', 'type_name')
+
+# Sequence fields that the grammar requires to be non-empty
+_NONEMPTY_SEQS = (('Program', 'classes'), ('Block', 'body'), ('Let', 'init'),
+                  ('Typcase', 'cases'))
+
+# Expression fields that the source can leave out, with the probability that
+# they are: they are then NoExpr.
+_OMITTABLE_EXPRS = {('Attr', 'init'): 0.5, ('Letinit', 'init'): 0.5,
+                    ('Dispatch', 'expr'): 0.3}
+
+# Constructors the parser never produces, or only in the fields above
+_EXCLUDED_CONSTRUCTORS = ('NoExpr',)
+
+_WORDS = ('hello', 'world', 'cool', 'list', 'node', 'value', 'graph', 'main')
+
+
+class Node:
+    """ A node of a generated tree: the name of its constructor and its
+        fields, name -> value, in the order of the schema. Values are Nodes,
+        lists of Nodes, strings, ints, booleans or None.
+    """
+    __slots__ = ('name', 'fields')
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def __repr__(self):
+        return 'Node(%s, %s)' % (self.name, self.fields)
+
+
+class Generator:
+    """ Generates random trees for a checked asdl_ast.Module of the Cool AST.
+        See the module comment for the parameters.
+    """
+    def __init__(self, module, nodes=1000, depth=12, fanout=4, mix=None,
+                 seed=0):
+        self.module = module
+        self.analysis = asdl_analysis.analyze(module, 'program')
+        self.nodes = nodes
+        self.depth = depth
+        self.fanout = fanout
+        self.mix = mix or {}
+        for name in self.mix:
+            if name not in module.constructor_type:
+                raise ValueError('Unknown constructor %s' % name)
+        self.rng = random.Random(seed)
+        self.count = 0
+        self.classnames = []
+        # (type name, exhausted) -> result of _candidates
+        self._choices = {}
+
+    def program(self):
+        """ Generate a Program. Its classes are generated until the node count
+            is reached.
+        """
+        self.count = 1
+        self.classnames = []
+        classes = [self.node('class', 1)]
+        while self.count < self.nodes:
+            classes.append(self.node('class', 1))
+        return Node('Program', {'classes': classes})
+
+    def node(self, typename, depth):
+        self.count += 1
+        exhausted = depth >= self.depth or self.count >= self.nodes
+        constructor = self._pick(typename, exhausted)
+        if constructor.name == 'Assign':
+            # Parsed as a BinaryOp
+            return Node('BinaryOp', {
+                'op': '<-', 'left': self._leaf('Obj', depth + 1),
+                'right': self.node('expression', depth + 1)})
+        fields = {}
+        for field in constructor.fields:
+            fields[field.name] = self._value(constructor.name, field, depth,
+                                             exhausted)
+        return Node(constructor.name, fields)
+
+    def _pick(self, typename, exhausted):
+        choice = self._choices.get((typename, exhausted))
+        if choice is None:
+            choice = self._choices[typename, exhausted] = self._candidates(
+                typename, exhausted)
+        candidates, cum_weights = choice
+        if len(candidates) == 1:
+            return candidates[0]
+        return self.rng.choices(candidates, cum_weights=cum_weights)[0]
+
+    def _candidates(self, typename, exhausted):
+        """ The constructors to pick from for a node of the given type, and
+            their cumulative weights.
+        """
+        candidates = [c for c in self.module.types[typename].types
+                      if c.name not in _EXCLUDED_CONSTRUCTORS]
+        leaves = [c for c in candidates if self.analysis.is_leaf(c)]
+        if exhausted and leaves:
+            candidates = leaves
+        weights = [self.mix.get(c.name, 1) for c in candidates]
+        if not any(weights):
+            # Everything excluded by the mix: fall back to the candidates
+            weights = [1] * len(candidates)
+        return candidates, list(itertools.accumulate(weights))
+
+    def _leaf(self, name, depth):
+        self.count += 1
+        return Node(name, {'name': self._identifier()})
+
+    def _value(self, consname, field, depth, exhausted):
+        rng = self.rng
+        if field.seq:
+            low = 1 if (consname, field.name) in _NONEMPTY_SEQS else 0
+            length = low if exhausted else rng.randint(low,
+                                                       max(low, self.fanout))
+            return [self.node(field.type, depth + 1) for i in range(length)]
+        if field.type == 'identifier':
+            if field.opt and rng.random() < 0.5:
+                return None
+            return self._identifier_field(consname, field.name)
+        elif field.type == 'int':
+            return rng.randrange(1000)
+        elif field.type == 'boolean':
+            return rng.random() < 0.5
+        elif field.type == 'string':
+            return '"%s"' % ' '.join(rng.choice(_WORDS)
+                                     for i in range(rng.randint(1, 4)))
+        omit = _OMITTABLE_EXPRS.get((consname, field.name), 0)
+        if omit and (exhausted or rng.random() < omit):
+            self.count += 1
+            return Node('NoExpr', {})
+        return self.node(field.type, depth + 1)
+
+    def _identifier_field(self, consname, fieldname):
+        if consname == 'Class' and fieldname == 'name':
+            name = 'C%d' % len(self.classnames)
+            self.classnames.append(name)
+            return name
+        elif fieldname in _TYPE_FIELDS:
+            # Only classes defined before, so that there are no cycles
+            types = _BASIC_TYPES + tuple(self.classnames[:-1])
+            return self.rng.choice(types)
+        elif fieldname == 'op':
+            return self.rng.choice(_BINARY_OPS if consname == 'BinaryOp' else
+                                   _UNARY_OPS)
+        return self._identifier(consname == 'Obj')
+
+    def _identifier(self, allow_self=False):
+        if allow_self and self.rng.random() < 0.05:
+            return 'self'
+        # A letter and a digit: never a keyword
+        return '%s%d' % (self.rng.choice('abcdegkmnprstuvwxyz'),
+                         self.rng.randrange(10))
+
+
+def count_nodes(node):
+    count = 1
+    for value in node.fields.values():
+        if isinstance(value, Node):
+            count += count_nodes(value)
+        elif isinstance(value, list):
+            count += sum(count_nodes(child) for child in value)
+    return count
+
+
+#---- Cool source
+
+def cool_source(program):
+    """ The Cool source of a Program tree.
+    """
+    return ''.join('%s;\n\n' % _cool_class(cls)
+                   for cls in program.fields['classes'])
+
+
+def _cool_class(cls):
+    f = cls.fields
+    lines = ['class %s%s {' % (f['name'], ' inherits %s' % f['parent']
+                               if f['parent'] is not None else '')]
+    for feature in f['features']:
+        lines.append('  %s;' % _cool_feature(feature, '  '))
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def _cool_feature(feature, indent):
+    f = feature.fields
+    if feature.name == 'Method':
+        formals = ', '.join('%s : %s' % (formal.fields['name'],
+                                         formal.fields['type_decl'])
+                            for formal in f['formals'])
+        inner = indent + '  '
+        return '%s(%s) : %s {\n%s%s\n%s}' % (
+            f['name'], formals, f['return_type'], inner,
+            _cool_expr(f['expr'], inner), indent)
+    return '%s : %s%s' % (f['name'], f['type_decl'],
+                          _cool_init(f['init'], indent))
+
+
+def _cool_init(expr, indent):
+    if expr.name == 'NoExpr':
+        return ''
+    return ' <- %s' % _cool_expr(expr, indent)
+
+
+def _cool_expr(e, indent):
+    """ The source of expression e in a context delimited by tokens, such as
+        an argument list or a block: it needs no parentheses. Multi-line
+        constructs are indented from indent.
+    """
+    f = e.fields
+    name = e.name
+    inner = indent + '  '
+    if name == 'BinaryOp':
+        prec = _BINARY_PRECEDENCE[f['op']]
+        right_prec = prec if f['op'] == '<-' else prec + 1
+        return '%s %s %s' % (_cool_operand(f['left'], prec, indent), f['op'],
+                             _cool_operand(f['right'], right_prec, indent))
+    elif name == 'UnaryOp':
+        if f['op'] == 'NOT':
+            return 'not %s' % _cool_operand(f['expr'], 90, indent)
+        return '~%s' % _cool_atom(f['expr'], indent, True)
+    elif name == 'IsVoid':
+        return 'isvoid %s' % _cool_atom(f['expr'], indent, True)
+    elif name == 'Dispatch':
+        args = _cool_args(f['actual'], indent)
+        if f['expr'].name == 'NoExpr':
+            return '%s(%s)' % (f['name'], args)
+        return '%s.%s(%s)' % (_cool_atom(f['expr'], indent, False), f['name'],
+                              args)
+    elif name == 'StaticDispatch':
+        return '%s@%s.%s(%s)' % (_cool_atom(f['expr'], indent, False),
+                                 f['type_name'], f['name'],
+                                 _cool_args(f['actual'], indent))
+    elif name == 'Cond':
+        return 'if %s then\n%s%s\n%selse\n%s%s\n%sfi' % (
+            _cool_expr(f['pred'], indent), inner,
+            _cool_expr(f['then_exp'], inner), indent, inner,
+            _cool_expr(f['else_exp'], inner), indent)
+    elif name == 'Loop':
+        return 'while %s loop\n%s%s\n%spool' % (
+            _cool_expr(f['pred'], indent), inner,
+            _cool_expr(f['body'], inner), indent)
+    elif name == 'Typcase':
+        cases = ''.join('%s%s : %s => %s;\n' % (
+            inner, case.fields['name'], case.fields['type_decl'],
+            _cool_expr(case.fields['expr'], inner))
+            for case in f['cases'])
+        return 'case %s of\n%s%sesac' % (_cool_expr(f['expr'], indent), cases,
+                                         indent)
+    elif name == 'Block':
+        body = ''.join('%s%s;\n' % (inner, _cool_expr(expr, inner))
+                       for expr in f['body'])
+        return '{\n%s%s}' % (body, indent)
+    elif name == 'Let':
+        inits = (',\n%s    ' % indent).join(
+            '%s : %s%s' % (init.fields['id'], init.fields['type_decl'],
+                           _cool_init(init.fields['init'], indent + '    '))
+            for init in f['init'])
+        return 'let %s in\n%s%s' % (inits, inner,
+                                    _cool_expr(f['body'], inner))
+    elif name == 'IntConst':
+        return str(f['token'])
+    elif name == 'BoolConst':
+        return 'true' if f['value'] else 'false'
+    elif name == 'StringConst':
+        return f['str']
+    elif name == 'New':
+        return 'new %s' % f['type_name']
+    elif name == 'Obj':
+        return f['name']
+    raise ValueError('Unexpected node %s' % name)
+
+
+def _cool_args(actual, indent):
+    return ', '.join(_cool_expr(arg, indent) for arg in actual)
+
+
+# Expressions that the parser reads as a whole wherever an atom is expected
+_ATOMS = ('Obj', 'IntConst', 'BoolConst', 'StringConst', 'New', 'Block',
+          'Cond', 'Loop', 'Typcase')
+
+
+def _cool_atom(e, indent, unary):
+    """ The source of e as the operand of ~ or isvoid (unary) or as the target
+        of a dispatch, parenthesized unless the parser reads it as an atom
+        there.
+    """
+    atom = e.name in _ATOMS
+    if e.name == 'Dispatch':
+        # The parser reads x.f() and f() as atoms, and chains dispatches
+        atom = not unary or e.fields['expr'].name in ('NoExpr', 'Obj')
+    elif e.name == 'StaticDispatch':
+        atom = unary and e.fields['expr'].name == 'Obj'
+    elif e.name == 'IsVoid' or (e.name == 'UnaryOp' and
+                                e.fields['op'] == '~'):
+        atom = unary
+    source = _cool_expr(e, indent)
+    return source if atom else '(%s)' % source
+
+
+def _cool_operand(e, min_prec, indent):
+    """ The source of e as an operand parsed with precedence min_prec. not
+        and let extend as far right as they can, so they're parenthesized.
+    """
+    if e.name == 'BinaryOp':
+        paren = _BINARY_PRECEDENCE[e.fields['op']] < min_prec
+    else:
+        paren = e.name == 'Let' or (e.name == 'UnaryOp' and
+                                    e.fields['op'] == 'NOT' and min_prec > 90)
+    source = _cool_expr(e, indent)
+    return '(%s)' % source if paren else source
+
+
+#---- JS construction code
+
+JS_HEADER = r'''//------------------------------------------------------------------------------
+// Random Cool AST: %(nodes)d nodes, generated by tools/cool_synth.py with
+// %(params)s.
+// NOTE: this code is auto-generated. Do not edit it directly.
+//------------------------------------------------------------------------------
+'use strict';
+
+exports.nodes = %(nodes)d;
+
+// Builds the tree through builder b: cool_ast.builder, or an arena of
+// cool_ast_arena.
+exports.build = function(b) {
+  var classes = [];
+'''
+
+JS_FOOTER = r'''  return b.Program(classes);
+}
+'''
+
+
+def js_module(program, params):
+    """ The JS module building a Program tree. params describes the
+        parameters of the generation, for the header.
+    """
+    out = [JS_HEADER % {'nodes': count_nodes(program), 'params': params}]
+    for cls in program.fields['classes']:
+        out.append('  classes.push(%s);\n' % _js_node(cls, '  '))
+    out.append(JS_FOOTER)
+    return ''.join(out)
+
+
+def _js_value(value, indent):
+    if isinstance(value, Node):
+        return _js_node(value, indent)
+    elif isinstance(value, list):
+        if not value:
+            return '[]'
+        inner = indent + '  '
+        return '[\n%s%s]' % (inner, (',\n' + inner).join(
+            _js_node(child, inner) for child in value))
+    elif value is None:
+        return 'null'
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    elif isinstance(value, int):
+        return str(value)
+    return "'%s'" % value.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def _js_node(node, indent):
+    inner = indent + '  '
+    args = [_js_value(value, inner) for value in node.fields.values()]
+    call = 'b.%s(%s)' % (node.name, ', '.join(args))
+    if len(indent) + len(call) <= 80 and '\n' not in call:
+        return call
+    return 'b.%s(\n%s%s)' % (node.name, inner, (',\n' + inner).join(args))
+
+
+def parse_mix(text):
+    """ Parse constructor weights given as Name=weight,Name=weight.
+    """
+    mix = {}
+    for item in text.split(','):
+        name, sep, weight = item.partition('=')
+        if not sep:
+            raise ValueError('Expected Name=weight, got %r' % item)
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description='Generate a random Cool AST, as Cool source and/or as a '
+                    'JS module building it.')
+    argparser.add_argument('--asdl', default=DEFAULT_ASDL,
+        help='ASDL schema of the Cool AST (default: %(default)s)')
+    argparser.add_argument('--nodes', type=int, default=1000,
+        help='approximate number of nodes (default: %(default)s)')
+    argparser.add_argument('--depth', type=int, default=12,
+        help='maximal depth of nodes (default: %(default)s)')
+    argparser.add_argument('--fanout', type=int, default=4,
+        help='maximal length of sequences (default: %(default)s)')
+    argparser.add_argument('--mix', type=parse_mix, default={},
+        metavar='NAME=WEIGHT,...',
+        help='weights of constructors, e.g. Let=4,Typcase=0 (default: 1)')
+    argparser.add_argument('--seed', type=int, default=0)
+    argparser.add_argument('--cool', metavar='FILE',
+        help='write the Cool source to FILE')
+    argparser.add_argument('--js', metavar='FILE',
+        help='write the JS module building the AST to FILE')
+    args = argparser.parse_args()
+
+    module = asdl_parser.parse_file(args.asdl)
+    if not asdl_ast.check(module):
+        return 1
+    try:
+        generator = Generator(module, args.nodes, args.depth, args.fanout,
+                              args.mix, args.seed)
+    except ValueError as e:
+        argparser.error(str(e))
+    program = generator.program()
+    params = 'nodes=%d depth=%d fanout=%d seed=%d' % (
+        args.nodes, args.depth, args.fanout, args.seed)
+    if args.mix:
+        params += ' mix=%s' % ','.join('%s=%g' % item
+                                       for item in sorted(args.mix.items()))
+    if args.js:
+        with open(args.js, 'w') as f:
+            f.write(js_module(program, params))
+    if args.cool or not args.js:
+        source = ('-- Random Cool program: %d nodes, generated by '
+                  'tools/cool_synth.py with\n-- %s.\n\n' % (
+                      count_nodes(program), params) + cool_source(program))
+        if args.cool:
+            with open(args.cool, 'w') as f:
+                f.write(source)
+        else:
+            sys.stdout.write(source)
+
+if __name__ == '__main__':
+    sys.exit(main())
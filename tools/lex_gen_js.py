@@ -0,0 +1,644 @@
+#-------------------------------------------------------------------------------
+# Generator of table-driven JavaScript lexers from declarative token specs.
+#
+# A token spec is a JSON file such as cool_tokens.json:
+#
+#   operators: maps each operator to its token name.
+#   keywords: the keywords; a keyword's token name is its uppercase form.
+#   identifiers: a list of {"name", "first", "rest"}: identifiers starting
+#     with a char of the set first, followed by any number of chars of rest.
+#   number: {"name", "digits"}: a run of digits.
+#   string: {"name", "quote", "escape"}: a string between quotes, in which
+#     the escape char escapes any char (including newlines and quotes).
+#   whitespace, newline: the chars skipped between tokens; newlines count
+#     lines.
+#   line_comment: the opener of comments running to the end of the line.
+#   block_comment: {"open", "close", "nested"}: delimited comments.
+#
+# Char sets are strings of chars and ranges such as "a-zA-Z_".
+#
+# The rules are compiled into an NFA, turned into a DFA over classes of
+# equivalent chars by subset construction, and minimized. The emitted lexer
+# runs the DFA from the current position for the longest match (ties go to
+# the earlier rule: comments, keywords, operators, strings, identifiers,
+# numbers, whitespace), looking up the class of each char and the next state
+# in typed arrays. What isn't regular - nested comments - and the diagnostics
+# about strings are handled by small actions run after the match.
+#
+# The emitted module has the interface of lexer.js: a Lexer with input(buf)
+# and token(), and lex_all(str). It produces the same tokens and errors.
+#
+# Eli Bendersky (eliben@gmail.com)
+# This code is in the public domain
+#-------------------------------------------------------------------------------
+import argparse
+import collections
+import io
+import json
+import sys
+
+import asdl_cache
+
+# Chars are partitioned into classes over this universe: the ASCII codes and
+# OTHER, which stands for all the codes above them.
+OTHER = 128
+UNIVERSE = frozenset(range(OTHER + 1))
+
+# What the lexer does with the match of each kind of rule
+ACTIONS = collections.OrderedDict([
+    ('token', 'Return a token for the match'),
+    ('skip', 'Skip the match'),
+    ('newline', 'Skip the match and count a line'),
+    ('block_comment', 'Skip a block comment, whose opener was matched'),
+    ('string', 'Return a string token, reporting unescaped newlines'),
+    ('unterminated_string', 'Report an unterminated string'),
+])
+
+
+class TokenSpecError(Exception):
+    pass
+
+
+def parse_charset(s):
+    """ The set of char codes described by s, a string of chars and ranges
+        such as 'a-zA-Z_'. A '-' at either end stands for itself.
+    """
+    codes = set()
+    i = 0
+    while i < len(s):
+        if i + 2 < len(s) and s[i + 1] == '-':
+            first, last = ord(s[i]), ord(s[i + 2])
+            if first > last:
+                raise TokenSpecError('Bad range %s' % s[i:i + 3])
+            codes.update(range(first, last + 1))
+            i += 3
+        else:
+            codes.add(ord(s[i]))
+            i += 1
+    if any(code >= OTHER for code in codes):
+        raise TokenSpecError('Only ASCII chars can be named in char sets: %r'
+                             % s)
+    return frozenset(codes)
+
+
+class NFA:
+    """ A Thompson NFA. States are ints; edges are labeled with sets of chars
+        of the universe, or None for epsilon edges. Fragments of the NFA are
+        (start, end) pairs of states.
+    """
+    def __init__(self):
+        self.edges = []
+        # state -> index of the rule it accepts
+        self.accepts = {}
+
+    def state(self):
+        self.edges.append([])
+        return len(self.edges) - 1
+
+    def edge(self, src, dst, chars=None):
+        self.edges[src].append((chars, dst))
+
+    def chars(self, chars):
+        start, end = self.state(), self.state()
+        self.edge(start, end, chars)
+        return start, end
+
+    def literal(self, text):
+        start = end = self.state()
+        for c in text:
+            if ord(c) >= OTHER:
+                raise TokenSpecError('Only ASCII chars can be used in '
+                                     'literals: %r' % text)
+            nxt = self.state()
+            self.edge(end, nxt, frozenset([ord(c)]))
+            end = nxt
+        return start, end
+
+    def concat(self, *fragments):
+        for (_, end), (start, _) in zip(fragments, fragments[1:]):
+            self.edge(end, start)
+        return fragments[0][0], fragments[-1][1]
+
+    def alt(self, *fragments):
+        start, end = self.state(), self.state()
+        for first, last in fragments:
+            self.edge(start, first)
+            self.edge(last, end)
+        return start, end
+
+    def star(self, fragment):
+        start, end = self.state(), self.state()
+        self.edge(start, fragment[0])
+        self.edge(start, end)
+        self.edge(fragment[1], fragment[0])
+        self.edge(fragment[1], end)
+        return start, end
+
+    def plus(self, fragment):
+        return self.concat(fragment, self.star(self._copy(fragment)))
+
+    def _copy(self, fragment):
+        """ A copy of the states reachable from fragment's start.
+        """
+        mapping = {}
+        pending = [fragment[0]]
+        while pending:
+            state = pending.pop()
+            if state not in mapping:
+                mapping[state] = self.state()
+                pending.extend(dst for _, dst in self.edges[state])
+        for state, copy in mapping.items():
+            for chars, dst in self.edges[state]:
+                self.edge(copy, mapping[dst], chars)
+        return mapping[fragment[0]], mapping[fragment[1]]
+
+
+class Rule:
+    """ A rule of the lexer: the token name (or a description, for rules that
+        produce no token) and the action run on a match.
+    """
+    def __init__(self, name, action):
+        self.name = name
+        self.action = action
+
+    def __repr__(self):
+        return 'Rule(%r, %r)' % (self.name, self.action)
+
+
+def build_nfa(spec):
+    """ Build the NFA of a token spec (a dict loaded from JSON). Return
+        (nfa, start state, list of Rules) - the index of a rule is its
+        priority, lower winning.
+    """
+    nfa = NFA()
+    rules = []
+    alternatives = []
+
+    def add(fragment, name, action):
+        nfa.accepts[fragment[1]] = len(rules)
+        rules.append(Rule(name, action))
+        alternatives.append(fragment)
+
+    line_comment = spec.get('line_comment')
+    if line_comment:
+        add(nfa.concat(nfa.literal(line_comment),
+                       nfa.star(nfa.chars(UNIVERSE - parse_charset('\n')))),
+            'line comment', 'skip')
+    block_comment = spec.get('block_comment')
+    if block_comment:
+        add(nfa.literal(block_comment['open']), 'block comment',
+            'block_comment')
+    for keyword in spec.get('keywords', []):
+        add(nfa.literal(keyword), keyword.upper(), 'token')
+    for op, name in sorted(spec.get('operators', {}).items()):
+        add(nfa.literal(op), name, 'token')
+    string = spec.get('string')
+    if string:
+        quote, escape = string['quote'], string['escape']
+        body = nfa.star(nfa.alt(
+            nfa.chars(UNIVERSE - parse_charset(quote + escape)),
+            nfa.concat(nfa.literal(escape), nfa.chars(UNIVERSE))))
+        add(nfa.concat(nfa.literal(quote), body, nfa.literal(quote)),
+            string['name'], 'string')
+        # Only matched if the string isn't terminated
+        add(nfa.literal(quote), 'unterminated string', 'unterminated_string')
+    for identifier in spec.get('identifiers', []):
+        add(nfa.concat(nfa.chars(parse_charset(identifier['first'])),
+                       nfa.star(nfa.chars(parse_charset(identifier['rest'])))),
+            identifier['name'], 'token')
+    number = spec.get('number')
+    if number:
+        add(nfa.plus(nfa.chars(parse_charset(number['digits']))),
+            number['name'], 'token')
+    if spec.get('whitespace'):
+        add(nfa.plus(nfa.chars(parse_charset(spec['whitespace']))),
+            'whitespace', 'skip')
+    if spec.get('newline'):
+        add(nfa.chars(parse_charset(spec['newline'])), 'newline', 'newline')
+    return nfa.alt(*alternatives)[0], nfa, rules
+
+
+def char_classes(nfa):
+    """ Partition the universe into classes of chars that no edge of nfa
+        tells apart. Return a list mapping each element of the universe to its
+        class; OTHER's class comes first, as class 0.
+    """
+    signatures = {}
+    labels = set(chars for edges in nfa.edges for chars, _ in edges
+                 if chars is not None)
+    labels = sorted(labels, key=sorted)
+    classes = {}
+    for code in sorted(UNIVERSE, key=lambda code: code != OTHER):
+        signature = tuple(code in chars for chars in labels)
+        classes[code] = signatures.setdefault(signature, len(signatures))
+    return [classes[code] for code in range(OTHER + 1)]
+
+
+def build_dfa(start, nfa, classes):
+    """ Subset construction. Return (transitions, accepts): transitions[s] is
+        the list of next states of state s for each char class, and
+        accepts[s] the index of the rule accepted in s, or -1. State 0 is the
+        dead state and state 1 the start state.
+    """
+    num_classes = max(classes) + 1
+    representatives = [classes.index(c) for c in range(num_classes)]
+
+    def closure(states):
+        result = set(states)
+        pending = list(states)
+        while pending:
+            for chars, dst in nfa.edges[pending.pop()]:
+                if chars is None and dst not in result:
+                    result.add(dst)
+                    pending.append(dst)
+        return frozenset(result)
+
+    dead = frozenset()
+    ids = {dead: 0}
+    subsets = [dead]
+    first = closure([start])
+    ids[first] = 1
+    subsets.append(first)
+    transitions = []
+    accepts = []
+    i = 0
+    while i < len(subsets):
+        subset = subsets[i]
+        row = []
+        for code in representatives:
+            target = closure([dst for state in subset
+                              for chars, dst in nfa.edges[state]
+                              if chars is not None and code in chars])
+            if target not in ids:
+                ids[target] = len(subsets)
+                subsets.append(target)
+            row.append(ids[target])
+        transitions.append(row)
+        accepted = [nfa.accepts[state] for state in subset
+                    if state in nfa.accepts]
+        accepts.append(min(accepted) if accepted else -1)
+        i += 1
+    return transitions, accepts
+
+
+def minimize(transitions, accepts):
+    """ Merge the equivalent states of a DFA (Moore's algorithm). Return the
+        minimized (transitions, accepts), with the dead state still 0 and the
+        start state 1, and the other states numbered in breadth-first order
+        from the start.
+    """
+    blocks = [accepts[state] for state in range(len(transitions))]
+    num_blocks = len(set(blocks))
+    while True:
+        signatures = {}
+        refined = [signatures.setdefault(
+                       (blocks[state],
+                        tuple(blocks[dst] for dst in transitions[state])),
+                       len(signatures))
+                   for state in range(len(transitions))]
+        blocks = refined
+        if len(signatures) == num_blocks:
+            break
+        num_blocks = len(signatures)
+
+    # Renumber the blocks: dead first, then breadth-first from the start
+    numbers = {blocks[0]: 0}
+    order = [0]
+    queue = collections.deque([1])
+    while queue:
+        state = queue.popleft()
+        if blocks[state] in numbers:
+            continue
+        numbers[blocks[state]] = len(order)
+        order.append(state)
+        queue.extend(transitions[state])
+    min_transitions = [[numbers[blocks[dst]] for dst in transitions[state]]
+                       for state in order]
+    min_accepts = [accepts[state] for state in order]
+    return min_transitions, min_accepts
+
+
+class Lexer:
+    """ The tables of the lexer of a token spec.
+
+        rules: the Rules, by priority.
+        classes: maps each element of the universe to its char class.
+        transitions, accepts: the minimized DFA (see build_dfa).
+        dfa_states: the number of states before minimization.
+    """
+    def __init__(self, spec):
+        start, nfa, self.rules = build_nfa(spec)
+        self.spec = spec
+        self.nfa_states = len(nfa.edges)
+        self.classes = char_classes(nfa)
+        transitions, accepts = build_dfa(start, nfa, self.classes)
+        self.dfa_states = len(transitions)
+        self.transitions, self.accepts = minimize(transitions, accepts)
+
+    @property
+    def num_classes(self):
+        return max(self.classes) + 1
+
+
+def load_spec(filename):
+    with open(filename) as f:
+        return json.load(f)
+
+
+CODE_PREFACE = r'''
+//------------------------------------------------------------------------------
+// Lexer for %(name)s.
+// NOTE: this code is auto-generated from the token spec in %(spec)s.
+//       Do not edit it directly.
+//
+// Splits a buffer of source code into a stream of tokens, by running a
+// minimized DFA over classes of chars. Has the same interface as lexer.js.
+//
+// Eli Bendersky (eliben@gmail.com)
+// This code is in the public domain
+//------------------------------------------------------------------------------
+'use strict';
+
+'''.lstrip()
+
+CODE_LEXER = r'''
+var Lexer = exports.Lexer = function() {
+  this.pos = 0;
+  this.buf = null;
+  this.buflen = 0;
+
+  // List of errors accumulated (and recovered from) during lexing.
+  this.errors = [];
+}
+
+// Initialize the Lexer's buffer. This resets the lexer's internal
+// state and subsequent tokens will be returned starting with the
+// beginning of the new buffer.
+Lexer.prototype.input = function(buf) {
+  this.pos = 0;
+  this.buf = buf;
+  this.buflen = buf.length;
+  this.lineno = 1;
+}
+
+// Get the next token from the current buffer. A token is an object with
+// the following properties:
+// - name: name of the pattern that this token matched.
+// - value: actual string value of the token.
+// - pos: offset in the current buffer where the token starts.
+// - lineno: line number.
+//
+// If there are no more tokens in the buffer, returns null. In case of
+// an error, returns a token with name 'ERROR' and adds an error string to the
+// errors attribute.
+Lexer.prototype.token = function() {
+  var buf = this.buf;
+  var buflen = this.buflen;
+  while (this.pos < buflen) {
+    // Run the DFA for the longest match from start
+    var start = this.pos;
+    var state = 1;
+    var rule = -1;
+    var end = start;
+    for (var i = start; i < buflen; i++) {
+      var c = buf.charCodeAt(i);
+      state = _NEXT[state * _NUM_CLASSES + (c < 128 ? _CLASS[c] : 0)];
+      if (state === 0) {
+        break;
+      }
+      if (_ACCEPT[state] >= 0) {
+        rule = _ACCEPT[state];
+        end = i + 1;
+      }
+    }
+
+    if (rule < 0) {
+      this._add_error("Unknown token '" + buf.charAt(start) + "'");
+      return this._maketoken('ERROR', '', this.pos++);
+    }
+    this.pos = end;
+    switch (_RULE_ACTIONS[rule]) {
+      case _TOKEN:
+        return this._maketoken(_RULE_NAMES[rule], buf.substring(start, end),
+                               start);
+      case _SKIP:
+        break;
+      case _NEWLINE:
+        this.lineno++;
+        break;
+      case _BLOCK_COMMENT:
+        this._skip_block_comment();
+        break;
+      case _STRING:
+        return this._string_token(_RULE_NAMES[rule], start, end);
+      case _UNTERMINATED_STRING:
+        // Lexing can't go on past the quote
+        this.pos = start;
+        this._add_error('Unterminated string');
+        return null;
+    }
+  }
+  return null;
+}
+
+// Creates a new token with the given name, value and pos. pos and lineno are is
+// optional: if not provided, the object attributes are used
+Lexer.prototype._maketoken = function(name, value, pos, lineno) {
+  var realpos = (typeof pos === "undefined") ? this.pos : pos;
+  var reallineno = (typeof lineno === "undefined") ? this.lineno : lineno;
+  return {name: name, value: value, pos: realpos, lineno: reallineno};
+}
+
+Lexer.prototype._add_error = function(str) {
+  this.errors.push('Line ' + this.lineno.toString() + ': ' + str);
+}
+
+// The string token between start and end. Newlines inside strings have to be
+// escaped; each one counts a line.
+Lexer.prototype._string_token = function(name, start, end) {
+  var string_lineno = this.lineno;
+  var nindex = start + 1;
+  while ((nindex = this.buf.indexOf('\n', nindex)) > 0 && nindex < end) {
+    if (this.buf.charAt(nindex - 1) !== _ESCAPE) {
+      this._add_error('Unescaped newline inside a string');
+    }
+    this.lineno++;
+    nindex++;
+  }
+  return this._maketoken(name, this.buf.substring(start, end), start,
+                         string_lineno);
+}
+'''
+
+CODE_BLOCK_COMMENT = r'''
+// Skip a block comment whose opener was just matched.%(nested_comment)s
+Lexer.prototype._skip_block_comment = function() {
+  var buf = this.buf;
+  var nestcount = 0;
+  while (this.pos < this.buflen) {
+    var c = buf.charCodeAt(this.pos);
+    if (c === _COMMENT_OPEN_0 && buf.startsWith(_COMMENT_OPEN, this.pos) &&
+        _COMMENT_NESTED) {
+      this.pos += _COMMENT_OPEN.length;
+      nestcount++;
+    } else if (c === _COMMENT_CLOSE_0 &&
+               buf.startsWith(_COMMENT_CLOSE, this.pos)) {
+      this.pos += _COMMENT_CLOSE.length;
+      if (nestcount === 0) {
+        return;
+      }
+      nestcount--;
+    } else {
+      if (c === 10) {
+        this.lineno++;
+      }
+      this.pos++;
+    }
+  }
+
+  this._add_error('Unterminated multi-line comment at EOF');
+}
+'''
+
+CODE_LEX_ALL = r'''
+// Utility function to lex all tokens from a given string. Returns tokens and
+// lexer errors packed into an object.
+var lex_all = exports.lex_all = function(str) {
+  var lex = new Lexer();
+  lex.input(str);
+
+  var toks = [];
+  while (true) {
+    var tok = lex.token();
+    if (tok === null) {
+      break;
+    } else {
+      toks.push(tok);
+    }
+  }
+  return {'tokens': toks, 'errors': lex.errors};
+}
+'''
+
+
+def _wrap(items, width=80):
+    """ Join items with commas into indented lines of at most width columns,
+        breaking only between items.
+    """
+    lines = []
+    line = ' '
+    for item in items:
+        if len(line) + len(item) + 2 > width:
+            lines.append(line.rstrip())
+            line = ' '
+        line += ' %s,' % item
+    lines.append(line[:-1])
+    return '\n'.join(lines)
+
+
+def _typed_array(arraytype, values):
+    """ JS code for a typed array holding values.
+    """
+    return 'new %s([\n%s])' % (arraytype, _wrap(str(v) for v in values))
+
+
+def _js_string(s):
+    return "'%s'" % s.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def emit_lexer(stream, lexer, spec_name):
+    def emit(s=''):
+        stream.write(s + '\n')
+    spec = lexer.spec
+    stream.write(CODE_PREFACE % {'name': spec.get('name', 'a language'),
+                                 'spec': spec_name})
+    emit('//')
+    emit('// Rules, by priority:')
+    for index, rule in enumerate(lexer.rules):
+        emit('//  %d: %s (%s)' % (index, rule.name, rule.action))
+    emit('//')
+    emit('// %d NFA states, %d DFA states, %d after minimization; '
+         '%d char classes.' % (lexer.nfa_states, lexer.dfa_states,
+                               len(lexer.transitions), lexer.num_classes))
+    emit('//')
+    emit()
+    emit('// Actions of the rules')
+    for index, action in enumerate(ACTIONS):
+        emit('var _%s = %d;  // %s' % (action.upper(), index, ACTIONS[action]))
+    emit()
+    emit('var _RULE_NAMES = [')
+    emit(_wrap("'%s'" % rule.name for rule in lexer.rules) + '];')
+    emit('var _RULE_ACTIONS = %s;' % _typed_array(
+        'Uint8Array', [list(ACTIONS).index(rule.action)
+                       for rule in lexer.rules]))
+    emit()
+    emit('// The char class of each ASCII char; all the other chars are in '
+         'class 0.')
+    emit('var _NUM_CLASSES = %d;' % lexer.num_classes)
+    emit('var _CLASS = %s;' % _typed_array('Uint8Array', lexer.classes[:OTHER]))
+    emit()
+    emit('// The next state of state s on a char of class c is')
+    emit('// _NEXT[s * _NUM_CLASSES + c]. State 0 is the dead state and state 1 '
+         'the')
+    emit('// start state. _ACCEPT holds the rule accepted in each state, or -1.')
+    num_states = len(lexer.transitions)
+    emit('var _NEXT = %s;' % _typed_array(
+        'Uint8Array' if num_states <= 256 else 'Uint16Array',
+        [dst for row in lexer.transitions for dst in row]))
+    emit('var _ACCEPT = %s;' % _typed_array(
+        'Int8Array' if len(lexer.rules) < 128 else 'Int16Array',
+        lexer.accepts))
+    emit()
+    string = spec.get('string')
+    emit('var _ESCAPE = %s;' % _js_string(string['escape'] if string else ''))
+    block_comment = spec.get('block_comment')
+    if block_comment:
+        for what in ('open', 'close'):
+            emit('var _COMMENT_%s = %s;' % (what.upper(),
+                                            _js_string(block_comment[what])))
+            emit('var _COMMENT_%s_0 = %d;' % (what.upper(),
+                                              ord(block_comment[what][0])))
+        emit('var _COMMENT_NESTED = %s;' % (
+            'true' if block_comment.get('nested') else 'false'))
+    stream.write(CODE_LEXER)
+    if block_comment:
+        stream.write(CODE_BLOCK_COMMENT % {'nested_comment': (
+            ' Comments can\n// be nested.' if block_comment.get('nested')
+            else '')})
+    stream.write(CODE_LEX_ALL)
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description='Generate a table-driven JavaScript lexer from a token '
+                    'spec.')
+    argparser.add_argument('spec', help='JSON token spec')
+    argparser.add_argument('-o', '--output',
+        help='output file (default: stdout). The file is only written if '
+             'its contents change')
+    argparser.add_argument('--stats', action='store_true',
+        help='report the sizes of the automata to stderr')
+    args = argparser.parse_args()
+
+    try:
+        lexer = Lexer(load_spec(args.spec))
+    except (TokenSpecError, KeyError, ValueError) as e:
+        sys.stderr.write('ERROR: %s: %s\n' % (args.spec, e))
+        return 1
+    if args.stats:
+        sys.stderr.write('%d rules, %d NFA states, %d DFA states, %d minimized,'
+                         ' %d char classes\n' % (
+                             len(lexer.rules), lexer.nfa_states,
+                             lexer.dfa_states, len(lexer.transitions),
+                             lexer.num_classes))
+    stream = io.StringIO()
+    emit_lexer(stream, lexer, args.spec.replace('\\', '/').split('/')[-1])
+    output = stream.getvalue().encode('utf-8')
+    if args.output:
+        asdl_cache.write_if_changed(args.output, output)
+    else:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output)
+
+if __name__ == '__main__':
+    sys.exit(main())